@@ -3,31 +3,24 @@
 Универсальный скрипт для автоматизации встреч
 Поддерживает различные действия: calendar, drive, media, transcribe, notion, all
 ОБНОВЛЕНО: Использует новые модульные handlers вместо устаревших функций
+
+Обработчики импортируются внутри команд: notify загружает только TelegramAPI,
+без клиентов Google, icalendar и остальных зависимостей обработчиков.
 """
 
 import os
 import sys
+import json
 import argparse
 import logging
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-import subprocess
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
 
 # Добавляем путь к src для импорта модулей
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 try:
     from config_manager import ConfigManager
-    from handlers.notion_handler import NotionHandler
-    from handlers.account_handler import AccountHandler
-    from handlers.media_handler import MediaHandler
-    from handlers.transcription_handler import TranscriptionHandler
-    from handlers.summary_handler import SummaryHandler
-    from telegram_api import TelegramAPI
-    NEW_HANDLERS_AVAILABLE = True
-    print("✅ Новые модульные обработчики загружены")
 except ImportError as e:
     print(f"❌ Ошибка импорта: {e}")
     print("Убедитесь, что все модули установлены")
@@ -35,6 +28,7 @@ except ImportError as e:
 
 def setup_logging():
     """Настройка логирования."""
+    os.makedirs("logs", exist_ok=True)
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -69,6 +63,7 @@ def process_account(config_manager: ConfigManager, account_type: str, logger: lo
     
     try:
         # Создаем AccountHandler для обработки аккаунта
+        from handlers.account_handler import AccountHandler
         account_handler = AccountHandler(config_manager, logger=logger)
         
         if account_type == 'personal':
@@ -111,6 +106,7 @@ def process_media(config_manager: ConfigManager, quality: str = 'medium', logger
     
     try:
         # Создаем MediaHandler для обработки медиа
+        from handlers.media_handler import MediaHandler
         media_handler = MediaHandler(config_manager, logger=logger)
         
         # Обрабатываем медиа файлы
@@ -132,6 +128,7 @@ def process_transcription(config_manager: ConfigManager, account_type: str, file
     
     try:
         # Создаем TranscriptionHandler для транскрипции
+        from handlers.transcription_handler import TranscriptionHandler
         transcription_handler = TranscriptionHandler(config_manager, logger=logger)
         
         if file_path:
@@ -158,6 +155,7 @@ def process_notion_sync(config_manager: ConfigManager, account_type: str, logger
     
     try:
         # Создаем NotionHandler для синхронизации
+        from handlers.notion_handler import NotionHandler
         notion_handler = NotionHandler(config_manager, logger=logger)
         
         # Синхронизируем с Notion
@@ -170,7 +168,8 @@ def process_notion_sync(config_manager: ConfigManager, account_type: str, logger
         logger.error(f"❌ Ошибка синхронизации с Notion: {e}")
         return {"status": "error", "message": str(e)}
 
-def process_notification(message: str, notification_type: str = "info", logger: logging.Logger = None):
+def process_notification(message: str, notification_type: str = "info", logger: logging.Logger = None,
+                         config_manager: ConfigManager = None):
     """Отправка уведомлений в Telegram через TelegramAPI."""
     if logger is None:
         logger = logging.getLogger(__name__)
@@ -179,7 +178,8 @@ def process_notification(message: str, notification_type: str = "info", logger:
     
     try:
         # Получаем настройки Telegram
-        config_manager = ConfigManager()
+        if config_manager is None:
+            config_manager = ConfigManager()
         telegram_config = config_manager.get_telegram_config()
         
         if not telegram_config.get('bot_token') or not telegram_config.get('chat_id'):
@@ -187,6 +187,7 @@ def process_notification(message: str, notification_type: str = "info", logger:
             return {"status": "error", "message": "Telegram not configured"}
         
         # Инициализируем Telegram API
+        from telegram_api import TelegramAPI
         telegram_api = TelegramAPI(telegram_config)
         
         # Отправляем сообщение с правильным parse_mode
@@ -221,6 +222,7 @@ def main():
     parser.add_argument('--message', help='Сообщение для команды notify')
     parser.add_argument('--notification_type', choices=['info', 'detailed'], default='info',
                        help='Тип уведомления для команды notify')
+    parser.add_argument('--result-file', help='Файл для записи результата в JSON (используется сервисом в режиме subprocess)')
     
     args = parser.parse_args()
     
@@ -250,7 +252,7 @@ def main():
                 logger.error("❌ Для команды notify необходимо указать --message")
                 return 1
             
-            result = process_notification(args.message, args.notification_type, logger)
+            result = process_notification(args.message, args.notification_type, logger, config_manager)
         elif args.action == 'all':
             logger.info("🚀 Запуск всех процессов...")
             results = {}
@@ -260,8 +262,18 @@ def main():
             results['notion'] = process_notion_sync(config_manager, args.account, logger)
             result = {"status": "success", "message": "All actions completed", "results": results}
         
+        # Без сервиса очередь Notion некому отправлять - отправляем накопленное сейчас
+        if args.action != 'notify' and config_manager.get_notion_config().get('outbox_enabled', False):
+            from handlers.notion_outbox import NotionOutbox
+            outbox_stats = NotionOutbox(config_manager, logger=logger).drain()
+            logger.info(f"📬 Очередь Notion: отправлено {outbox_stats['processed']}, ошибок {outbox_stats['errors']}")
+        
         logger.info(f"✅ {args.action} завершен: {result}")
         
+        if args.result_file:
+            with open(args.result_file, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, default=str)
+        
     except Exception as e:
         logger.error(f"❌ Ошибка выполнения {args.action}: {e}")
         sys.exit(1)
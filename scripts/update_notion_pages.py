@@ -7,16 +7,18 @@
 import os
 import sys
 import json
-import requests
 from datetime import datetime
 from typing import Dict, Any, List
 
 # Добавляем путь к src для импорта модулей
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 try:
     from config_manager import ConfigManager
     from notion_templates import add_meeting_details_to_page
+    from handlers.notion_api import get_notion_client
+    from handlers.notion_diff import content_hash
+    from handlers.state_manager import StateManager
 except ImportError as e:
     print(f"❌ Ошибка импорта: {e}")
     print("Убедитесь, что все модули установлены")
@@ -61,7 +63,7 @@ def get_all_notion_pages(notion_token: str, database_id: str) -> List[Dict[str,
             query_data["start_cursor"] = start_cursor
         
         try:
-            response = requests.post(url, headers=headers, json=query_data)
+            response = get_notion_client(notion_token).post(url, headers=headers, json=query_data)
             response.raise_for_status()
             
             data = response.json()
@@ -165,7 +167,7 @@ def check_page_content(notion_token: str, page_id: str) -> Dict[str, Any]:
     url = f"https://api.notion.com/v1/blocks/{page_id}/children"
     
     try:
-        response = requests.get(url, headers=headers)
+        response = get_notion_client(notion_token).get(url, headers=headers)
         response.raise_for_status()
         
         data = response.json()
@@ -208,37 +210,51 @@ def check_page_content(notion_token: str, page_id: str) -> Dict[str, Any]:
         return {}
 
 
-def update_page_with_details(notion_token: str, page_data: Dict[str, Any], content_info: Dict[str, Any]) -> bool:
+def page_needs_details(page_data: Dict[str, Any], content_info: Dict[str, Any]) -> bool:
     """
-    Обновляет страницу детальной информацией, если её не хватает.
+    Проверяет, не хватает ли на странице детальной информации.
     
     Args:
-        notion_token: Токен для API Notion
         page_data: Данные страницы
         content_info: Информация о содержимом
         
     Returns:
-        True если страница обновлена, False в противном случае
+        True если на страницу нужно добавить детали
     """
-    # Проверяем, что нужно добавить
-    needs_update = False
-    
     if not content_info.get("has_description") and page_data.get("title"):
-        needs_update = True
+        return True
     
     if not content_info.get("has_location"):
-        needs_update = True
+        return True
     
     if not content_info.get("has_attendees") and page_data.get("attendees"):
-        needs_update = True
+        return True
     
     if not content_info.get("has_meeting_link") and page_data.get("meeting_link"):
-        needs_update = True
+        return True
     
     if not content_info.get("has_calendar_source") and page_data.get("calendar_type"):
-        needs_update = True
+        return True
     
-    if not needs_update:
+    return False
+
+
+def update_page_with_details(notion_token: str, page_data: Dict[str, Any], content_info: Dict[str, Any],
+                             state_manager: StateManager = None) -> bool:
+    """
+    Обновляет страницу детальной информацией, если её не хватает.
+    
+    Args:
+        notion_token: Токен для API Notion
+        page_data: Данные страницы
+        content_info: Информация о содержимом
+        state_manager: Хранилище хешей добавленных блоков (добавляются только новые блоки)
+        
+    Returns:
+        True если страница обновлена, False в противном случае
+    """
+    # Проверяем, что нужно добавить
+    if not page_needs_details(page_data, content_info):
         return False
     
     # Формируем данные для обновления
@@ -267,7 +283,8 @@ def update_page_with_details(notion_token: str, page_data: Dict[str, Any], conte
             notion_token,
             page_data["page_id"],
             event_data,
-            None  # Без логгера для этого скрипта
+            None,  # Без логгера для этого скрипта
+            state_manager=state_manager
         )
         
         if success:
@@ -306,6 +323,9 @@ def main():
         print(f"❌ Ошибка загрузки конфигурации: {e}")
         return
     
+    # Хеши последней проверенной версии страниц: неизменившиеся страницы не перечитываются
+    state_manager = StateManager()
+    
     # Получаем все страницы
     print("\n📄 Загружаю все страницы из базы данных...")
     pages = get_all_notion_pages(notion_token, database_id)
@@ -320,6 +340,7 @@ def main():
     print("\n🔍 Анализирую содержимое страниц...")
     
     updated_count = 0
+    skipped_count = 0
     total_pages = len(pages)
     
     for i, page in enumerate(pages, 1):
@@ -337,6 +358,13 @@ def main():
         print(f"   🆔 Event ID: {page_data['event_id']}")
         print(f"   📱 Ссылка: {page_data['url']}")
         
+        # Свойства не изменились с прошлой проверки - содержимое уже приведено в порядок
+        source_hash = content_hash(page_data)
+        if state_manager.get_page_hashes(page_data["page_id"])["source_hash"] == source_hash:
+            print("   ⏭️ Без изменений с последней проверки")
+            skipped_count += 1
+            continue
+        
         # Проверяем содержимое
         content_info = check_page_content(notion_token, page_data["page_id"])
         
@@ -349,19 +377,21 @@ def main():
             print(f"   📅 Источник: {'✅' if content_info.get('has_calendar_source') else '❌'}")
         
         # Обновляем страницу, если нужно
-        if update_page_with_details(notion_token, page_data, content_info):
+        updated = update_page_with_details(notion_token, page_data, content_info, state_manager)
+        if updated:
             updated_count += 1
         
-        # Небольшая пауза между запросами
-        import time
-        time.sleep(0.5)
+        # Запоминаем проверенную версию, только если страница теперь полная
+        if content_info and (updated or not page_needs_details(page_data, content_info)):
+            state_manager.save_page_hashes(page_data["page_id"], source_hash=source_hash)
     
     # Итоговая статистика
     print("\n" + "=" * 50)
     print("📊 ИТОГОВАЯ СТАТИСТИКА")
     print(f"   Всего страниц: {total_pages}")
     print(f"   Обновлено: {updated_count}")
-    print(f"   Не требовали обновления: {total_pages - updated_count}")
+    print(f"   Пропущено без изменений: {skipped_count}")
+    print(f"   Не требовали обновления: {total_pages - updated_count - skipped_count}")
     
     if updated_count > 0:
         print(f"\n✅ Успешно обновлено {updated_count} страниц!")
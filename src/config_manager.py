@@ -12,6 +12,9 @@ from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
 
+# Общий файл токена OAuth из версий без отдельных токенов аккаунтов
+LEGACY_GOOGLE_TOKEN = 'token.json'
+
 class ConfigManager:
     """Менеджер конфигурации для альтернативных провайдеров."""
     
@@ -51,14 +54,32 @@ class ConfigManager:
         # Общие настройки Telegram и Notion
         self.config['telegram'] = {
             'bot_token': os.getenv('TELEGRAM_BOT_TOKEN', ''),
-            'chat_id': os.getenv('TELEGRAM_CHAT_ID', '')
+            'chat_id': os.getenv('TELEGRAM_CHAT_ID', ''),
+            'api_base_url': os.getenv('TELEGRAM_API_BASE_URL', ''),
+            'queue_enabled': os.getenv('TELEGRAM_QUEUE_ENABLED', 'true').lower() == 'true',
+            'coalesce_window': int(os.getenv('TELEGRAM_COALESCE_WINDOW', '60')),
+            'queue_max_pending': int(os.getenv('TELEGRAM_QUEUE_MAX_PENDING', '20')),
+            'retry_delay': int(os.getenv('TELEGRAM_RETRY_DELAY', '60')),
+            'min_interval': float(os.getenv('TELEGRAM_MIN_INTERVAL', '1.0')),
+            'max_retries': int(os.getenv('TELEGRAM_MAX_RETRIES', '3'))
         }
         
         self.config['notion'] = {
             'token': os.getenv('NOTION_TOKEN', ''),
             'database_id': os.getenv('NOTION_DATABASE_ID', ''),
             'parent_page_id': os.getenv('NOTION_PARENT_PAGE_ID', ''),
-            'db_title': os.getenv('NOTION_DB_TITLE', '')
+            'db_title': os.getenv('NOTION_DB_TITLE', ''),
+            'rate_limit': float(os.getenv('NOTION_RATE_LIMIT', '3')),
+            'max_retries': int(os.getenv('NOTION_MAX_RETRIES', '5')),
+            'api_base_url': os.getenv('NOTION_API_BASE_URL', ''),
+            'mirror_enabled': os.getenv('NOTION_MIRROR_ENABLED', 'true').lower() == 'true',
+            'mirror_refresh_interval': int(os.getenv('NOTION_MIRROR_REFRESH_INTERVAL', '300')),
+            'mirror_full_sync_interval': int(os.getenv('NOTION_MIRROR_FULL_SYNC_INTERVAL', '86400')),
+            'outbox_enabled': os.getenv('NOTION_OUTBOX_ENABLED', 'true').lower() == 'true',
+            'outbox_batch_size': int(os.getenv('NOTION_OUTBOX_BATCH_SIZE', '50')),
+            'outbox_poll_interval': int(os.getenv('NOTION_OUTBOX_POLL_INTERVAL', '5')),
+            'outbox_max_attempts': int(os.getenv('NOTION_OUTBOX_MAX_ATTEMPTS', '10')),
+            'outbox_retry_delay': int(os.getenv('NOTION_OUTBOX_RETRY_DELAY', '60'))
         }
         
         # Настройки аккаунтов
@@ -67,24 +88,31 @@ class ConfigManager:
             'personal': {
                 'enabled': account_type in ['personal', 'both'],
                 'google_credentials': os.getenv('PERSONAL_GOOGLE_CREDENTIALS', ''),
+                'google_token': os.getenv('PERSONAL_GOOGLE_TOKEN', ''),
+                'google_calendar_ids': [c.strip() for c in os.getenv('PERSONAL_GOOGLE_CALENDAR_IDS', 'primary').split(',') if c.strip()],
                 'calendar_id': os.getenv('PERSONAL_CALENDAR_ID', ''),
                 'drive_parent_id': os.getenv('PERSONAL_DRIVE_PARENT_ID', ''),
                 'calendar_provider': os.getenv('PERSONAL_CALENDAR_PROVIDER', 'web_ical'),
                 'ical_calendar_url': os.getenv('PERSONAL_ICAL_CALENDAR_URL', ''),
+                'ical_extra_urls': [u.strip() for u in os.getenv('PERSONAL_ICAL_EXTRA_URLS', '').split(',') if u.strip()],
                 'drive_provider': os.getenv('PERSONAL_DRIVE_PROVIDER', 'local'),
                 'local_drive_root': os.getenv('PERSONAL_LOCAL_DRIVE_ROOT', '')
             },
             'work': {
                 'enabled': account_type in ['work', 'both'],
                 'google_credentials': os.getenv('WORK_GOOGLE_CREDENTIALS', ''),
+                'google_token': os.getenv('WORK_GOOGLE_TOKEN', ''),
+                'google_calendar_ids': [c.strip() for c in os.getenv('WORK_GOOGLE_CALENDAR_IDS', 'primary').split(',') if c.strip()],
                 'calendar_id': os.getenv('WORK_CALENDAR_ID', ''),
                 'drive_parent_id': os.getenv('WORK_DRIVE_PARENT_ID', ''),
                 'calendar_provider': os.getenv('WORK_CALENDAR_PROVIDER', 'web_ical'),
                 'ical_calendar_url': os.getenv('WORK_ICAL_CALENDAR_URL', ''),
+                'ical_extra_urls': [u.strip() for u in os.getenv('WORK_ICAL_EXTRA_URLS', '').split(',') if u.strip()],
                 'drive_provider': os.getenv('WORK_DRIVE_PROVIDER', 'local'),
                 'local_drive_root': os.getenv('WORK_LOCAL_DRIVE_ROOT', '')
             }
         }
+        self._resolve_google_tokens()
         
         # Общие настройки
         self.config['general'] = {
@@ -94,13 +122,56 @@ class ConfigManager:
             'service_media_interval': int(os.getenv('SERVICE_MEDIA_INTERVAL', '1800')),
             'media_processing_timeout': int(os.getenv('MEDIA_PROCESSING_TIMEOUT', '1800')),
             'calendar_days_back': int(os.getenv('CALENDAR_DAYS_BACK', '3')),
-            'calendar_days_forward': int(os.getenv('CALENDAR_DAYS_FORWARD', '2'))
+            'calendar_days_forward': int(os.getenv('CALENDAR_DAYS_FORWARD', '2')),
+            'calendar_sync_token_enabled': os.getenv('GOOGLE_CALENDAR_SYNC_TOKEN_ENABLED', 'true').lower() == 'true',
+            'calendar_full_sync_interval': int(os.getenv('CALENDAR_FULL_SYNC_INTERVAL', '86400')),
+            'ical_cache_enabled': os.getenv('ICAL_CACHE_ENABLED', 'true').lower() == 'true',
+            'calendar_fetch_workers': int(os.getenv('CALENDAR_FETCH_WORKERS', '4'))
+        }
+        
+        # Обработка аккаунтов: в процессе сервиса или в отдельном процессе (изоляция)
+        self.config['account_processing'] = {
+            'mode': os.getenv('ACCOUNT_PROCESSING_MODE', 'inprocess').lower(),
+            'subprocess_timeout': int(os.getenv('ACCOUNT_SUBPROCESS_TIMEOUT', '600'))
+        }
+        
+        # Настройки конвейера этапов (медиа -> транскрипция -> саммари)
+        self.config['pipeline'] = {
+            'enabled': os.getenv('PIPELINE_ENABLED', 'true').lower() == 'true',
+            'media_workers': int(os.getenv('PIPELINE_MEDIA_WORKERS', '1')),
+            'transcription_workers': int(os.getenv('PIPELINE_TRANSCRIPTION_WORKERS', '1')),
+            'summary_workers': int(os.getenv('PIPELINE_SUMMARY_WORKERS', os.getenv('OPENAI_MAX_CONCURRENCY', '8'))),
+            'queue_size': int(os.getenv('PIPELINE_QUEUE_SIZE', '4'))
+        }
+        
+        # Настройки графа задач по встречам (использует количество потоков конвейера)
+        self.config['task_graph'] = {
+            'enabled': os.getenv('TASK_GRAPH_ENABLED', 'true').lower() == 'true',
+            'max_attempts': int(os.getenv('TASK_GRAPH_MAX_ATTEMPTS', '3')),
+            'retry_delay': int(os.getenv('TASK_GRAPH_RETRY_DELAY', '60'))
+        }
+        
+        # Настройки адаптивного интервала и пропуска циклов без изменений
+        self.config['service_schedule'] = {
+            'adaptive_interval': os.getenv('SERVICE_ADAPTIVE_INTERVAL', 'true').lower() == 'true',
+            'idle_skip': os.getenv('SERVICE_IDLE_SKIP', 'true').lower() == 'true',
+            'min_interval': int(os.getenv('SERVICE_MIN_INTERVAL', '60')),
+            'max_interval': int(os.getenv('SERVICE_MAX_INTERVAL', '1800')),
+            'active_hours_start': int(os.getenv('SERVICE_ACTIVE_HOURS_START', '8')),
+            'active_hours_end': int(os.getenv('SERVICE_ACTIVE_HOURS_END', '21')),
+            'meeting_end_window': int(os.getenv('SERVICE_MEETING_END_WINDOW', '900')),
+            'full_cycle_interval': int(os.getenv('SERVICE_FULL_CYCLE_INTERVAL', '3600')),
+            'processing_deadline': int(os.getenv('SERVICE_PROCESSING_DEADLINE', '240'))
         }
         
         # Настройки саммари
         self.config['summary'] = {
             'enable_complex_summary': os.getenv('ENABLE_COMPLEX_SUMMARY', 'false').lower() == 'true',
-            'enable_general_summary': os.getenv('ENABLE_GENERAL_SUMMARY', 'false').lower() == 'true'
+            'enable_general_summary': os.getenv('ENABLE_GENERAL_SUMMARY', 'false').lower() == 'true',
+            'complex_summary_keep': int(os.getenv('COMPLEX_SUMMARY_KEEP', '1')),
+            'chunk_tokens': int(os.getenv('SUMMARY_CHUNK_TOKENS', '6000')),
+            'reduce_tokens': int(os.getenv('SUMMARY_REDUCE_TOKENS', '8000')),
+            'map_workers': int(os.getenv('SUMMARY_MAP_WORKERS', '4'))
         }
         
         # Настройки медиа обработки
@@ -131,9 +202,21 @@ class ConfigManager:
         # Настройки OpenAI для анализа
         self.config['openai'] = {
             'api_key': os.getenv('OPENAI_API_KEY', ''),
+            'base_url': os.getenv('OPENAI_BASE_URL', ''),
             'analysis_model': os.getenv('OPENAI_ANALYSIS_MODEL', 'gpt-4o-mini'),
             'analysis_temperature': float(os.getenv('OPENAI_ANALYSIS_TEMPERATURE', '0.3')),
-            'analysis_max_tokens': int(os.getenv('OPENAI_ANALYSIS_MAX_TOKENS', '4000'))
+            'analysis_max_tokens': int(os.getenv('OPENAI_ANALYSIS_MAX_TOKENS', '4000')),
+            'summary_cache_enabled': os.getenv('SUMMARY_CACHE_ENABLED', 'true').lower() == 'true',
+            'summary_prompt_version': os.getenv('SUMMARY_PROMPT_VERSION', '1'),
+            'requests_per_minute': int(os.getenv('OPENAI_RPM', '500')),
+            'tokens_per_minute': int(os.getenv('OPENAI_TPM', '200000')),
+            'max_concurrency': int(os.getenv('OPENAI_MAX_CONCURRENCY', '8')),
+            'max_retries': int(os.getenv('OPENAI_MAX_RETRIES', '5')),
+            'request_timeout': float(os.getenv('OPENAI_TIMEOUT', '120')),
+            'context_window': int(os.getenv('OPENAI_CONTEXT_WINDOW', '0')),
+            'batch_poll_interval': int(os.getenv('OPENAI_BATCH_POLL_INTERVAL', '60')),
+            'batch_max_requests': int(os.getenv('OPENAI_BATCH_MAX_REQUESTS', '5000')),
+            'batch_dir': os.getenv('OPENAI_BATCH_DIR', 'data/batches')
         }
         
         # TASK-3: Настройки промптов
@@ -203,6 +286,32 @@ class ConfigManager:
         logger.info(f"🔧 TASK-5: Настройки управления оригинальными видео загружены")
         logger.info("Конфигурация загружена")
     
+    def _resolve_google_tokens(self):
+        """
+        Назначает файлы токенов OAuth аккаунтам без явного *_GOOGLE_TOKEN.
+        
+        У каждого аккаунта свой файл (token_personal.json, token_work.json), иначе
+        второй аккаунт загрузил бы токен первого. Старый общий token.json
+        используется, только если Google API включен у одного аккаунта и файла
+        токена аккаунта еще нет.
+        """
+        accounts = self.config['accounts']
+        google_accounts = [
+            name for name in ('personal', 'work')
+            if accounts[name]['enabled']
+            and 'google_api' in (accounts[name]['calendar_provider'], accounts[name]['drive_provider'])
+        ]
+        for name in ('personal', 'work'):
+            account = accounts[name]
+            if account['google_token']:
+                continue
+            token_path = f"token_{name}.json"
+            if (google_accounts == [name] and not os.path.exists(token_path)
+                    and os.path.exists(LEGACY_GOOGLE_TOKEN)):
+                logger.info(f"🔑 Аккаунт {name} использует общий {LEGACY_GOOGLE_TOKEN}")
+                token_path = LEGACY_GOOGLE_TOKEN
+            account['google_token'] = token_path
+    
     def get_accounts_config(self) -> Dict[str, Any]:
         """Получить конфигурацию аккаунтов."""
         return self.config['accounts']
@@ -249,14 +358,61 @@ class ConfigManager:
         """Получить настройки календаря."""
         return {
             'days_back': self.config['general']['calendar_days_back'],
-            'days_forward': self.config['general']['calendar_days_forward']
+            'days_forward': self.config['general']['calendar_days_forward'],
+            'sync_token_enabled': self.config['general']['calendar_sync_token_enabled'],
+            'full_sync_interval': self.config['general']['calendar_full_sync_interval'],
+            'ical_cache_enabled': self.config['general']['ical_cache_enabled'],
+            'fetch_workers': self.config['general']['calendar_fetch_workers']
         }
     
+    def get_account_processing_config(self) -> Dict[str, Any]:
+        """Получить настройки обработки аккаунтов."""
+        return self.config.get('account_processing', {
+            'mode': 'inprocess',
+            'subprocess_timeout': 600
+        })
+    
+    def get_pipeline_config(self) -> Dict[str, Any]:
+        """Получить настройки конвейера этапов."""
+        return self.config.get('pipeline', {
+            'enabled': False,
+            'media_workers': 1,
+            'transcription_workers': 1,
+            'summary_workers': 8,
+            'queue_size': 4
+        })
+    
+    def get_task_graph_config(self) -> Dict[str, Any]:
+        """Получить настройки графа задач по встречам."""
+        return self.config.get('task_graph', {
+            'enabled': False,
+            'max_attempts': 3,
+            'retry_delay': 60
+        })
+    
+    def get_service_schedule_config(self) -> Dict[str, Any]:
+        """Получить настройки расписания циклов сервиса."""
+        return self.config.get('service_schedule', {
+            'adaptive_interval': False,
+            'idle_skip': False,
+            'min_interval': 60,
+            'max_interval': 1800,
+            'active_hours_start': 8,
+            'active_hours_end': 21,
+            'meeting_end_window': 900,
+            'full_cycle_interval': 3600,
+            'processing_deadline': 0
+        })
+    
     def get_summary_config(self) -> Dict[str, Any]:
         """Получить настройки саммари."""
         return self.config.get('summary', {
             'enable_complex_summary': False,
-            'enable_general_summary': False
+            'enable_general_summary': False,
+            'complex_summary_keep': 1,
+            'chunk_tokens': 6000,
+            'reduce_tokens': 8000,
+            'map_workers': 4
         })
     
     def get_whisper_config(self) -> Dict[str, Any]:
@@ -1,23 +1,32 @@
 """
 Модуль обработчиков для автоматизации встреч
 Содержит базовые классы и специализированные обработчики
+
+Обработчики импортируются при первом обращении (from handlers import NotionHandler),
+поэтому импорт отдельного модуля пакета не загружает Google API, icalendar и
+остальные зависимости всех обработчиков.
 """
 
-from .base_handler import BaseHandler
-from .account_handler import AccountHandler
-from .process_handler import ProcessHandler
-from .metrics_handler import MetricsHandler
-from .transcription_handler import TranscriptionHandler
-from .summary_handler import SummaryHandler
-from .media_handler import MediaHandler
-from .notion_handler import NotionHandler
-from .calendar_handler import CalendarHandler
-from .notion_api import NotionAPI
-from .calendar_integration_handler import CalendarIntegrationHandler
+import importlib
+
+# Имя класса -> модуль пакета, в котором он определен
+_LAZY_IMPORTS = {
+    'BaseHandler': '.base_handler',
+    'AccountHandler': '.account_handler',
+    'ProcessHandler': '.process_handler',
+    'MetricsHandler': '.metrics_handler',
+    'TranscriptionHandler': '.transcription_handler',
+    'SummaryHandler': '.summary_handler',
+    'MediaHandler': '.media_handler',
+    'NotionHandler': '.notion_handler',
+    'CalendarHandler': '.calendar_handler',
+    'NotionAPI': '.notion_api',
+    'CalendarIntegrationHandler': '.calendar_integration_handler',
+}
 
 __all__ = [
     'BaseHandler',
-    'AccountHandler', 
+    'AccountHandler',
     'ProcessHandler',
     'MetricsHandler',
     'TranscriptionHandler',
@@ -28,3 +37,18 @@ __all__ = [
     'CalendarHandler',
     'NotionAPI'
 ]
+
+
+def __getattr__(name):
+    """Импортирует обработчик при первом обращении к нему."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Список атрибутов пакета вместе с отложенными обработчиками."""
+    return sorted(set(globals()) | set(__all__))
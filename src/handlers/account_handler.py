@@ -6,6 +6,8 @@
 
 import os
 import sys
+import json
+import tempfile
 import subprocess
 import traceback
 from typing import Dict, Any, Optional
@@ -13,10 +15,17 @@ from .base_handler import BaseHandler, retry
 from .calendar_integration_handler import CalendarIntegrationHandler
 
 
+# Переменная окружения дочернего процесса: внутри него аккаунт всегда обрабатывается в процессе
+SUBPROCESS_ENV_FLAG = 'MEETING_AUTOMATION_ACCOUNT_SUBPROCESS'
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
 class AccountHandler(BaseHandler):
     """Базовый класс для обработки аккаунтов."""
     
-    def __init__(self, config_manager, calendar_handler=None, notion_handler=None, logger=None):
+    def __init__(self, config_manager, calendar_handler=None, notion_handler=None, logger=None,
+                 calendar_integration_handler=None):
         """
         Инициализация обработчика аккаунтов.
         
@@ -25,11 +34,20 @@ class AccountHandler(BaseHandler):
             calendar_handler: Обработчик календаря (если есть)
             notion_handler: Обработчик Notion
             logger: Логгер
+            calendar_integration_handler: Существующий обработчик интеграции календаря (с прогретыми клиентами)
         """
         super().__init__(config_manager, logger)
         self.calendar_handler = calendar_handler
         self.notion_handler = notion_handler
-        self.calendar_integration_handler = CalendarIntegrationHandler(config_manager, notion_handler, None, logger)
+        self.calendar_integration_handler = calendar_integration_handler or CalendarIntegrationHandler(
+            config_manager, notion_handler, calendar_handler, logger
+        )
+        
+        processing_config = config_manager.get_account_processing_config()
+        self.processing_mode = processing_config.get('mode', 'inprocess')
+        self.subprocess_timeout = processing_config.get('subprocess_timeout', 600)
+        if os.getenv(SUBPROCESS_ENV_FLAG):
+            self.processing_mode = 'inprocess'
     
     def process(self, account_type: str = 'personal') -> Dict[str, Any]:
         """
@@ -62,7 +80,13 @@ class AccountHandler(BaseHandler):
                 self.logger.info(f"⏭️ Аккаунт {account_type} пропущен (отключен в конфигурации)")
                 return self._create_success_result(0, [f"Аккаунт {account_type} отключен"])
             
-            # Пытаемся использовать новый обработчик интеграции календаря
+            # Изоляция в отдельном процессе - только по настройке ACCOUNT_PROCESSING_MODE=subprocess
+            if self.processing_mode == 'subprocess':
+                result = self._run_universal_script(account_type)
+                self._log_operation_end(f"обработку аккаунта {account_type}", result)
+                return result
+            
+            # Обрабатываем в процессе сервиса через обработчик интеграции календаря
             if self.calendar_integration_handler:
                 result = self.calendar_integration_handler.process(account_type)
                 self._log_operation_end(f"обработку аккаунта {account_type}", result)
@@ -98,43 +122,54 @@ class AccountHandler(BaseHandler):
     
     def _run_universal_script(self, account_type: str) -> Dict[str, Any]:
         """
-        Запускает обработку через universal script.
+        Запускает обработку аккаунта в отдельном процессе через universal script.
+        
+        Используется только в режиме изоляции (ACCOUNT_PROCESSING_MODE=subprocess):
+        каждый запуск заново импортирует модули и авторизуется в API.
         
         Args:
             account_type: Тип аккаунта
             
         Returns:
-            Результат выполнения скрипта
+            Результат обработки, полученный из дочернего процесса
         """
+        result_path = None
         try:
             # Определяем эмодзи для типа аккаунта
             emoji = "👤" if account_type == "personal" else "🏢"
             account_name = "личного" if account_type == "personal" else "рабочего"
             
-            self.logger.info(f"{emoji} Запуск обработки {account_name} аккаунта...")
+            self.logger.info(f"{emoji} Запуск обработки {account_name} аккаунта в отдельном процессе...")
+            
+            fd, result_path = tempfile.mkstemp(prefix=f"account_{account_type}_", suffix=".json")
+            os.close(fd)
             
             # Формируем команду
             cmd = [
                 sys.executable,
-                'meeting_automation_universal.py',
+                os.path.join(PROJECT_ROOT, 'meeting_automation_universal.py'),
                 'calendar',
-                '--account', account_type
+                '--account', account_type,
+                '--result-file', result_path
             ]
             
             self.logger.info(f"🔄 Запуск команды: {' '.join(cmd)}")
             
             # Выполняем команду
-            process = subprocess.run(cmd, capture_output=True, text=True)
+            env = dict(os.environ, **{SUBPROCESS_ENV_FLAG: '1'})
+            process = subprocess.run(cmd, capture_output=True, text=True, cwd=PROJECT_ROOT, env=env,
+                                     timeout=self.subprocess_timeout)
             
             if process.returncode == 0:
                 self.logger.info(f"✅ Обработка {account_name} аккаунта завершена успешно")
-                return {
-                    "status": "success",
-                    "output": process.stdout,
-                    "processed": 0,  # Нет реальной обработки, только проверка
-                    "errors": 0,
-                    "details": [f"Аккаунт {account_type} обработан через universal script"]
-                }
+                result = {"status": "success", "processed": 0, "errors": 0, "details": []}
+                try:
+                    with open(result_path, 'r', encoding='utf-8') as f:
+                        result.update(json.load(f) or {})
+                except (OSError, ValueError) as e:
+                    self.logger.warning(f"⚠️ Не удалось прочитать результат дочернего процесса: {e}")
+                result["output"] = process.stdout
+                return result
             else:
                 self.logger.error(f"❌ Ошибка обработки {account_name} аккаунта: {process.stderr}")
                 return {
@@ -145,10 +180,22 @@ class AccountHandler(BaseHandler):
                     "details": [f"Ошибка выполнения universal script для {account_type}"]
                 }
                 
+        except subprocess.TimeoutExpired:
+            self.logger.error(f"❌ Обработка аккаунта {account_type} не завершилась за {self.subprocess_timeout}с")
+            return {
+                "status": "error",
+                "output": "",
+                "processed": 0,
+                "errors": 1,
+                "details": [f"Таймаут universal script для {account_type}"]
+            }
         except Exception as e:
             self.logger.error(f"❌ Ошибка запуска universal script для {account_type}: {e}")
             self.logger.debug(f"Стек вызовов: {traceback.format_exc()}")
             return self._create_error_result(e, f"запуск universal script для {account_type}")
+        finally:
+            if result_path and os.path.exists(result_path):
+                os.remove(result_path)
     
     def process_both_accounts(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Изолированные клиенты календарей по аккаунтам.
+
+У каждого аккаунта свои учетные данные Google, свой пул HTTP соединений для
+iCal лент и своя блокировка инициализации, поэтому личный и рабочий аккаунты
+можно синхронизировать параллельно, а календари внутри аккаунта - одновременно.
+Объект сервиса googleapiclient не потокобезопасен (httplib2), поэтому он
+создается отдельно для каждого потока.
+"""
+
+import os
+import logging
+import threading
+from typing import Dict, Any, List
+
+try:
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+    from googleapiclient.discovery import build
+    GOOGLE_CALENDAR_AVAILABLE = True
+except ImportError:
+    GOOGLE_CALENDAR_AVAILABLE = False
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+
+CALENDAR_SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
+
+
+class AccountCalendarClient:
+    """Клиент календарей одного аккаунта."""
+
+    def __init__(self, account_type: str, account_config: Dict[str, Any], workers: int = 4, logger=None):
+        """
+        Инициализация клиента аккаунта.
+
+        Args:
+            account_type: Тип аккаунта
+            account_config: Конфигурация аккаунта
+            workers: Количество календарей, загружаемых одновременно
+            logger: Логгер
+        """
+        self.account_type = account_type
+        self.account_config = account_config
+        self.workers = max(1, workers)
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.google_calendar_ids: List[str] = account_config.get('google_calendar_ids') or ['primary']
+        self.ical_urls: List[str] = [url for url in [account_config.get('ical_calendar_url')]
+                                     + list(account_config.get('ical_extra_urls') or []) if url]
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._credentials = None
+        self._session = None
+
+    def get_google_service(self):
+        """
+        Возвращает сервис Google Calendar API для текущего потока.
+
+        Returns:
+            Сервис googleapiclient или None, если авторизация недоступна
+        """
+        service = getattr(self._local, 'google_service', None)
+        if service is not None:
+            return service
+        credentials = self._get_credentials()
+        if credentials is None:
+            return None
+        service = build('calendar', 'v3', credentials=credentials, cache_discovery=False)
+        self._local.google_service = service
+        return service
+
+    def get_session(self):
+        """
+        Возвращает HTTP сессию аккаунта для загрузки iCal лент.
+
+        Returns:
+            requests.Session с пулом соединений на workers потоков
+        """
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._session = session
+            return self._session
+
+    def close(self):
+        """Закрывает HTTP сессию аккаунта."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _get_credentials(self):
+        """
+        Загружает (и при необходимости обновляет) учетные данные Google аккаунта.
+
+        Returns:
+            Credentials или None
+        """
+        with self._lock:
+            if self._credentials is not None and self._credentials.valid:
+                return self._credentials
+            try:
+                credentials_path = self.account_config.get('google_credentials')
+                token_path = self.account_config.get('google_token') or f"token_{self.account_type}.json"
+                if not credentials_path or not os.path.exists(credentials_path):
+                    self.logger.warning(f"⚠️ Файл учетных данных Google для {self.account_type} не найден")
+                    return None
+
+                # Загружаем учетные данные
+                creds = self._credentials
+                if creds is None and os.path.exists(token_path):
+                    creds = Credentials.from_authorized_user_file(token_path, CALENDAR_SCOPES)
+
+                # Если нет действительных учетных данных, запрашиваем авторизацию
+                if not creds or not creds.valid:
+                    if creds and creds.expired and creds.refresh_token:
+                        creds.refresh(Request())
+                    else:
+                        flow = InstalledAppFlow.from_client_secrets_file(credentials_path, CALENDAR_SCOPES)
+                        creds = flow.run_local_server(port=0)
+
+                    # Сохраняем учетные данные
+                    with open(token_path, 'w') as token:
+                        token.write(creds.to_json())
+
+                self._credentials = creds
+                self.logger.info(f"✅ Google Calendar API инициализирован для {self.account_type}")
+                return creds
+
+            except Exception as e:
+                self.logger.error(f"❌ Ошибка инициализации Google Calendar API для {self.account_type}: {e}")
+                return None
+
+
+class CalendarClientRegistry:
+    """Реестр клиентов календарей: один изолированный клиент на аккаунт."""
+
+    def __init__(self, config_manager, logger=None):
+        """
+        Инициализация реестра.
+
+        Args:
+            config_manager: Менеджер конфигурации
+            logger: Логгер
+        """
+        self.config_manager = config_manager
+        self.logger = logger or logging.getLogger(__name__)
+        self._clients: Dict[str, AccountCalendarClient] = {}
+        self._lock = threading.Lock()
+
+    def get(self, account_type: str, account_config: Dict[str, Any]) -> AccountCalendarClient:
+        """
+        Возвращает клиент аккаунта, создавая его при первом обращении.
+
+        Args:
+            account_type: Тип аккаунта
+            account_config: Конфигурация аккаунта
+
+        Returns:
+            Клиент календарей аккаунта
+        """
+        with self._lock:
+            client = self._clients.get(account_type)
+            if client is None:
+                workers = self.config_manager.get_calendar_config().get('fetch_workers', 4)
+                client = AccountCalendarClient(account_type, account_config, workers, self.logger)
+                self._clients[account_type] = client
+            return client
+
+    def close(self):
+        """Закрывает HTTP сессии всех клиентов."""
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
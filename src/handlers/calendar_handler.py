@@ -4,26 +4,21 @@
 Обработчик для работы с календарями (Google Calendar, Outlook, iCal)
 """
 
-import os
 import json
+import time
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+import tempfile
+import concurrent.futures
+from typing import Dict, Any, List, Optional, Tuple, Callable
 from datetime import datetime, timezone, timedelta
 from .base_handler import BaseHandler, retry
 import pytz
 
-try:
-    from google.oauth2.credentials import Credentials
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from google.auth.transport.requests import Request
-    from googleapiclient.discovery import build
-    GOOGLE_CALENDAR_AVAILABLE = True
-except ImportError:
-    GOOGLE_CALENDAR_AVAILABLE = False
+from .calendar_clients import CalendarClientRegistry, GOOGLE_CALENDAR_AVAILABLE
 
 try:
-    import icalendar
-    import requests
+    from .ical_stream import iter_window_occurrences
     ICAL_AVAILABLE = True
 except ImportError:
     ICAL_AVAILABLE = False
@@ -41,9 +36,19 @@ class CalendarHandler(BaseHandler):
             logger: Логгер
         """
         super().__init__(config_manager, logger)
-        self.google_service = None
         self.calendar_cache = {}
         
+        # Клиенты календарей изолированы по аккаунтам (учетные данные, HTTP пул)
+        self.clients = CalendarClientRegistry(config_manager, self.logger)
+        
+        # Состояние инкрементальной синхронизации и кэш событий хранятся в SQLite
+        try:
+            from .state_manager import StateManager
+            self.state_manager = StateManager(logger=self.logger)
+        except Exception as e:
+            self.logger.warning(f"⚠️ StateManager недоступен в CalendarHandler: {e}")
+            self.state_manager = None
+        
         # Инициализируем менеджер исключений
         try:
             from ..event_exclusions import EventExclusionManager
@@ -80,10 +85,10 @@ class CalendarHandler(BaseHandler):
             
             calendar_provider = account_config.get('calendar_provider', 'web_ical')
             
-            if calendar_provider == 'google' and GOOGLE_CALENDAR_AVAILABLE:
-                return self._get_google_calendar_events(account_config, days_ahead)
+            if calendar_provider in ('google', 'google_api') and GOOGLE_CALENDAR_AVAILABLE:
+                return self._get_google_calendar_events(account_config, days_ahead, account_type)
             elif calendar_provider == 'web_ical' and ICAL_AVAILABLE:
-                return self._get_ical_calendar_events(account_config, days_ahead)
+                return self._get_ical_calendar_events(account_config, days_ahead, account_type)
             else:
                 self.logger.warning(f"⚠️ Провайдер календаря {calendar_provider} не поддерживается")
                 return self._get_sample_events(account_type, days_ahead)
@@ -92,23 +97,27 @@ class CalendarHandler(BaseHandler):
             self.logger.error(f"❌ Ошибка получения событий календаря: {e}")
             return []
     
-    def _get_google_calendar_events(self, account_config: Dict[str, Any], days_ahead: int) -> List[Dict[str, Any]]:
+    def _get_google_calendar_events(self, account_config: Dict[str, Any], days_ahead: int,
+                                    account_type: str = 'work') -> List[Dict[str, Any]]:
         """
         Получает события из Google Calendar.
         
+        Если включена инкрементальная синхронизация, окно событий выгружается полностью
+        раз в full_sync_interval, а в остальных циклах запрашиваются только изменения
+        по nextSyncToken. События берутся из локального кэша в StateManager.
+        
         Args:
             account_config: Конфигурация аккаунта
             days_ahead: Количество дней вперед
+            account_type: Тип аккаунта
             
         Returns:
             Список событий Google Calendar
         """
         try:
-            # Инициализируем Google Calendar API
-            if not self.google_service:
-                self._init_google_calendar(account_config)
-            
-            if not self.google_service:
+            # Инициализируем Google Calendar API аккаунта
+            client = self.clients.get(account_type, account_config)
+            if not client.get_google_service():
                 return []
             
             # Получаем события с учетом дней назад и вперед
@@ -116,24 +125,34 @@ class CalendarHandler(BaseHandler):
             days_back = calendar_config['days_back']
             days_forward = calendar_config['days_forward']
             
-            start_time = (datetime.utcnow() - timedelta(days=days_back)).isoformat() + 'Z'
-            end_time = (datetime.utcnow() + timedelta(days=days_forward)).isoformat() + 'Z'
-            
-            events_result = self.google_service.events().list(
-                calendarId='primary',
-                timeMin=start_time,
-                timeMax=end_time,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
+            now = datetime.now(timezone.utc)
+            window_start = now - timedelta(days=days_back)
+            window_end = now + timedelta(days=days_forward)
+            use_sync_token = bool(self.state_manager and calendar_config.get('sync_token_enabled', True))
+            
+            def fetch(calendar_id: str) -> List[Dict[str, Any]]:
+                service = client.get_google_service()
+                if use_sync_token:
+                    return self._sync_google_events(service, account_type, calendar_id, window_start, window_end,
+                                                    calendar_config.get('full_sync_interval', 86400))
+                events, _ = self._list_google_events(
+                    service, calendar_id,
+                    timeMin=self._to_utc_iso(window_start), timeMax=self._to_utc_iso(window_end)
+                )
+                return [event for event in events if event.get('status') != 'cancelled']
+            
+            # Календари аккаунта загружаются одновременно
+            events = self._fetch_calendars(client, client.google_calendar_ids, fetch)
+            events.sort(key=self._google_event_start)
             
             # Преобразуем в стандартный формат
             formatted_events = []
+            seen_ids = set()
             for event in events:
                 formatted_event = self._format_google_event(event, account_type)
-                if formatted_event:
+                # Одно событие может быть в нескольких календарях аккаунта
+                if formatted_event and formatted_event['id'] not in seen_ids:
+                    seen_ids.add(formatted_event['id'])
                     formatted_events.append(formatted_event)
             
             self.logger.info(f"✅ Получено {len(formatted_events)} событий из Google Calendar (с {days_back} дней назад по {days_forward} дней вперед)")
@@ -143,30 +162,147 @@ class CalendarHandler(BaseHandler):
             self.logger.error(f"❌ Ошибка получения событий Google Calendar: {e}")
             return []
     
-    def _get_ical_calendar_events(self, account_config: Dict[str, Any], days_ahead: int) -> List[Dict[str, Any]]:
+    def _sync_google_events(self, service, account_type: str, calendar_id: str, window_start: datetime,
+                            window_end: datetime, full_sync_interval: int) -> List[Dict[str, Any]]:
+        """
+        Синхронизирует кэш событий Google Calendar и возвращает события окна.
+        
+        Полная выгрузка выполняется при первом запуске, раз в full_sync_interval,
+        если окно вышло за выгруженные границы, или если Google вернул 410 Gone
+        (токен синхронизации устарел). Иначе запрашиваются только изменения.
+        
+        Args:
+            service: Сервис Google Calendar API текущего потока
+            account_type: Тип аккаунта
+            calendar_id: ID календаря
+            window_start: Начало окна
+            window_end: Конец окна
+            full_sync_interval: Интервал полной синхронизации в секундах
+            
+        Returns:
+            События окна в формате Google Calendar API
+        """
+        state = self.state_manager.get_calendar_sync_state(account_type, calendar_id)
+        start_iso, end_iso = self._to_utc_iso(window_start), self._to_utc_iso(window_end)
+        
+        full = (not state['sync_token'] or not state['window_start'] or not state['window_end']
+                or start_iso < state['window_start'] or end_iso > state['window_end']
+                or time.time() - state['full_synced_at'] >= full_sync_interval)
+        
+        if not full:
+            try:
+                changes, sync_token = self._list_google_events(service, calendar_id, syncToken=state['sync_token'])
+                updated = [self._google_cache_entry(event) for event in changes if event.get('status') != 'cancelled']
+                removed = [event['id'] for event in changes if event.get('status') == 'cancelled']
+                if not self.state_manager.save_calendar_sync(account_type, calendar_id, updated, removed, sync_token):
+                    raise RuntimeError("не удалось сохранить изменения календаря")
+                if changes:
+                    self.logger.info(f"🔄 Google Calendar ({account_type}): изменено {len(updated)}, удалено {len(removed)}")
+            except Exception as e:
+                if getattr(getattr(e, 'resp', None), 'status', None) != 410:
+                    raise
+                self.logger.warning(f"⚠️ Токен синхронизации Google Calendar ({account_type}) устарел, выполняю полную синхронизацию")
+                self.state_manager.reset_calendar_sync(account_type, calendar_id)
+                full = True
+        
+        if full:
+            # Выгружаем окно с запасом на интервал до следующей полной синхронизации,
+            # чтобы сдвигающееся окно оставалось внутри выгруженного
+            fetch_end = self._to_utc_iso(window_end + timedelta(seconds=full_sync_interval))
+            events, sync_token = self._list_google_events(service, calendar_id, timeMin=start_iso, timeMax=fetch_end)
+            entries = [self._google_cache_entry(event) for event in events if event.get('status') != 'cancelled']
+            if not self.state_manager.save_calendar_sync(account_type, calendar_id, entries, [], sync_token,
+                                                         window_start=start_iso, window_end=fetch_end, full=True):
+                raise RuntimeError("не удалось сохранить события календаря")
+            self.logger.info(f"📥 Google Calendar ({account_type}): полная синхронизация, {len(entries)} событий")
+        
+        return self.state_manager.get_cached_calendar_events(account_type, calendar_id, start_iso, end_iso)
+    
+    def _list_google_events(self, service, calendar_id: str, **params) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
-        Получает события из iCal календаря.
+        Выгружает все страницы events().list.
+        
+        Args:
+            service: Сервис Google Calendar API текущего потока
+            calendar_id: ID календаря
+            **params: Параметры запроса (timeMin/timeMax или syncToken)
+            
+        Returns:
+            Кортеж (события, nextSyncToken с последней страницы)
+        """
+        events = []
+        page_token = None
+        while True:
+            result = service.events().list(
+                calendarId=calendar_id,
+                singleEvents=True,
+                maxResults=2500,
+                pageToken=page_token,
+                **params
+            ).execute()
+            events.extend(result.get('items', []))
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                return events, result.get('nextSyncToken')
+    
+    def _google_cache_entry(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Формирует запись кэша для события Google Calendar.
+        
+        Args:
+            event: Событие Google Calendar
+            
+        Returns:
+            Словарь {"event_id", "start_time", "raw_event"}
+        """
+        return {'event_id': event['id'], 'start_time': self._google_event_start(event), 'raw_event': event}
+    
+    def _google_event_start(self, event: Dict[str, Any]) -> str:
+        """
+        Возвращает время начала события Google Calendar в UTC ISO (для сортировки и выборки по окну).
+        
+        Args:
+            event: Событие Google Calendar
+            
+        Returns:
+            Время начала в формате YYYY-MM-DDTHH:MM:SSZ
+        """
+        start = event.get('start', {})
+        try:
+            if start.get('dateTime'):
+                return self._to_utc_iso(datetime.fromisoformat(start['dateTime'].replace('Z', '+00:00')))
+            if start.get('date'):
+                return f"{start['date']}T00:00:00Z"
+        except ValueError:
+            pass
+        return ''
+    
+    @staticmethod
+    def _to_utc_iso(value: datetime) -> str:
+        """Форматирует время в UTC ISO (YYYY-MM-DDTHH:MM:SSZ)."""
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    
+    def _get_ical_calendar_events(self, account_config: Dict[str, Any], days_ahead: int,
+                                  account_type: str = 'personal') -> List[Dict[str, Any]]:
+        """
+        Получает события из iCal календарей аккаунта (основная лента и дополнительные).
         
         Args:
             account_config: Конфигурация аккаунта
             days_ahead: Количество дней вперед
+            account_type: Тип аккаунта
             
         Returns:
             Список событий iCal календаря
         """
         try:
-            ical_url = account_config.get('ical_calendar_url')
-            if not ical_url:
+            client = self.clients.get(account_type, account_config)
+            if not client.ical_urls:
                 self.logger.warning("⚠️ URL iCal календаря не указан")
                 return []
             
-            # Загружаем iCal календарь
-            response = requests.get(ical_url, timeout=30)
-            response.raise_for_status()
-            
-            # Парсим iCal
-            cal = icalendar.Calendar.from_ical(response.content)
-            
             # Получаем события с учетом дней назад и вперед
             calendar_config = self.config_manager.get_calendar_config()
             days_back = calendar_config['days_back']
@@ -176,12 +312,17 @@ class CalendarHandler(BaseHandler):
             start_time = now - timedelta(days=days_back)
             end_time = now + timedelta(days=days_forward)
             
-            events = []
-            for component in cal.walk():
-                if component.name == "VEVENT":
-                    event = self._format_ical_event(component, start_time, end_time, account_type)
-                    if event:
-                        events.append(event)
+            # Ленты аккаунта загружаются одновременно
+            events = self._fetch_calendars(
+                client, client.ical_urls,
+                lambda ical_url: self._fetch_ical_feed(client, ical_url, account_type, start_time, end_time, calendar_config)
+            )
+            
+            # Одно событие может быть в нескольких лентах аккаунта
+            unique_events = {}
+            for event in events:
+                unique_events.setdefault(event['id'], event)
+            events = sorted(unique_events.values(), key=lambda event: self._ical_start_key(event['start']))
             
             self.logger.info(f"✅ Получено {len(events)} событий из iCal календаря (с {days_back} дней назад по {days_forward} дней вперед)")
             return events
@@ -190,6 +331,207 @@ class CalendarHandler(BaseHandler):
             self.logger.error(f"❌ Ошибка получения событий iCal календаря: {e}")
             return []
     
+    def _fetch_ical_feed(self, client, ical_url: str, account_type: str, start_time: datetime,
+                         end_time: datetime, calendar_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Загружает одну iCal ленту.
+        
+        Лента запрашивается условно (If-None-Match/If-Modified-Since): при ответе 304
+        или неизменном хеше содержимого события берутся из кэша без разбора iCal.
+        Разбор выполняется с запасом окна на full_sync_interval вперед.
+        
+        Args:
+            client: Клиент календарей аккаунта
+            ical_url: URL ленты
+            account_type: Тип аккаунта
+            start_time: Начало окна
+            end_time: Конец окна
+            calendar_config: Настройки календаря
+            
+        Returns:
+            Список событий ленты в окне
+        """
+        session = client.get_session()
+        full_sync_interval = calendar_config.get('full_sync_interval', 86400)
+        
+        if not self.state_manager or not calendar_config.get('ical_cache_enabled', True):
+            with session.get(ical_url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                body, _ = self._download_ical(response)
+            with body:
+                return self._parse_ical_events(body, start_time, end_time, account_type)
+        
+        # Ключ ленты - хеш URL (в URL приватный токен календаря)
+        feed_id = f"ical_{hashlib.md5(ical_url.encode('utf-8')).hexdigest()[:12]}"
+        state = self.state_manager.get_calendar_feed_state(account_type, feed_id)
+        start_key, end_key = self._ical_start_key(start_time), self._ical_start_key(end_time)
+        
+        # Кэш пригоден, если покрывает окно и не старше интервала полного разбора
+        cache_valid = bool(
+            state['content_hash'] and state['window_start'] and state['window_end']
+            and state['window_start'] <= start_key and end_key <= state['window_end']
+            and time.time() - state['parsed_at'] < full_sync_interval
+        )
+        
+        headers = {}
+        if cache_valid:
+            if state['etag']:
+                headers['If-None-Match'] = state['etag']
+            if state['last_modified']:
+                headers['If-Modified-Since'] = state['last_modified']
+        
+        # Загружаем iCal календарь (тело читается потоком во временный файл)
+        with session.get(ical_url, headers=headers, timeout=30, stream=True) as response:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            not_modified = cache_valid and response.status_code == 304
+            if not not_modified:
+                response.raise_for_status()
+                body, content_hash = self._download_ical(response)
+        
+        if not_modified:
+            self.state_manager.touch_calendar_feed(account_type, feed_id, etag, last_modified)
+            events = self._get_cached_ical_events(account_type, feed_id, start_key, end_key)
+            self.logger.info(f"✅ iCal календарь не изменился (304), из кэша {len(events)} событий")
+            return events
+        
+        with body:
+            if cache_valid and content_hash == state['content_hash']:
+                self.state_manager.touch_calendar_feed(account_type, feed_id, etag, last_modified)
+                events = self._get_cached_ical_events(account_type, feed_id, start_key, end_key)
+                self.logger.info(f"✅ Содержимое iCal календаря не изменилось, из кэша {len(events)} событий")
+                return events
+            
+            # Разбираем ленту с запасом окна до следующего полного разбора
+            parse_end = end_time + timedelta(seconds=full_sync_interval)
+            parsed = self._parse_ical_events(body, start_time, parse_end, account_type)
+        
+        entries = [{'event_id': event['id'], 'start_time': self._ical_start_key(event['start']), 'raw_event': event}
+                   for event in parsed]
+        self.state_manager.save_calendar_feed(account_type, feed_id, entries, etag, last_modified, content_hash,
+                                              start_key, self._ical_start_key(parse_end))
+        return [entry['raw_event'] for entry in entries if start_key <= entry['start_time'] < end_key]
+    
+    def _fetch_calendars(self, client, calendars: List[str],
+                         fetch: Callable[[str], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Загружает несколько календарей аккаунта одновременно.
+        
+        Ошибка одного календаря не мешает загрузке остальных.
+        
+        Args:
+            client: Клиент календарей аккаунта
+            calendars: ID календарей или URL лент
+            fetch: Функция загрузки одного календаря
+            
+        Returns:
+            События всех календарей
+        """
+        if len(calendars) == 1:
+            return fetch(calendars[0])
+        
+        events = []
+        workers = min(client.workers, len(calendars))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers,
+                                                   thread_name_prefix=f"calendar-{client.account_type}") as executor:
+            futures = {executor.submit(fetch, calendar): calendar for calendar in calendars}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    events.extend(future.result())
+                except Exception as e:
+                    self.logger.error(f"❌ Ошибка загрузки календаря {client.account_type} "
+                                      f"({self._calendar_label(futures[future])}): {e}")
+        return events
+    
+    @staticmethod
+    def _calendar_label(calendar: str) -> str:
+        """Подпись календаря для логов (без приватного токена iCal ссылки)."""
+        if calendar.startswith('http'):
+            return f"ical_{hashlib.md5(calendar.encode('utf-8')).hexdigest()[:12]}"
+        return calendar
+    
+    def _download_ical(self, response) -> Tuple[Any, str]:
+        """
+        Читает тело ответа во временный файл (в памяти до 1 МБ), одновременно считая хеш.
+        
+        Args:
+            response: Ответ requests, открытый с stream=True
+            
+        Returns:
+            Кортеж (файл, установленный на начало; sha256 содержимого)
+        """
+        body = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        digest = hashlib.sha256()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            digest.update(chunk)
+            body.write(chunk)
+        body.seek(0)
+        return body, digest.hexdigest()
+    
+    def _parse_ical_events(self, source, start_time: datetime, end_time: datetime,
+                           account_type: str) -> List[Dict[str, Any]]:
+        """
+        Потоково разбирает iCal ленту и возвращает события в заданном окне.
+        
+        Повторяющиеся события разворачиваются в экземпляры внутри окна
+        (RRULE/RDATE с учетом EXDATE и RECURRENCE-ID).
+        
+        Args:
+            source: Содержимое ленты или бинарный файл
+            start_time: Начало окна
+            end_time: Конец окна
+            account_type: Тип аккаунта
+            
+        Returns:
+            Список событий в стандартном формате
+        """
+        events = []
+        for component, occurrence_start, occurrence_end in iter_window_occurrences(
+                source, start_time, end_time, logger=self.logger):
+            event = self._format_ical_event(component, start_time, end_time, account_type,
+                                            occurrence_start=occurrence_start, occurrence_end=occurrence_end)
+            if event:
+                events.append(event)
+        return events
+    
+    def _get_cached_ical_events(self, account_type: str, feed_id: str,
+                                start_key: str, end_key: str) -> List[Dict[str, Any]]:
+        """
+        Возвращает события iCal ленты из кэша с повторной проверкой исключений.
+        
+        Args:
+            account_type: Тип аккаунта
+            feed_id: ID ленты
+            start_key: Начало окна (см. _ical_start_key)
+            end_key: Конец окна
+            
+        Returns:
+            Список событий в стандартном формате
+        """
+        events = self.state_manager.get_cached_calendar_events(account_type, feed_id, start_key, end_key)
+        if self.exclusion_manager:
+            events = [event for event in events
+                      if not self.exclusion_manager.should_exclude_event(event.get('title', ''), account_type)]
+        return events
+    
+    @staticmethod
+    def _ical_start_key(value) -> str:
+        """
+        Ключ времени начала iCal события для кэша.
+        
+        Совпадает с проверкой окна в _format_ical_event: сравнивается время
+        без учета часового пояса.
+        
+        Args:
+            value: datetime или ISO строка
+            
+        Returns:
+            Время в формате YYYY-MM-DDTHH:MM:SS
+        """
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        return value.replace(tzinfo=None).isoformat(timespec='seconds')
+    
     def _format_google_event(self, event: Dict[str, Any], account_type: str = 'work') -> Optional[Dict[str, Any]]:
         """
         Форматирует событие Google Calendar в стандартный формат.
@@ -244,7 +586,8 @@ class CalendarHandler(BaseHandler):
             self.logger.error(f"❌ Ошибка форматирования события Google Calendar: {e}")
             return None
     
-    def _format_ical_event(self, component, now: datetime, end_time: datetime, account_type: str = 'personal') -> Optional[Dict[str, Any]]:
+    def _format_ical_event(self, component, now: datetime, end_time: datetime, account_type: str = 'personal',
+                           occurrence_start: datetime = None, occurrence_end: datetime = None) -> Optional[Dict[str, Any]]:
         """
         Форматирует событие iCal в стандартный формат.
         
@@ -252,6 +595,9 @@ class CalendarHandler(BaseHandler):
             component: Компонент iCal события
             now: Текущее время
             end_time: Время окончания периода поиска
+            account_type: Тип аккаунта
+            occurrence_start: Начало экземпляра повторяющегося события (вместо DTSTART)
+            occurrence_end: Конец экземпляра повторяющегося события (вместо DTEND)
             
         Returns:
             Отформатированное событие или None
@@ -267,7 +613,7 @@ class CalendarHandler(BaseHandler):
                 return None
             
             # Обрабатываем начальное время
-            start_dt_value = start_dt.dt
+            start_dt_value = occurrence_start if occurrence_start is not None else start_dt.dt
             
             # Если это дата без времени (date), преобразуем в datetime
             if isinstance(start_dt_value, date) and not isinstance(start_dt_value, datetime):
@@ -281,7 +627,11 @@ class CalendarHandler(BaseHandler):
                 start_dt_value = start_dt_value.replace(tzinfo=pytz.UTC)
             
             # Обрабатываем конечное время
-            if end_dt:
+            if occurrence_end is not None:
+                end_dt_value = occurrence_end
+                if end_dt_value.tzinfo is None:
+                    end_dt_value = end_dt_value.replace(tzinfo=pytz.UTC)
+            elif end_dt:
                 end_dt_value = end_dt.dt
                 
                 # Если это дата без времени, преобразуем в datetime
@@ -372,45 +722,6 @@ class CalendarHandler(BaseHandler):
             self.logger.error(f"❌ Ошибка форматирования события iCal: {e}")
             return None
     
-    def _init_google_calendar(self, account_config: Dict[str, Any]):
-        """
-        Инициализирует Google Calendar API.
-        
-        Args:
-            account_config: Конфигурация аккаунта
-        """
-        try:
-            credentials_path = account_config.get('google_credentials')
-            if not credentials_path or not os.path.exists(credentials_path):
-                self.logger.warning("⚠️ Файл учетных данных Google не найден")
-                return
-            
-            # Загружаем учетные данные
-            creds = None
-            if os.path.exists('token.json'):
-                creds = Credentials.from_authorized_user_file('token.json', ['https://www.googleapis.com/auth/calendar.readonly'])
-            
-            # Если нет действительных учетных данных, запрашиваем авторизацию
-            if not creds or not creds.valid:
-                if creds and creds.expired and creds.refresh_token:
-                    creds.refresh(Request())
-                else:
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        credentials_path, ['https://www.googleapis.com/auth/calendar.readonly'])
-                    creds = flow.run_local_server(port=0)
-                
-                # Сохраняем учетные данные
-                with open('token.json', 'w') as token:
-                    token.write(creds.to_json())
-            
-            # Создаем сервис
-            self.google_service = build('calendar', 'v3', credentials=creds)
-            self.logger.info("✅ Google Calendar API инициализирован")
-            
-        except Exception as e:
-            self.logger.error(f"❌ Ошибка инициализации Google Calendar API: {e}")
-            self.google_service = None
-    
     def _get_account_config(self, account_type: str) -> Optional[Dict[str, Any]]:
         """
         Получает конфигурацию аккаунта.
@@ -7,6 +7,7 @@
 
 import os
 import json
+import hashlib
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
@@ -76,7 +77,10 @@ class CalendarIntegrationHandler(BaseHandler):
             calendar_events = self._load_calendar_events(account_type)
             if not calendar_events:
                 self.logger.info(f"📅 События календаря для {account_type} не найдены")
-                return self._create_success_result(0, [f"События календаря для {account_type} не найдены"])
+                result = self._create_success_result(0, [f"События календаря для {account_type} не найдены"])
+                result["change_token"] = self._get_events_change_token([])
+                result["meeting_ends"] = []
+                return result
             
             self.logger.info(f"📅 Найдено {len(calendar_events)} событий календаря для {account_type}")
             
@@ -115,6 +119,8 @@ class CalendarIntegrationHandler(BaseHandler):
                 "notion_pages_created": created_notion_pages,
                 "errors": errors,
                 "skipped": skipped_events,
+                "change_token": self._get_events_change_token(calendar_events),
+                "meeting_ends": [event['end'] for event in calendar_events if event.get('end')],
                 "details": [
                     f"Обработано событий: {processed_events}",
                     f"Создано папок: {created_folders}",
@@ -130,6 +136,22 @@ class CalendarIntegrationHandler(BaseHandler):
         except Exception as e:
             return self._create_error_result(e, f"обработка событий календаря {account_type}")
     
+    def _get_events_change_token(self, events: List[Dict[str, Any]]) -> str:
+        """
+        Вычисляет токен изменений календаря по набору событий.
+        
+        Args:
+            events: Список событий календаря
+            
+        Returns:
+            Хеш идентификаторов, названий и времени событий
+        """
+        items = sorted(
+            (str(event.get('id', '')), str(event.get('title', '')), str(event.get('start', '')), str(event.get('end', '')))
+            for event in events
+        )
+        return hashlib.md5(json.dumps(items, ensure_ascii=False).encode('utf-8')).hexdigest()
+    
     def _load_calendar_events(self, account_type: str) -> List[Dict[str, Any]]:
         """
         Загружает события календаря для указанного аккаунта.
@@ -413,6 +435,9 @@ class CalendarIntegrationHandler(BaseHandler):
         Создает или обновляет страницу в Notion для события.
         Сначала проверяет существование страницы, чтобы избежать дублирования.
         
+        При включенной очереди Notion операция записывается в очередь и выполняется
+        фоновым обработчиком, поэтому этап календаря не ждет ответа Notion.
+        
         Args:
             event: Событие календаря
             account_type: Тип аккаунта
@@ -424,68 +449,41 @@ class CalendarIntegrationHandler(BaseHandler):
             if not self.notion_handler:
                 return {"success": False, "message": "Notion handler not available"}
             
-            # Сначала проверяем, существует ли уже страница для этой встречи
-            existing_page_id = self.notion_handler.find_existing_meeting_page(event, account_type)
-            
-            if existing_page_id:
-                # Страница уже существует - обновляем её свойства
-                self.logger.info(f"🔄 Страница для встречи '{event.get('title', 'Unknown')}' уже существует, обновляю свойства")
-                
-                update_result = self.notion_handler.update_existing_meeting_page(existing_page_id, event, account_type)
-                
-                if update_result.get('success'):
-                    # Помечаем событие как синхронизированное с Notion в БД
-                    if self.state_manager and event.get('id'):
-                        self.state_manager.mark_notion_synced(
-                            event['id'], 
-                            existing_page_id, 
-                            update_result.get('page_url', ''), 
-                            "success"
-                        )
-                    
-                    return {
-                        "success": True,
-                        "page_id": existing_page_id,
-                        "message": "Existing Notion page updated successfully",
-                        "updated": True
-                    }
-                else:
-                    self.logger.warning(f"⚠️ Не удалось обновить существующую страницу: {update_result.get('message')}")
-                    # Продолжаем с созданием новой страницы
-            
-            # Создаем новую страницу
-            self.logger.info(f"📄 Создаю новую страницу в Notion для встречи '{event.get('title', 'Unknown')}'")
-            
-            page_data = self.notion_handler._prepare_page_data(event, "", account_type)
-            notion_page = self.notion_handler._create_notion_page(page_data)
-            
-            if notion_page:
-                page_id = notion_page.get('page_id')
-                self.logger.info(f"✅ Страница Notion создана для {event.get('title', 'Unknown')}: {page_id}")
-                
-                # Помечаем событие как синхронизированное с Notion в БД
-                if self.state_manager and event.get('id'):
-                    self.state_manager.mark_notion_synced(
-                        event['id'], 
-                        page_id, 
-                        notion_page.get('url', ''), 
-                        "success"
-                    )
-                
+            if self.state_manager and self.state_manager.notion_outbox_enabled:
+                queued = self.state_manager.enqueue_notion_operation(
+                    'upsert_meeting',
+                    self._get_notion_target(event, account_type),
+                    {"event": event, "account_type": account_type}
+                )
                 return {
-                    "success": True,
-                    "page_id": page_id,
-                    "message": "Notion page created successfully",
-                    "updated": False
+                    "success": queued,
+                    "queued": True,
+                    "page_id": None,
+                    "message": "Notion operation queued" if queued else "Failed to queue Notion operation"
                 }
-            else:
-                self.logger.error(f"❌ Не удалось создать страницу Notion для {event.get('title', 'Unknown')}")
-                return {"success": False, "message": "Failed to create Notion page"}
+            
+            return self.notion_handler.upsert_meeting_page(event, account_type)
             
         except Exception as e:
             self.logger.error(f"❌ Ошибка создания/обновления страницы Notion: {e}")
             return {"success": False, "message": str(e)}
     
+    def _get_notion_target(self, event: Dict[str, Any], account_type: str) -> str:
+        """
+        Возвращает ключ события для очереди Notion (операции с одним ключом объединяются).
+        
+        Args:
+            event: Событие календаря
+            account_type: Тип аккаунта
+            
+        Returns:
+            ID события или составной ключ для событий без ID
+        """
+        event_id = event.get('id')
+        if event_id and event_id != 'unknown':
+            return str(event_id)
+        return f"{account_type}:{event.get('title', '')}:{event.get('start', '')}"
+    
     def _get_account_config(self, account_type: str) -> Optional[Dict[str, Any]]:
         """
         Получает конфигурацию аккаунта.
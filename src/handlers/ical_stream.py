@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Потоковый разбор iCal ленты с разворачиванием повторений только внутри окна.
+
+Лента читается построчно, VEVENT разбираются по одному. Одиночные события вне
+окна отбрасываются по строке DTSTART без разбора icalendar. Серии (RRULE/RDATE)
+разворачиваются только в пределах окна с учетом EXDATE и переопределенных
+экземпляров (RECURRENCE-ID). В памяти держатся только события окна, поэтому
+расход памяти не зависит от размера истории в ленте.
+"""
+
+import re
+import logging
+from datetime import datetime, date, timedelta
+from typing import Dict, List, Iterable, Iterator, Optional, Tuple, Union
+
+import icalendar
+from dateutil.rrule import rrulestr
+
+
+# Максимум экземпляров одной серии в окне (защита от ошибочных правил с FREQ=SECONDLY и т.п.)
+MAX_OCCURRENCES_PER_SERIES = 500
+
+# Запас в днях для грубой проверки DTSTART по строке (часовые пояса, длинные события)
+PREFILTER_MARGIN_DAYS = 2
+
+_DTSTART_RE = re.compile(r'^DTSTART[;:][^\r\n]*?(\d{8})', re.IGNORECASE)
+_RECURRENCE_ID_RE = re.compile(r'^RECURRENCE-ID[;:][^\r\n]*?(\d{8})', re.IGNORECASE)
+
+Occurrence = Tuple[icalendar.Event, datetime, datetime]
+
+
+def iter_unfolded_lines(source: Union[bytes, Iterable[bytes]]) -> Iterator[str]:
+    """
+    Читает строки iCal с объединением перенесенных строк (RFC 5545, 3.1).
+
+    Args:
+        source: Содержимое ленты или итерируемый источник строк (например, открытый бинарный файл)
+
+    Yields:
+        Логические строки без завершающего перевода строки
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = bytes(source).splitlines()
+    current = None
+    for raw in source:
+        line = raw.decode('utf-8', errors='replace').rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def iter_vevent_blocks(source: Union[bytes, Iterable[bytes]]) -> Iterator[List[str]]:
+    """
+    Выделяет из ленты блоки VEVENT (вместе с вложенными VALARM).
+
+    Args:
+        source: Содержимое ленты или итерируемый источник строк
+
+    Yields:
+        Строки одного VEVENT от BEGIN до END
+    """
+    block: Optional[List[str]] = None
+    for line in iter_unfolded_lines(source):
+        upper = line.upper()
+        if upper == 'BEGIN:VEVENT':
+            block = [line]
+        elif block is not None:
+            block.append(line)
+            if upper == 'END:VEVENT':
+                yield block
+                block = None
+
+
+def _to_datetime(value: Union[date, datetime]) -> datetime:
+    """Приводит date к datetime (полночь), datetime возвращает без изменений."""
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, datetime.min.time())
+
+
+def _wall_clock(value: Union[date, datetime], tzinfo=None) -> datetime:
+    """
+    Время без часового пояса для сравнения с окном.
+
+    Как и _format_ical_event, окно проверяется по «настенному» времени события;
+    если указан tzinfo, время сначала переводится в этот пояс.
+    """
+    value = _to_datetime(value)
+    if value.tzinfo is not None and tzinfo is not None:
+        value = value.astimezone(tzinfo)
+    return value.replace(tzinfo=None)
+
+
+def _date_values(component: icalendar.Event, name: str) -> List[Union[date, datetime]]:
+    """Возвращает значения EXDATE/RDATE (свойство может встречаться несколько раз)."""
+    prop = component.get(name)
+    if prop is None:
+        return []
+    props = prop if isinstance(prop, list) else [prop]
+    values = []
+    for item in props:
+        values.extend(dt.dt for dt in getattr(item, 'dts', []))
+    return values
+
+
+def _duration(component: icalendar.Event, start: datetime) -> timedelta:
+    """Длительность события по DTEND или DURATION (по умолчанию час)."""
+    if component.get('dtend') is not None:
+        end = _to_datetime(component['dtend'].dt)
+        if (end.tzinfo is None) == (start.tzinfo is None):
+            return end - start
+    if component.get('duration') is not None:
+        return component['duration'].dt
+    return timedelta(hours=1)
+
+
+def _build_rule(component: icalendar.Event, dtstart: datetime):
+    """
+    Строит правило повторения dateutil для серии.
+
+    UNTIL приводится к виду, который dateutil допускает для данного DTSTART:
+    для «плавающего» времени - без Z, для времени с поясом - в UTC.
+    """
+    rrule = component.get('rrule')
+    if isinstance(rrule, list):
+        rrule = rrule[0]
+    text = rrule.to_ical().decode('utf-8')
+    if dtstart.tzinfo is None:
+        text = re.sub(r'(UNTIL=\d{8}T\d{6})Z', r'\1', text)
+    else:
+        text = re.sub(r'UNTIL=(\d{8})(?=;|$)', r'UNTIL=\1T235959Z', text)
+        text = re.sub(r'(UNTIL=\d{8}T\d{6})(?=;|$)', r'\1Z', text)
+    return rrulestr(text, dtstart=dtstart)
+
+
+def _block_date(block: List[str], pattern: re.Pattern) -> Optional[date]:
+    """Извлекает дату из строки свойства блока без разбора icalendar."""
+    for line in block:
+        match = pattern.match(line)
+        if match:
+            value = match.group(1)
+            try:
+                return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+            except ValueError:
+                return None
+    return None
+
+
+def _is_recurring(block: List[str]) -> bool:
+    """Проверяет, задает ли блок серию повторений."""
+    return any(line[:6].upper() in ('RRULE:', 'RRULE;', 'RDATE:', 'RDATE;') for line in block)
+
+
+def iter_window_occurrences(source: Union[bytes, Iterable[bytes]], window_start: datetime,
+                            window_end: datetime, logger=None) -> Iterator[Occurrence]:
+    """
+    Потоково разбирает ленту и возвращает экземпляры событий в окне.
+
+    Одиночные события возвращаются сразу по мере чтения. Экземпляры серий и
+    переопределения (RECURRENCE-ID) накапливаются в пределах окна и
+    возвращаются после чтения ленты, когда известны все переопределения.
+
+    Args:
+        source: Содержимое ленты или итерируемый источник строк
+        window_start: Начало окна (время без пояса)
+        window_end: Конец окна (время без пояса)
+        logger: Логгер
+
+    Yields:
+        Кортежи (компонент VEVENT, начало экземпляра, конец экземпляра)
+    """
+    logger = logger or logging.getLogger(__name__)
+    window_start = window_start.replace(tzinfo=None)
+    window_end = window_end.replace(tzinfo=None)
+    margin = timedelta(days=PREFILTER_MARGIN_DAYS)
+    first_day = (window_start - margin).date()
+    last_day = (window_end + margin).date()
+
+    # Экземпляры серий: (UID, время экземпляра) -> экземпляр
+    series: Dict[Tuple[str, datetime], Occurrence] = {}
+    # Переопределения экземпляров: (UID, RECURRENCE-ID) -> экземпляр или None (отменен)
+    overrides: Dict[Tuple[str, datetime], Optional[Occurrence]] = {}
+
+    for block in iter_vevent_blocks(source):
+        recurring = _is_recurring(block)
+        recurrence_day = _block_date(block, _RECURRENCE_ID_RE)
+        start_day = _block_date(block, _DTSTART_RE)
+
+        # Ранний отсев без разбора: одиночное событие (или переопределение) далеко от окна
+        if not recurring and start_day and not first_day <= start_day <= last_day:
+            if recurrence_day is None or not first_day <= recurrence_day <= last_day:
+                continue
+
+        try:
+            component = icalendar.Calendar.from_ical('\r\n'.join(block))
+            if component.get('dtstart') is None:
+                continue
+            dtstart = _to_datetime(component['dtstart'].dt)
+            duration = _duration(component, dtstart)
+            uid = str(component.get('uid', ''))
+
+            if component.get('recurrence-id') is not None:
+                key = (uid, _wall_clock(component['recurrence-id'].dt, dtstart.tzinfo))
+                cancelled = str(component.get('status', '')).upper() == 'CANCELLED'
+                overrides[key] = None if cancelled else (component, dtstart, dtstart + duration)
+                continue
+
+            if not recurring:
+                if window_start <= _wall_clock(dtstart) <= window_end:
+                    yield component, dtstart, dtstart + duration
+                continue
+
+            # Разворачиваем серию только внутри окна (границы в поясе DTSTART)
+            excluded = {_wall_clock(value, dtstart.tzinfo) for value in _date_values(component, 'exdate')}
+            starts: List[datetime] = []
+            if component.get('rrule') is not None:
+                rule = _build_rule(component, dtstart)
+                after = window_start - duration
+                if dtstart.tzinfo is not None:
+                    after = after.replace(tzinfo=dtstart.tzinfo)
+                for occurrence in rule.xafter(after, inc=True):
+                    if _wall_clock(occurrence) > window_end or len(starts) >= MAX_OCCURRENCES_PER_SERIES:
+                        break
+                    starts.append(occurrence)
+            starts.extend(_to_datetime(value) for value in _date_values(component, 'rdate'))
+
+            for occurrence in starts:
+                wall = _wall_clock(occurrence, dtstart.tzinfo)
+                if wall in excluded or not window_start <= wall <= window_end:
+                    continue
+                series[(uid, wall)] = (component, occurrence, occurrence + duration)
+
+        except Exception as e:
+            logger.warning(f"⚠️ Пропущено событие iCal, которое не удалось разобрать: {e}")
+
+    # Переопределенные экземпляры заменяют (или отменяют) экземпляры серии
+    for key, override in overrides.items():
+        series.pop(key, None)
+        if override is not None and window_start <= _wall_clock(override[1]) <= window_end:
+            series[key] = override
+
+    yield from sorted(series.values(), key=lambda item: _wall_clock(item[1]))
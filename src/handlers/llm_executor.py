@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Общий для процесса исполнитель запросов к OpenAI.
+
+Один клиент openai с пулом соединений на все потоки, ограничения запросов и
+токенов в минуту (скользящее окно), ограничение одновременных запросов и
+повторы при 429/5xx с экспоненциальной задержкой. Саммари из очереди
+отправляются параллельно, поэтому очередь из десятков транскрипций
+обрабатывается за время нескольких запросов, а не их суммы.
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+import concurrent.futures
+from collections import deque
+from typing import Dict, Any, List, Optional, Callable, Iterable
+
+from .map_reduce_summarizer import estimate_tokens
+
+
+# Статусы, при которых запрос к OpenAI повторяется
+RETRY_STATUSES = (408, 409, 429, 500, 502, 503, 504)
+
+# Длина окна ограничений RPM/TPM в секундах
+WINDOW_SECONDS = 60.0
+
+
+class MinuteBudget:
+    """Ограничение запросов и токенов в минуту (скользящее окно), общее для всех потоков."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """
+        Инициализация ограничителя.
+
+        Args:
+            requests_per_minute: Запросов в минуту (0 - без ограничения)
+            tokens_per_minute: Токенов в минуту (0 - без ограничения)
+        """
+        self.requests_per_minute = max(0, int(requests_per_minute))
+        self.tokens_per_minute = max(0, int(tokens_per_minute))
+        self.blocked_until = 0.0
+        self._entries: deque = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int) -> List[float]:
+        """
+        Ждет, пока запрос с указанной оценкой токенов укладывается в лимиты, и учитывает его.
+
+        Args:
+            tokens: Оценка токенов запроса (промпт и ответ)
+
+        Returns:
+            Запись окна [время, токены] для уточнения фактическим расходом
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._entries and self._entries[0][0] <= now - WINDOW_SECONDS:
+                    self._entries.popleft()
+                used_tokens = sum(entry[1] for entry in self._entries)
+                requests_ok = not self.requests_per_minute or len(self._entries) < self.requests_per_minute
+                # Запрос больше всего бюджета пропускается, когда окно пусто
+                tokens_ok = (not self.tokens_per_minute or used_tokens + tokens <= self.tokens_per_minute
+                             or not self._entries)
+                if now >= self.blocked_until and requests_ok and tokens_ok:
+                    entry = [now, tokens]
+                    self._entries.append(entry)
+                    return entry
+                wait = self.blocked_until - now
+                if self._entries and not (requests_ok and tokens_ok):
+                    wait = max(wait, self._entries[0][0] + WINDOW_SECONDS - now)
+            time.sleep(max(wait, 0.05))
+
+    def settle(self, entry: List[float], tokens: int):
+        """
+        Заменяет оценку токенов запроса фактическим расходом.
+
+        Args:
+            entry: Запись окна, полученная из acquire
+            tokens: Фактически потраченные токены
+        """
+        with self._lock:
+            entry[1] = tokens
+
+    def pause(self, seconds: float):
+        """
+        Приостанавливает выдачу запросов (например, по Retry-After от сервера).
+
+        Args:
+            seconds: Длительность паузы в секундах
+        """
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class LLMExecutor:
+    """Исполнитель запросов к OpenAI с лимитами, повторами и параллельной отправкой."""
+
+    def __init__(self, config: Dict[str, Any], logger=None):
+        """
+        Инициализация исполнителя.
+
+        Args:
+            config: Конфигурация OpenAI (api_key, base_url, requests_per_minute, tokens_per_minute,
+                max_concurrency, max_retries, request_timeout)
+            logger: Логгер
+        """
+        self.api_key = config.get('api_key') or os.getenv('OPENAI_API_KEY', '')
+        self.base_url = config.get('base_url') or None
+        self.max_concurrency = max(1, int(config.get('max_concurrency', 8)))
+        self.max_retries = int(config.get('max_retries', 5))
+        self.request_timeout = float(config.get('request_timeout', 120))
+        self.logger = logger or logging.getLogger(__name__)
+        self.budget = MinuteBudget(config.get('requests_per_minute', 500), config.get('tokens_per_minute', 200000))
+
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    def get_client(self):
+        """
+        Возвращает общий клиент openai (создается при первом обращении).
+
+        Returns:
+            openai.OpenAI
+        """
+        with self._client_lock:
+            if self._client is None:
+                import openai
+                # Повторы выполняет исполнитель, чтобы учитывать их в общих лимитах
+                self._client = openai.OpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0,
+                                             timeout=self.request_timeout)
+            return self._client
+
+    def complete(self, messages: List[Dict[str, str]], model: str, temperature: float, max_tokens: int):
+        """
+        Выполняет chat.completions с учетом лимитов и повторами.
+
+        Args:
+            messages: Сообщения чата
+            model: Модель
+            temperature: Температура
+            max_tokens: Максимум токенов ответа
+
+        Returns:
+            Ответ openai (ChatCompletion)
+        """
+        estimate = sum(estimate_tokens(message.get('content') or '') for message in messages) + max_tokens
+        client = self.get_client()
+        attempt = 0
+        while True:
+            entry = self.budget.acquire(estimate)
+            try:
+                with self._slots:
+                    response = client.chat.completions.create(
+                        model=model, messages=messages, temperature=temperature, max_tokens=max_tokens
+                    )
+            except Exception as e:
+                status = getattr(e, 'status_code', None)
+                retryable = status in RETRY_STATUSES or (status is None and self._is_connection_error(e))
+                if not retryable or attempt >= self.max_retries:
+                    with self._stats_lock:
+                        self.stats["errors"] += 1
+                    raise
+                delay = self._retry_after(e) or self._backoff(attempt)
+                if status == 429:
+                    # Пауза распространяется на все потоки, использующие исполнитель
+                    self.budget.pause(delay)
+                with self._stats_lock:
+                    self.stats["retries"] += 1
+                self.logger.warning(f"⚠️ OpenAI вернул {status or type(e).__name__}, повтор через {delay:.1f}с")
+                attempt += 1
+                time.sleep(delay)
+                continue
+
+            usage = getattr(response, 'usage', None)
+            prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+            completion_tokens = getattr(usage, 'completion_tokens', 0) or 0
+            if usage is not None:
+                self.budget.settle(entry, prompt_tokens + completion_tokens)
+            with self._stats_lock:
+                self.stats["requests"] += 1
+                self.stats["prompt_tokens"] += prompt_tokens
+                self.stats["completion_tokens"] += completion_tokens
+            return response
+
+    def submit(self, fn: Callable, *args, **kwargs) -> concurrent.futures.Future:
+        """
+        Ставит задачу, выполняющую запросы к OpenAI, в общий пул потоков.
+
+        Задачи пула не должны сами отправлять задачи в пул (для вложенного
+        параллелизма используйте отдельный пул, как MapReduceSummarizer).
+
+        Args:
+            fn: Функция
+            *args: Аргументы
+            **kwargs: Именованные аргументы
+
+        Returns:
+            Future с результатом
+        """
+        with self._client_lock:
+            if self._pool is None:
+                self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                                   thread_name_prefix="llm")
+            pool = self._pool
+        return pool.submit(fn, *args, **kwargs)
+
+    def map(self, fn: Callable, items: Iterable) -> List[Any]:
+        """
+        Выполняет fn для всех элементов параллельно и возвращает результаты по порядку.
+
+        Args:
+            fn: Функция одного элемента
+            items: Элементы
+
+        Returns:
+            Результаты в порядке элементов
+        """
+        futures = [self.submit(fn, item) for item in items]
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        """Останавливает пул потоков и закрывает клиент."""
+        with self._client_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+            if self._client is not None:
+                try:
+                    self._client.close()
+                except Exception:
+                    pass
+                self._client = None
+
+    def _is_connection_error(self, error: Exception) -> bool:
+        """Сетевая ошибка или таймаут openai/httpx."""
+        names = {cls.__name__ for cls in type(error).__mro__}
+        return bool(names & {'APIConnectionError', 'APITimeoutError', 'ConnectError', 'TimeoutException'})
+
+    def _backoff(self, attempt: int) -> float:
+        """Экспоненциальная задержка со случайным разбросом."""
+        return min(60.0, 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    def _retry_after(self, error: Exception) -> Optional[float]:
+        """Возвращает задержку из заголовков retry-after-ms/retry-after ответа в секундах."""
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None) or {}
+        try:
+            if headers.get('retry-after-ms'):
+                return float(headers['retry-after-ms']) / 1000
+            if headers.get('retry-after'):
+                return float(headers['retry-after'])
+        except (TypeError, ValueError):
+            return None
+        return None
+
+
+_llm_executor: Optional[LLMExecutor] = None
+_llm_executor_lock = threading.Lock()
+
+
+def get_llm_executor(config_manager=None, logger=None) -> LLMExecutor:
+    """
+    Возвращает общий для процесса исполнитель запросов к OpenAI.
+
+    Все запросы к OpenAI должны идти через него, чтобы использовать один клиент
+    и общие лимиты OPENAI_RPM и OPENAI_TPM.
+
+    Args:
+        config_manager: Менеджер конфигурации (нужен при первом вызове)
+        logger: Логгер
+
+    Returns:
+        Исполнитель запросов
+    """
+    global _llm_executor
+    with _llm_executor_lock:
+        if _llm_executor is None:
+            config = config_manager.get_openai_config() if config_manager is not None else {}
+            _llm_executor = LLMExecutor(config, logger=logger)
+        return _llm_executor
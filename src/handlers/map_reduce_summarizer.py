@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Иерархическое саммари (map-reduce) с ограничением размера каждого запроса.
+
+Длинный текст режется на фрагменты по бюджету токенов, фрагменты
+конспектируются параллельно (map), затем конспекты объединяются группами,
+пока результат не поместится в один запрос (reduce). Каждый запрос к модели
+не превышает бюджета независимо от длины встреч.
+"""
+
+import re
+import logging
+import concurrent.futures
+from typing import Callable, List
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+# Максимум токенов ответа для конспекта фрагмента и промежуточного объединения
+MAP_MAX_TOKENS = 600
+
+# Защита от бесконечного объединения, если конспекты не сокращаются
+MAX_REDUCE_LEVELS = 5
+
+CHUNK_SYSTEM_PROMPT = "Ты - помощник по анализу встреч. Составляй краткие конспекты фрагментов встреч на русском языке."
+
+CHUNK_PROMPT_TEMPLATE = """Ниже фрагмент транскрипции встречи. Кратко перечисли темы, решения, задачи (с ответственными и сроками, если названы) и важные моменты этого фрагмента:
+
+{content}
+
+Конспект фрагмента:"""
+
+MERGE_PROMPT_TEMPLATE = """Ниже конспекты последовательных частей встречи. Объедини их в один конспект без повторов, сохранив все решения, задачи и важные моменты:
+
+{content}
+
+Объединенный конспект:"""
+
+_SENTENCE_RE = re.compile(r'(?<=[.!?…])\s+')
+
+# Токенизатор cl100k_base: None - еще не загружался, False - недоступен
+# (tiktoken скачивает словарь при первом обращении; без сети повторять загрузку нельзя)
+_encoding = None
+
+
+def _get_encoding():
+    """Возвращает токенизатор cl100k_base или None, если он недоступен."""
+    global _encoding
+    if _encoding is None:
+        try:
+            _encoding = tiktoken.get_encoding('cl100k_base') if TIKTOKEN_AVAILABLE else False
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"⚠️ Токенизатор tiktoken недоступен, используется оценка по длине: {e}")
+            _encoding = False
+    return _encoding or None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Оценивает количество токенов текста.
+
+    Использует tiktoken (cl100k_base), если он установлен, иначе - оценку по
+    длине (русский текст - около 3 символов на токен).
+
+    Args:
+        text: Текст
+
+    Returns:
+        Количество токенов
+    """
+    encoding = _get_encoding()
+    if encoding:
+        try:
+            return len(encoding.encode(text, disallowed_special=()))
+        except Exception:
+            pass
+    return len(text) // 3 + 1
+
+
+def _pieces(text: str, max_tokens: int) -> List[str]:
+    """Делит текст на строки, а слишком длинные строки - на предложения и слова."""
+    pieces = []
+    for line in text.split('\n'):
+        if estimate_tokens(line) <= max_tokens:
+            pieces.append(line)
+            continue
+        for sentence in _SENTENCE_RE.split(line):
+            if estimate_tokens(sentence) <= max_tokens:
+                pieces.append(sentence)
+                continue
+            words, current = sentence.split(' '), []
+            for word in words:
+                if current and estimate_tokens(' '.join(current + [word])) > max_tokens:
+                    pieces.append(' '.join(current))
+                    current = []
+                current.append(word)
+            if current:
+                pieces.append(' '.join(current))
+    return pieces
+
+
+def split_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Режет текст на фрагменты не больше бюджета токенов по границам строк и предложений.
+
+    Args:
+        text: Текст
+        max_tokens: Бюджет токенов фрагмента
+
+    Returns:
+        Список фрагментов
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    chunks, current, current_tokens = [], [], 0
+    for piece in _pieces(text, max_tokens):
+        tokens = estimate_tokens(piece) + 1
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append('\n'.join(current).strip())
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        chunks.append('\n'.join(current).strip())
+    return [chunk for chunk in chunks if chunk]
+
+
+class MapReduceSummarizer:
+    """Иерархическое саммари длинных текстов."""
+
+    def __init__(self, generate: Callable[[str, str, str, int], str], chunk_tokens: int = 6000,
+                 reduce_tokens: int = 8000, workers: int = 4, logger=None):
+        """
+        Инициализация.
+
+        Args:
+            generate: Функция (системный промпт, шаблон с {content}, содержимое, max_tokens) -> текст
+            chunk_tokens: Бюджет токенов фрагмента исходного текста
+            reduce_tokens: Бюджет токенов входа одного запроса объединения
+            workers: Количество параллельных запросов
+            logger: Логгер
+        """
+        self.generate = generate
+        self.chunk_tokens = max(500, chunk_tokens)
+        self.reduce_tokens = max(self.chunk_tokens, reduce_tokens)
+        self.workers = max(1, workers)
+        self.logger = logger or logging.getLogger(__name__)
+
+    def summarize(self, text: str, system_prompt: str, prompt_template: str, max_tokens: int) -> str:
+        """
+        Создает саммари текста любой длины.
+
+        Короткий текст отправляется одним запросом с итоговым шаблоном; длинный
+        конспектируется по фрагментам, и итоговый шаблон применяется к конспектам.
+
+        Args:
+            text: Исходный текст
+            system_prompt: Системный промпт итогового запроса
+            prompt_template: Шаблон итогового запроса с {content}
+            max_tokens: Максимум токенов итогового ответа
+
+        Returns:
+            Текст саммари
+        """
+        chunks = split_text(text, self.chunk_tokens)
+        if len(chunks) == 1:
+            return self.generate(system_prompt, prompt_template, text, max_tokens)
+
+        self.logger.info(f"🧩 Текст разбит на {len(chunks)} фрагментов по {self.chunk_tokens} токенов")
+        notes = self._map(CHUNK_SYSTEM_PROMPT, CHUNK_PROMPT_TEMPLATE, chunks, MAP_MAX_TOKENS)
+        return self.reduce(
+            [f"--- Часть {index} ---\n{note}" for index, note in enumerate(notes, 1)],
+            system_prompt, prompt_template, max_tokens
+        )
+
+    def reduce(self, parts: List[str], system_prompt: str, prompt_template: str, max_tokens: int) -> str:
+        """
+        Объединяет готовые части (конспекты, саммари файлов) в одно саммари.
+
+        Пока части не помещаются в бюджет одного запроса, они объединяются
+        группами параллельно; итоговый шаблон применяется к последнему уровню.
+
+        Args:
+            parts: Части для объединения
+            system_prompt: Системный промпт итогового запроса
+            prompt_template: Шаблон итогового запроса с {content}
+            max_tokens: Максимум токенов итогового ответа
+
+        Returns:
+            Текст саммари
+        """
+        for level in range(MAX_REDUCE_LEVELS):
+            content = '\n\n'.join(parts)
+            if estimate_tokens(content) <= self.reduce_tokens or len(parts) == 1:
+                break
+            groups = self._group(parts)
+            self.logger.info(f"🧩 Объединение уровня {level + 1}: {len(parts)} частей в {len(groups)} групп")
+            if len(groups) == len(parts):
+                # Каждая часть больше бюджета: сокращаем части по отдельности
+                groups = [[part] for part in parts]
+            parts = self._map(CHUNK_SYSTEM_PROMPT, MERGE_PROMPT_TEMPLATE,
+                              ['\n\n'.join(group) for group in groups], MAP_MAX_TOKENS)
+        content = '\n\n'.join(parts)
+        if estimate_tokens(content) > self.reduce_tokens:
+            # Последняя страховка: итоговый запрос никогда не превышает бюджет
+            content = split_text(content, self.reduce_tokens)[0]
+            self.logger.warning("⚠️ Конспекты не уложились в бюджет объединения, итог построен по первой части")
+        return self.generate(system_prompt, prompt_template, content, max_tokens)
+
+    def _group(self, parts: List[str]) -> List[List[str]]:
+        """Группирует части по порядку так, чтобы каждая группа укладывалась в бюджет."""
+        groups, current, current_tokens = [], [], 0
+        for part in parts:
+            tokens = estimate_tokens(part) + 2
+            if current and current_tokens + tokens > self.reduce_tokens:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(part)
+            current_tokens += tokens
+        if current:
+            groups.append(current)
+        return groups
+
+    def _map(self, system_prompt: str, prompt_template: str, contents: List[str],
+             max_tokens: int) -> List[str]:
+        """
+        Выполняет запросы для частей параллельно, сохраняя порядок результатов.
+
+        Args:
+            system_prompt: Системный промпт
+            prompt_template: Шаблон с {content}
+            contents: Содержимое запросов
+            max_tokens: Максимум токенов ответа
+
+        Returns:
+            Ответы в порядке contents
+        """
+        if len(contents) == 1 or self.workers == 1:
+            return [self.generate(system_prompt, prompt_template, content, max_tokens) for content in contents]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.workers, len(contents)),
+                                                   thread_name_prefix="summary-map") as executor:
+            return list(executor.map(
+                lambda content: self.generate(system_prompt, prompt_template, content, max_tokens), contents
+            ))
@@ -8,6 +8,7 @@ import os
 import time
 from typing import Dict, Any, List
 from .base_handler import BaseHandler, retry
+from .stage_pipeline import StageOutput
 
 
 class MediaHandler(BaseHandler):
@@ -263,10 +264,6 @@ class MediaHandler(BaseHandler):
             meeting_folder = os.path.dirname(video_file)
             compressed_video, compressed_audio = self._generate_smart_filename(video_file, meeting_folder, file_index)
             
-            # TASK-5: Проверяем настройку удаления оригиналов
-            should_delete = self.config_manager.should_delete_original_videos()
-            self.logger.info(f"🔧 TASK-5: Настройка удаления оригиналов: {should_delete}")
-            
             # Реальная логика сжатия видео через FFmpeg
             video_success = self._compress_video(video_file, compressed_video, quality)
             if not video_success:
@@ -282,31 +279,7 @@ class MediaHandler(BaseHandler):
             self.logger.info(f"✅ Создан сжатый видео файл: {compressed_video}")
             self.logger.info(f"✅ Создан сжатый аудио файл: {compressed_audio}")
             
-            # ИНТЕГРАЦИЯ С МЕХАНИЗМОМ ИСКЛЮЧЕНИЯ: Отмечаем файл как обработанный
-            if self.service_manager:
-                self.service_manager._mark_file_processed(video_file)
-                self.logger.info(f"✅ Файл отмечен как обработанный: {os.path.basename(video_file)}")
-            
-            # Сохраняем информацию о медиа файле в БД
-            if self.state_manager:
-                self.state_manager.mark_media_processed(video_file, compressed_video, compressed_audio, "success")
-            
-            # TASK-5: Логируем информацию о файлах
-            if should_delete:
-                self.logger.info(f"🔧 TASK-5: Система настроена на удаление оригиналов при совпадении длины")
-                
-                # TASK-5: Сравниваем длину оригинального и сжатого видео
-                if self._compare_video_duration(video_file, compressed_video):
-                    self.logger.info(f"🔧 TASK-5: Длины видео совпадают, удаляю оригинал: {os.path.basename(video_file)}")
-                    try:
-                        os.remove(video_file)
-                        self.logger.info(f"✅ TASK-5: Оригинальный файл удален: {os.path.basename(video_file)}")
-                    except Exception as e:
-                        self.logger.error(f"❌ TASK-5: Не удалось удалить оригинальный файл {video_file}: {e}")
-                else:
-                    self.logger.warning(f"⚠️ TASK-5: Длины видео НЕ совпадают, оригинал сохранен: {os.path.basename(video_file)}")
-            else:
-                self.logger.info(f"🔧 TASK-5: Система настроена на сохранение оригиналов")
+            self._finalize_processed_video(video_file, compressed_video, compressed_audio)
             
             return True
             
@@ -314,6 +287,45 @@ class MediaHandler(BaseHandler):
             self.logger.error(f"❌ Ошибка обработки видео файла {video_file}: {e}")
             return False
     
+    def _finalize_processed_video(self, video_file: str, compressed_video: str, compressed_audio: str):
+        """
+        Отмечает видео как обработанное и при необходимости удаляет оригинал.
+        
+        Args:
+            video_file: Путь к оригинальному видео файлу
+            compressed_video: Путь к сжатому видео файлу
+            compressed_audio: Путь к извлеченному аудио файлу
+        """
+        # TASK-5: Проверяем настройку удаления оригиналов
+        should_delete = self.config_manager.should_delete_original_videos()
+        self.logger.info(f"🔧 TASK-5: Настройка удаления оригиналов: {should_delete}")
+        
+        # ИНТЕГРАЦИЯ С МЕХАНИЗМОМ ИСКЛЮЧЕНИЯ: Отмечаем файл как обработанный
+        if self.service_manager:
+            self.service_manager._mark_file_processed(video_file)
+            self.logger.info(f"✅ Файл отмечен как обработанный: {os.path.basename(video_file)}")
+        
+        # Сохраняем информацию о медиа файле в БД
+        if self.state_manager:
+            self.state_manager.mark_media_processed(video_file, compressed_video, compressed_audio, "success")
+        
+        # TASK-5: Логируем информацию о файлах
+        if should_delete:
+            self.logger.info(f"🔧 TASK-5: Система настроена на удаление оригиналов при совпадении длины")
+            
+            # TASK-5: Сравниваем длину оригинального и сжатого видео
+            if self._compare_video_duration(video_file, compressed_video):
+                self.logger.info(f"🔧 TASK-5: Длины видео совпадают, удаляю оригинал: {os.path.basename(video_file)}")
+                try:
+                    os.remove(video_file)
+                    self.logger.info(f"✅ TASK-5: Оригинальный файл удален: {os.path.basename(video_file)}")
+                except Exception as e:
+                    self.logger.error(f"❌ TASK-5: Не удалось удалить оригинальный файл {video_file}: {e}")
+            else:
+                self.logger.warning(f"⚠️ TASK-5: Длины видео НЕ совпадают, оригинал сохранен: {os.path.basename(video_file)}")
+        else:
+            self.logger.info(f"🔧 TASK-5: Система настроена на сохранение оригиналов")
+    
     def _process_video_file(self, video_file: str, quality: str) -> bool:
         """
         TASK-5: Обрабатывает видео файл с поддержкой удаления оригиналов (для обратной совместимости).
@@ -328,6 +340,46 @@ class MediaHandler(BaseHandler):
         # Вызываем новый метод с индексом 1 (для одного файла)
         return self._process_video_file_with_index(video_file, quality, 1)
     
+    def find_pending_videos(self, folder_path: str) -> List[tuple]:
+        """
+        Находит необработанные видео и назначает им индексы по времени создания.
+        
+        Args:
+            folder_path: Корневая папка аккаунта
+            
+        Returns:
+            Список кортежей (путь_к_видео, индекс) для конвейера этапов
+        """
+        video_files_with_time = []
+        for video_file in self._find_video_files(folder_path):
+            try:
+                video_files_with_time.append((video_file, os.path.getctime(video_file)))
+            except Exception:
+                video_files_with_time.append((video_file, time.time()))
+        
+        # TASK-5: Индексы назначаются так же, как в _process_folder_media
+        video_files_with_time.sort(key=lambda x: x[1])
+        return [(video_file, index) for index, (video_file, _) in enumerate(video_files_with_time, 1)]
+    
+    def process_pipeline_item(self, item: tuple, quality: str = 'medium'):
+        """
+        Обрабатывает одно видео на этапе конвейера.
+        
+        Args:
+            item: Кортеж (путь_к_видео, индекс)
+            quality: Качество сжатия
+            
+        Returns:
+            StageOutput с путем к извлеченному аудио для этапа транскрипции,
+            None если аудио не появилось, False при ошибке
+        """
+        video_file, file_index = item
+        if not self._process_video_file_with_index(video_file, quality, file_index):
+            return False
+        
+        _, compressed_audio = self._generate_smart_filename(video_file, os.path.dirname(video_file), file_index)
+        return StageOutput(compressed_audio) if os.path.exists(compressed_audio) else None
+    
     def set_media_check_interval(self, interval: int):
         """
         Устанавливает интервал проверки медиа файлов.
@@ -364,6 +416,7 @@ class MediaHandler(BaseHandler):
         Returns:
             True, если сжатие прошло успешно
         """
+        partial_file = self._partial_path(output_file)
         try:
             import subprocess
             
@@ -382,8 +435,9 @@ class MediaHandler(BaseHandler):
                 '-c:a', 'aac',
                 '-b:a', '128k'
             ] + params + [
+                '-f', 'mp4',
                 '-y',  # Перезаписывать существующие файлы
-                output_file
+                partial_file
             ]
             
             self.logger.info(f"🎬 Запуск FFmpeg: {' '.join(cmd)}")
@@ -391,17 +445,21 @@ class MediaHandler(BaseHandler):
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=1800)  # 30 минут
             
             if result.returncode == 0:
+                os.replace(partial_file, output_file)
                 self.logger.info(f"✅ Видео успешно сжато: {output_file}")
                 return True
             else:
                 self.logger.error(f"❌ Ошибка сжатия видео: {result.stderr}")
+                self._remove_partial(partial_file)
                 return False
                 
         except subprocess.TimeoutExpired:
             self.logger.error(f"⏰ Таймаут сжатия видео: {input_file}")
+            self._remove_partial(partial_file)
             return False
         except Exception as e:
             self.logger.error(f"❌ Ошибка сжатия видео {input_file}: {e}")
+            self._remove_partial(partial_file)
             return False
     
     def _generate_smart_filename(self, video_file: str, meeting_folder: str, file_index: int = 1) -> tuple[str, str]:
@@ -551,6 +609,7 @@ class MediaHandler(BaseHandler):
         Returns:
             True, если извлечение прошло успешно
         """
+        partial_file = self._partial_path(output_file)
         try:
             import subprocess
             
@@ -560,8 +619,9 @@ class MediaHandler(BaseHandler):
                 '-c:a', 'mp3',
                 '-b:a', '128k',
                 '-ar', '44100',
+                '-f', 'mp3',
                 '-y',  # Перезаписывать существующие файлы
-                output_file
+                partial_file
             ]
             
             self.logger.info(f"🎵 Извлечение аудио: {' '.join(cmd)}")
@@ -569,15 +629,45 @@ class MediaHandler(BaseHandler):
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)  # 10 минут
             
             if result.returncode == 0:
+                os.replace(partial_file, output_file)
                 self.logger.info(f"✅ Аудио успешно извлечено: {output_file}")
                 return True
             else:
                 self.logger.error(f"❌ Ошибка извлечения аудио: {result.stderr}")
+                self._remove_partial(partial_file)
                 return False
                 
         except subprocess.TimeoutExpired:
             self.logger.error(f"⏰ Таймаут извлечения аудио: {input_file}")
+            self._remove_partial(partial_file)
             return False
         except Exception as e:
             self.logger.error(f"❌ Ошибка извлечения аудио {input_file}: {e}")
+            self._remove_partial(partial_file)
             return False
+    
+    @staticmethod
+    def _partial_path(output_file: str) -> str:
+        """
+        Возвращает временный путь, в который FFmpeg пишет результат.
+        
+        Готовый файл переименовывается в output_file одной операцией, поэтому
+        поиск файлов (в том числе параллельный обход конвейера) никогда не видит
+        недописанный *_compressed.mp3 или *_compressed.mp4.
+        
+        Args:
+            output_file: Итоговый путь файла
+            
+        Returns:
+            Путь временного файла в той же папке
+        """
+        folder, name = os.path.split(output_file)
+        return os.path.join(folder, f".{name}.part")
+    
+    def _remove_partial(self, partial_file: str):
+        """Удаляет недописанный временный файл FFmpeg."""
+        try:
+            if os.path.exists(partial_file):
+                os.remove(partial_file)
+        except OSError as e:
+            self.logger.warning(f"⚠️ Не удалось удалить временный файл {partial_file}: {e}")
@@ -6,10 +6,277 @@ API клиент для работы с Notion
 
 import os
 import json
+import time
+import random
 import logging
+import threading
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+
+
+NOTION_BASE_URL = "https://api.notion.com/v1"
+NOTION_VERSION = "2022-06-28"
+
+# Статусы, при которых запрос к Notion повторяется
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# POST запросы, которые только читают данные и безопасны для повтора
+READ_ONLY_POST_SUFFIXES = ("/query", "/search")
+
+
+class TokenBucket:
+    """Ограничитель частоты запросов (token bucket), общий для всех потоков."""
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Инициализация ограничителя.
+        
+        Args:
+            rate: Количество запросов в секунду
+            capacity: Максимальный размер пачки запросов (по умолчанию равен rate)
+        """
+        self.rate = max(0.1, float(rate))
+        self.capacity = max(1.0, float(capacity if capacity is not None else rate))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Ждет, пока появится свободный токен, и забирает его."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+    
+    def pause(self, seconds: float):
+        """
+        Приостанавливает выдачу токенов (например, по Retry-After от сервера).
+        
+        Args:
+            seconds: Длительность паузы в секундах
+        """
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+class NotionClient:
+    """
+    HTTP клиент Notion: общая keep-alive сессия с пулом соединений,
+    ограничение частоты запросов и повторы при 429/5xx.
+    
+    Создание страниц и добавление блоков (POST/PATCH) после таймаута или 5xx
+    не повторяются: Notion мог уже выполнить запись, и повтор создал бы дубликат.
+    Для них повторяется только 429 (запрос отклонен без выполнения).
+    """
+    
+    def __init__(self, token: str = None, rate_limit: float = 3.0, max_retries: int = 5,
+                 timeout: int = 30, pool_size: int = 10, base_url: str = None, logger=None):
+        """
+        Инициализация клиента.
+        
+        Args:
+            token: Токен интеграции Notion
+            rate_limit: Количество запросов в секунду
+            max_retries: Количество повторов при 429, 5xx и сетевых ошибках
+            timeout: Таймаут запроса в секундах
+            pool_size: Размер пула соединений
+            base_url: Адрес API (по умолчанию api.notion.com; для локальной заглушки в тестах)
+            logger: Логгер
+        """
+        self.token = token
+        self.base_url = (base_url or NOTION_BASE_URL).rstrip("/")
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+        self.rate_limiter = TokenBucket(rate_limit)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+    
+    def headers(self, token: str = None) -> Dict[str, str]:
+        """
+        Формирует заголовки запроса к Notion.
+        
+        Args:
+            token: Токен (по умолчанию токен клиента)
+            
+        Returns:
+            Словарь заголовков
+        """
+        return {
+            "Authorization": f"Bearer {token or self.token}",
+            "Content-Type": "application/json",
+            "Notion-Version": NOTION_VERSION
+        }
+    
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Выполняет запрос к Notion с ограничением частоты и повторами.
+        
+        Сетевые ошибки и 5xx повторяются только для запросов на чтение
+        (GET, DELETE, databases/query, search), 429 - для всех запросов.
+        
+        Args:
+            method: HTTP метод
+            url: Полный URL или путь относительно /v1 (например, 'pages/<id>')
+            **kwargs: Аргументы requests (json, params, headers, timeout)
+            
+        Returns:
+            Ответ последней попытки
+        """
+        if url.startswith(NOTION_BASE_URL):
+            url = self.base_url + url[len(NOTION_BASE_URL):]
+        elif not url.startswith("http"):
+            url = f"{self.base_url}/{url.lstrip('/')}"
+        headers = kwargs.pop("headers", None) or self.headers()
+        kwargs.setdefault("timeout", self.timeout)
+        idempotent = self._is_idempotent(method, url)
+        
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.request(method, url, headers=headers, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # Таймаут подключения означает, что запрос не был отправлен
+                if attempt >= self.max_retries or not (idempotent or isinstance(e, requests.ConnectTimeout)):
+                    raise
+                delay = self._backoff(attempt)
+                self.logger.warning(f"⚠️ Сетевая ошибка Notion ({e}), повтор через {delay:.1f}с")
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                if response.status_code != 429 and not idempotent:
+                    self.logger.warning(f"⚠️ Notion вернул {response.status_code} на {method} {url}, "
+                                        f"запрос не повторяется (запись могла быть выполнена)")
+                    return response
+                if response.status_code == 429:
+                    delay = self._retry_after(response) or self._backoff(attempt)
+                    # Пауза распространяется на все потоки, использующие клиент
+                    self.rate_limiter.pause(delay)
+                else:
+                    delay = self._backoff(attempt)
+                self.logger.warning(f"⚠️ Notion вернул {response.status_code}, повтор через {delay:.1f}с")
+            attempt += 1
+            time.sleep(delay)
+    
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET запрос к Notion."""
+        return self.request("GET", url, **kwargs)
+    
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST запрос к Notion."""
+        return self.request("POST", url, **kwargs)
+    
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        """PATCH запрос к Notion."""
+        return self.request("PATCH", url, **kwargs)
+    
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        """DELETE запрос к Notion."""
+        return self.request("DELETE", url, **kwargs)
+    
+    def _is_idempotent(self, method: str, url: str) -> bool:
+        """
+        Проверяет, безопасно ли повторить запрос после таймаута или 5xx.
+        
+        Args:
+            method: HTTP метод
+            url: Полный URL запроса
+            
+        Returns:
+            True для чтения (GET, DELETE, databases/query, search)
+        """
+        method = method.upper()
+        if method in ("GET", "HEAD", "DELETE"):
+            return True
+        return method == "POST" and url.split("?")[0].rstrip("/").endswith(READ_ONLY_POST_SUFFIXES)
+    
+    def _backoff(self, attempt: int) -> float:
+        """Экспоненциальная задержка со случайным разбросом."""
+        return min(30.0, 2 ** attempt) * random.uniform(0.5, 1.0)
+    
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        """Возвращает задержку из заголовка Retry-After в секундах."""
+        try:
+            return float(response.headers.get("Retry-After", ""))
+        except ValueError:
+            return None
+
+
+_notion_client: Optional[NotionClient] = None
+_notion_client_lock = threading.Lock()
+
+
+def _client_settings(notion_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Собирает настройки клиента Notion из конфигурации с переменными окружения как запасным вариантом.
+    
+    Args:
+        notion_config: Настройки Notion из ConfigManager.get_notion_config()
+        
+    Returns:
+        Словарь с token, rate_limit, max_retries и base_url
+    """
+    notion_config = notion_config or {}
+    return {
+        'token': notion_config.get('token') or os.getenv('NOTION_TOKEN', ''),
+        'rate_limit': float(notion_config.get('rate_limit') or os.getenv('NOTION_RATE_LIMIT', '3')),
+        'max_retries': int(notion_config.get('max_retries') or os.getenv('NOTION_MAX_RETRIES', '5')),
+        'base_url': notion_config.get('api_base_url') or os.getenv('NOTION_API_BASE_URL') or None
+    }
+
+
+def get_notion_client(token: str = None, logger=None, notion_config: Optional[Dict[str, Any]] = None) -> NotionClient:
+    """
+    Возвращает общий для процесса клиент Notion.
+    
+    Все обращения к Notion должны идти через него, чтобы использовать одну сессию
+    и общий лимит запросов (NOTION_RATE_LIMIT запросов в секунду).
+    
+    Настройки берутся из notion_config, если он передан, иначе из переменных окружения.
+    Если клиент уже создан, переданный notion_config применяется к нему.
+    
+    Args:
+        token: Токен интеграции (по умолчанию токен из notion_config или NOTION_TOKEN)
+        logger: Логгер
+        notion_config: Настройки Notion из ConfigManager.get_notion_config()
+        
+    Returns:
+        Клиент Notion
+    """
+    global _notion_client
+    settings = _client_settings(notion_config)
+    token = token or settings['token']
+    with _notion_client_lock:
+        if _notion_client is None:
+            _notion_client = NotionClient(
+                token=token,
+                rate_limit=settings['rate_limit'],
+                max_retries=settings['max_retries'],
+                base_url=settings['base_url'],
+                logger=logger
+            )
+        elif notion_config:
+            _notion_client.token = token or _notion_client.token
+            _notion_client.max_retries = settings['max_retries']
+            _notion_client.base_url = (settings['base_url'] or NOTION_BASE_URL).rstrip("/")
+            if _notion_client.rate_limiter.rate != max(0.1, settings['rate_limit']):
+                _notion_client.rate_limiter = TokenBucket(settings['rate_limit'])
+        elif token and not _notion_client.token:
+            _notion_client.token = token
+        return _notion_client
 
 
 class NotionAPI:
@@ -25,8 +292,10 @@ class NotionAPI:
         """
         self.config_manager = config_manager
         self.logger = logger or logging.getLogger(__name__)
-        self.base_url = "https://api.notion.com/v1"
+        self.base_url = NOTION_BASE_URL
         self.headers = self._setup_headers()
+        notion_config = self.config_manager.get_notion_config()
+        self.client = get_notion_client(notion_config.get('token'), self.logger, notion_config)
         
     def _setup_headers(self) -> Dict[str, str]:
         """
@@ -45,7 +314,7 @@ class NotionAPI:
         return {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json",
-            "Notion-Version": "2022-06-28"
+            "Notion-Version": NOTION_VERSION
         }
     
     def create_page(self, parent_id: str, title: str, properties: Dict[str, Any] = None, content: List[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
@@ -74,7 +343,7 @@ class NotionAPI:
             }
             
             # Создаем страницу
-            response = requests.post(
+            response = self.client.post(
                 f"{self.base_url}/pages",
                 headers=self.headers,
                 json=page_data,
@@ -122,7 +391,7 @@ class NotionAPI:
                 return True
             
             # Обновляем страницу
-            response = requests.patch(
+            response = self.client.patch(
                 f"{self.base_url}/pages/{page_id}",
                 headers=self.headers,
                 json=update_data,
@@ -155,7 +424,7 @@ class NotionAPI:
                 self.logger.error("❌ Заголовки API не настроены")
                 return None
             
-            response = requests.get(
+            response = self.client.get(
                 f"{self.base_url}/pages/{page_id}",
                 headers=self.headers,
                 timeout=30
@@ -197,7 +466,7 @@ class NotionAPI:
             if query:
                 search_data["query"] = query
             
-            response = requests.post(
+            response = self.client.post(
                 f"{self.base_url}/search",
                 headers=self.headers,
                 json=search_data,
@@ -238,7 +507,7 @@ class NotionAPI:
                 "properties": properties
             }
             
-            response = requests.post(
+            response = self.client.post(
                 f"{self.base_url}/databases",
                 headers=self.headers,
                 json=database_data,
@@ -270,7 +539,7 @@ class NotionAPI:
                 return False
             
             # Пытаемся получить информацию о пользователе
-            response = requests.get(
+            response = self.client.get(
                 f"{self.base_url}/users/me",
                 headers=self.headers,
                 timeout=30
@@ -328,7 +597,7 @@ class NotionAPI:
             
             # Выполняем запрос к базе данных
             # Правильный endpoint для запроса к базе данных
-            response = requests.post(
+            response = self.client.post(
                 f"{self.base_url}/databases/{database_id}/query",
                 headers=self.headers,
                 json=query_data,
@@ -388,7 +657,7 @@ class NotionAPI:
                 ]
             }
             
-            response = requests.post(
+            response = self.client.post(
                 f"{self.base_url}/search",
                 headers=self.headers,
                 json=search_data,
@@ -430,7 +699,7 @@ class NotionAPI:
             }
             
             # Обновляем страницу
-            response = requests.patch(
+            response = self.client.patch(
                 f"{self.base_url}/pages/{page_id}",
                 headers=self.headers,
                 json=update_data,
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Построение блоков Notion из длинного текста и их пакетная дозапись.
+
+Notion ограничивает rich_text 2000 символами, массив дочерних блоков - 100 элементами,
+а тело запроса - ~500 КБ. Текст разбивается на абзацы, абзацы - на фрагменты
+допустимой длины, блоки упаковываются в запросы по этим ограничениям.
+"""
+
+import io
+import logging
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Callable, Union
+
+
+# Ограничения Notion API
+MAX_RICH_TEXT_LENGTH = 2000
+MAX_BLOCKS_PER_REQUEST = 100
+
+# Фрагментов rich_text в одном абзаце (Notion допускает 100, но так блоки остаются читаемыми)
+MAX_RUNS_PER_BLOCK = 10
+
+# Символов текста в одном запросе: кириллица в JSON кодируется как \uXXXX (6 байт)
+MAX_CHARS_PER_REQUEST = 60000
+
+
+def rich_text(content: str) -> List[Dict[str, Any]]:
+    """
+    Формирует rich_text из короткой строки.
+
+    Args:
+        content: Текст (не длиннее MAX_RICH_TEXT_LENGTH)
+
+    Returns:
+        Массив rich_text из одного фрагмента
+    """
+    return [{"type": "text", "text": {"content": content[:MAX_RICH_TEXT_LENGTH]}}]
+
+
+def heading_block(text: str, level: int = 2) -> Dict[str, Any]:
+    """
+    Формирует блок заголовка.
+
+    Args:
+        text: Текст заголовка
+        level: Уровень заголовка (1-3)
+
+    Returns:
+        Блок Notion
+    """
+    block_type = f"heading_{level}"
+    return {"object": "block", "type": block_type, block_type: {"rich_text": rich_text(text)}}
+
+
+def split_text(text: str, limit: int = MAX_RICH_TEXT_LENGTH) -> Iterator[str]:
+    """
+    Делит текст на фрагменты не длиннее limit, по возможности по границе строки или слова.
+
+    Args:
+        text: Исходный текст
+        limit: Максимальная длина фрагмента
+
+    Yields:
+        Фрагменты текста
+    """
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit)
+        if cut < limit // 2:
+            cut = text.rfind(" ", 0, limit)
+        if cut < limit // 2:
+            cut = limit - 1
+        yield text[:cut + 1]
+        text = text[cut + 1:]
+    if text:
+        yield text
+
+
+def iter_paragraph_blocks(text: Union[str, Iterable[str]]) -> Iterator[Dict[str, Any]]:
+    """
+    Потоково превращает текст в блоки-абзацы допустимого размера.
+
+    Абзацы разделяются пустыми строками. Длинный абзац разбивается на фрагменты
+    rich_text по MAX_RICH_TEXT_LENGTH символов и, при необходимости, на несколько блоков.
+
+    Args:
+        text: Строка или итерируемый источник строк (например, открытый файл)
+
+    Yields:
+        Блоки paragraph
+    """
+    lines = io.StringIO(text) if isinstance(text, str) else text
+    paragraph: List[str] = []
+
+    def flush() -> Iterator[Dict[str, Any]]:
+        content = "".join(paragraph).strip("\n")
+        paragraph.clear()
+        runs: List[Dict[str, Any]] = []
+        for chunk in split_text(content):
+            runs.append({"type": "text", "text": {"content": chunk}})
+            if len(runs) == MAX_RUNS_PER_BLOCK:
+                yield {"object": "block", "type": "paragraph", "paragraph": {"rich_text": runs}}
+                runs = []
+        if runs:
+            yield {"object": "block", "type": "paragraph", "paragraph": {"rich_text": runs}}
+
+    for line in lines:
+        if line.strip():
+            paragraph.append(line)
+        elif paragraph:
+            yield from flush()
+    if paragraph:
+        yield from flush()
+
+
+def block_text_length(block: Dict[str, Any]) -> int:
+    """Возвращает количество символов текста в блоке."""
+    body = block.get(block.get("type", ""), {})
+    return sum(len(part.get("text", {}).get("content", "")) for part in body.get("rich_text", []))
+
+
+def iter_block_batches(blocks: Iterable[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Упаковывает блоки в пакеты для одного запроса append.
+
+    Args:
+        blocks: Блоки Notion
+
+    Yields:
+        Пакеты не более MAX_BLOCKS_PER_REQUEST блоков и MAX_CHARS_PER_REQUEST символов
+    """
+    batch: List[Dict[str, Any]] = []
+    chars = 0
+    for block in blocks:
+        length = block_text_length(block)
+        if batch and (len(batch) >= MAX_BLOCKS_PER_REQUEST or chars + length > MAX_CHARS_PER_REQUEST):
+            yield batch
+            batch, chars = [], 0
+        batch.append(block)
+        chars += length
+    if batch:
+        yield batch
+
+
+def append_blocks(client, page_id: str, blocks: Iterable[Dict[str, Any]], token: str = None,
+                  start: int = 0, on_progress: Optional[Callable[[int], None]] = None,
+                  logger=None) -> int:
+    """
+    Дописывает блоки в конец страницы пакетами через общий клиент Notion.
+
+    Частота запросов и повторы при 429/5xx обеспечиваются клиентом. После каждого
+    успешного пакета вызывается on_progress, поэтому при сбое дозапись можно
+    продолжить с первого неотправленного блока.
+
+    Args:
+        client: NotionClient
+        page_id: ID страницы или блока
+        blocks: Блоки для добавления (в детерминированном порядке)
+        token: Токен интеграции
+        start: Количество блоков, уже добавленных ранее (пропускаются)
+        on_progress: Обработчик с общим числом добавленных блоков
+        logger: Логгер
+
+    Returns:
+        Общее количество добавленных блоков (включая start)
+
+    Raises:
+        requests.HTTPError: если Notion отклонил пакет
+    """
+    logger = logger or logging.getLogger(__name__)
+
+    def remaining() -> Iterator[Dict[str, Any]]:
+        for index, block in enumerate(blocks):
+            if index >= start:
+                yield block
+
+    appended = start
+    for batch in iter_block_batches(remaining()):
+        response = client.patch(f"blocks/{page_id}/children", headers=client.headers(token),
+                                json={"children": batch})
+        if response.status_code != 200:
+            logger.error(f"❌ Notion отклонил пакет блоков {appended + 1}-{appended + len(batch)}: "
+                         f"{response.status_code} - {response.text[:200]}")
+        response.raise_for_status()
+        appended += len(batch)
+        if on_progress:
+            on_progress(appended)
+    return appended
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Вычисление минимальных изменений страницы Notion.
+Сравнивает свойства и блоки с хешами последней отправленной версии,
+чтобы отправлять только измененные свойства и только новые блоки.
+"""
+
+import json
+import hashlib
+from typing import Dict, Any, List, Tuple
+
+
+def content_hash(value: Any) -> str:
+    """
+    Вычисляет стабильный хеш значения (свойства, блока, данных события).
+
+    Args:
+        value: JSON-совместимое значение
+
+    Returns:
+        MD5 хеш канонического JSON представления
+    """
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.md5(data.encode('utf-8')).hexdigest()
+
+
+def diff_properties(properties: Dict[str, Any], previous: Dict[str, str]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Оставляет только свойства, изменившиеся с последней отправки.
+
+    Args:
+        properties: Полный набор свойств страницы
+        previous: Хеши последних отправленных свойств {имя: хеш}
+
+    Returns:
+        Кортеж (измененные свойства, хеши всех свойств после отправки)
+    """
+    hashes = dict(previous or {})
+    changed = {}
+    for name, value in properties.items():
+        value_hash = content_hash(value)
+        if hashes.get(name) != value_hash:
+            changed[name] = value
+            hashes[name] = value_hash
+    return changed, hashes
+
+
+def diff_blocks(blocks: List[Dict[str, Any]], previous: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Оставляет только блоки, которые еще не были добавлены на страницу.
+
+    Args:
+        blocks: Блоки, которые должны быть на странице
+        previous: Хеши уже добавленных блоков
+
+    Returns:
+        Кортеж (новые блоки, хеши всех блоков после добавления)
+    """
+    known = set(previous or [])
+    hashes = list(previous or [])
+    new = []
+    for block in blocks:
+        block_hash = content_hash(block)
+        if block_hash not in known:
+            new.append(block)
+            known.add(block_hash)
+            hashes.append(block_hash)
+    return new, hashes
@@ -7,6 +7,7 @@
 from typing import Dict, Any, List, Optional
 from .base_handler import BaseHandler, retry
 from .notion_api import NotionAPI
+from .notion_diff import diff_properties
 import os
 import pytz
 from datetime import datetime
@@ -40,6 +41,23 @@ class NotionHandler(BaseHandler):
         except Exception as e:
             self.logger.warning(f"⚠️ StateManager недоступен в NotionHandler: {e}")
             self.state_manager = None
+        
+        # Локальное зеркало базы встреч для поиска существующих страниц без запросов к Notion
+        self.mirror = None
+        notion_config = config_manager.get_notion_config()
+        if self.state_manager and notion_config.get('mirror_enabled', True) and notion_config.get('database_id'):
+            try:
+                from .notion_mirror import NotionMirror
+                self.mirror = NotionMirror(
+                    self.state_manager,
+                    notion_config['database_id'],
+                    token=notion_config.get('token'),
+                    refresh_interval=notion_config.get('mirror_refresh_interval', 300),
+                    full_sync_interval=notion_config.get('mirror_full_sync_interval', 86400),
+                    logger=self.logger
+                )
+            except Exception as e:
+                self.logger.warning(f"⚠️ Зеркало базы Notion недоступно: {e}")
     
     @retry(max_attempts=2, delay=3, backoff=2)
     def process(self, *args, **kwargs) -> Dict[str, Any]:
@@ -205,7 +223,8 @@ class NotionHandler(BaseHandler):
                 from notion_templates import create_meeting_page
                 
                 # Создаем реальную страницу в Notion
-                notion_result = create_meeting_page(event_data, self.config_manager)
+                notion_result = create_meeting_page(event_data, self.config_manager, mirror=self.mirror,
+                                                    state_manager=self.state_manager)
                 
                 if notion_result and notion_result.get('status') == 'success':
                     page_id = notion_result.get('page_id', 'unknown')
@@ -281,7 +300,8 @@ class NotionHandler(BaseHandler):
                 from notion_templates import update_meeting_page
                 
                 # Обновляем реальную страницу в Notion
-                notion_result = update_meeting_page(page_id, update_data, self.config_manager)
+                notion_result = update_meeting_page(page_id, update_data, self.config_manager,
+                                                    state_manager=self.state_manager)
                 
                 if notion_result and notion_result.get('status') == 'success':
                     # Помечаем событие как синхронизированное с Notion в БД
@@ -705,6 +725,17 @@ class NotionHandler(BaseHandler):
                 self.logger.warning("⚠️ Не настроена конфигурация Notion для поиска")
                 return None
             
+            # Ищем в локальном зеркале; к API обращаемся, только если зеркало не удалось обновить
+            if self.mirror and self.mirror.ensure_fresh():
+                page_id = self.mirror.find_page(event_id=event_data.get('id'))
+                if not page_id and event_data.get('title'):
+                    page_id = self.mirror.find_page(title=event_data['title'], calendar=account_type)
+                if page_id:
+                    self.logger.info(f"✅ Найдена существующая страница: {page_id}")
+                    return page_id
+                self.logger.info(f"🔍 Существующая страница для встречи '{event_data.get('title', 'Unknown')}' не найдена")
+                return None
+            
             # Создаем фильтры для поиска (в порядке приоритета)
             filters = []
             
@@ -739,11 +770,8 @@ class NotionHandler(BaseHandler):
             # Выполняем поиск
             for filter_config in filters:
                 try:
-                    from src.handlers.notion_api import NotionAPI
-                    api = NotionAPI(self.config_manager)
-                    
                     # Ищем страницы с текущим фильтром
-                    search_result = api.search_pages(
+                    search_result = self.notion_api.search_pages(
                         database_id=database_id,
                         filter_config=filter_config,
                         max_results=5
@@ -765,6 +793,88 @@ class NotionHandler(BaseHandler):
             self.logger.error(f"❌ Ошибка поиска существующей страницы: {e}")
             return None
     
+    def upsert_meeting_page(self, event: Dict[str, Any], account_type: str) -> Dict[str, Any]:
+        """
+        Создает страницу встречи или обновляет существующую.
+        Сначала проверяет существование страницы, чтобы избежать дублирования.
+        
+        Args:
+            event: Событие календаря
+            account_type: Тип аккаунта
+            
+        Returns:
+            Результат создания/обновления страницы Notion
+        """
+        try:
+            # Сначала проверяем, существует ли уже страница для этой встречи
+            existing_page_id = self.find_existing_meeting_page(event, account_type)
+            
+            if existing_page_id:
+                # Страница уже существует - обновляем её свойства
+                self.logger.info(f"🔄 Страница для встречи '{event.get('title', 'Unknown')}' уже существует, обновляю свойства")
+                
+                update_result = self.update_existing_meeting_page(existing_page_id, event, account_type)
+                
+                if update_result.get('success'):
+                    # Помечаем событие как синхронизированное с Notion в БД
+                    if self.state_manager and event.get('id'):
+                        self.state_manager.mark_notion_synced(
+                            event['id'], 
+                            existing_page_id, 
+                            update_result.get('page_url', ''), 
+                            "success"
+                        )
+                    
+                    return {
+                        "success": True,
+                        "page_id": existing_page_id,
+                        "message": "Existing Notion page updated successfully",
+                        "updated": True
+                    }
+                else:
+                    self.logger.warning(f"⚠️ Не удалось обновить существующую страницу: {update_result.get('message')}")
+                    # Продолжаем с созданием новой страницы
+            
+            # Создаем новую страницу
+            self.logger.info(f"📄 Создаю новую страницу в Notion для встречи '{event.get('title', 'Unknown')}'")
+            
+            page_data = self._prepare_page_data(event, "", account_type)
+            notion_page = self._create_notion_page(page_data)
+            
+            if notion_page:
+                page_id = notion_page.get('page_id')
+                self.logger.info(f"✅ Страница Notion создана для {event.get('title', 'Unknown')}: {page_id}")
+                
+                # Запоминаем хеши свойств новой страницы, чтобы повторная синхронизация
+                # без изменений не отправляла обновление
+                if self.state_manager and page_id:
+                    timezone = pytz.timezone(self.config_manager.get_general_config().get('timezone', 'Europe/Moscow'))
+                    _, hashes = diff_properties(self._create_meeting_properties(event, timezone), {})
+                    self.state_manager.save_page_hashes(page_id, properties=hashes)
+                
+                # Помечаем событие как синхронизированное с Notion в БД
+                if self.state_manager and event.get('id'):
+                    self.state_manager.mark_notion_synced(
+                        event['id'], 
+                        page_id, 
+                        notion_page.get('url', ''), 
+                        "success"
+                    )
+                
+                return {
+                    "success": True,
+                    "page_id": page_id,
+                    "message": "Notion page created successfully",
+                    "updated": False
+                }
+            else:
+                self.logger.error(f"❌ Не удалось создать страницу Notion для {event.get('title', 'Unknown')}")
+                return {"success": False, "message": "Failed to create Notion page"}
+            
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка создания/обновления страницы Notion: {e}")
+            return {"success": False, "message": str(e)}
+    
     def update_existing_meeting_page(self, page_id: str, event_data: Dict[str, Any], account_type: str) -> Dict[str, Any]:
         """
         Обновляет существующую страницу встречи в Notion.
@@ -789,16 +899,31 @@ class NotionHandler(BaseHandler):
                 }
             
             # Создаем только свойства для обновления (без содержимого)
-            properties = self._create_meeting_properties(event_data, account_type)
+            timezone = pytz.timezone(self.config_manager.get_general_config().get('timezone', 'Europe/Moscow'))
+            properties = self._create_meeting_properties(event_data, timezone)
+            # Время создания задается при создании страницы и при обновлении не меняется
+            properties.pop('Created At', None)
             
-            # Обновляем только свойства страницы
-            from src.handlers.notion_api import NotionAPI
-            api = NotionAPI(self.config_manager)
+            # Отправляем только свойства, изменившиеся с последнего обновления
+            previous = self.state_manager.get_page_hashes(page_id) if self.state_manager else {'properties': {}}
+            changed, hashes = diff_properties(properties, previous['properties'])
             
-            update_result = api.update_page_properties(page_id, properties)
+            if not changed:
+                self.logger.info(f"⏭️ Свойства страницы {page_id} не изменились, обновление пропущено")
+                return {
+                    "success": True,
+                    "page_id": page_id,
+                    "skipped": True,
+                    "message": "Свойства страницы встречи не изменились"
+                }
+            
+            # Обновляем только свойства страницы
+            update_result = self.notion_api.update_page_properties(page_id, changed)
             
             if update_result:
-                self.logger.info(f"✅ Свойства страницы {page_id} успешно обновлены")
+                if self.state_manager:
+                    self.state_manager.save_page_hashes(page_id, properties=hashes)
+                self.logger.info(f"✅ Свойства страницы {page_id} успешно обновлены: {', '.join(changed)}")
                 return {
                     "success": True,
                     "page_id": page_id,
@@ -838,6 +963,7 @@ class NotionHandler(BaseHandler):
             
             # Формируем данные для шаблона
             page_data = {
+                "id": event.get("id"),
                 "title": title,
                 "start_time": start_time,
                 "end_time": end_time,
@@ -868,7 +994,8 @@ class NotionHandler(BaseHandler):
             from notion_templates import create_meeting_page
             
             # Создаем страницу через notion_templates
-            result = create_meeting_page(page_data, self.config_manager)
+            result = create_meeting_page(page_data, self.config_manager, mirror=self.mirror,
+                                         state_manager=self.state_manager)
             
             if result and result.get('status') == 'success':
                 page_id = result.get('page_id')
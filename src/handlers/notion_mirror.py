@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Локальное зеркало базы встреч Notion в SQLite.
+Полностью выгружается один раз, затем обновляется инкрементально по last_edited_time,
+поэтому проверка существования страницы встречи не требует запросов к Notion.
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, Any, List, Optional
+
+from .notion_api import get_notion_client
+
+
+class NotionMirror:
+    """Зеркало страниц базы Notion с поиском по Event ID, названию+дате и календарю."""
+
+    def __init__(self, state_manager, database_id: str, token: str = None,
+                 refresh_interval: int = 300, full_sync_interval: int = 86400, logger=None):
+        """
+        Инициализация зеркала.
+
+        Args:
+            state_manager: StateManager, в базе которого хранится зеркало
+            database_id: ID базы данных Notion
+            token: Токен интеграции Notion
+            refresh_interval: Минимальный интервал инкрементального обновления в секундах
+            full_sync_interval: Интервал полной синхронизации (удаляет исчезнувшие страницы)
+            logger: Логгер
+        """
+        self.state_manager = state_manager
+        self.database_id = database_id
+        self.token = token
+        self.refresh_interval = refresh_interval
+        self.full_sync_interval = full_sync_interval
+        self.logger = logger or logging.getLogger(__name__)
+        self.client = get_notion_client(token, self.logger)
+        self._lock = threading.Lock()
+
+    def ensure_fresh(self) -> bool:
+        """
+        Обновляет зеркало, если с последней синхронизации прошло больше refresh_interval.
+
+        Returns:
+            True если зеркало можно использовать для поиска, False если синхронизация не удалась
+        """
+        state = self.state_manager.get_mirror_state(self.database_id)
+        if state['full_synced_at'] and time.time() - state['synced_at'] < self.refresh_interval:
+            return True
+        return self.sync()
+
+    def sync(self, full: bool = False) -> bool:
+        """
+        Синхронизирует зеркало с базой Notion.
+
+        Полная синхронизация выполняется при первом запуске, раз в full_sync_interval
+        или по запросу; иначе запрашиваются только страницы, измененные после курсора.
+
+        Args:
+            full: Принудительная полная синхронизация
+
+        Returns:
+            True если успешно, False иначе
+        """
+        with self._lock:
+            try:
+                state = self.state_manager.get_mirror_state(self.database_id)
+                now = time.time()
+                full = (full or not state['full_synced_at'] or not state['last_edited_cursor']
+                        or now - state['full_synced_at'] >= self.full_sync_interval)
+
+                query = {
+                    "page_size": 100,
+                    "sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}]
+                }
+                if not full:
+                    # Точность last_edited_time в Notion - минута, поэтому берем с запасом (on_or_after)
+                    query["filter"] = {
+                        "timestamp": "last_edited_time",
+                        "last_edited_time": {"on_or_after": state['last_edited_cursor']}
+                    }
+
+                pages = self._query_all(query)
+                if pages is None:
+                    return False
+
+                cursor = state['last_edited_cursor'] if not full else None
+                for page in pages:
+                    if page['last_edited_time'] and (not cursor or page['last_edited_time'] > cursor):
+                        cursor = page['last_edited_time']
+
+                if not self.state_manager.upsert_mirror_pages(self.database_id, pages, replace=full):
+                    return False
+                self.state_manager.set_mirror_state(
+                    self.database_id, cursor, now, full_synced_at=now if full else None
+                )
+
+                if full:
+                    self.logger.info(f"🪞 Зеркало Notion: полная синхронизация, {len(pages)} страниц")
+                elif pages:
+                    self.logger.info(f"🪞 Зеркало Notion: обновлено {len(pages)} страниц")
+                return True
+
+            except Exception as e:
+                self.logger.error(f"❌ Ошибка синхронизации зеркала Notion: {e}")
+                return False
+
+    def find_page(self, event_id: str = None, title: str = None,
+                  event_date: str = None, calendar: str = None) -> Optional[str]:
+        """
+        Ищет страницу встречи в зеркале.
+
+        Args:
+            event_id: ID события
+            title: Название встречи
+            event_date: Дата встречи (ISO, используется только YYYY-MM-DD)
+            calendar: Тип календаря
+
+        Returns:
+            ID страницы или None
+        """
+        if event_id == 'unknown':
+            event_id = None
+        page = self.state_manager.find_mirror_page(
+            self.database_id,
+            event_id=event_id,
+            title=title,
+            event_date=str(event_date)[:10] if event_date else None,
+            calendar=calendar
+        )
+        return page['page_id'] if page else None
+
+    def remember_page(self, page_id: str, event_data: Dict[str, Any], url: str = "") -> bool:
+        """
+        Добавляет в зеркало только что созданную страницу, не дожидаясь синхронизации.
+
+        Args:
+            page_id: ID страницы
+            event_data: Данные события, по которым создана страница
+            url: URL страницы
+
+        Returns:
+            True если успешно, False иначе
+        """
+        start = event_data.get('start_time') or event_data.get('start') or event_data.get('date') or ''
+        if hasattr(start, 'isoformat'):
+            start = start.isoformat()
+        return self.state_manager.upsert_mirror_pages(self.database_id, [{
+            'page_id': page_id,
+            'event_id': str(event_data['id']) if event_data.get('id') else None,
+            'title': event_data.get('title', ''),
+            'event_date': str(start)[:10],
+            'calendar': event_data.get('account_type', ''),
+            'url': url,
+            'last_edited_time': ''
+        }])
+
+    def _query_all(self, query: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Постранично выгружает результаты запроса к базе.
+
+        Args:
+            query: Тело запроса databases/{id}/query
+
+        Returns:
+            Список страниц в формате зеркала или None при ошибке
+        """
+        pages = []
+        while True:
+            response = self.client.post(f"databases/{self.database_id}/query",
+                                        headers=self.client.headers(self.token), json=query)
+            if response.status_code != 200:
+                self.logger.error(f"❌ Ошибка выгрузки базы Notion: {response.status_code} - {response.text[:200]}")
+                return None
+
+            data = response.json()
+            pages.extend(self._extract(page) for page in data.get('results', []))
+            if not data.get('has_more') or not data.get('next_cursor'):
+                return pages
+            query = dict(query, start_cursor=data['next_cursor'])
+
+    def _extract(self, page: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Извлекает из страницы Notion поля, по которым ищутся встречи.
+
+        Args:
+            page: Объект страницы из ответа Notion
+
+        Returns:
+            Словарь в формате зеркала
+        """
+        properties = page.get('properties', {})
+
+        def plain_text(prop: Dict[str, Any], kind: str) -> str:
+            return ''.join(part.get('plain_text') or part.get('text', {}).get('content', '')
+                           for part in (prop or {}).get(kind) or [])
+
+        date = (properties.get('Date') or {}).get('date') or {}
+        calendar = (properties.get('Calendar') or {}).get('select') or {}
+        return {
+            'page_id': page['id'],
+            'event_id': plain_text(properties.get('Event ID'), 'rich_text') or None,
+            'title': plain_text(properties.get('Name'), 'title'),
+            'event_date': (date.get('start') or '')[:10],
+            'calendar': calendar.get('name', ''),
+            'url': page.get('url', ''),
+            'last_edited_time': page.get('last_edited_time', '')
+        }
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Фоновая отправка изменений Notion из очереди (notion_outbox).
+
+Этапы календаря и саммари только записывают операции в очередь SQLite и сразу
+продолжают работу; фоновый поток отправляет их в Notion. Несколько изменений
+одного события, накопившихся до отправки, объединяются в одну операцию.
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+
+# Порядок выполнения операций одного события: страница должна существовать до дозаписи
+OPERATION_ORDER = {
+    'upsert_meeting': 0,
+    'append_transcription': 1,
+    'append_summary': 2,
+}
+
+
+class NotionOutbox:
+    """Обработчик очереди изменений Notion."""
+
+    def __init__(self, config_manager, state_manager=None, notion_handler=None, logger=None):
+        """
+        Инициализация обработчика очереди.
+
+        Args:
+            config_manager: Менеджер конфигурации
+            state_manager: StateManager с таблицей очереди
+            notion_handler: NotionHandler для создания/обновления страниц (создается при необходимости)
+            logger: Логгер
+        """
+        self.config_manager = config_manager
+        self.logger = logger or logging.getLogger(__name__)
+        if state_manager is None:
+            from .state_manager import StateManager
+            state_manager = StateManager(logger=self.logger)
+        self.state_manager = state_manager
+        self.notion_handler = notion_handler
+
+        config = config_manager.get_notion_config()
+        self.batch_size = config.get('outbox_batch_size', 50)
+        self.poll_interval = config.get('outbox_poll_interval', 5)
+        self.max_attempts = config.get('outbox_max_attempts', 10)
+        self.retry_delay = config.get('outbox_retry_delay', 60)
+
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.stats = {"processed": 0, "errors": 0, "failed": 0}
+
+    def start(self):
+        """Запускает фоновый поток отправки."""
+        if self._running:
+            return
+        reset = self.state_manager.reset_running_notion_operations()
+        if reset:
+            self.logger.info(f"🔄 Очередь Notion: возвращено {reset} прерванных операций")
+        self._running = True
+        self._wakeup.clear()
+        self._thread = threading.Thread(target=self._worker, name="notion-outbox", daemon=True)
+        self._thread.start()
+        self.logger.info("📬 Фоновая отправка очереди Notion запущена")
+
+    def stop(self, timeout: float = 10):
+        """
+        Останавливает фоновый поток (текущая операция дорабатывает до конца).
+
+        Args:
+            timeout: Время ожидания завершения потока в секундах
+        """
+        if not self._running:
+            return
+        self._running = False
+        self._wakeup.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def wake(self):
+        """Будит фоновый поток, не дожидаясь очередного опроса очереди."""
+        self._wakeup.set()
+
+    def drain(self, deadline: Optional[float] = None) -> Dict[str, int]:
+        """
+        Выполняет готовые операции очереди в текущем потоке.
+
+        Args:
+            deadline: Время (time.time()), после которого новые пакеты не забираются
+
+        Returns:
+            Статистика {"processed", "errors"}
+        """
+        stats = {"processed": 0, "errors": 0}
+        while deadline is None or time.time() < deadline:
+            operations = self.state_manager.claim_notion_operations(self.batch_size)
+            if not operations:
+                break
+            operations.sort(key=lambda op: (op['target'], OPERATION_ORDER.get(op['operation'], 99), op['created_at']))
+            for operation in operations:
+                if self._execute(operation):
+                    stats["processed"] += 1
+                else:
+                    stats["errors"] += 1
+        return stats
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Возвращает метрики очереди: глубину, задержку и статистику отправки.
+
+        Returns:
+            Словарь метрик
+        """
+        metrics = self.state_manager.get_notion_outbox_metrics()
+        metrics.update(sent=self.stats["processed"], send_errors=self.stats["errors"])
+        return metrics
+
+    def _worker(self):
+        """Фоновый поток: отправляет операции и ждет новых."""
+        while self._running:
+            try:
+                stats = self.drain()
+                self.stats["processed"] += stats["processed"]
+                self.stats["errors"] += stats["errors"]
+                if stats["processed"] or stats["errors"]:
+                    self.logger.info(f"📬 Очередь Notion: отправлено {stats['processed']}, ошибок {stats['errors']}")
+            except Exception as e:
+                self.logger.error(f"❌ Ошибка фоновой отправки очереди Notion: {e}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _execute(self, operation: Dict[str, Any]) -> bool:
+        """
+        Выполняет одну операцию и обновляет ее состояние в очереди.
+
+        Args:
+            operation: Операция из очереди
+
+        Returns:
+            True если операция выполнена, False иначе
+        """
+        try:
+            success = self._apply(operation['operation'], operation['target'], operation['payload'])
+            error = "" if success else "Notion operation failed"
+        except Exception as e:
+            success, error = False, str(e)
+
+        if success:
+            self.state_manager.complete_notion_operation(operation['id'])
+            return True
+
+        attempts = operation['attempts'] + 1
+        give_up = attempts >= self.max_attempts
+        delay = min(self.retry_delay * (2 ** (attempts - 1)), 3600)
+        self.state_manager.retry_notion_operation(operation['id'], error, delay, give_up)
+        if give_up:
+            self.stats["failed"] += 1
+            self.logger.error(f"❌ Операция Notion {operation['operation']} для {operation['target']} "
+                              f"не выполнена после {attempts} попыток: {error}")
+        else:
+            self.logger.warning(f"⚠️ Операция Notion {operation['operation']} для {operation['target']} "
+                                f"отложена на {delay:.0f}с: {error}")
+        return False
+
+    def _apply(self, operation: str, target: str, payload: Dict[str, Any]) -> bool:
+        """
+        Отправляет операцию в Notion.
+
+        Args:
+            operation: Тип операции
+            target: Ключ события
+            payload: Данные операции
+
+        Returns:
+            True если успешно, False иначе
+        """
+        if operation == 'upsert_meeting':
+            if self.notion_handler is None:
+                from .notion_handler import NotionHandler
+                self.notion_handler = NotionHandler(self.config_manager, logger=self.logger)
+            result = self.notion_handler.upsert_meeting_page(payload['event'], payload.get('account_type', 'personal'))
+            return bool(result.get('success'))
+
+        if operation == 'append_summary':
+            return self.state_manager.push_summary_to_notion(
+                target, payload['summary_file'], payload.get('analysis_file', '')
+            )
+
+        if operation == 'append_transcription':
+            return self.state_manager.push_transcription_to_notion(target, payload['transcript_file'])
+
+        self.logger.warning(f"⚠️ Неизвестная операция очереди Notion: {operation}")
+        return False
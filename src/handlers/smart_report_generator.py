@@ -27,7 +27,8 @@ class SmartReportGenerator:
     
     def generate_smart_report(self, current_state: Dict[str, Any], 
                             previous_state: Optional[Dict[str, Any]] = None,
-                            execution_time: float = 0) -> Optional[str]:
+                            execution_time: float = 0,
+                            stage_backlog: Optional[Dict[str, int]] = None) -> Optional[str]:
         """
         Генерирует умный отчет только при наличии изменений.
         
@@ -35,6 +36,7 @@ class SmartReportGenerator:
             current_state: Текущее состояние системы
             previous_state: Предыдущее состояние системы
             execution_time: Время выполнения цикла
+            stage_backlog: Размеры очередей этапов (из StateManager.get_stage_backlog)
             
         Returns:
             Текст отчета или None если изменений нет
@@ -47,7 +49,7 @@ class SmartReportGenerator:
                 return None
             
             # Генерируем отчет
-            report = self._build_smart_report(current_state, previous_state, execution_time)
+            report = self._build_smart_report(current_state, previous_state, execution_time, stage_backlog)
             
             # Обновляем время последнего отчета
             self.last_report_time = datetime.now()
@@ -226,7 +228,8 @@ class SmartReportGenerator:
     
     def _build_smart_report(self, current_state: Dict[str, Any], 
                            previous_state: Optional[Dict[str, Any]], 
-                           execution_time: float) -> str:
+                           execution_time: float,
+                           stage_backlog: Optional[Dict[str, int]] = None) -> str:
         """
         Строит умный отчет с группировкой по папкам встреч.
         
@@ -234,6 +237,7 @@ class SmartReportGenerator:
             current_state: Текущее состояние
             previous_state: Предыдущее состояние
             execution_time: Время выполнения
+            stage_backlog: Размеры очередей этапов
             
         Returns:
             Текст отчета
@@ -280,6 +284,18 @@ class SmartReportGenerator:
             else:
                 report += "🎯 <b>🟢 ошибок и замечаний нет</b>\n\n"
             
+            # Очереди этапов
+            if stage_backlog and any(stage_backlog.values()):
+                stage_names = {
+                    'folders': '📁 папки',
+                    'notion': '📙 notion',
+                    'transcription': '📝 транскрипция',
+                    'summary': '🧑🏻‍💻 саммари'
+                }
+                pending = [f"{stage_names.get(stage, stage)}: {count}"
+                           for stage, count in stage_backlog.items() if count > 0]
+                report += f"⏳ <b>в очереди</b> {', '.join(pending)}\n"
+            
             # Время выполнения
             if execution_time > 0:
                 report += f"⏱️ <b>время выполнения</b> {execution_time:.2f} секунд\n"
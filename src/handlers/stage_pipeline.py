@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Конвейер этапов обработки встреч.
+Каждый этап имеет собственный пул потоков и ограниченную очередь:
+файл переходит на следующий этап сразу после завершения предыдущего,
+не дожидаясь окончания всего этапа по всем папкам.
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Callable
+
+
+# Маркер остановки рабочих потоков этапа
+_STOP = object()
+
+
+class StageOutput:
+    """Результат этапа, который передается на следующий этап конвейера."""
+
+    __slots__ = ("item",)
+
+    def __init__(self, item: Any):
+        """
+        Args:
+            item: Элемент для следующего этапа (обычно путь к файлу)
+        """
+        self.item = item
+
+
+class PipelineStage:
+    """Этап конвейера: функция обработки, пул потоков и ограниченная очередь."""
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1, queue_size: int = 4):
+        """
+        Инициализация этапа.
+
+        Args:
+            name: Название этапа
+            func: Функция обработки элемента. Возвращает False при ошибке,
+                None если обработка не требовалась, True если цепочка на этом
+                этапе завершается, StageOutput - элемент для следующего этапа
+            workers: Количество рабочих потоков этапа
+            queue_size: Максимальный размер входной очереди этапа
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+        self.queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self.threads: List[threading.Thread] = []
+        self.next_stage: Optional['PipelineStage'] = None
+        self.stats = {
+            "processed": 0,
+            "skipped": 0,
+            "errors": 0,
+            "busy_time": 0.0,
+            "max_queue": 0
+        }
+
+
+class StagePipeline:
+    """Конвейер этапов с передачей элементов между пулами потоков."""
+
+    def __init__(self, logger=None):
+        """
+        Инициализация конвейера.
+
+        Args:
+            logger: Логгер
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.stages: Dict[str, PipelineStage] = {}
+        self._order: List[str] = []
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._meetings: Dict[str, Dict[str, Any]] = {}
+        # Элементы, уже поставленные в каждый этап: обход папок и предыдущий этап
+        # могут найти один и тот же файл, второй экземпляр не ставится в очередь
+        self._seen: Dict[str, set] = {}
+        self._started = False
+
+    def add_stage(self, name: str, func: Callable[[Any], Any], workers: int = 1, queue_size: int = 4) -> 'StagePipeline':
+        """
+        Добавляет этап в конец конвейера.
+
+        Args:
+            name: Название этапа
+            func: Функция обработки элемента
+            workers: Количество рабочих потоков
+            queue_size: Размер входной очереди
+
+        Returns:
+            Сам конвейер (для цепочки вызовов)
+        """
+        stage = PipelineStage(name, func, workers, queue_size)
+        if self._order:
+            self.stages[self._order[-1]].next_stage = stage
+        self.stages[name] = stage
+        self._seen[name] = set()
+        self._order.append(name)
+        return self
+
+    def start(self):
+        """Запускает рабочие потоки всех этапов."""
+        if self._started:
+            return
+        for name in self._order:
+            stage = self.stages[name]
+            for index in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(stage,),
+                    name=f"pipeline-{name}-{index + 1}",
+                    daemon=True
+                )
+                thread.start()
+                stage.threads.append(thread)
+            self.logger.info(f"🧵 Этап конвейера '{name}': {stage.workers} потоков, очередь {stage.queue.maxsize}")
+        self._started = True
+
+    def submit(self, stage_name: str, item: Any, meeting: str = "") -> bool:
+        """
+        Ставит элемент в очередь этапа. Блокируется, если очередь заполнена.
+
+        Каждый файл попадает в этап не больше одного раза за время жизни конвейера.
+
+        Args:
+            stage_name: Название этапа
+            item: Элемент для обработки (обычно путь к файлу)
+            meeting: Папка встречи, к которой относится элемент
+
+        Returns:
+            True если элемент поставлен в очередь, False если он уже был в этапе
+        """
+        stage = self.stages.get(stage_name)
+        if not stage:
+            self.logger.warning(f"⚠️ Неизвестный этап конвейера: {stage_name}")
+            return False
+
+        meeting = meeting or self._meeting_of(item)
+        key = os.path.normpath(str(self._path_of(item)))
+        with self._lock:
+            if key in self._seen[stage_name]:
+                self.logger.debug(f"⏭️ {os.path.basename(key)} уже в этапе '{stage_name}'")
+                return False
+            self._seen[stage_name].add(key)
+            self._pending += 1
+            info = self._meetings.setdefault(meeting, {
+                "started_at": time.time(),
+                "finished_at": None,
+                "stages": {},
+                "errors": 0,
+                "pending": 0
+            })
+            info["pending"] += 1
+            info["finished_at"] = None
+
+        stage.queue.put((item, meeting))
+        stage.stats["max_queue"] = max(stage.stats["max_queue"], stage.queue.qsize())
+        return True
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ожидает завершения обработки всех поставленных элементов.
+
+        Args:
+            timeout: Максимальное время ожидания в секундах
+
+        Returns:
+            True если все элементы обработаны, False при таймауте
+        """
+        deadline = time.time() + timeout if timeout else None
+        with self._idle:
+            while self._pending > 0:
+                remaining = deadline - time.time() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def shutdown(self):
+        """Останавливает рабочие потоки всех этапов."""
+        if not self._started:
+            return
+        for name in self._order:
+            stage = self.stages[name]
+            for _ in stage.threads:
+                stage.queue.put(_STOP)
+        for name in self._order:
+            for thread in self.stages[name].threads:
+                thread.join(timeout=5)
+            self.stages[name].threads = []
+        self._started = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Возвращает статистику этапов и сквозную задержку по встречам.
+
+        Returns:
+            Словарь {"stages": {...}, "meetings": {...}}
+        """
+        with self._lock:
+            stages = {
+                name: {
+                    "processed": self.stages[name].stats["processed"],
+                    "skipped": self.stages[name].stats["skipped"],
+                    "errors": self.stages[name].stats["errors"],
+                    "busy_time": round(self.stages[name].stats["busy_time"], 2),
+                    "max_queue": self.stages[name].stats["max_queue"],
+                    "workers": self.stages[name].workers
+                }
+                for name in self._order
+            }
+            meetings = {}
+            for meeting, info in self._meetings.items():
+                finished_at = info["finished_at"] or time.time()
+                meetings[meeting] = {
+                    "latency": round(finished_at - info["started_at"], 2),
+                    "stages": {name: round(duration, 2) for name, duration in info["stages"].items()},
+                    "errors": info["errors"],
+                    "completed": info["finished_at"] is not None
+                }
+        return {"stages": stages, "meetings": meetings}
+
+    def log_latency_report(self):
+        """Логирует сквозную задержку по каждой встрече."""
+        stats = self.get_stats()
+        if not stats["meetings"]:
+            return
+        self.logger.info("⏱️ Сквозная задержка по встречам:")
+        for meeting, info in sorted(stats["meetings"].items(), key=lambda x: -x[1]["latency"]):
+            stages = ", ".join(f"{name} {duration:.1f}с" for name, duration in info["stages"].items())
+            errors = f", ошибок {info['errors']}" if info["errors"] else ""
+            self.logger.info(f"   📁 {os.path.basename(meeting) or meeting}: {info['latency']:.1f}с ({stages}{errors})")
+
+    def _worker(self, stage: PipelineStage):
+        """
+        Рабочий поток этапа.
+
+        Args:
+            stage: Этап, очередь которого обрабатывает поток
+        """
+        while True:
+            entry = stage.queue.get()
+            if entry is _STOP:
+                break
+
+            item, meeting = entry
+            started = time.time()
+            try:
+                result = stage.func(item)
+            except Exception as e:
+                self.logger.error(f"❌ Ошибка этапа '{stage.name}' для {item}: {e}")
+                result = False
+            duration = time.time() - started
+
+            with self._lock:
+                stage.stats["busy_time"] += duration
+                info = self._meetings[meeting]
+                info["stages"][stage.name] = info["stages"].get(stage.name, 0.0) + duration
+                if result is False:
+                    stage.stats["errors"] += 1
+                    info["errors"] += 1
+                elif result is None:
+                    stage.stats["skipped"] += 1
+                else:
+                    stage.stats["processed"] += 1
+
+            # Передаем результат дальше до уменьшения счетчика, чтобы join не завершился раньше времени
+            if isinstance(result, StageOutput) and stage.next_stage:
+                self.submit(stage.next_stage.name, result.item, meeting)
+
+            with self._idle:
+                self._pending -= 1
+                info["pending"] -= 1
+                if info["pending"] == 0:
+                    info["finished_at"] = time.time()
+                if self._pending == 0:
+                    self._idle.notify_all()
+
+    def _meeting_of(self, item: Any) -> str:
+        """
+        Определяет папку встречи по элементу.
+
+        Args:
+            item: Элемент конвейера (путь к файлу или кортеж с путем)
+
+        Returns:
+            Путь к папке встречи
+        """
+        return os.path.dirname(str(self._path_of(item)))
+
+    def _path_of(self, item: Any) -> Any:
+        """Возвращает путь к файлу элемента (первое поле кортежа или сам элемент)."""
+        return item[0] if isinstance(item, (tuple, list)) else item
@@ -5,6 +5,8 @@
 Отслеживает изменения и определяет, что нужно обработать.
 """
 
+import os
+import time
 import sqlite3
 import json
 import logging
@@ -13,6 +15,22 @@ from datetime import datetime
 from pathlib import Path
 
 
+# Источники для агрегированной статистики: таблица -> этап, колонки аккаунта/статуса/времени.
+# Агрегаты поддерживаются триггерами, поэтому отчеты и viewer читают их за O(1).
+STATS_SOURCES = {
+    'system_state': {'stage': 'cycles', 'account': None, 'status': None, 'time': 'created_at'},
+    'processed_events': {'stage': 'calendar', 'account': 'account_type', 'status': None, 'time': 'processed_at'},
+    'folder_creation_status': {'stage': 'folders', 'account': 'account_type', 'status': 'status', 'time': 'created_at'},
+    'processed_media': {'stage': 'media', 'account': None, 'status': 'status', 'time': 'processed_at'},
+    'processed_transcriptions': {'stage': 'transcription', 'account': None, 'status': 'status', 'time': 'processed_at'},
+    'processed_summaries': {'stage': 'summary', 'account': None, 'status': 'status', 'time': 'created_at'},
+    'notion_sync_status': {'stage': 'notion', 'account': None, 'status': 'sync_status', 'time': 'last_sync'},
+}
+
+# Версия схемы триггеров статистики (входит в имена триггеров)
+STATS_TRIGGERS_VERSION = 2
+
+
 class StateManager:
     """Менеджер состояния системы с SQLite."""
     
@@ -27,6 +45,13 @@ class StateManager:
         self.db_path = db_path
         self.logger = logger or logging.getLogger(__name__)
         
+        # Обновлять Notion сразу при пометке транскрипции/саммари.
+        # Граф задач встреч отключает это и обновляет Notion отдельной задачей.
+        self.auto_notion_updates = True
+        
+        # Записывать изменения Notion в очередь (notion_outbox) вместо прямых запросов
+        self.notion_outbox_enabled = os.getenv('NOTION_OUTBOX_ENABLED', 'true').lower() == 'true'
+        
         # Создаем директорию для базы данных
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         
@@ -71,6 +96,9 @@ class StateManager:
                         event_title TEXT,
                         event_start_time TEXT,
                         event_end_time TEXT,
+                        attendees TEXT,
+                        meeting_link TEXT,
+                        calendar_type TEXT,
                         processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         UNIQUE(event_id, account_type)
                     )
@@ -82,6 +110,8 @@ class StateManager:
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         file_path TEXT NOT NULL UNIQUE,
                         file_hash TEXT,
+                        compressed_video TEXT,
+                        compressed_audio TEXT,
                         processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         status TEXT DEFAULT 'success'
                     )
@@ -92,6 +122,8 @@ class StateManager:
                     CREATE TABLE IF NOT EXISTS processed_transcriptions (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         file_path TEXT NOT NULL UNIQUE,
+                        transcript_file TEXT,
+                        event_id TEXT,
                         processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         status TEXT DEFAULT 'success'
                     )
@@ -108,12 +140,66 @@ class StateManager:
                     )
                 ''')
                 
+                # Таблица для отслеживания обработанных саммари
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS processed_summaries (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        transcript_file TEXT NOT NULL UNIQUE,
+                        summary_file TEXT,
+                        analysis_file TEXT,
+                        status TEXT DEFAULT 'success',
+                        event_id TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+
+                # Таблица для отслеживания страниц Notion по событиям
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS notion_sync_status (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        event_id TEXT NOT NULL UNIQUE,
+                        page_id TEXT,
+                        page_url TEXT,
+                        sync_status TEXT DEFAULT 'success',
+                        last_sync TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+
+                # Таблица для отслеживания создания папок
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS folder_creation_status (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        event_id TEXT NOT NULL,
+                        folder_path TEXT,
+                        account_type TEXT NOT NULL,
+                        status TEXT DEFAULT 'success',
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        UNIQUE(event_id, account_type)
+                    )
+                ''')
+
                 # Создаем индексы для быстрого поиска
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_processed_events_event_id ON processed_events(event_id)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_processed_events_account ON processed_events(account_type)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_system_state_timestamp ON system_state(timestamp)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_system_state_cycle ON system_state(cycle_id)')
-                
+
+                # Агрегированная статистика (счетчики, пропускная способность, этапы событий)
+                self._init_statistics_tables(cursor)
+
+                # Граф задач по встречам
+                self._init_task_graph_tables(cursor)
+
+                # Зеркало базы встреч Notion и состояние записи на страницы
+                self._init_notion_tables(cursor)
+
+                # Состояние инкрементальной синхронизации календарей
+                self._init_calendar_sync_tables(cursor)
+
+                # Кэш ответов модели для саммари
+                self._init_summary_cache_tables(cursor)
+
                 conn.commit()
                 self.logger.info(f"✅ База данных инициализирована: {self.db_path}")
                 
@@ -398,6 +484,9 @@ class StateManager:
         """
         Получает статистику из базы данных.
         
+        Читает агрегированные счетчики (stats_counters), которые поддерживаются
+        триггерами, вместо COUNT(*) по таблицам обработки.
+        
         Returns:
             Словарь со статистикой
         """
@@ -405,34 +494,38 @@ class StateManager:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                # Общая статистика
-                cursor.execute('SELECT COUNT(*) FROM system_state')
-                total_cycles = cursor.fetchone()[0]
+                counters = self._read_counters(cursor)
                 
-                cursor.execute('SELECT COUNT(*) FROM processed_events')
-                total_events = cursor.fetchone()[0]
-                
-                cursor.execute('SELECT COUNT(*) FROM processed_media')
-                total_media = cursor.fetchone()[0]
-                
-                cursor.execute('SELECT COUNT(*) FROM processed_transcriptions')
-                total_transcriptions = cursor.fetchone()[0]
-                
-                # Последний цикл
+                # Последний цикл (по первичному ключу, без сортировки всей таблицы)
                 cursor.execute('''
                     SELECT cycle_id, timestamp, personal_events_processed, work_events_processed,
                            media_processed, transcriptions_processed, notion_synced, errors_count
                     FROM system_state 
-                    ORDER BY created_at DESC LIMIT 1
+                    ORDER BY id DESC LIMIT 1
                 ''')
                 
                 last_cycle = cursor.fetchone()
                 
+                cursor.execute('''
+                    SELECT stage, processed, errors FROM stats_daily_throughput
+                    WHERE day = date('now')
+                ''')
+                today = {row[0]: {'processed': row[1], 'errors': row[2]} for row in cursor.fetchall()}
+                
                 return {
-                    'total_cycles': total_cycles,
-                    'total_events': total_events,
-                    'total_media': total_media,
-                    'total_transcriptions': total_transcriptions,
+                    'total_cycles': self._counter_total(counters, 'system_state'),
+                    'total_events': self._counter_total(counters, 'processed_events'),
+                    'total_media': self._counter_total(counters, 'processed_media'),
+                    'total_transcriptions': self._counter_total(counters, 'processed_transcriptions'),
+                    'total_summaries': self._counter_total(counters, 'processed_summaries'),
+                    'total_notion_synced': self._counter_total(counters, 'notion_sync_status', success_only=True),
+                    'events_by_account': {
+                        account: values[0]
+                        for (table, account), values in counters.items()
+                        if table == 'processed_events'
+                    },
+                    'stage_backlog': self._calculate_stage_backlog(counters),
+                    'today': today,
                     'last_cycle': {
                         'cycle_id': last_cycle[0] if last_cycle else 0,
                         'timestamp': last_cycle[1] if last_cycle else None,
@@ -449,6 +542,65 @@ class StateManager:
             self.logger.error(f"❌ Ошибка получения статистики: {e}")
             return {}
     
+    def get_stage_backlog(self) -> Dict[str, int]:
+        """
+        Получает количество элементов, ожидающих каждого этапа обработки.
+        
+        Returns:
+            Словарь {этап: размер очереди}
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                return self._calculate_stage_backlog(self._read_counters(conn.cursor()))
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения очередей этапов: {e}")
+            return {}
+    
+    def get_daily_throughput(self, days: int = 7) -> List[Dict[str, Any]]:
+        """
+        Получает пропускную способность по дням и этапам.
+        
+        Args:
+            days: Количество последних дней
+            
+        Returns:
+            Список записей {day, stage, processed, errors}
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT day, stage, processed, errors FROM stats_daily_throughput
+                    WHERE day >= date('now', ?)
+                    ORDER BY day DESC, stage
+                ''', (f'-{max(days - 1, 0)} days',))
+                return [
+                    {'day': row[0], 'stage': row[1], 'processed': row[2], 'errors': row[3]}
+                    for row in cursor.fetchall()
+                ]
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения пропускной способности: {e}")
+            return []
+    
+    def rebuild_statistics(self) -> bool:
+        """
+        Полностью пересчитывает агрегированную статистику по таблицам обработки.
+        
+        Нужен после ручных правок базы в обход триггеров.
+        
+        Returns:
+            True если успешно, False иначе
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                self._rebuild_statistics(conn.cursor())
+                conn.commit()
+                self.logger.info("✅ Агрегированная статистика пересчитана")
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка пересчета статистики: {e}")
+            return False
+    
     def cleanup_old_data(self, days_to_keep: int = 30):
         """
         Очищает старые данные из базы данных.
@@ -510,7 +662,7 @@ class StateManager:
                 conn.commit()
                 
                 # Если есть event_id и файл транскрипции, обновляем Notion
-                if event_id and transcript_file and os.path.exists(transcript_file):
+                if self.auto_notion_updates and event_id and transcript_file and os.path.exists(transcript_file):
                     self._update_notion_with_transcription(event_id, transcript_file)
                 
                 return True
@@ -629,7 +781,7 @@ class StateManager:
                 conn.commit()
                 
                 # Если есть event_id и файлы саммари, обновляем Notion
-                if event_id and summary_file and os.path.exists(summary_file):
+                if self.auto_notion_updates and event_id and summary_file and os.path.exists(summary_file):
                     self._update_notion_with_summary(event_id, summary_file, analysis_file)
                 
                 return True
@@ -767,12 +919,34 @@ class StateManager:
     
     def _update_notion_with_summary(self, event_id: str, summary_file: str, analysis_file: str = ""):
         """
-        Обновляет страницу Notion с саммари и анализом.
+        Обновляет страницу Notion с саммари и анализом (через очередь, если она включена).
+        
+        Args:
+            event_id: ID события
+            summary_file: Путь к файлу саммари
+            analysis_file: Путь к файлу анализа
+            
+        Returns:
+            True если страница обновлена или операция поставлена в очередь, False иначе
+        """
+        if self.notion_outbox_enabled:
+            return self.enqueue_notion_operation('append_summary', event_id, {
+                "summary_file": summary_file,
+                "analysis_file": analysis_file
+            })
+        return self.push_summary_to_notion(event_id, summary_file, analysis_file)
+    
+    def push_summary_to_notion(self, event_id: str, summary_file: str, analysis_file: str = "") -> bool:
+        """
+        Добавляет саммари и анализ на страницу Notion события (сразу, без очереди).
         
         Args:
             event_id: ID события
             summary_file: Путь к файлу саммари
             analysis_file: Путь к файлу анализа
+            
+        Returns:
+            True если страница обновлена, False иначе
         """
         try:
             # Получаем page_id для события
@@ -786,14 +960,14 @@ class StateManager:
                 result = cursor.fetchone()
                 if not result or not result[0]:
                     self.logger.warning(f"⚠️ Page ID не найден для события {event_id}")
-                    return
+                    return False
                 
                 page_id = result[0]
             
             # Читаем содержимое саммари
             if not os.path.exists(summary_file):
                 self.logger.warning(f"⚠️ Файл саммари не найден: {summary_file}")
-                return
+                return False
             
             with open(summary_file, 'r', encoding='utf-8') as f:
                 summary_content = f.read()
@@ -805,10 +979,11 @@ class StateManager:
                     analysis_content = f.read()
             
             # Обновляем страницу Notion
-            self._add_content_to_notion_page(page_id, summary_content, analysis_content)
+            return self._add_content_to_notion_page(page_id, summary_content, analysis_content)
             
         except Exception as e:
             self.logger.error(f"❌ Ошибка обновления Notion с саммари: {e}")
+            return False
     
     def _add_content_to_notion_page(self, page_id: str, summary_content: str, analysis_content: str = ""):
         """
@@ -818,99 +993,23 @@ class StateManager:
             page_id: ID страницы в Notion
             summary_content: Содержимое саммари
             analysis_content: Содержимое анализа
-        """
-        try:
-            import requests
-            import os
-            
-            # Получаем токен из переменных окружения
-            notion_token = os.getenv('NOTION_TOKEN')
-            if not notion_token:
-                self.logger.warning("⚠️ NOTION_TOKEN не найден в переменных окружения")
-                return
-            
-            headers = {
-                "Authorization": f"Bearer {notion_token}",
-                "Content-Type": "application/json",
-                "Notion-Version": "2022-06-28"
-            }
-            
-            # Формируем блоки для добавления
-            blocks_to_add = []
-            
-            # Добавляем заголовок для саммари
-            blocks_to_add.append({
-                "type": "heading_2",
-                "heading_2": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": "📊 Саммари и анализ"
-                            }
-                        }
-                    ]
-                }
-            })
             
-            # Добавляем саммари
-            blocks_to_add.append({
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": summary_content
-                            }
-                        }
-                    ]
-                }
-            })
-            
-            # Добавляем анализ (если есть)
+        Returns:
+            True если контент добавлен, False иначе
+        """
+        from .notion_blocks import heading_block, iter_paragraph_blocks
+        
+        def build_blocks():
+            yield heading_block("📊 Саммари и анализ", 2)
+            yield from iter_paragraph_blocks(summary_content)
             if analysis_content:
-                blocks_to_add.append({
-                    "type": "heading_3",
-                    "heading_3": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": "🔍 Детальный анализ"
-                                }
-                            }
-                        ]
-                    }
-                })
-                
-                blocks_to_add.append({
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": analysis_content
-                                }
-                            }
-                        ]
-                    }
-                })
-            
-            # Добавляем контент в страницу
-            url = f"https://api.notion.com/v1/blocks/{page_id}/children"
-            payload = {
-                "children": blocks_to_add
-            }
-            
-            response = requests.patch(url, headers=headers, json=payload)
-            response.raise_for_status()
-            
+                yield heading_block("🔍 Детальный анализ", 3)
+                yield from iter_paragraph_blocks(analysis_content)
+        
+        if self._append_blocks_to_notion_page(page_id, "summary", summary_content + analysis_content, build_blocks):
             self.logger.info(f"✅ Страница Notion обновлена с саммари: {page_id}")
-            
-        except Exception as e:
-            self.logger.error(f"❌ Ошибка добавления контента в Notion: {e}")
+            return True
+        return False
     
     def _find_event_id_by_file_path(self, file_path: str) -> str:
         """
@@ -964,11 +1063,31 @@ class StateManager:
     
     def _update_notion_with_transcription(self, event_id: str, transcript_file: str):
         """
-        Обновляет страницу Notion с транскрипцией.
+        Обновляет страницу Notion с транскрипцией (через очередь, если она включена).
+        
+        Args:
+            event_id: ID события
+            transcript_file: Путь к файлу транскрипции
+            
+        Returns:
+            True если страница обновлена или операция поставлена в очередь, False иначе
+        """
+        if self.notion_outbox_enabled:
+            return self.enqueue_notion_operation('append_transcription', event_id, {
+                "transcript_file": transcript_file
+            })
+        return self.push_transcription_to_notion(event_id, transcript_file)
+    
+    def push_transcription_to_notion(self, event_id: str, transcript_file: str) -> bool:
+        """
+        Добавляет транскрипцию на страницу Notion события (сразу, без очереди).
         
         Args:
             event_id: ID события
             transcript_file: Путь к файлу транскрипции
+            
+        Returns:
+            True если страница обновлена, False иначе
         """
         try:
             # Получаем page_id для события
@@ -982,23 +1101,24 @@ class StateManager:
                 result = cursor.fetchone()
                 if not result or not result[0]:
                     self.logger.warning(f"⚠️ Page ID не найден для события {event_id}")
-                    return
+                    return False
                 
                 page_id = result[0]
             
             # Читаем содержимое транскрипции
             if not os.path.exists(transcript_file):
                 self.logger.warning(f"⚠️ Файл транскрипции не найден: {transcript_file}")
-                return
+                return False
             
             with open(transcript_file, 'r', encoding='utf-8') as f:
                 transcript_content = f.read()
             
             # Обновляем страницу Notion
-            self._add_transcription_to_notion_page(page_id, transcript_content)
+            return self._add_transcription_to_notion_page(page_id, transcript_content)
             
         except Exception as e:
             self.logger.error(f"❌ Ошибка обновления Notion с транскрипцией: {e}")
+            return False
     
     def _add_transcription_to_notion_page(self, page_id: str, transcript_content: str):
         """
@@ -1007,66 +1127,2048 @@ class StateManager:
         Args:
             page_id: ID страницы в Notion
             transcript_content: Содержимое транскрипции
+            
+        Returns:
+            True если транскрипция добавлена, False иначе
+        """
+        from .notion_blocks import heading_block, iter_paragraph_blocks
+        
+        def build_blocks():
+            yield heading_block("📝 Транскрипция встречи", 2)
+            yield from iter_paragraph_blocks(transcript_content)
+        
+        if self._append_blocks_to_notion_page(page_id, "transcription", transcript_content, build_blocks):
+            self.logger.info(f"✅ Страница Notion обновлена с транскрипцией: {page_id}")
+            return True
+        return False
+    
+    def _append_blocks_to_notion_page(self, page_id: str, content_key: str, content: str, build_blocks) -> bool:
+        """
+        Дописывает блоки на страницу Notion пакетами с сохранением прогресса.
+        
+        Если предыдущая попытка оборвалась на середине, дозапись продолжается
+        с первого неотправленного блока; уже полностью добавленный контент не дублируется.
+        Прогресс хранится по хешу контента, поэтому несколько транскрипций
+        (или саммари) одной страницы учитываются независимо.
+        
+        Args:
+            page_id: ID страницы в Notion
+            content_key: Вид контента (summary, transcription)
+            content: Исходный текст (по нему определяется, тот же ли это контент)
+            build_blocks: Функция, возвращающая блоки в детерминированном порядке
+            
+        Returns:
+            True если все блоки добавлены, False иначе
         """
         try:
-            import requests
-            import os
+            import hashlib
+            from .notion_api import get_notion_client
+            from .notion_blocks import append_blocks
             
             # Получаем токен из переменных окружения
             notion_token = os.getenv('NOTION_TOKEN')
             if not notion_token:
                 self.logger.warning("⚠️ NOTION_TOKEN не найден в переменных окружения")
-                return
-            
-            headers = {
-                "Authorization": f"Bearer {notion_token}",
-                "Content-Type": "application/json",
-                "Notion-Version": "2022-06-28"
-            }
-            
-            # Формируем блоки для добавления
-            blocks_to_add = []
-            
-            # Добавляем заголовок для транскрипции
-            blocks_to_add.append({
-                "type": "heading_2",
-                "heading_2": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": "📝 Транскрипция встречи"
-                            }
-                        }
-                    ]
-                }
-            })
+                return False
             
-            # Добавляем транскрипцию
-            blocks_to_add.append({
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": transcript_content
-                            }
-                        }
-                    ]
-                }
-            })
+            notion = get_notion_client(notion_token, self.logger)
+            content_hash = hashlib.md5(content.encode('utf-8')).hexdigest()
             
-            # Добавляем контент в страницу
-            url = f"https://api.notion.com/v1/blocks/{page_id}/children"
-            payload = {
-                "children": blocks_to_add
-            }
+            progress = self.get_append_progress(page_id, content_key, content_hash)
+            start = 0
+            if progress:
+                if progress['completed']:
+                    self.logger.info(f"⏭️ Контент '{content_key}' уже добавлен на страницу {page_id}")
+                    return True
+                start = progress['blocks_appended']
+                self.logger.info(f"🔄 Продолжаю дозапись '{content_key}' на страницу {page_id} с блока {start + 1}")
             
-            response = requests.patch(url, headers=headers, json=payload)
-            response.raise_for_status()
+            def on_progress(appended: int):
+                self.set_append_progress(page_id, content_key, content_hash, appended, completed=False)
             
-            self.logger.info(f"✅ Страница Notion обновлена с транскрипцией: {page_id}")
+            appended = append_blocks(notion, page_id, build_blocks(), token=notion_token,
+                                     start=start, on_progress=on_progress, logger=self.logger)
+            self.set_append_progress(page_id, content_key, content_hash, appended, completed=True)
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка добавления контента '{content_key}' в Notion: {e}")
+            return False
+    
+    def get_append_progress(self, page_id: str, content_key: str, content_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Получает прогресс дозаписи контента на страницу Notion.
+        
+        Args:
+            page_id: ID страницы
+            content_key: Вид контента
+            content_hash: Хеш исходного текста
+            
+        Returns:
+            Словарь с content_hash, blocks_appended, completed или None
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                row = conn.execute('''
+                    SELECT content_hash, blocks_appended, completed FROM notion_append_progress
+                    WHERE page_id = ? AND content_key = ? AND content_hash = ?
+                ''', (page_id, content_key, content_hash)).fetchone()
+                return dict(row) if row else None
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения прогресса дозаписи Notion: {e}")
+            return None
+    
+    def set_append_progress(self, page_id: str, content_key: str, content_hash: str,
+                            blocks_appended: int, completed: bool) -> bool:
+        """
+        Сохраняет прогресс дозаписи контента на страницу Notion.
+        
+        Args:
+            page_id: ID страницы
+            content_key: Вид контента
+            content_hash: Хеш исходного текста
+            blocks_appended: Количество уже добавленных блоков
+            completed: Весь контент добавлен
             
+        Returns:
+            True если успешно, False иначе
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO notion_append_progress
+                    (page_id, content_key, content_hash, blocks_appended, completed, updated_at)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', (page_id, content_key, content_hash, blocks_appended, int(completed)))
+                conn.commit()
+                return True
         except Exception as e:
-            self.logger.error(f"❌ Ошибка добавления транскрипции в Notion: {e}")
+            self.logger.error(f"❌ Ошибка сохранения прогресса дозаписи Notion: {e}")
+            return False
+
+    # ===== АГРЕГИРОВАННАЯ СТАТИСТИКА =====
+    
+    def _init_statistics_tables(self, cursor):
+        """
+        Создает таблицы агрегатов и триггеры, поддерживающие их в актуальном состоянии.
+        
+        Args:
+            cursor: Курсор открытого соединения
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stats_counters'")
+        stats_exist = cursor.fetchone() is not None
+        
+        # Счетчики по таблицам и аккаунтам
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_counters (
+                table_name TEXT NOT NULL,
+                account_type TEXT NOT NULL DEFAULT 'all',
+                total INTEGER DEFAULT 0,
+                success INTEGER DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (table_name, account_type)
+            )
+        ''')
+        
+        # Пропускная способность по дням и этапам
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stats_daily_throughput (
+                day TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                processed INTEGER DEFAULT 0,
+                errors INTEGER DEFAULT 0,
+                PRIMARY KEY (day, stage)
+            )
+        ''')
+        
+        # Состояние этапов по каждому событию (для таблиц обработки в viewer)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS event_stage_summary (
+                event_id TEXT NOT NULL,
+                account_type TEXT NOT NULL,
+                folder_path TEXT,
+                folder_created INTEGER DEFAULT 0,
+                notion_synced INTEGER DEFAULT 0,
+                media_count INTEGER DEFAULT 0,
+                transcription_count INTEGER DEFAULT 0,
+                summary_count INTEGER DEFAULT 0,
+                last_media_at TEXT,
+                last_transcription_at TEXT,
+                last_summary_at TEXT,
+                last_notion_sync_at TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (event_id, account_type)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_event_stage_summary_folder ON event_stage_summary(folder_path)')
+        
+        self._create_statistics_triggers(cursor)
+        
+        # Первичное заполнение для уже существующей базы
+        if not stats_exist:
+            self._rebuild_statistics(cursor)
+    
+    def _table_columns(self, cursor, table: str) -> set:
+        """Возвращает множество колонок таблицы (пустое, если таблицы нет)."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        return {row[1] for row in cursor.fetchall()}
+    
+    def _unique_key(self, cursor, table: str) -> List[str]:
+        """Возвращает колонки первого уникального ключа таблицы (кроме PRIMARY KEY)."""
+        cursor.execute(f"PRAGMA index_list({table})")
+        for row in cursor.fetchall():
+            # seq, name, unique, origin, partial
+            if row[2] and row[3] != 'pk':
+                cursor.execute(f"PRAGMA index_info('{row[1]}')")
+                return [info[2] for info in cursor.fetchall()]
+        return []
+    
+    def _stage_refresh_sql(self, cursor, where: str) -> List[str]:
+        """
+        Формирует UPDATE для пересчета медиа/транскрипций/саммари по папке события.
+        
+        Args:
+            cursor: Курсор открытого соединения
+            where: Условие отбора строк event_stage_summary
+            
+        Returns:
+            Список SQL выражений
+        """
+        sources = [
+            ('processed_media', 'file_path', 'processed_at', 'media_count', 'last_media_at'),
+            ('processed_transcriptions', 'file_path', 'processed_at', 'transcription_count', 'last_transcription_at'),
+            ('processed_summaries', 'summary_file', 'created_at', 'summary_count', 'last_summary_at'),
+        ]
+        statements = []
+        for table, path_col, time_col, count_col, last_col in sources:
+            columns = self._table_columns(cursor, table)
+            if path_col not in columns or time_col not in columns:
+                continue
+            match = (f"length(event_stage_summary.folder_path) > 0 AND "
+                     f"substr(src.{path_col}, 1, length(event_stage_summary.folder_path)) = event_stage_summary.folder_path")
+            statements.append(
+                f"UPDATE event_stage_summary SET "
+                f"{count_col} = (SELECT COUNT(*) FROM {table} src WHERE {match}), "
+                f"{last_col} = (SELECT MAX(src.{time_col}) FROM {table} src WHERE {match}), "
+                f"updated_at = CURRENT_TIMESTAMP "
+                f"WHERE {where}"
+            )
+        return statements
+    
+    def _create_statistics_triggers(self, cursor):
+        """
+        Создает триггеры, инкрементально обновляющие агрегаты.
+        
+        Args:
+            cursor: Курсор открытого соединения
+        """
+        version = STATS_TRIGGERS_VERSION
+        
+        # Триггеры прежних версий удаляются, иначе агрегаты обновлялись бы дважды
+        cursor.execute("""
+            SELECT name FROM sqlite_master WHERE type = 'trigger'
+            AND (name LIKE 'trg\\_stats\\_v%' ESCAPE '\\' OR name LIKE 'trg\\_stage\\_v%' ESCAPE '\\')
+        """)
+        current = (f"trg_stats_v{version}_", f"trg_stage_v{version}_")
+        for (name,) in cursor.fetchall():
+            if not name.startswith(current):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        
+        for table, source in STATS_SOURCES.items():
+            columns = self._table_columns(cursor, table)
+            if not columns:
+                continue
+            
+            account_col = source['account'] if source['account'] in columns else None
+            status_col = source['status'] if source['status'] in columns else None
+            time_col = source['time'] if source['time'] in columns else None
+            stage = source['stage']
+            prefix = f"trg_stats_v{version}_{table}"
+            
+            account_new = f"COALESCE(NEW.{account_col}, 'all')" if account_col else "'all'"
+            account_old = f"COALESCE(OLD.{account_col}, 'all')" if account_col else "'all'"
+            ok_new = f"(NEW.{status_col} IS 'success')" if status_col else "1"
+            ok_old = f"(OLD.{status_col} IS 'success')" if status_col else "1"
+            day_new = f"COALESCE(date(NEW.{time_col}), date('now'))" if time_col else "date('now')"
+            unique_key = self._unique_key(cursor, table)
+            
+            # Без уникального ключа каждая вставка - новая обработка;
+            # с ключом пропускную способность считает BEFORE INSERT по смене статуса
+            throughput = "" if unique_key else self._throughput_sql(day_new, stage, ok_new, f"1 - {ok_new}")
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {prefix}_ai AFTER INSERT ON {table}
+                BEGIN
+                    INSERT INTO stats_counters (table_name, account_type)
+                    SELECT '{table}', {account_new} WHERE NOT EXISTS (
+                        SELECT 1 FROM stats_counters WHERE table_name = '{table}' AND account_type = {account_new}
+                    );
+                    UPDATE stats_counters SET total = total + 1, success = success + {ok_new}, updated_at = CURRENT_TIMESTAMP
+                    WHERE table_name = '{table}' AND account_type = {account_new};
+                    {throughput}
+                END
+            ''')
+            
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {prefix}_ad AFTER DELETE ON {table}
+                BEGIN
+                    UPDATE stats_counters SET total = total - 1, success = success - {ok_old}, updated_at = CURRENT_TIMESTAMP
+                    WHERE table_name = '{table}' AND account_type = {account_old};
+                END
+            ''')
+            
+            if status_col:
+                throughput = self._throughput_sql(day_new, stage, f"({ok_new} AND NOT {ok_old})",
+                                                  f"(NOT {ok_new} AND {ok_old})")
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {prefix}_au AFTER UPDATE OF {status_col} ON {table}
+                    BEGIN
+                        UPDATE stats_counters SET success = success + {ok_new} - {ok_old}, updated_at = CURRENT_TIMESTAMP
+                        WHERE table_name = '{table}' AND account_type = {account_new};
+                        {throughput}
+                    END
+                ''')
+            
+            # INSERT OR REPLACE удаляет конфликтующую строку без вызова DELETE триггеров,
+            # поэтому заранее вычитаем строки, которые будут заменены.
+            # По той же причине в телах триггеров нет INSERT OR IGNORE: политика конфликта
+            # внешнего INSERT OR REPLACE переопределяет ее и обнуляет счетчики.
+            # Повторная пометка уже обработанной строки не считается новой обработкой за день:
+            # учитывается только переход в успешный (или ошибочный) статус.
+            if unique_key:
+                match = " AND ".join(f"{col} = NEW.{col}" for col in unique_key)
+                replaced_ok = f" AND {status_col} IS 'success'" if status_col else ""
+                replaced_failed = f" AND {status_col} IS NOT 'success'" if status_col else " AND 0"
+                throughput = self._throughput_sql(
+                    day_new, stage,
+                    f"({ok_new} AND NOT EXISTS (SELECT 1 FROM {table} WHERE {match}{replaced_ok}))",
+                    f"(NOT {ok_new} AND NOT EXISTS (SELECT 1 FROM {table} WHERE {match}{replaced_failed}))"
+                )
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {prefix}_bi BEFORE INSERT ON {table}
+                    BEGIN
+                        {throughput}
+                        UPDATE stats_counters SET
+                            total = total - (SELECT COUNT(*) FROM {table} WHERE {match}),
+                            success = success - (SELECT COUNT(*) FROM {table} WHERE {match}{replaced_ok})
+                        WHERE table_name = '{table}' AND account_type = {account_new};
+                    END
+                ''')
+        
+        self._create_event_stage_triggers(cursor)
+    
+    def _throughput_sql(self, day: str, stage: str, processed: str, errors: str) -> str:
+        """
+        Формирует тело триггера, прибавляющее обработки этапа за день.
+        
+        Args:
+            day: SQL выражение дня
+            stage: Этап
+            processed: SQL выражение (0/1) успешной обработки
+            errors: SQL выражение (0/1) ошибки
+            
+        Returns:
+            SQL выражения для тела триггера
+        """
+        return f'''
+                    INSERT INTO stats_daily_throughput (day, stage)
+                    SELECT {day}, '{stage}' WHERE NOT EXISTS (
+                        SELECT 1 FROM stats_daily_throughput WHERE day = {day} AND stage = '{stage}'
+                    );
+                    UPDATE stats_daily_throughput SET processed = processed + {processed}, errors = errors + {errors}
+                    WHERE day = {day} AND stage = '{stage}';'''
+    
+    def _create_event_stage_triggers(self, cursor):
+        """
+        Создает триггеры для таблицы состояния этапов по событиям.
+        
+        Args:
+            cursor: Курсор открытого соединения
+        """
+        prefix = f"trg_stage_v{STATS_TRIGGERS_VERSION}"
+        
+        if self._table_columns(cursor, 'processed_events'):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {prefix}_events_ai AFTER INSERT ON processed_events
+                BEGIN
+                    INSERT INTO event_stage_summary (event_id, account_type)
+                    SELECT NEW.event_id, NEW.account_type WHERE NOT EXISTS (
+                        SELECT 1 FROM event_stage_summary
+                        WHERE event_id = NEW.event_id AND account_type = NEW.account_type
+                    );
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {prefix}_events_ad AFTER DELETE ON processed_events
+                BEGIN
+                    DELETE FROM event_stage_summary
+                    WHERE event_id = OLD.event_id AND account_type = OLD.account_type;
+                END
+            ''')
+        
+        if {'event_id', 'account_type', 'folder_path', 'status'} <= self._table_columns(cursor, 'folder_creation_status'):
+            refresh = ";\n".join(self._stage_refresh_sql(
+                cursor, "event_id = NEW.event_id AND account_type = NEW.account_type"
+            ))
+            for suffix, event in (('ai', 'AFTER INSERT'), ('au', 'AFTER UPDATE')):
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {prefix}_folders_{suffix} {event} ON folder_creation_status
+                    BEGIN
+                        INSERT INTO event_stage_summary (event_id, account_type)
+                        SELECT NEW.event_id, NEW.account_type WHERE NOT EXISTS (
+                            SELECT 1 FROM event_stage_summary
+                            WHERE event_id = NEW.event_id AND account_type = NEW.account_type
+                        );
+                        UPDATE event_stage_summary SET
+                            folder_path = NEW.folder_path,
+                            folder_created = (NEW.status IS 'success'),
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE event_id = NEW.event_id AND account_type = NEW.account_type;
+                        {refresh};
+                    END
+                ''')
+        
+        if {'event_id', 'sync_status', 'last_sync'} <= self._table_columns(cursor, 'notion_sync_status'):
+            for suffix, event, row in (('ai', 'AFTER INSERT', 'NEW'), ('au', 'AFTER UPDATE', 'NEW'), ('ad', 'AFTER DELETE', 'OLD')):
+                last_sync = f", last_notion_sync_at = {row}.last_sync" if row == 'NEW' else ""
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {prefix}_notion_{suffix} {event} ON notion_sync_status
+                    BEGIN
+                        UPDATE event_stage_summary SET
+                            notion_synced = EXISTS (
+                                SELECT 1 FROM notion_sync_status n
+                                WHERE n.event_id = {row}.event_id AND n.sync_status IS 'success'
+                            ){last_sync},
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE event_id = {row}.event_id;
+                    END
+                ''')
+        
+        # Медиа, транскрипции и саммари относятся к событию по префиксу пути папки
+        for table, path_col in (('processed_media', 'file_path'),
+                                ('processed_transcriptions', 'file_path'),
+                                ('processed_summaries', 'summary_file')):
+            if path_col not in self._table_columns(cursor, table):
+                continue
+            for suffix, event, row in (('ai', 'AFTER INSERT', 'NEW'), ('ad', 'AFTER DELETE', 'OLD')):
+                where = (f"length(folder_path) > 0 AND "
+                         f"substr({row}.{path_col}, 1, length(folder_path)) = folder_path")
+                refresh = ";\n".join(self._stage_refresh_sql(cursor, where))
+                if not refresh:
+                    continue
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {prefix}_{table}_{suffix} {event} ON {table}
+                    BEGIN
+                        {refresh};
+                    END
+                ''')
+    
+    def _rebuild_statistics(self, cursor):
+        """
+        Пересчитывает все агрегаты по исходным таблицам.
+        
+        Args:
+            cursor: Курсор открытого соединения
+        """
+        cursor.execute('DELETE FROM stats_counters')
+        cursor.execute('DELETE FROM stats_daily_throughput')
+        cursor.execute('DELETE FROM event_stage_summary')
+        
+        for table, source in STATS_SOURCES.items():
+            columns = self._table_columns(cursor, table)
+            if not columns:
+                continue
+            
+            account = f"COALESCE({source['account']}, 'all')" if source['account'] in columns else "'all'"
+            ok = f"({source['status']} IS 'success')" if source['status'] in columns else "1"
+            day = f"COALESCE(date({source['time']}), date('now'))" if source['time'] in columns else "date('now')"
+            
+            cursor.execute(f'''
+                INSERT INTO stats_counters (table_name, account_type, total, success)
+                SELECT '{table}', {account}, COUNT(*), SUM({ok}) FROM {table} GROUP BY 2
+            ''')
+            cursor.execute(f'''
+                INSERT INTO stats_daily_throughput (day, stage, processed, errors)
+                SELECT {day}, '{source['stage']}', SUM({ok}), SUM(1 - {ok}) FROM {table} GROUP BY 1
+            ''')
+        
+        if self._table_columns(cursor, 'processed_events'):
+            cursor.execute('''
+                INSERT OR IGNORE INTO event_stage_summary (event_id, account_type)
+                SELECT event_id, account_type FROM processed_events
+            ''')
+        
+        if {'event_id', 'account_type', 'folder_path', 'status'} <= self._table_columns(cursor, 'folder_creation_status'):
+            cursor.execute('''
+                UPDATE event_stage_summary SET
+                    folder_path = (
+                        SELECT f.folder_path FROM folder_creation_status f
+                        WHERE f.event_id = event_stage_summary.event_id
+                          AND f.account_type = event_stage_summary.account_type
+                        ORDER BY (f.status IS 'success') DESC LIMIT 1
+                    ),
+                    folder_created = EXISTS (
+                        SELECT 1 FROM folder_creation_status f
+                        WHERE f.event_id = event_stage_summary.event_id
+                          AND f.account_type = event_stage_summary.account_type
+                          AND f.status IS 'success'
+                    )
+            ''')
+        
+        if {'event_id', 'sync_status', 'last_sync'} <= self._table_columns(cursor, 'notion_sync_status'):
+            cursor.execute('''
+                UPDATE event_stage_summary SET
+                    notion_synced = EXISTS (
+                        SELECT 1 FROM notion_sync_status n
+                        WHERE n.event_id = event_stage_summary.event_id AND n.sync_status IS 'success'
+                    ),
+                    last_notion_sync_at = (
+                        SELECT MAX(n.last_sync) FROM notion_sync_status n
+                        WHERE n.event_id = event_stage_summary.event_id
+                    )
+            ''')
+        
+        for statement in self._stage_refresh_sql(cursor, "length(folder_path) > 0"):
+            cursor.execute(statement)
+    
+    def _read_counters(self, cursor) -> Dict[tuple, tuple]:
+        """Читает stats_counters в словарь {(таблица, аккаунт): (total, success)}."""
+        cursor.execute('SELECT table_name, account_type, total, success FROM stats_counters')
+        return {(row[0], row[1]): (row[2] or 0, row[3] or 0) for row in cursor.fetchall()}
+    
+    def _counter_total(self, counters: Dict[tuple, tuple], table: str, success_only: bool = False) -> int:
+        """Суммирует счетчик таблицы по всем аккаунтам."""
+        index = 1 if success_only else 0
+        return sum(values[index] for (name, _), values in counters.items() if name == table)
+    
+    def _calculate_stage_backlog(self, counters: Dict[tuple, tuple]) -> Dict[str, int]:
+        """
+        Вычисляет размер очереди каждого этапа по разнице счетчиков соседних этапов.
+        
+        Args:
+            counters: Счетчики из stats_counters
+            
+        Returns:
+            Словарь {этап: количество ожидающих элементов}
+        """
+        events = self._counter_total(counters, 'processed_events')
+        folders = self._counter_total(counters, 'folder_creation_status', success_only=True)
+        notion = self._counter_total(counters, 'notion_sync_status', success_only=True)
+        media = self._counter_total(counters, 'processed_media', success_only=True)
+        transcriptions = self._counter_total(counters, 'processed_transcriptions', success_only=True)
+        summaries = self._counter_total(counters, 'processed_summaries', success_only=True)
+        
+        return {
+            'folders': max(events - folders, 0),
+            'notion': max(events - notion, 0),
+            'transcription': max(media - transcriptions, 0),
+            'summary': max(transcriptions - summaries, 0)
+        }
+
+    # ===== ГРАФ ЗАДАЧ ВСТРЕЧ =====
+    
+    def _init_task_graph_tables(self, cursor):
+        """
+        Создает таблицы графа задач по встречам.
+        
+        Args:
+            cursor: Курсор открытого соединения
+        """
+        # Задачи: сжатие, извлечение аудио, транскрипция, саммари, комплексное саммари, Notion
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS meeting_tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_key TEXT NOT NULL UNIQUE,
+                meeting_folder TEXT NOT NULL,
+                account_type TEXT,
+                task_type TEXT NOT NULL,
+                inputs TEXT DEFAULT '[]',
+                outputs TEXT DEFAULT '[]',
+                input_fingerprint TEXT,
+                status TEXT DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                next_attempt_at REAL DEFAULT 0,
+                last_error TEXT,
+                duration REAL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Ребра графа: задача -> задача, от результатов которой она зависит
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS meeting_task_deps (
+                task_key TEXT NOT NULL,
+                depends_on TEXT NOT NULL,
+                PRIMARY KEY (task_key, depends_on)
+            )
+        ''')
+        
+        # Время изменения папок встреч на момент последнего построения графа
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS task_graph_folders (
+                folder_path TEXT PRIMARY KEY,
+                account_type TEXT,
+                mtime REAL,
+                scanned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_meeting_tasks_status ON meeting_tasks(status)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_meeting_tasks_meeting ON meeting_tasks(meeting_folder)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_meeting_task_deps_depends ON meeting_task_deps(depends_on)')
+    
+    def _task_from_row(self, row) -> Dict[str, Any]:
+        """Преобразует строку meeting_tasks в словарь."""
+        task = dict(row)
+        task['inputs'] = json.loads(task.get('inputs') or '[]')
+        task['outputs'] = json.loads(task.get('outputs') or '[]')
+        return task
+    
+    def register_task(self, task_key: str, meeting_folder: str, account_type: str, task_type: str,
+                      inputs: List[str] = None, depends_on: List[str] = None) -> bool:
+        """
+        Регистрирует задачу графа или обновляет ее входы и зависимости.
+        
+        Args:
+            task_key: Уникальный ключ задачи
+            meeting_folder: Папка встречи
+            account_type: Тип аккаунта
+            task_type: Тип задачи
+            inputs: Собственные входные файлы задачи (кроме результатов зависимостей)
+            depends_on: Ключи задач, от которых зависит задача
+            
+        Returns:
+            True если задача создана впервые, False если уже существовала
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT INTO meeting_tasks (task_key, meeting_folder, account_type, task_type, inputs)
+                    SELECT ?, ?, ?, ?, ?
+                    WHERE NOT EXISTS (SELECT 1 FROM meeting_tasks WHERE task_key = ?)
+                ''', (task_key, meeting_folder, account_type, task_type, json.dumps(inputs or [], ensure_ascii=False), task_key))
+                created = cursor.rowcount > 0
+                if not created:
+                    cursor.execute('UPDATE meeting_tasks SET inputs = ? WHERE task_key = ?',
+                                   (json.dumps(inputs or [], ensure_ascii=False), task_key))
+                
+                cursor.execute('DELETE FROM meeting_task_deps WHERE task_key = ?', (task_key,))
+                cursor.executemany('INSERT OR IGNORE INTO meeting_task_deps (task_key, depends_on) VALUES (?, ?)',
+                                   [(task_key, dep) for dep in (depends_on or [])])
+                conn.commit()
+                return created
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка регистрации задачи {task_key}: {e}")
+            return False
+    
+    def update_task(self, task_key: str, **fields) -> bool:
+        """
+        Обновляет поля задачи графа.
+        
+        Args:
+            task_key: Ключ задачи
+            **fields: Поля meeting_tasks (outputs сериализуется в JSON)
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        try:
+            if 'outputs' in fields:
+                fields['outputs'] = json.dumps(fields['outputs'], ensure_ascii=False)
+            columns = ', '.join(f"{name} = ?" for name in fields)
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(f'UPDATE meeting_tasks SET {columns}, updated_at = CURRENT_TIMESTAMP WHERE task_key = ?',
+                             (*fields.values(), task_key))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка обновления задачи {task_key}: {e}")
+            return False
+    
+    def get_task(self, task_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Получает задачу графа по ключу.
+        
+        Args:
+            task_key: Ключ задачи
+            
+        Returns:
+            Задача или None
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                row = conn.execute('SELECT * FROM meeting_tasks WHERE task_key = ?', (task_key,)).fetchone()
+                return self._task_from_row(row) if row else None
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения задачи {task_key}: {e}")
+            return None
+    
+    def get_tasks(self, meeting_folder: str = None, statuses: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        Получает задачи графа с фильтрами.
+        
+        Args:
+            meeting_folder: Папка встречи (None - все встречи)
+            statuses: Список статусов (None - любые)
+            
+        Returns:
+            Список задач
+        """
+        try:
+            query = 'SELECT * FROM meeting_tasks WHERE 1 = 1'
+            params = []
+            if meeting_folder:
+                query += ' AND meeting_folder = ?'
+                params.append(meeting_folder)
+            if statuses:
+                query += f" AND status IN ({', '.join('?' for _ in statuses)})"
+                params.extend(statuses)
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                return [self._task_from_row(row) for row in conn.execute(query + ' ORDER BY id', params)]
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения задач графа: {e}")
+            return []
+    
+    def get_task_dependencies(self, task_key: str) -> List[Dict[str, Any]]:
+        """
+        Получает задачи, от которых зависит указанная задача.
+        
+        Args:
+            task_key: Ключ задачи
+            
+        Returns:
+            Список задач-зависимостей
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                rows = conn.execute('''
+                    SELECT t.* FROM meeting_task_deps d
+                    JOIN meeting_tasks t ON t.task_key = d.depends_on
+                    WHERE d.task_key = ?
+                    ORDER BY t.id
+                ''', (task_key,))
+                return [self._task_from_row(row) for row in rows]
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения зависимостей задачи {task_key}: {e}")
+            return []
+    
+    def get_task_dependents(self, task_key: str) -> List[Dict[str, Any]]:
+        """
+        Получает задачи, зависящие от указанной задачи.
+        
+        Args:
+            task_key: Ключ задачи
+            
+        Returns:
+            Список зависимых задач
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                rows = conn.execute('''
+                    SELECT t.* FROM meeting_task_deps d
+                    JOIN meeting_tasks t ON t.task_key = d.task_key
+                    WHERE d.depends_on = ?
+                    ORDER BY t.id
+                ''', (task_key,))
+                return [self._task_from_row(row) for row in rows]
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения зависимых задач {task_key}: {e}")
+            return []
+    
+    def get_runnable_tasks(self, max_attempts: int, now: float) -> List[Dict[str, Any]]:
+        """
+        Получает задачи, готовые к запуску: все зависимости выполнены, попытки не исчерпаны.
+        
+        Args:
+            max_attempts: Максимальное количество попыток
+            now: Текущее время (time.time())
+            
+        Returns:
+            Список задач в порядке регистрации
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                rows = conn.execute('''
+                    SELECT t.* FROM meeting_tasks t
+                    WHERE t.status IN ('pending', 'failed')
+                      AND t.attempts < ?
+                      AND COALESCE(t.next_attempt_at, 0) <= ?
+                      AND NOT EXISTS (
+                          SELECT 1 FROM meeting_task_deps d
+                          JOIN meeting_tasks u ON u.task_key = d.depends_on
+                          WHERE d.task_key = t.task_key AND u.status != 'done'
+                      )
+                    ORDER BY t.id
+                ''', (max_attempts, now))
+                return [self._task_from_row(row) for row in rows]
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения готовых задач: {e}")
+            return []
+    
+    def reset_running_tasks(self) -> int:
+        """
+        Возвращает в очередь задачи, прерванные остановкой сервиса.
+        
+        Returns:
+            Количество сброшенных задач
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.execute("UPDATE meeting_tasks SET status = 'pending' WHERE status = 'running'")
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка сброса выполняющихся задач: {e}")
+            return 0
+    
+    def get_task_graph_summary(self) -> Dict[str, int]:
+        """
+        Получает количество задач графа по статусам.
+        
+        Returns:
+            Словарь {статус: количество}
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute('SELECT status, COUNT(*) FROM meeting_tasks GROUP BY status').fetchall()
+                return {status: count for status, count in rows}
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения сводки графа задач: {e}")
+            return {}
+    
+    def get_graph_folders(self) -> Dict[str, float]:
+        """
+        Получает время изменения папок встреч на момент последнего построения графа.
+        
+        Returns:
+            Словарь {путь_к_папке: mtime}
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                return {row[0]: row[1] for row in conn.execute('SELECT folder_path, mtime FROM task_graph_folders')}
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения папок графа задач: {e}")
+            return {}
+    
+    def set_graph_folder(self, folder_path: str, account_type: str, mtime: float) -> bool:
+        """
+        Сохраняет время изменения папки встречи после ее сканирования.
+        
+        Args:
+            folder_path: Путь к папке встречи
+            account_type: Тип аккаунта
+            mtime: Время изменения папки
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO task_graph_folders (folder_path, account_type, mtime, scanned_at)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ''', (folder_path, account_type, mtime))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка сохранения папки графа задач: {e}")
+            return False
+    
+    def get_media_record(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Получает запись об обработанном медиа файле.
+        
+        Args:
+            file_path: Путь к исходному медиа файлу
+            
+        Returns:
+            Словарь с compressed_video/compressed_audio или None
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                row = conn.execute('''
+                    SELECT * FROM processed_media WHERE file_path = ? AND status = 'success'
+                ''', (file_path,)).fetchone()
+                return dict(row) if row else None
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения записи медиа файла: {e}")
+            return None
+    
+    def find_event_id_by_folder(self, folder_path: str) -> Optional[str]:
+        """
+        Находит event_id по папке встречи.
+        
+        Args:
+            folder_path: Путь к папке встречи
+            
+        Returns:
+            event_id или None
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute('''
+                    SELECT event_id FROM folder_creation_status
+                    WHERE folder_path = ? AND status = 'success'
+                    ORDER BY created_at DESC LIMIT 1
+                ''', (folder_path,)).fetchone()
+            if row:
+                return row[0]
+            return self._find_event_id_by_file_path(os.path.join(folder_path, ''))
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка поиска event_id по папке: {e}")
+            return None
+    
+    def update_notion_with_summary(self, event_id: str, summary_file: str, analysis_file: str = "") -> bool:
+        """
+        Добавляет саммари и анализ на страницу Notion события.
+        
+        Args:
+            event_id: ID события
+            summary_file: Путь к файлу саммари
+            analysis_file: Путь к файлу анализа
+            
+        Returns:
+            True если страница обновлена, False иначе
+        """
+        return self._update_notion_with_summary(event_id, summary_file, analysis_file)
+    
+    def update_notion_with_transcription(self, event_id: str, transcript_file: str) -> bool:
+        """
+        Добавляет транскрипцию на страницу Notion события.
+        
+        Args:
+            event_id: ID события
+            transcript_file: Путь к файлу транскрипции
+            
+        Returns:
+            True если страница обновлена, False иначе
+        """
+        return self._update_notion_with_transcription(event_id, transcript_file)
+    
+    # ===== ЗЕРКАЛО БАЗЫ NOTION =====
+    
+    def _init_notion_tables(self, cursor):
+        """
+        Создает таблицы зеркала базы встреч Notion, прогресса дозаписи блоков,
+        очереди изменений и хешей последней отправленной версии страниц.
+        
+        Args:
+            cursor: Курсор открытого соединения
+        """
+        # Страницы базы с полями, по которым ищутся существующие встречи
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS notion_pages_mirror (
+                page_id TEXT PRIMARY KEY,
+                database_id TEXT NOT NULL,
+                event_id TEXT,
+                title TEXT,
+                event_date TEXT,
+                calendar TEXT,
+                url TEXT,
+                last_edited_time TEXT,
+                synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Курсор инкрементальной синхронизации по каждой базе
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS notion_mirror_state (
+                database_id TEXT PRIMARY KEY,
+                last_edited_cursor TEXT,
+                full_synced_at REAL DEFAULT 0,
+                synced_at REAL DEFAULT 0
+            )
+        ''')
+        
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_notion_mirror_event ON notion_pages_mirror(database_id, event_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_notion_mirror_title_date ON notion_pages_mirror(database_id, title, event_date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_notion_mirror_calendar ON notion_pages_mirror(database_id, calendar)')
+        
+        # Прогресс пакетной дозаписи длинного контента (саммари, транскрипции) на страницы.
+        # Ключ включает хеш контента: у встречи с несколькими записями на одной странице
+        # несколько транскрипций, и прогресс каждой хранится отдельно.
+        # Таблица прежней схемы (ключ без хеша) пересоздается с переносом записей.
+        legacy_pk = [row[1] for row in cursor.execute("PRAGMA table_info(notion_append_progress)") if row[5]]
+        if legacy_pk and 'content_hash' not in legacy_pk:
+            cursor.execute('ALTER TABLE notion_append_progress RENAME TO notion_append_progress_legacy')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS notion_append_progress (
+                page_id TEXT NOT NULL,
+                content_key TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                blocks_appended INTEGER DEFAULT 0,
+                completed INTEGER DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (page_id, content_key, content_hash)
+            )
+        ''')
+        if legacy_pk and 'content_hash' not in legacy_pk:
+            cursor.execute('''
+                INSERT OR IGNORE INTO notion_append_progress
+                (page_id, content_key, content_hash, blocks_appended, completed, updated_at)
+                SELECT page_id, content_key, COALESCE(content_hash, ''), blocks_appended, completed, updated_at
+                FROM notion_append_progress_legacy
+            ''')
+            cursor.execute('DROP TABLE notion_append_progress_legacy')
+        
+        # Очередь изменений Notion: операции с одним coalesce_key объединяются, пока ждут отправки
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS notion_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                operation TEXT NOT NULL,
+                target TEXT NOT NULL,
+                coalesce_key TEXT NOT NULL,
+                payload TEXT DEFAULT '{}',
+                status TEXT DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                coalesced INTEGER DEFAULT 0,
+                next_attempt_at REAL DEFAULT 0,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        ''')
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_notion_outbox_pending ON notion_outbox(coalesce_key) WHERE status = 'pending'")
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_notion_outbox_status ON notion_outbox(status, next_attempt_at)')
+        
+        # Хеши последних отправленных свойств и блоков страниц (для отправки только изменений)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS notion_page_hashes (
+                page_id TEXT PRIMARY KEY,
+                property_hashes TEXT DEFAULT '{}',
+                block_hashes TEXT DEFAULT '[]',
+                source_hash TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+    
+    def upsert_mirror_pages(self, database_id: str, pages: List[Dict[str, Any]], replace: bool = False) -> bool:
+        """
+        Сохраняет страницы в локальное зеркало базы Notion.
+        
+        Args:
+            database_id: ID базы данных
+            pages: Страницы с полями page_id, event_id, title, event_date, calendar, url, last_edited_time
+            replace: Заменить все страницы базы (полная синхронизация, удаляет исчезнувшие страницы)
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                if replace:
+                    conn.execute('DELETE FROM notion_pages_mirror WHERE database_id = ?', (database_id,))
+                conn.executemany('''
+                    INSERT OR REPLACE INTO notion_pages_mirror
+                    (page_id, database_id, event_id, title, event_date, calendar, url, last_edited_time, synced_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', [
+                    (page['page_id'], database_id, page.get('event_id') or None, page.get('title') or '',
+                     page.get('event_date') or '', page.get('calendar') or '', page.get('url') or '',
+                     page.get('last_edited_time') or '')
+                    for page in pages
+                ])
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка сохранения зеркала Notion: {e}")
+            return False
+    
+    def find_mirror_page(self, database_id: str, event_id: str = None, title: str = None,
+                         event_date: str = None, calendar: str = None) -> Optional[Dict[str, Any]]:
+        """
+        Ищет страницу в локальном зеркале базы Notion.
+        
+        Args:
+            database_id: ID базы данных
+            event_id: ID события (ищется первым, если указан)
+            title: Название встречи
+            event_date: Дата встречи (YYYY-MM-DD)
+            calendar: Тип календаря
+            
+        Returns:
+            Словарь с данными страницы или None
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                if event_id:
+                    row = conn.execute('''
+                        SELECT * FROM notion_pages_mirror WHERE database_id = ? AND event_id = ?
+                        ORDER BY last_edited_time DESC LIMIT 1
+                    ''', (database_id, str(event_id))).fetchone()
+                    if row:
+                        return dict(row)
+                if not title:
+                    return None
+                conditions = ['database_id = ?', 'title = ?']
+                params = [database_id, title]
+                if event_date:
+                    conditions.append('event_date = ?')
+                    params.append(event_date)
+                if calendar:
+                    conditions.append('calendar = ?')
+                    params.append(calendar)
+                row = conn.execute(f'''
+                    SELECT * FROM notion_pages_mirror WHERE {' AND '.join(conditions)}
+                    ORDER BY event_date DESC, last_edited_time DESC LIMIT 1
+                ''', params).fetchone()
+                return dict(row) if row else None
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка поиска в зеркале Notion: {e}")
+            return None
+    
+    def get_mirror_state(self, database_id: str) -> Dict[str, Any]:
+        """
+        Получает состояние синхронизации зеркала базы Notion.
+        
+        Args:
+            database_id: ID базы данных
+            
+        Returns:
+            Словарь с last_edited_cursor, full_synced_at, synced_at и pages
+        """
+        state = {'last_edited_cursor': None, 'full_synced_at': 0, 'synced_at': 0, 'pages': 0}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute('''
+                    SELECT last_edited_cursor, full_synced_at, synced_at FROM notion_mirror_state WHERE database_id = ?
+                ''', (database_id,)).fetchone()
+                if row:
+                    state.update(last_edited_cursor=row[0], full_synced_at=row[1] or 0, synced_at=row[2] or 0)
+                state['pages'] = conn.execute('SELECT COUNT(*) FROM notion_pages_mirror WHERE database_id = ?',
+                                              (database_id,)).fetchone()[0]
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения состояния зеркала Notion: {e}")
+        return state
+    
+    def set_mirror_state(self, database_id: str, last_edited_cursor: str, synced_at: float,
+                         full_synced_at: float = None) -> bool:
+        """
+        Сохраняет состояние синхронизации зеркала базы Notion.
+        
+        Args:
+            database_id: ID базы данных
+            last_edited_cursor: Максимальный last_edited_time среди полученных страниц
+            synced_at: Время синхронизации
+            full_synced_at: Время полной синхронизации (None - не менять)
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('''
+                    INSERT INTO notion_mirror_state (database_id, last_edited_cursor, full_synced_at, synced_at)
+                    VALUES (?, ?, COALESCE(?, 0), ?)
+                    ON CONFLICT(database_id) DO UPDATE SET
+                        last_edited_cursor = excluded.last_edited_cursor,
+                        full_synced_at = COALESCE(?, notion_mirror_state.full_synced_at),
+                        synced_at = excluded.synced_at
+                ''', (database_id, last_edited_cursor, full_synced_at, synced_at, full_synced_at))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка сохранения состояния зеркала Notion: {e}")
+            return False
+    
+    def get_page_hashes(self, page_id: str) -> Dict[str, Any]:
+        """
+        Получает хеши последней отправленной версии страницы Notion.
+        
+        Args:
+            page_id: ID страницы
+            
+        Returns:
+            Словарь с properties {имя: хеш}, blocks [хеш] и source_hash
+        """
+        hashes = {'properties': {}, 'blocks': [], 'source_hash': None}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute('''
+                    SELECT property_hashes, block_hashes, source_hash FROM notion_page_hashes WHERE page_id = ?
+                ''', (page_id,)).fetchone()
+                if row:
+                    hashes['properties'] = json.loads(row[0] or '{}')
+                    hashes['blocks'] = json.loads(row[1] or '[]')
+                    hashes['source_hash'] = row[2]
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения хешей страницы Notion: {e}")
+        return hashes
+    
+    def save_page_hashes(self, page_id: str, properties: Dict[str, str] = None,
+                         blocks: List[str] = None, source_hash: str = None) -> bool:
+        """
+        Сохраняет хеши отправленной версии страницы Notion (None - оставить прежнее значение).
+        
+        Args:
+            page_id: ID страницы
+            properties: Хеши свойств {имя: хеш}
+            blocks: Хеши добавленных блоков
+            source_hash: Хеш исходных данных, по которым страница последний раз проверялась
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        properties_json = json.dumps(properties, ensure_ascii=False) if properties is not None else None
+        blocks_json = json.dumps(blocks) if blocks is not None else None
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('''
+                    INSERT INTO notion_page_hashes (page_id, property_hashes, block_hashes, source_hash)
+                    VALUES (?, COALESCE(?, '{}'), COALESCE(?, '[]'), ?)
+                    ON CONFLICT(page_id) DO UPDATE SET
+                        property_hashes = COALESCE(?, notion_page_hashes.property_hashes),
+                        block_hashes = COALESCE(?, notion_page_hashes.block_hashes),
+                        source_hash = COALESCE(?, notion_page_hashes.source_hash),
+                        updated_at = CURRENT_TIMESTAMP
+                ''', (page_id, properties_json, blocks_json, source_hash, properties_json, blocks_json, source_hash))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка сохранения хешей страницы Notion: {e}")
+            return False
+    
+    # ===== ОЧЕРЕДЬ ИЗМЕНЕНИЙ NOTION =====
+    
+    def enqueue_notion_operation(self, operation: str, target: str, payload: Dict[str, Any]) -> bool:
+        """
+        Записывает изменение Notion в очередь.
+        
+        Ожидающая upsert_meeting того же события заменяется новой (в Notion уйдут
+        только последние свойства). Дозаписи объединяются только для того же
+        файла: транскрипции и саммари разных записей одной встречи отправляются
+        каждая своей операцией.
+        
+        Args:
+            operation: Тип операции (upsert_meeting, append_summary, append_transcription)
+            target: Ключ события
+            payload: Данные операции (для дозаписей - transcript_file или summary_file)
+            
+        Returns:
+            True если операция записана, False иначе
+        """
+        try:
+            now = time.time()
+            coalesce_key = f"{operation}:{target}"
+            source_file = payload.get('transcript_file') or payload.get('summary_file')
+            if operation != 'upsert_meeting' and source_file:
+                coalesce_key += f":{source_file}"
+            data = json.dumps(payload, ensure_ascii=False,
+                              default=lambda value: value.isoformat() if hasattr(value, 'isoformat') else str(value))
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.execute('''
+                    UPDATE notion_outbox SET payload = ?, coalesced = coalesced + 1, updated_at = ?
+                    WHERE coalesce_key = ? AND status = 'pending'
+                ''', (data, now, coalesce_key))
+                if cursor.rowcount == 0:
+                    conn.execute('''
+                        INSERT INTO notion_outbox (operation, target, coalesce_key, payload, created_at, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    ''', (operation, target, coalesce_key, data, now, now))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка записи операции Notion в очередь: {e}")
+            return False
+    
+    def claim_notion_operations(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Забирает из очереди операции, готовые к выполнению, и помечает их как выполняемые.
+        
+        Args:
+            limit: Максимальное количество операций
+            
+        Returns:
+            Список операций (payload десериализован)
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                conn.execute('BEGIN IMMEDIATE')
+                rows = [dict(row) for row in conn.execute('''
+                    SELECT * FROM notion_outbox
+                    WHERE status = 'pending' AND next_attempt_at <= ?
+                    ORDER BY created_at LIMIT ?
+                ''', (time.time(), limit))]
+                conn.executemany("UPDATE notion_outbox SET status = 'running' WHERE id = ?",
+                                 [(row['id'],) for row in rows])
+                conn.commit()
+            for row in rows:
+                row['payload'] = json.loads(row['payload'] or '{}')
+            return rows
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения операций из очереди Notion: {e}")
+            return []
+    
+    def complete_notion_operation(self, operation_id: int) -> bool:
+        """
+        Удаляет выполненную операцию из очереди.
+        
+        Args:
+            operation_id: ID операции
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('DELETE FROM notion_outbox WHERE id = ?', (operation_id,))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка завершения операции очереди Notion: {e}")
+            return False
+    
+    def retry_notion_operation(self, operation_id: int, error: str, delay: float, give_up: bool = False) -> bool:
+        """
+        Возвращает неудавшуюся операцию в очередь с задержкой или помечает ее как проваленную.
+        
+        Если за время выполнения для того же события появилась более новая операция,
+        неудавшаяся удаляется - новая содержит актуальные данные.
+        
+        Args:
+            operation_id: ID операции
+            error: Текст ошибки
+            delay: Задержка до следующей попытки в секундах
+            give_up: Больше не повторять (статус failed)
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        try:
+            now = time.time()
+            with sqlite3.connect(self.db_path) as conn:
+                newer = conn.execute('''
+                    SELECT 1 FROM notion_outbox
+                    WHERE status = 'pending' AND coalesce_key = (SELECT coalesce_key FROM notion_outbox WHERE id = ?)
+                ''', (operation_id,)).fetchone()
+                if newer:
+                    conn.execute('DELETE FROM notion_outbox WHERE id = ?', (operation_id,))
+                else:
+                    conn.execute('''
+                        UPDATE notion_outbox
+                        SET status = ?, attempts = attempts + 1, last_error = ?, next_attempt_at = ?, updated_at = ?
+                        WHERE id = ?
+                    ''', ('failed' if give_up else 'pending', error, now + delay, now, operation_id))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка возврата операции в очередь Notion: {e}")
+            return False
+    
+    def reset_running_notion_operations(self) -> int:
+        """
+        Возвращает в очередь операции, выполнение которых прервалось (после перезапуска).
+        
+        Returns:
+            Количество возвращенных операций
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                running = conn.execute('''
+                    SELECT id, coalesce_key FROM notion_outbox WHERE status = 'running'
+                ''').fetchall()
+                for operation_id, coalesce_key in running:
+                    newer = conn.execute('''
+                        SELECT 1 FROM notion_outbox WHERE status = 'pending' AND coalesce_key = ?
+                    ''', (coalesce_key,)).fetchone()
+                    if newer:
+                        conn.execute('DELETE FROM notion_outbox WHERE id = ?', (operation_id,))
+                    else:
+                        conn.execute("UPDATE notion_outbox SET status = 'pending' WHERE id = ?", (operation_id,))
+                conn.commit()
+                return len(running)
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка сброса выполняемых операций очереди Notion: {e}")
+            return 0
+    
+    def get_notion_outbox_metrics(self) -> Dict[str, Any]:
+        """
+        Получает метрики очереди Notion.
+        
+        Returns:
+            Словарь с depth (ожидают и выполняются), failed, coalesced, lag (возраст
+            самой старой ожидающей операции в секундах) и by_operation
+        """
+        metrics = {'depth': 0, 'failed': 0, 'coalesced': 0, 'lag': 0.0, 'by_operation': {}}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                for operation, status, count, coalesced, oldest in conn.execute('''
+                    SELECT operation, status, COUNT(*), SUM(coalesced), MIN(created_at)
+                    FROM notion_outbox GROUP BY operation, status
+                '''):
+                    if status == 'failed':
+                        metrics['failed'] += count
+                        continue
+                    metrics['depth'] += count
+                    metrics['coalesced'] += coalesced or 0
+                    metrics['by_operation'][operation] = metrics['by_operation'].get(operation, 0) + count
+                    if oldest:
+                        metrics['lag'] = max(metrics['lag'], round(time.time() - oldest, 1))
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения метрик очереди Notion: {e}")
+        return metrics
+    
+    # ===== ИНКРЕМЕНТАЛЬНАЯ СИНХРОНИЗАЦИЯ КАЛЕНДАРЕЙ =====
+    
+    def _init_calendar_sync_tables(self, cursor):
+        """
+        Создает таблицы состояния синхронизации календарей, iCal лент и кэша событий.
+        
+        Args:
+            cursor: Курсор открытого соединения
+        """
+        # Токен синхронизации и окно, выгруженное последней полной синхронизацией
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS calendar_sync_state (
+                account_type TEXT NOT NULL,
+                calendar_id TEXT NOT NULL,
+                sync_token TEXT,
+                window_start TEXT,
+                window_end TEXT,
+                full_synced_at REAL DEFAULT 0,
+                synced_at REAL DEFAULT 0,
+                PRIMARY KEY (account_type, calendar_id)
+            )
+        ''')
+        
+        # События календаря в исходном формате провайдера (start_time - UTC ISO для выборки по окну)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS calendar_events_cache (
+                account_type TEXT NOT NULL,
+                calendar_id TEXT NOT NULL,
+                event_id TEXT NOT NULL,
+                start_time TEXT NOT NULL,
+                raw_event TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (account_type, calendar_id, event_id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_calendar_events_cache_start
+            ON calendar_events_cache(account_type, calendar_id, start_time)
+        ''')
+        
+        # Состояние загрузки iCal лент: валидаторы HTTP и хеш содержимого, по которому разобран кэш
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS calendar_feed_state (
+                account_type TEXT NOT NULL,
+                feed_id TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                window_start TEXT,
+                window_end TEXT,
+                parsed_at REAL DEFAULT 0,
+                checked_at REAL DEFAULT 0,
+                PRIMARY KEY (account_type, feed_id)
+            )
+        ''')
+    
+    def get_calendar_sync_state(self, account_type: str, calendar_id: str) -> Dict[str, Any]:
+        """
+        Получает состояние синхронизации календаря.
+        
+        Args:
+            account_type: Тип аккаунта
+            calendar_id: ID календаря
+            
+        Returns:
+            Словарь с sync_token, window_start, window_end, full_synced_at и synced_at
+        """
+        state = {'sync_token': None, 'window_start': None, 'window_end': None, 'full_synced_at': 0, 'synced_at': 0}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute('''
+                    SELECT sync_token, window_start, window_end, full_synced_at, synced_at
+                    FROM calendar_sync_state WHERE account_type = ? AND calendar_id = ?
+                ''', (account_type, calendar_id)).fetchone()
+                if row:
+                    state.update(sync_token=row[0], window_start=row[1], window_end=row[2],
+                                 full_synced_at=row[3] or 0, synced_at=row[4] or 0)
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения состояния синхронизации календаря: {e}")
+        return state
+    
+    def save_calendar_sync(self, account_type: str, calendar_id: str, events: List[Dict[str, Any]],
+                           removed_ids: List[str], sync_token: str, window_start: str = None,
+                           window_end: str = None, full: bool = False) -> bool:
+        """
+        Применяет результат синхронизации календаря к кэшу и сохраняет токен в одной транзакции.
+        
+        Args:
+            account_type: Тип аккаунта
+            calendar_id: ID календаря
+            events: Новые и измененные события {"event_id", "start_time", "raw_event"}
+            removed_ids: ID удаленных событий
+            sync_token: Токен для следующей инкрементальной синхронизации
+            window_start: Начало выгруженного окна (только при полной синхронизации)
+            window_end: Конец выгруженного окна (только при полной синхронизации)
+            full: Полная синхронизация (кэш календаря заменяется целиком)
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        try:
+            now = time.time()
+            with sqlite3.connect(self.db_path) as conn:
+                if full:
+                    conn.execute('DELETE FROM calendar_events_cache WHERE account_type = ? AND calendar_id = ?',
+                                 (account_type, calendar_id))
+                conn.executemany('''
+                    INSERT OR REPLACE INTO calendar_events_cache
+                    (account_type, calendar_id, event_id, start_time, raw_event, updated_at)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', [
+                    (account_type, calendar_id, event['event_id'], event['start_time'],
+                     json.dumps(event['raw_event'], ensure_ascii=False))
+                    for event in events
+                ])
+                conn.executemany('''
+                    DELETE FROM calendar_events_cache WHERE account_type = ? AND calendar_id = ? AND event_id = ?
+                ''', [(account_type, calendar_id, event_id) for event_id in removed_ids])
+                if full:
+                    conn.execute('''
+                        INSERT OR REPLACE INTO calendar_sync_state
+                        (account_type, calendar_id, sync_token, window_start, window_end, full_synced_at, synced_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ''', (account_type, calendar_id, sync_token, window_start, window_end, now, now))
+                else:
+                    conn.execute('''
+                        UPDATE calendar_sync_state SET sync_token = ?, synced_at = ?
+                        WHERE account_type = ? AND calendar_id = ?
+                    ''', (sync_token, now, account_type, calendar_id))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка сохранения синхронизации календаря: {e}")
+            return False
+    
+    def get_cached_calendar_events(self, account_type: str, calendar_id: str,
+                                   window_start: str, window_end: str) -> List[Dict[str, Any]]:
+        """
+        Получает события календаря из кэша в заданном окне.
+        
+        Args:
+            account_type: Тип аккаунта
+            calendar_id: ID календаря
+            window_start: Начало окна (UTC ISO)
+            window_end: Конец окна (UTC ISO)
+            
+        Returns:
+            Список событий в исходном формате провайдера, по возрастанию времени начала
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute('''
+                    SELECT raw_event FROM calendar_events_cache
+                    WHERE account_type = ? AND calendar_id = ? AND start_time >= ? AND start_time < ?
+                    ORDER BY start_time
+                ''', (account_type, calendar_id, window_start, window_end)).fetchall()
+                return [json.loads(row[0]) for row in rows]
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка чтения кэша событий календаря: {e}")
+            return []
+    
+    def reset_calendar_sync(self, account_type: str, calendar_id: str) -> bool:
+        """
+        Сбрасывает токен синхронизации календаря (следующая синхронизация будет полной).
+        
+        Args:
+            account_type: Тип аккаунта
+            calendar_id: ID календаря
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('''
+                    UPDATE calendar_sync_state SET sync_token = NULL, full_synced_at = 0
+                    WHERE account_type = ? AND calendar_id = ?
+                ''', (account_type, calendar_id))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка сброса синхронизации календаря: {e}")
+            return False
+    
+    def get_calendar_feed_state(self, account_type: str, feed_id: str) -> Dict[str, Any]:
+        """
+        Получает состояние загрузки iCal ленты.
+        
+        Args:
+            account_type: Тип аккаунта
+            feed_id: ID ленты
+            
+        Returns:
+            Словарь с etag, last_modified, content_hash, window_start, window_end, parsed_at и checked_at
+        """
+        state = {'etag': None, 'last_modified': None, 'content_hash': None,
+                 'window_start': None, 'window_end': None, 'parsed_at': 0, 'checked_at': 0}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute('''
+                    SELECT etag, last_modified, content_hash, window_start, window_end, parsed_at, checked_at
+                    FROM calendar_feed_state WHERE account_type = ? AND feed_id = ?
+                ''', (account_type, feed_id)).fetchone()
+                if row:
+                    state.update(etag=row[0], last_modified=row[1], content_hash=row[2], window_start=row[3],
+                                 window_end=row[4], parsed_at=row[5] or 0, checked_at=row[6] or 0)
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения состояния iCal ленты: {e}")
+        return state
+    
+    def save_calendar_feed(self, account_type: str, feed_id: str, events: List[Dict[str, Any]],
+                           etag: str, last_modified: str, content_hash: str,
+                           window_start: str, window_end: str) -> bool:
+        """
+        Заменяет кэш событий разобранной iCal ленты и сохраняет ее состояние в одной транзакции.
+        
+        Args:
+            account_type: Тип аккаунта
+            feed_id: ID ленты
+            events: События {"event_id", "start_time", "raw_event"}
+            etag: Заголовок ETag ответа
+            last_modified: Заголовок Last-Modified ответа
+            content_hash: Хеш содержимого ленты
+            window_start: Начало разобранного окна
+            window_end: Конец разобранного окна
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        try:
+            now = time.time()
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('DELETE FROM calendar_events_cache WHERE account_type = ? AND calendar_id = ?',
+                             (account_type, feed_id))
+                conn.executemany('''
+                    INSERT OR REPLACE INTO calendar_events_cache
+                    (account_type, calendar_id, event_id, start_time, raw_event, updated_at)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', [
+                    (account_type, feed_id, event['event_id'], event['start_time'],
+                     json.dumps(event['raw_event'], ensure_ascii=False))
+                    for event in events
+                ])
+                conn.execute('''
+                    INSERT OR REPLACE INTO calendar_feed_state
+                    (account_type, feed_id, etag, last_modified, content_hash, window_start, window_end, parsed_at, checked_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (account_type, feed_id, etag, last_modified, content_hash, window_start, window_end, now, now))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка сохранения событий iCal ленты: {e}")
+            return False
+    
+    def touch_calendar_feed(self, account_type: str, feed_id: str, etag: str = None,
+                            last_modified: str = None) -> bool:
+        """
+        Отмечает проверку iCal ленты без изменений и обновляет валидаторы HTTP.
+        
+        Args:
+            account_type: Тип аккаунта
+            feed_id: ID ленты
+            etag: Новый ETag (None - не менять)
+            last_modified: Новый Last-Modified (None - не менять)
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('''
+                    UPDATE calendar_feed_state
+                    SET etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified), checked_at = ?
+                    WHERE account_type = ? AND feed_id = ?
+                ''', (etag, last_modified, time.time(), account_type, feed_id))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка обновления состояния iCal ленты: {e}")
+            return False
+    
+    # ===== КЭШ САММАРИ =====
+    
+    def _init_summary_cache_tables(self, cursor):
+        """
+        Создает таблицу кэша ответов модели для саммари.
+        
+        Args:
+            cursor: Курсор открытого соединения
+        """
+        # Ключ - хеш (нормализованный текст, версия промпта, модель, температура)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS summary_cache (
+                cache_key TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                model TEXT NOT NULL,
+                temperature REAL,
+                output TEXT NOT NULL,
+                prompt_tokens INTEGER DEFAULT 0,
+                completion_tokens INTEGER DEFAULT 0,
+                total_tokens INTEGER DEFAULT 0,
+                hits INTEGER DEFAULT 0,
+                created_at REAL DEFAULT 0,
+                last_hit_at REAL DEFAULT 0
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_summary_cache_content ON summary_cache(content_hash)')
+        
+        # Комплексное саммари папки и набор хешей транскрипций, по которому оно создано
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS complex_summaries (
+                folder_path TEXT PRIMARY KEY,
+                inputs_hash TEXT NOT NULL,
+                input_files TEXT,
+                summary_file TEXT,
+                analysis_file TEXT,
+                created_at REAL DEFAULT 0
+            )
+        ''')
+        
+        # Расход токенов каждого запроса к модели (оценка промпта до отправки и фактический)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS llm_usage (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                purpose TEXT NOT NULL,
+                model TEXT NOT NULL,
+                estimated_prompt_tokens INTEGER DEFAULT 0,
+                prompt_tokens INTEGER DEFAULT 0,
+                completion_tokens INTEGER DEFAULT 0,
+                total_tokens INTEGER DEFAULT 0,
+                truncated INTEGER DEFAULT 0,
+                created_at REAL DEFAULT 0
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_llm_usage_created ON llm_usage(created_at)')
+        
+        # Пакеты Batch API и запросы в них (custom_id - ключ кэша саммари)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS llm_batches (
+                batch_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                input_file TEXT,
+                request_count INTEGER DEFAULT 0,
+                completed_count INTEGER DEFAULT 0,
+                failed_count INTEGER DEFAULT 0,
+                created_at REAL DEFAULT 0,
+                updated_at REAL DEFAULT 0
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS llm_batch_requests (
+                batch_id TEXT NOT NULL,
+                custom_id TEXT NOT NULL,
+                request TEXT,
+                PRIMARY KEY (batch_id, custom_id)
+            )
+        ''')
+    
+    def get_cached_summary(self, cache_key: str, count_hit: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Получает ответ модели из кэша и учитывает попадание.
+        
+        Args:
+            cache_key: Ключ кэша
+            count_hit: Учитывать ли попадание (False - только проверка наличия)
+            
+        Returns:
+            Словарь с output, model, prompt_tokens, completion_tokens, total_tokens и hits или None
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute('''
+                    SELECT output, model, prompt_tokens, completion_tokens, total_tokens, hits
+                    FROM summary_cache WHERE cache_key = ?
+                ''', (cache_key,)).fetchone()
+                if not row:
+                    return None
+                hits = row[5] or 0
+                if count_hit:
+                    conn.execute('UPDATE summary_cache SET hits = hits + 1, last_hit_at = ? WHERE cache_key = ?',
+                                 (time.time(), cache_key))
+                    conn.commit()
+                    hits += 1
+                return {'output': row[0], 'model': row[1], 'prompt_tokens': row[2] or 0,
+                        'completion_tokens': row[3] or 0, 'total_tokens': row[4] or 0, 'hits': hits}
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка чтения кэша саммари: {e}")
+            return None
+    
+    def save_cached_summary(self, cache_key: str, content_hash: str, prompt_version: str, model: str,
+                            temperature: float, output: str, usage: Dict[str, int] = None) -> bool:
+        """
+        Сохраняет ответ модели и расход токенов в кэш.
+        
+        Args:
+            cache_key: Ключ кэша
+            content_hash: Хеш нормализованного текста транскрипции
+            prompt_version: Версия шаблона промпта
+            model: Модель
+            temperature: Температура
+            output: Ответ модели
+            usage: Расход токенов {"prompt_tokens", "completion_tokens", "total_tokens"}
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        usage = usage or {}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO summary_cache
+                    (cache_key, content_hash, prompt_version, model, temperature, output,
+                     prompt_tokens, completion_tokens, total_tokens, hits, created_at, last_hit_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, 0)
+                ''', (cache_key, content_hash, prompt_version, model, temperature, output,
+                      usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0),
+                      usage.get('total_tokens', 0), time.time()))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка записи кэша саммари: {e}")
+            return False
+    
+    def get_summary_cache_stats(self) -> Dict[str, int]:
+        """
+        Возвращает статистику кэша саммари.
+        
+        Returns:
+            Словарь с entries, hits и saved_tokens (токены, не потраченные благодаря попаданиям)
+        """
+        stats = {'entries': 0, 'hits': 0, 'saved_tokens': 0}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute('''
+                    SELECT COUNT(*), COALESCE(SUM(hits), 0), COALESCE(SUM(hits * total_tokens), 0)
+                    FROM summary_cache
+                ''').fetchone()
+                stats.update(entries=row[0], hits=row[1], saved_tokens=row[2])
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения статистики кэша саммари: {e}")
+        return stats
+    
+    def get_complex_summary(self, folder_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Получает последнее комплексное саммари папки.
+        
+        Args:
+            folder_path: Путь к папке встречи
+            
+        Returns:
+            Словарь с inputs_hash, input_files, summary_file, analysis_file и created_at или None
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute('''
+                    SELECT inputs_hash, input_files, summary_file, analysis_file, created_at
+                    FROM complex_summaries WHERE folder_path = ?
+                ''', (folder_path,)).fetchone()
+                if not row:
+                    return None
+                return {'inputs_hash': row[0], 'input_files': json.loads(row[1] or '{}'),
+                        'summary_file': row[2], 'analysis_file': row[3], 'created_at': row[4] or 0}
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения комплексного саммари: {e}")
+            return None
+    
+    def save_complex_summary(self, folder_path: str, inputs_hash: str, input_files: Dict[str, str],
+                             summary_file: str, analysis_file: str) -> bool:
+        """
+        Сохраняет комплексное саммари папки и набор входных транскрипций.
+        
+        Args:
+            folder_path: Путь к папке встречи
+            inputs_hash: Хеш набора хешей транскрипций
+            input_files: Имя файла транскрипции -> хеш содержимого
+            summary_file: Файл саммари
+            analysis_file: Файл анализа
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO complex_summaries
+                    (folder_path, inputs_hash, input_files, summary_file, analysis_file, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (folder_path, inputs_hash, json.dumps(input_files, ensure_ascii=False),
+                      summary_file, analysis_file, time.time()))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка сохранения комплексного саммари: {e}")
+            return False
+    
+    def record_llm_usage(self, purpose: str, model: str, estimated_prompt_tokens: int,
+                         usage: Dict[str, int] = None, truncated: bool = False) -> bool:
+        """
+        Записывает расход токенов запроса к модели.
+        
+        Args:
+            purpose: Назначение запроса (summary, chunk, merge, complex_summary)
+            model: Модель
+            estimated_prompt_tokens: Оценка токенов промпта до отправки
+            usage: Фактический расход {"prompt_tokens", "completion_tokens", "total_tokens"}
+            truncated: Было ли содержимое обрезано под окно модели
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        usage = usage or {}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('''
+                    INSERT INTO llm_usage
+                    (purpose, model, estimated_prompt_tokens, prompt_tokens, completion_tokens,
+                     total_tokens, truncated, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (purpose, model, estimated_prompt_tokens, usage.get('prompt_tokens', 0),
+                      usage.get('completion_tokens', 0), usage.get('total_tokens', 0),
+                      1 if truncated else 0, time.time()))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка записи расхода токенов: {e}")
+            return False
+    
+    def get_llm_usage_stats(self, since: float = 0) -> Dict[str, Dict[str, int]]:
+        """
+        Возвращает расход токенов по назначению запросов.
+        
+        Args:
+            since: Учитывать запросы начиная с этого времени (timestamp)
+            
+        Returns:
+            Назначение -> {"requests", "prompt_tokens", "completion_tokens", "truncated"}
+        """
+        stats = {}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute('''
+                    SELECT purpose, COUNT(*), COALESCE(SUM(prompt_tokens), 0),
+                           COALESCE(SUM(completion_tokens), 0), COALESCE(SUM(truncated), 0)
+                    FROM llm_usage WHERE created_at >= ? GROUP BY purpose
+                ''', (since,)).fetchall()
+                for purpose, requests, prompt_tokens, completion_tokens, truncated in rows:
+                    stats[purpose] = {'requests': requests, 'prompt_tokens': prompt_tokens,
+                                      'completion_tokens': completion_tokens, 'truncated': truncated}
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения расхода токенов: {e}")
+        return stats
+    
+    def save_llm_batch(self, batch_id: str, input_file: str, requests: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Сохраняет отправленный пакет Batch API и его запросы.
+        
+        Args:
+            batch_id: ID пакета
+            input_file: Локальный JSONL файл пакета
+            requests: custom_id -> описание запроса (хеш содержимого, версия промпта, модель, ...)
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        try:
+            now = time.time()
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO llm_batches
+                    (batch_id, status, input_file, request_count, completed_count, failed_count, created_at, updated_at)
+                    VALUES (?, 'submitted', ?, ?, 0, 0, ?, ?)
+                ''', (batch_id, input_file, len(requests), now, now))
+                conn.executemany(
+                    'INSERT OR REPLACE INTO llm_batch_requests (batch_id, custom_id, request) VALUES (?, ?, ?)',
+                    [(batch_id, custom_id, json.dumps(request, ensure_ascii=False))
+                     for custom_id, request in requests.items()]
+                )
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка сохранения пакета {batch_id}: {e}")
+            return False
+    
+    def get_active_llm_batches(self) -> List[Dict[str, Any]]:
+        """
+        Возвращает пакеты Batch API, результаты которых еще не получены.
+        
+        Returns:
+            Список {"batch_id", "status", "input_file", "request_count", "created_at"}
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute('''
+                    SELECT batch_id, status, input_file, request_count, created_at FROM llm_batches
+                    WHERE status NOT IN ('completed', 'failed', 'expired', 'cancelled')
+                    ORDER BY created_at
+                ''').fetchall()
+                return [{'batch_id': row[0], 'status': row[1], 'input_file': row[2],
+                         'request_count': row[3], 'created_at': row[4]} for row in rows]
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения пакетов: {e}")
+            return []
+    
+    def get_llm_batch_requests(self, batch_id: str = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Возвращает запросы пакета или всех активных пакетов.
+        
+        Args:
+            batch_id: ID пакета (None - запросы всех активных пакетов)
+            
+        Returns:
+            custom_id -> описание запроса
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                if batch_id:
+                    rows = conn.execute('SELECT custom_id, request FROM llm_batch_requests WHERE batch_id = ?',
+                                        (batch_id,)).fetchall()
+                else:
+                    rows = conn.execute('''
+                        SELECT r.custom_id, r.request FROM llm_batch_requests r
+                        JOIN llm_batches b ON b.batch_id = r.batch_id
+                        WHERE b.status NOT IN ('completed', 'failed', 'expired', 'cancelled')
+                    ''').fetchall()
+                return {row[0]: json.loads(row[1] or '{}') for row in rows}
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка получения запросов пакета: {e}")
+            return {}
+    
+    def update_llm_batch(self, batch_id: str, status: str, completed_count: int = 0, failed_count: int = 0) -> bool:
+        """
+        Обновляет статус пакета Batch API.
+        
+        Args:
+            batch_id: ID пакета
+            status: Статус (submitted, in_progress, completed, failed, expired, cancelled)
+            completed_count: Количество успешных запросов
+            failed_count: Количество неудачных запросов
+            
+        Returns:
+            True если успешно, False иначе
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('''
+                    UPDATE llm_batches SET status = ?, completed_count = ?, failed_count = ?, updated_at = ?
+                    WHERE batch_id = ?
+                ''', (status, completed_count, failed_count, time.time(), batch_id))
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка обновления пакета {batch_id}: {e}")
+            return False
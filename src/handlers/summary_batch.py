@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Пакетная (Batch API) генерация саммари для ночных догрузок.
+
+Запросы, которые обычный путь отправил бы по одному, собираются в JSONL файл
+и отправляются одним пакетом OpenAI Batch API (дешевле и вне интерактивных
+лимитов). Ответы сохраняются в кэш саммари под теми же ключами, после чего
+обычный путь SummaryHandler создает _summary.txt, _analysis.json и записи в БД
+без запросов к API. Длинные транскрипции (map-reduce) требуют нескольких
+раундов: каждый раунд отправляет запросы, для которых готовы входные данные.
+
+Пакеты и их запросы хранятся в SQLite, поэтому прерванный запуск продолжает
+ожидание уже отправленных пакетов. Свежие встречи обрабатываются обычным путем.
+"""
+
+import os
+import json
+import time
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Tuple, Optional
+
+from .summary_handler import (
+    SummaryHandler,
+    normalize_transcript,
+    SUMMARY_SYSTEM_PROMPT,
+    SUMMARY_PROMPT_TEMPLATE,
+    COMPLEX_SYSTEM_PROMPT,
+    COMPLEX_PROMPT_TEMPLATE,
+)
+from .map_reduce_summarizer import MAX_REDUCE_LEVELS
+from .llm_executor import get_llm_executor
+
+
+BATCH_ENDPOINT = '/v1/chat/completions'
+BATCH_COMPLETION_WINDOW = '24h'
+
+# Статусы Batch API, после которых результаты больше не изменятся
+BATCH_FINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+# Заглушка ответа, который еще не получен: запросы, зависящие от нее, откладываются до следующего раунда
+_DEFERRED = "\x00deferred\x00"
+
+
+class SummaryBatchRunner:
+    """Догрузка саммари через OpenAI Batch API."""
+
+    def __init__(self, config_manager, summary_handler: SummaryHandler = None, logger=None):
+        """
+        Инициализация.
+
+        Args:
+            config_manager: Менеджер конфигурации
+            summary_handler: Обработчик саммари (по умолчанию создается новый)
+            logger: Логгер
+        """
+        self.config_manager = config_manager
+        self.logger = logger or logging.getLogger(__name__)
+        self.summary_handler = summary_handler or SummaryHandler(config_manager, logger=self.logger)
+        self.state_manager = self.summary_handler.state_manager
+        self.openai_config = self.summary_handler.get_openai_config()
+
+        self.poll_interval = self.openai_config.get('batch_poll_interval', 60)
+        self.max_requests = max(1, self.openai_config.get('batch_max_requests', 5000))
+        self.batch_dir = self.openai_config.get('batch_dir', 'data/batches')
+
+        # Ключи запросов, завершившихся ошибкой в этом запуске: создаются обычным путем
+        self._failed = set()
+        self.stats = {"rounds": 0, "batches": 0, "requests": 0, "completed": 0, "failed": 0,
+                      "processed": 0, "errors": 0}
+
+    def run(self, folders: List[Tuple[str, str]], max_wait: float = 0) -> Dict[str, Any]:
+        """
+        Создает саммари для папок через пакеты и раскладывает результаты по файлам.
+
+        Args:
+            folders: Список (путь к папке встречи, тип аккаунта)
+            max_wait: Максимальное время ожидания пакетов в секундах (0 - до завершения)
+
+        Returns:
+            Статистика {"rounds", "batches", "requests", "completed", "failed",
+            "processed", "errors", "complete"}
+        """
+        if not self.openai_config.get('api_key'):
+            self.logger.error("❌ OpenAI API не настроен, пакетная обработка невозможна")
+            return dict(self.stats, complete=False)
+        if not self.summary_handler.summary_cache_enabled or not self.state_manager:
+            self.logger.error("❌ Пакетная обработка требует кэша саммари (SUMMARY_CACHE_ENABLED=true)")
+            return dict(self.stats, complete=False)
+
+        deadline = time.time() + max_wait if max_wait else None
+        # Раундов не больше глубины map-reduce: фрагменты, объединения, итог, комплексное саммари
+        for _ in range(MAX_REDUCE_LEVELS + 3):
+            # Сначала дожидаемся уже отправленных пакетов (в том числе с прошлого запуска)
+            if not self.wait_for_batches(deadline):
+                self.logger.info("⏳ Пакеты еще обрабатываются, запустите догрузку повторно позже")
+                return dict(self.stats, complete=False)
+
+            missing = self.plan(folders)
+            if not missing:
+                break
+            self.stats["rounds"] += 1
+            self.logger.info(f"📦 Раунд {self.stats['rounds']}: {len(missing)} запросов в пакет")
+            items = list(missing.items())
+            for start in range(0, len(items), self.max_requests):
+                if not self.submit(dict(items[start:start + self.max_requests])):
+                    return dict(self.stats, complete=False)
+
+        # Все ответы в кэше: обычный путь записывает файлы и БД без запросов к API
+        for folder_path, account_type in folders:
+            result = self.summary_handler._process_folder_summaries(folder_path, account_type)
+            self.stats["processed"] += result.get("processed", 0)
+            self.stats["errors"] += result.get("errors", 0)
+        return dict(self.stats, complete=True)
+
+    def plan(self, folders: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Находит запросы, которые нужно отправить в следующем пакете.
+
+        Обходит саммари так же, как обычный путь, но вместо запросов к API берет
+        ответы из кэша; отсутствующие ответы собираются, а зависящие от них
+        запросы откладываются до следующего раунда.
+
+        Args:
+            folders: Список (путь к папке встречи, тип аккаунта)
+
+        Returns:
+            Ключ кэша -> запрос (_build_summary_request)
+        """
+        handler = self.summary_handler
+        in_flight = self.state_manager.get_llm_batch_requests()
+        missing: Dict[str, Dict[str, Any]] = {}
+
+        def generate(system_prompt: str, prompt_template: str, content: str, max_tokens: int) -> str:
+            if _DEFERRED in content:
+                return _DEFERRED
+            request = handler._build_summary_request(self.openai_config, system_prompt, prompt_template,
+                                                     content, max_tokens)
+            cached = self.state_manager.get_cached_summary(request['cache_key'], count_hit=False)
+            if cached:
+                return cached['output']
+            key = request['cache_key']
+            if key not in in_flight and key not in self._failed:
+                missing[key] = request
+            return _DEFERRED
+
+        summarizer = handler._get_summarizer(self.openai_config, generate)
+        complex_enabled = self.config_manager.get_summary_config().get('enable_complex_summary', False)
+
+        for folder_path, _ in folders:
+            transcripts = []
+            for root, _, files in os.walk(folder_path):
+                for file in sorted(files):
+                    if file.lower().endswith('_transcript.txt'):
+                        path = os.path.join(root, file)
+                        try:
+                            with open(path, 'r', encoding='utf-8') as f:
+                                content = handler._strip_transcript_header(f.read())
+                        except Exception as e:
+                            self.logger.error(f"❌ Ошибка чтения {path}: {e}")
+                            continue
+                        transcripts.append({"file": file, "content": content, "path": path})
+
+            for transcript in transcripts:
+                if handler._should_process_transcript_file(transcript['path']):
+                    summarizer.summarize(normalize_transcript(transcript['content']), SUMMARY_SYSTEM_PROMPT,
+                                         SUMMARY_PROMPT_TEMPLATE, max_tokens=1000)
+
+            if complex_enabled and len(transcripts) > 1:
+                _, inputs_hash = handler._complex_inputs_hash(transcripts, self.openai_config)
+                previous = self.state_manager.get_complex_summary(folder_path)
+                if previous and previous['inputs_hash'] == inputs_hash:
+                    continue
+                file_summaries = [
+                    f"=== {t['file']} ===\n{handler._get_file_summary_text(t, summarizer).strip()}"
+                    for t in transcripts
+                ]
+                summarizer.reduce(file_summaries, COMPLEX_SYSTEM_PROMPT, COMPLEX_PROMPT_TEMPLATE, max_tokens=2000)
+
+        return missing
+
+    def submit(self, requests: Dict[str, Dict[str, Any]]) -> Optional[str]:
+        """
+        Записывает запросы в JSONL файл и отправляет пакет.
+
+        Args:
+            requests: Ключ кэша -> запрос
+
+        Returns:
+            ID пакета или None при ошибке
+        """
+        try:
+            os.makedirs(self.batch_dir, exist_ok=True)
+            input_file = os.path.join(
+                self.batch_dir, f"summary_batch_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.jsonl"
+            )
+            with open(input_file, 'w', encoding='utf-8') as f:
+                for custom_id, request in requests.items():
+                    f.write(json.dumps({
+                        "custom_id": custom_id,
+                        "method": "POST",
+                        "url": BATCH_ENDPOINT,
+                        "body": {
+                            "model": request['model'],
+                            "messages": request['messages'],
+                            "temperature": request['temperature'],
+                            "max_tokens": request['max_tokens']
+                        }
+                    }, ensure_ascii=False) + "\n")
+
+            client = get_llm_executor(self.config_manager, self.logger).get_client()
+            with open(input_file, 'rb') as f:
+                uploaded = client.files.create(file=f, purpose='batch')
+            batch = client.batches.create(input_file_id=uploaded.id, endpoint=BATCH_ENDPOINT,
+                                          completion_window=BATCH_COMPLETION_WINDOW,
+                                          metadata={"source": "meeting-automation-summaries"})
+
+            # В БД хранится все, кроме текста сообщений: он есть в JSONL файле
+            self.state_manager.save_llm_batch(batch.id, input_file, {
+                custom_id: {key: value for key, value in request.items() if key != 'messages'}
+                for custom_id, request in requests.items()
+            })
+            self.stats["batches"] += 1
+            self.stats["requests"] += len(requests)
+            self.logger.info(f"📤 Пакет {batch.id} отправлен: {len(requests)} запросов ({input_file})")
+            return batch.id
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка отправки пакета: {e}")
+            return None
+
+    def wait_for_batches(self, deadline: float = None) -> bool:
+        """
+        Ожидает завершения отправленных пакетов и сохраняет их результаты.
+
+        Args:
+            deadline: Время (timestamp), после которого ожидание прекращается
+
+        Returns:
+            True если активных пакетов не осталось
+        """
+        client = None
+        while True:
+            active = self.state_manager.get_active_llm_batches()
+            if not active:
+                return True
+            client = client or get_llm_executor(self.config_manager, self.logger).get_client()
+            for record in active:
+                try:
+                    batch = client.batches.retrieve(record['batch_id'])
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Не удалось получить статус пакета {record['batch_id']}: {e}")
+                    continue
+                if batch.status in BATCH_FINAL_STATUSES:
+                    self._apply_results(client, batch)
+                elif batch.status != record['status']:
+                    self.state_manager.update_llm_batch(batch.id, batch.status)
+                    self.logger.info(f"⏳ Пакет {batch.id}: {batch.status}")
+
+            if not self.state_manager.get_active_llm_batches():
+                return True
+            if deadline and time.time() + self.poll_interval > deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+    def _apply_results(self, client, batch) -> Tuple[int, int]:
+        """
+        Сохраняет ответы завершенного пакета в кэш саммари и учет токенов.
+
+        Args:
+            client: Клиент openai
+            batch: Пакет Batch API
+
+        Returns:
+            Кортеж (успешных, неудачных) запросов
+        """
+        requests = self.state_manager.get_llm_batch_requests(batch.id)
+        completed = set()
+        for file_id in (batch.output_file_id, getattr(batch, 'error_file_id', None)):
+            if not file_id:
+                continue
+            try:
+                lines = client.files.content(file_id).text.splitlines()
+            except Exception as e:
+                self.logger.error(f"❌ Ошибка загрузки результатов пакета {batch.id}: {e}")
+                continue
+            for line in lines:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                request = requests.get(item.get('custom_id'))
+                response = item.get('response') or {}
+                if request is None or response.get('status_code') != 200:
+                    continue
+                body = response.get('body') or {}
+                text = body['choices'][0]['message']['content']
+                usage = {key: (body.get('usage') or {}).get(key, 0)
+                         for key in ('prompt_tokens', 'completion_tokens', 'total_tokens')}
+                self.state_manager.save_cached_summary(item['custom_id'], request['content_hash'],
+                                                       request['prompt_version'], request['model'],
+                                                       request['temperature'], text, usage)
+                self.state_manager.record_llm_usage(f"batch_{request['purpose']}", request['model'],
+                                                    request['prompt_tokens'], usage, request['truncated'])
+                completed.add(item['custom_id'])
+
+        failed = set(requests) - completed
+        self._failed |= failed
+        self.stats["completed"] += len(completed)
+        self.stats["failed"] += len(failed)
+        self.state_manager.update_llm_batch(batch.id, batch.status, len(completed), len(failed))
+        if failed:
+            self.logger.warning(f"⚠️ Пакет {batch.id} ({batch.status}): {len(completed)} ответов, "
+                                f"{len(failed)} запросов будут выполнены обычным путем")
+        else:
+            self.logger.info(f"✅ Пакет {batch.id} завершен: {len(completed)} ответов")
+        return len(completed), len(failed)
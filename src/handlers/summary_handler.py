@@ -4,10 +4,74 @@
 """
 
 import os
+import re
+import json
+import hashlib
 import logging
-from typing import Dict, Any, List
+import unicodedata
+from typing import Dict, Any, List, Optional
 from .base_handler import BaseHandler
 from .process_handler import ProcessHandler
+from .map_reduce_summarizer import MapReduceSummarizer, CHUNK_PROMPT_TEMPLATE, MERGE_PROMPT_TEMPLATE
+from .llm_executor import get_llm_executor
+
+
+SUMMARY_SYSTEM_PROMPT = "Ты - помощник по анализу встреч. Создавай краткие, структурированные саммари на русском языке."
+
+SUMMARY_PROMPT_TEMPLATE = """Проанализируй следующую транскрипцию встречи и создай краткое саммари:
+
+Транскрипция:
+{content}
+
+Создай структурированное саммари на русском языке, включающее:
+1. Основные темы обсуждения
+2. Ключевые решения
+3. Действия и задачи
+4. Важные моменты
+
+Саммари:"""
+
+COMPLEX_SYSTEM_PROMPT = "Ты - эксперт по анализу встреч. Создавай детальные, структурированные комплексные саммари на русском языке."
+
+COMPLEX_PROMPT_TEMPLATE = """Ниже саммари отдельных записей встреч. Проанализируй их и создай комплексное саммари:
+
+{content}
+
+Создай детальное комплексное саммари на русском языке, включающее:
+1. Общие темы и тенденции
+2. Ключевые решения и их взаимосвязи
+3. Действия и задачи по всем встречам
+4. Повторяющиеся проблемы и их решения
+5. Прогресс и достижения
+6. Инсайты и рекомендации
+
+Комплексное саммари:"""
+
+# Назначение запроса по шаблону (для учета расхода токенов)
+PROMPT_PURPOSES = {
+    SUMMARY_PROMPT_TEMPLATE: 'summary',
+    COMPLEX_PROMPT_TEMPLATE: 'complex_summary',
+    CHUNK_PROMPT_TEMPLATE: 'chunk',
+    MERGE_PROMPT_TEMPLATE: 'merge',
+}
+
+
+def normalize_transcript(text: str) -> str:
+    """
+    Нормализует текст транскрипции для ключа кэша и промпта.
+    
+    Одинаковый текст, сохраненный с другими переводами строк, лишними пробелами
+    или пустыми строками, дает одинаковый результат.
+    
+    Args:
+        text: Текст транскрипции
+        
+    Returns:
+        Нормализованный текст
+    """
+    text = unicodedata.normalize('NFC', text).replace('\r\n', '\n').replace('\r', '\n')
+    text = '\n'.join(' '.join(line.split()) for line in text.split('\n'))
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
 
 
 class SummaryHandler(ProcessHandler):
@@ -17,11 +81,15 @@ class SummaryHandler(ProcessHandler):
         super().__init__(config_manager, logger)
         self.transcription_handler = transcription_handler
         try:
-            from prompt_manager import PromptManager
+            try:
+                from ..prompt_manager import PromptManager
+            except ImportError:
+                # handlers импортирован как пакет верхнего уровня (src в sys.path)
+                from prompt_manager import PromptManager
             self.prompt_manager = PromptManager(config_manager)
-        except ImportError:
+        except ImportError as e:
             self.prompt_manager = None
-            self.logger.warning("⚠️ PromptManager не найден, используется базовая функциональность")
+            self.logger.warning(f"⚠️ PromptManager не найден, подсчет токенов промпта отключен: {e}")
         
         # Инициализируем StateManager для отслеживания обработанных саммари
         try:
@@ -31,6 +99,10 @@ class SummaryHandler(ProcessHandler):
         except Exception as e:
             self.logger.warning(f"⚠️ StateManager недоступен в SummaryHandler: {e}")
             self.state_manager = None
+        
+        openai_config = self.get_openai_config()
+        self.summary_cache_enabled = openai_config.get('summary_cache_enabled', True)
+        self.summary_prompt_version = str(openai_config.get('summary_prompt_version', '1'))
     
     def process(self, account_type: str = 'both') -> Dict[str, Any]:
         """
@@ -106,10 +178,10 @@ class SummaryHandler(ProcessHandler):
         try:
             result = {"account": account_type, "folder": folder_path, "processed": 0, "errors": 0, "files": []}
             
-            # Ищем файлы транскрипций
+            # Ищем файлы транскрипций (в постоянном порядке: от него зависит промпт комплексного саммари)
             transcript_files = []
             for root, dirs, files in os.walk(folder_path):
-                for file in files:
+                for file in sorted(files):
                     if file.lower().endswith('_transcript.txt'):
                         transcript_files.append(os.path.join(root, file))
             
@@ -119,28 +191,17 @@ class SummaryHandler(ProcessHandler):
             
             self.logger.info(f"📄 Найдено {len(transcript_files)} файлов транскрипций")
             
-            # Обрабатываем каждый файл транскрипции
+            # Отбираем необработанные транскрипции
+            pending = []
             for transcript_file in transcript_files:
                 try:
                     if self._should_process_transcript_file(transcript_file):
-                        if self._process_transcript_file(transcript_file):
-                            result["processed"] += 1
-                            result["files"].append({
-                                "file": os.path.basename(transcript_file),
-                                "status": "success"
-                            })
-                        else:
-                            result["errors"] += 1
-                            result["files"].append({
-                                "file": os.path.basename(transcript_file),
-                                "status": "error"
-                            })
+                        pending.append(transcript_file)
                     else:
                         result["files"].append({
                             "file": os.path.basename(transcript_file),
                             "status": "already_processed"
                         })
-                        
                 except Exception as e:
                     result["errors"] += 1
                     result["files"].append({
@@ -149,6 +210,32 @@ class SummaryHandler(ProcessHandler):
                         "error": str(e)
                     })
             
+            # Саммари создаются параллельно через общий исполнитель OpenAI (с лимитами RPM/TPM)
+            if pending:
+                executor = get_llm_executor(self.config_manager, self.logger)
+                if len(pending) > 1:
+                    self.logger.info(f"🚀 Создаю {len(pending)} саммари параллельно "
+                                     f"(до {executor.max_concurrency} запросов одновременно)")
+                futures = [executor.submit(self._process_transcript_file, path) for path in pending]
+                for transcript_file, future in zip(pending, futures):
+                    try:
+                        success = future.result()
+                        if success:
+                            result["processed"] += 1
+                        else:
+                            result["errors"] += 1
+                        result["files"].append({
+                            "file": os.path.basename(transcript_file),
+                            "status": "success" if success else "error"
+                        })
+                    except Exception as e:
+                        result["errors"] += 1
+                        result["files"].append({
+                            "file": os.path.basename(transcript_file),
+                            "status": "error",
+                            "error": str(e)
+                        })
+            
             # TASK-2: Если файлов несколько, создаем комплексное саммари (если включено)
             if len(transcript_files) > 1:
                 summary_config = self.config_manager.get_summary_config()
@@ -170,7 +257,9 @@ class SummaryHandler(ProcessHandler):
         """
         Обрабатывает несколько файлов транскрипции для создания комплексного саммари.
         
-        TASK-2: Создает единое саммари для всех видео в папке.
+        TASK-2: Создает единое саммари для всех видео в папке. Хеш входов (саммари
+        записей, промпты и модель) сохраняется в БД: пока он не изменился,
+        возвращается уже созданное саммари без обращения к OpenAI.
         
         Args:
             transcript_files: Список путей к файлам транскрипции
@@ -202,7 +291,7 @@ class SummaryHandler(ProcessHandler):
                         filename = os.path.basename(transcript_file)
                         all_transcripts.append({
                             "file": filename,
-                            "content": content,
+                            "content": self._strip_transcript_header(content),
                             "path": transcript_file
                         })
                         self.logger.debug(f"📖 Прочитана транскрипция: {filename}")
@@ -214,50 +303,41 @@ class SummaryHandler(ProcessHandler):
                 self.logger.error("❌ Не удалось прочитать ни одной транскрипции")
                 return None
             
+            openai_config = self.get_openai_config()
+            input_hashes, inputs_hash = self._complex_inputs_hash(all_transcripts, openai_config)
+            previous = self.state_manager.get_complex_summary(folder_path) if self.state_manager else None
+            if (previous and previous['inputs_hash'] == inputs_hash
+                    and os.path.exists(previous['summary_file']) and os.path.exists(previous['analysis_file'])):
+                self.logger.info(f"⏭️ TASK-2: Саммари записей не изменились, комплексное саммари актуально: "
+                                 f"{os.path.basename(previous['summary_file'])}")
+                return {
+                    "status": "success",
+                    "summary_file": previous['summary_file'],
+                    "analysis_file": previous['analysis_file'],
+                    "processed_files": len(all_transcripts),
+                    "unchanged": True
+                }
+            
             # Создаем комплексное саммари с использованием OpenAI API
             try:
                 # Проверяем OpenAI API
-                openai_config = self.get_openai_config()
                 if openai_config and openai_config.get('api_key'):
                     self.logger.info("🔧 OpenAI API настроен, создаю комплексное саммари...")
                     
-                    # Создаем промпт для комплексного анализа
-                    all_content = "\n\n".join([
-                        f"=== {t['file']} ===\n{t['content']}"
+                    # Комплексное саммари строится по саммари файлов, а не по полным транскрипциям:
+                    # размер каждого запроса ограничен бюджетом независимо от длины встреч
+                    summarizer = self._get_summarizer(openai_config)
+                    file_summaries = [
+                        f"=== {t['file']} ===\n{self._get_file_summary_text(t, summarizer)}"
                         for t in all_transcripts
-                    ])
-                    
-                    complex_prompt = f"""Проанализируй следующие транскрипции встреч и создай комплексное саммари:
-
-{all_content}
-
-Создай детальное комплексное саммари на русском языке, включающее:
-1. Общие темы и тенденции
-2. Ключевые решения и их взаимосвязи
-3. Действия и задачи по всем встречам
-4. Повторяющиеся проблемы и их решения
-5. Прогресс и достижения
-6. Инсайты и рекомендации
-
-Комплексное саммари:"""
+                    ]
                     
-                    # Вызываем OpenAI API
-                    import openai
-                    client = openai.OpenAI(api_key=openai_config['api_key'])
-                    
-                    response = client.chat.completions.create(
-                        model=openai_config.get('model', 'gpt-4o-mini'),
-                        messages=[
-                            {"role": "system", "content": "Ты - эксперт по анализу встреч. Создавай детальные, структурированные комплексные саммари на русском языке."},
-                            {"role": "user", "content": complex_prompt}
-                        ],
-                        temperature=openai_config.get('temperature', 0.3),
-                        max_tokens=2000
+                    # Вызываем OpenAI API (повторное содержимое берется из кэша)
+                    generated = True
+                    complex_summary_text = summarizer.reduce(
+                        file_summaries, COMPLEX_SYSTEM_PROMPT, COMPLEX_PROMPT_TEMPLATE, max_tokens=2000
                     )
                     
-                    # Получаем результат
-                    complex_summary_text = response.choices[0].message.content
-                    
                     # Сохраняем комплексное саммари
                     with open(complex_summary_file, 'w', encoding='utf-8') as f:
                         f.write(f"# Комплексное саммари папки: {folder_name}\n\n")
@@ -277,6 +357,7 @@ class SummaryHandler(ProcessHandler):
                     
                 else:
                     self.logger.warning("⚠️ OpenAI API не настроен, создаю базовое комплексное саммари")
+                    generated = False
                     
                     # Создаем базовое комплексное саммари
                     with open(complex_summary_file, 'w', encoding='utf-8') as f:
@@ -320,6 +401,13 @@ class SummaryHandler(ProcessHandler):
                 self.logger.info(f"✅ TASK-2: Создано комплексное саммари: {complex_summary_file}")
                 self.logger.info(f"✅ TASK-2: Создан комплексный анализ: {complex_analysis_file}")
                 
+                # Базовое саммари без OpenAI не фиксируем: после настройки API оно будет создано заново
+                if generated and self.state_manager:
+                    self.state_manager.save_complex_summary(folder_path, inputs_hash, input_hashes,
+                                                            complex_summary_file, complex_analysis_file)
+                self._prune_complex_summaries(complex_summary_dir, folder_name,
+                                              [complex_summary_file, complex_analysis_file])
+                
                 return {
                     "status": "success",
                     "summary_file": complex_summary_file,
@@ -335,6 +423,69 @@ class SummaryHandler(ProcessHandler):
             self.logger.error(f"❌ Ошибка обработки множественных транскрипций: {e}")
             return None
     
+    def _complex_inputs_hash(self, transcripts: List[Dict[str, str]], openai_config: Dict[str, Any] = None):
+        """
+        Вычисляет хеши входов комплексного саммари.
+        
+        Комплексное саммари строится из саммари файлов, поэтому для каждой записи
+        хешируется готовое саммари (_summary.txt), а если его еще нет - транскрипция,
+        из которой оно будет построено. В хеш набора входят также версия промптов,
+        модель и температура: перегенерированное саммари файла или смена промпта
+        и модели делают комплексное саммари устаревшим. Порядок и имена файлов
+        не влияют на хеш набора.
+        
+        Args:
+            transcripts: Транскрипции {"file", "content", "path"}
+            openai_config: Конфигурация OpenAI (по умолчанию из настроек)
+            
+        Returns:
+            Кортеж (имя файла -> хеш входа, хеш набора)
+        """
+        if openai_config is None:
+            openai_config = self.get_openai_config()
+        input_hashes = {}
+        for t in transcripts:
+            summary = self._read_file_summary(t)
+            source = f"summary:{normalize_transcript(summary)}" if summary else \
+                f"transcript:{normalize_transcript(t['content'])}"
+            input_hashes[t["file"]] = hashlib.sha256(source.encode('utf-8')).hexdigest()
+        prompts_hash = hashlib.sha256("\n".join([
+            SUMMARY_SYSTEM_PROMPT, SUMMARY_PROMPT_TEMPLATE, COMPLEX_SYSTEM_PROMPT, COMPLEX_PROMPT_TEMPLATE
+        ]).encode('utf-8')).hexdigest()
+        inputs_hash = hashlib.sha256(json.dumps([
+            sorted(input_hashes.values()),
+            f"{self.summary_prompt_version}:{prompts_hash[:12]}",
+            openai_config.get('model', 'gpt-4o-mini'),
+            openai_config.get('temperature', 0.3)
+        ]).encode('utf-8')).hexdigest()
+        return input_hashes, inputs_hash
+    
+    def _prune_complex_summaries(self, complex_summary_dir: str, folder_name: str, keep_files: List[str]):
+        """
+        Удаляет старые копии комплексного саммари с отметкой времени.
+        
+        Args:
+            complex_summary_dir: Папка комплексного саммари
+            folder_name: Имя папки встречи
+            keep_files: Только что созданные файлы
+        """
+        try:
+            keep = max(1, self.config_manager.get_summary_config().get('complex_summary_keep', 1))
+            for kind in ('_complex_summary_', '_complex_analysis_'):
+                prefix = f"{folder_name}{kind}"
+                copies = sorted(
+                    (os.path.join(complex_summary_dir, file) for file in os.listdir(complex_summary_dir)
+                     if file.startswith(prefix)),
+                    key=os.path.getmtime, reverse=True
+                )
+                current = [path for path in copies if path in keep_files]
+                older = [path for path in copies if path not in keep_files]
+                for path in older[max(0, keep - len(current)):]:
+                    os.remove(path)
+                    self.logger.info(f"🗑️ TASK-2: Удалена устаревшая копия: {os.path.basename(path)}")
+        except Exception as e:
+            self.logger.warning(f"⚠️ Ошибка удаления старых комплексных саммари: {e}")
+    
     def _should_process_transcript_file(self, file_path: str) -> bool:
         """
         Проверяет, нужно ли обрабатывать файл транскрипции.
@@ -414,37 +565,12 @@ class SummaryHandler(ProcessHandler):
                         self.logger.error(f"❌ Ошибка чтения файла транскрипции: {e}")
                         transcript_content = "Содержание недоступно"
                     
-                    # Создаем промпт для OpenAI
-                    prompt = f"""Проанализируй следующую транскрипцию встречи и создай краткое саммари:
-
-Транскрипция:
-{transcript_content}
-
-Создай структурированное саммари на русском языке, включающее:
-1. Основные темы обсуждения
-2. Ключевые решения
-3. Действия и задачи
-4. Важные моменты
-
-Саммари:"""
-                    
-                    # Вызываем OpenAI API
-                    import openai
-                    client = openai.OpenAI(api_key=openai_config['api_key'])
-                    
-                    response = client.chat.completions.create(
-                        model=openai_config.get('model', 'gpt-4o-mini'),
-                        messages=[
-                            {"role": "system", "content": "Ты - помощник по анализу встреч. Создавай краткие, структурированные саммари на русском языке."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=openai_config.get('temperature', 0.3),
-                        max_tokens=1000
+                    # Вызываем OpenAI API (длинная транскрипция - по фрагментам, повторы - из кэша)
+                    summary_text = self._get_summarizer(openai_config).summarize(
+                        normalize_transcript(self._strip_transcript_header(transcript_content)), SUMMARY_SYSTEM_PROMPT,
+                        SUMMARY_PROMPT_TEMPLATE, max_tokens=1000
                     )
                     
-                    # Получаем результат
-                    summary_text = response.choices[0].message.content
-                    
                     # Сохраняем саммари
                     with open(summary_file, 'w', encoding='utf-8') as f:
                         f.write(f"# Саммари транскрипции: {os.path.basename(file_path)}\n\n")
@@ -499,6 +625,239 @@ class SummaryHandler(ProcessHandler):
             self.logger.error(f"❌ Ошибка обработки транскрипции {file_path}: {e}")
             return False
     
+    def _get_summarizer(self, openai_config: Dict[str, Any], generate=None) -> MapReduceSummarizer:
+        """
+        Создает map-reduce саммаризатор поверх запросов с кэшем.
+        
+        Args:
+            openai_config: Конфигурация OpenAI
+            generate: Функция запроса вместо _generate_summary (планирование пакетной обработки)
+            
+        Returns:
+            MapReduceSummarizer
+        """
+        summary_config = self.config_manager.get_summary_config()
+        chunk_tokens = summary_config.get('chunk_tokens', 6000)
+        reduce_tokens = summary_config.get('reduce_tokens', 8000)
+        if self.prompt_manager:
+            # Фрагменты и объединения не превышают окно модели вместе с промптом и ответом
+            model = openai_config.get('model', 'gpt-4o-mini')
+            chunk_tokens = min(chunk_tokens, self.prompt_manager.get_content_budget(
+                SUMMARY_SYSTEM_PROMPT, SUMMARY_PROMPT_TEMPLATE, model, 1000))
+            reduce_tokens = min(reduce_tokens, self.prompt_manager.get_content_budget(
+                COMPLEX_SYSTEM_PROMPT, COMPLEX_PROMPT_TEMPLATE, model, 2000))
+        
+        if generate is None:
+            def generate(system_prompt: str, prompt_template: str, content: str, max_tokens: int) -> str:
+                return self._generate_summary(openai_config, system_prompt, prompt_template, content, max_tokens)['text']
+        
+        return MapReduceSummarizer(
+            generate,
+            chunk_tokens=chunk_tokens,
+            reduce_tokens=reduce_tokens,
+            workers=summary_config.get('map_workers', 4),
+            logger=self.logger
+        )
+    
+    def _strip_transcript_header(self, content: str) -> str:
+        """
+        Убирает служебный заголовок файла транскрипции перед отправкой в модель.
+        
+        Args:
+            content: Содержимое файла транскрипции
+            
+        Returns:
+            Текст транскрипции
+        """
+        if self.prompt_manager:
+            return self.prompt_manager.strip_transcript_header(content)
+        return content
+    
+    def _get_file_summary_text(self, transcript: Dict[str, str], summarizer: MapReduceSummarizer) -> str:
+        """
+        Возвращает текст саммари одной транскрипции для комплексного саммари.
+        
+        Берется из готового файла _summary.txt; если его нет или он создан без
+        OpenAI, саммари строится из транскрипции (повторы берутся из кэша).
+        
+        Args:
+            transcript: Транскрипция {"file", "content", "path"}
+            summarizer: Саммаризатор
+            
+        Returns:
+            Текст саммари
+        """
+        summary = self._read_file_summary(transcript)
+        if summary:
+            return summary
+        
+        self.logger.info(f"📋 TASK-2: Саммари {transcript['file']} нет, создаю из транскрипции")
+        return summarizer.summarize(normalize_transcript(transcript['content']), SUMMARY_SYSTEM_PROMPT,
+                                    SUMMARY_PROMPT_TEMPLATE, max_tokens=1000)
+    
+    def _read_file_summary(self, transcript: Dict[str, str]) -> Optional[str]:
+        """
+        Читает готовое саммари транскрипции, созданное через OpenAI.
+        
+        Args:
+            transcript: Транскрипция {"file", "content", "path"}
+            
+        Returns:
+            Текст саммари или None, если файла нет или он создан без OpenAI
+        """
+        summary_file = os.path.splitext(transcript['path'])[0] + '_summary.txt'
+        try:
+            with open(summary_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+            header, marker, body = content.partition("## Содержание:\n")
+            if marker and "Сгенерировано через OpenAI API" in header and body.strip():
+                return body.strip()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"⚠️ Не удалось прочитать саммари {os.path.basename(summary_file)}: {e}")
+        return None
+    
+    def _generate_summary(self, openai_config: Dict[str, Any], system_prompt: str, prompt_template: str,
+                          content: str, max_tokens: int) -> Dict[str, Any]:
+        """
+        Генерирует текст через OpenAI с кэшем по хешу содержимого.
+        
+        Ключ кэша - хеш нормализованного содержимого, версия промпта (номер из
+        настроек и хеш шаблона), модель и температура. Повторное содержимое
+        (перегенерированная транскрипция, переименованная папка, повторный запуск
+        tools/process_missing_summaries.py) не вызывает API.
+        
+        Args:
+            openai_config: Конфигурация OpenAI
+            system_prompt: Системный промпт
+            prompt_template: Шаблон промпта с {content}
+            content: Нормализованное содержимое
+            max_tokens: Максимум токенов ответа
+            
+        Returns:
+            Словарь {"text", "cached", "usage"}
+        """
+        request = self._build_summary_request(openai_config, system_prompt, prompt_template, content, max_tokens)
+        model, temperature, cache_key = request['model'], request['temperature'], request['cache_key']
+        
+        if cache_key:
+            cached = self.state_manager.get_cached_summary(cache_key)
+            if cached:
+                self.logger.info(f"♻️ Саммари взято из кэша (совпадение содержимого, "
+                                 f"сэкономлено токенов: {cached['total_tokens']})")
+                usage = {key: cached[key] for key in ('prompt_tokens', 'completion_tokens', 'total_tokens')}
+                return {"text": cached['output'], "cached": True, "usage": usage}
+        
+        # Общий клиент и лимиты процесса: параллельные саммари не превышают RPM/TPM
+        response = get_llm_executor(self.config_manager, self.logger).complete(
+            request['messages'], model=model, temperature=temperature, max_tokens=max_tokens
+        )
+        
+        text = response.choices[0].message.content
+        usage = {
+            key: getattr(response.usage, key, 0) or 0
+            for key in ('prompt_tokens', 'completion_tokens', 'total_tokens')
+        } if getattr(response, 'usage', None) else {}
+        if usage:
+            self.logger.info(f"🔢 Токены OpenAI: {usage['prompt_tokens']} + {usage['completion_tokens']} = {usage['total_tokens']}")
+        if self.state_manager:
+            self.state_manager.record_llm_usage(request['purpose'], model, request['prompt_tokens'],
+                                                usage, request['truncated'])
+        
+        if cache_key:
+            self.state_manager.save_cached_summary(cache_key, request['content_hash'], request['prompt_version'],
+                                                   model, temperature, text, usage)
+        return {"text": text, "cached": False, "usage": usage}
+    
+    def _build_summary_request(self, openai_config: Dict[str, Any], system_prompt: str, prompt_template: str,
+                               content: str, max_tokens: int) -> Dict[str, Any]:
+        """
+        Собирает запрос к модели: подгоняет содержимое под окно и вычисляет ключ кэша.
+        
+        Используется и для обычных запросов, и для пакетной обработки (summary_batch),
+        поэтому ответ пакета попадает в кэш под тем же ключом.
+        
+        Args:
+            openai_config: Конфигурация OpenAI
+            system_prompt: Системный промпт
+            prompt_template: Шаблон промпта с {content}
+            content: Нормализованное содержимое
+            max_tokens: Максимум токенов ответа
+            
+        Returns:
+            Словарь {"model", "temperature", "max_tokens", "messages", "purpose", "prompt_tokens",
+            "truncated", "cache_key", "content_hash", "prompt_version"} (cache_key None без кэша)
+        """
+        model = openai_config.get('model', 'gpt-4o-mini')
+        temperature = openai_config.get('temperature', 0.3)
+        
+        # Промпт считается токенизатором до отправки: не помещающееся в окно обрезается
+        fitted = None
+        if self.prompt_manager:
+            fitted = self.prompt_manager.fit_prompt(system_prompt, prompt_template, content, model, max_tokens)
+            content = fitted['content']
+        
+        request = {
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt_template.format(content=content)}
+            ],
+            "purpose": PROMPT_PURPOSES.get(prompt_template, 'other'),
+            "prompt_tokens": fitted['prompt_tokens'] if fitted else 0,
+            "truncated": fitted['truncated'] if fitted else False,
+            "cache_key": None,
+            "content_hash": hashlib.sha256(content.encode('utf-8')).hexdigest(),
+            "prompt_version": None
+        }
+        if self.summary_cache_enabled and self.state_manager:
+            template_hash = hashlib.sha256(f"{system_prompt}\n{prompt_template}\n{max_tokens}".encode('utf-8')).hexdigest()
+            request["prompt_version"] = f"{self.summary_prompt_version}:{template_hash[:12]}"
+            request["cache_key"] = hashlib.sha256(
+                json.dumps([request["content_hash"], request["prompt_version"], model, temperature]).encode('utf-8')
+            ).hexdigest()
+        return request
+    
+    def process_pipeline_item(self, file_path: str):
+        """
+        Создает саммари для одной транскрипции на этапе конвейера.
+        
+        Args:
+            file_path: Путь к файлу транскрипции
+            
+        Returns:
+            True если саммари создано, None если не требуется, False при ошибке
+        """
+        if not self._should_process_transcript_file(file_path):
+            return None
+        return self._process_transcript_file(file_path)
+    
+    def process_meeting_complex_summary(self, folder_path: str, account_type: str) -> Dict[str, Any]:
+        """
+        Создает комплексное саммари для папки встречи с несколькими транскрипциями.
+        
+        Args:
+            folder_path: Путь к папке встречи
+            account_type: Тип аккаунта
+            
+        Returns:
+            Результат обработки или None, если транскрипций меньше двух
+        """
+        transcript_files = [
+            os.path.join(folder_path, file)
+            for file in sorted(os.listdir(folder_path))
+            if file.lower().endswith('_transcript.txt')
+        ] if os.path.isdir(folder_path) else []
+        
+        if len(transcript_files) < 2:
+            return None
+        
+        self.logger.info(f"🔄 TASK-2: Обнаружено несколько видео в папке, создаю комплексное саммари")
+        return self._process_multiple_transcripts(transcript_files, account_type, folder_path)
+    
     def _get_current_timestamp(self) -> str:
         """
         Получает текущий timestamp.
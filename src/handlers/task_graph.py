@@ -0,0 +1,632 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Граф задач по встречам.
+Для каждой записи встречи строится цепочка задач
+(сжатие → извлечение аудио → транскрипция → саммари), а для встречи в целом -
+комплексное саммари и обновление Notion. Граф хранится в SQLite (StateManager),
+задачи перезапускаются только при изменении их входных файлов.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import concurrent.futures
+from typing import Dict, Any, List, Optional
+
+
+# Расширения исходных видео (как в MediaHandler._find_video_files)
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv')
+
+# Пул потоков, в котором выполняется задача каждого типа
+TASK_POOLS = {
+    'compress': 'media',
+    'extract': 'media',
+    'transcribe': 'transcription',
+    'summarize': 'summary',
+    'complex_summary': 'summary',
+    'notion_update': 'notion'
+}
+
+
+def task_key(task_type: str, path: str) -> str:
+    """
+    Формирует ключ задачи графа.
+
+    Args:
+        task_type: Тип задачи
+        path: Исходный файл записи или папка встречи
+
+    Returns:
+        Ключ задачи
+    """
+    return f"{task_type}:{path}"
+
+
+class MeetingTaskGraph:
+    """Построение графа задач по папкам встреч и выполнение отдельных задач."""
+
+    def __init__(self, state_manager, media_handler, transcription_handler, summary_handler,
+                 config_manager, logger=None, quality: str = 'medium'):
+        """
+        Инициализация графа задач.
+
+        Args:
+            state_manager: StateManager, в котором хранится граф
+            media_handler: Обработчик медиа (сжатие и извлечение аудио)
+            transcription_handler: Обработчик транскрипций
+            summary_handler: Обработчик саммари
+            config_manager: Менеджер конфигурации
+            logger: Логгер
+            quality: Качество сжатия видео
+        """
+        self.state_manager = state_manager
+        self.media_handler = media_handler
+        self.transcription_handler = transcription_handler
+        self.summary_handler = summary_handler
+        self.config_manager = config_manager
+        self.logger = logger or logging.getLogger(__name__)
+        self.quality = quality
+
+    # ===== ПОСТРОЕНИЕ ГРАФА =====
+
+    def sync(self, roots: Dict[str, str]) -> Dict[str, int]:
+        """
+        Обновляет граф: сканирует только папки встреч, изменившиеся с прошлого раза,
+        и сбрасывает выполненные задачи, чьи входные файлы изменились.
+
+        Args:
+            roots: Словарь {тип_аккаунта: корневая папка}
+
+        Returns:
+            Статистика {"scanned": ..., "registered": ..., "invalidated": ...}
+        """
+        stats = {"scanned": 0, "registered": 0, "invalidated": 0}
+        known_folders = self.state_manager.get_graph_folders()
+
+        for account_type, root in roots.items():
+            try:
+                entries = [entry for entry in os.scandir(root) if entry.is_dir()]
+            except OSError as e:
+                self.logger.error(f"❌ Ошибка чтения папки {root}: {e}")
+                continue
+
+            for entry in entries:
+                mtime = self._tree_mtime(entry.path)
+                if known_folders.get(entry.path) == mtime:
+                    continue
+                stats["registered"] += self._scan_meeting(entry.path, account_type)
+                self.state_manager.set_graph_folder(entry.path, account_type, mtime)
+                stats["scanned"] += 1
+
+        stats["invalidated"] = self.refresh()
+        if stats["scanned"] or stats["registered"] or stats["invalidated"]:
+            self.logger.info(
+                f"🕸️ Граф задач: просканировано папок {stats['scanned']}, "
+                f"новых задач {stats['registered']}, к перезапуску {stats['invalidated']}"
+            )
+        return stats
+
+    def _tree_mtime(self, meeting_folder: str) -> float:
+        """
+        Возвращает последнее время изменения папки встречи и всех ее подпапок.
+
+        Файл, добавленный во вложенную папку (например, complex_summary/), меняет
+        mtime только своей папки, поэтому учитываются все папки, которые обходит
+        _scan_meeting.
+
+        Args:
+            meeting_folder: Папка встречи
+
+        Returns:
+            Максимальный mtime среди папок (0, если папку не удалось прочитать)
+        """
+        mtime = 0.0
+        for dirpath, _, _ in os.walk(meeting_folder):
+            try:
+                mtime = max(mtime, os.stat(dirpath).st_mtime)
+            except OSError:
+                continue
+        return mtime
+
+    def _scan_meeting(self, meeting_folder: str, account_type: str) -> int:
+        """
+        Регистрирует задачи для записей папки встречи.
+
+        Args:
+            meeting_folder: Папка встречи
+            account_type: Тип аккаунта
+
+        Returns:
+            Количество новых задач
+        """
+        summary_config = self.config_manager.get_summary_config()
+        summary_enabled = summary_config.get('enable_general_summary', False) or summary_config.get('enable_complex_summary', False)
+
+        videos, audios = [], []
+        for dirpath, _, files in os.walk(meeting_folder):
+            for file in files:
+                lower = file.lower()
+                path = os.path.join(dirpath, file)
+                if lower.endswith(VIDEO_EXTENSIONS) and not lower.endswith('_compressed.mp4'):
+                    videos.append(path)
+                elif lower.endswith('_compressed.mp3'):
+                    audios.append(path)
+
+        existing = self.state_manager.get_tasks(meeting_folder)
+        existing_keys = {task['task_key'] for task in existing}
+        known_audio = {output for task in existing if task['task_type'] == 'extract' for output in task['outputs']}
+        recordings = sum(1 for task in existing if task['task_type'] == 'compress')
+        adopted = set()
+        created = 0
+
+        # Цепочки для новых записей: индекс продолжает нумерацию встречи, чтобы имена не пересекались
+        for video in sorted(videos, key=self._ctime):
+            if task_key('compress', video) in existing_keys:
+                continue
+            recordings += 1
+            record = self.state_manager.get_media_record(video) or {}
+            compressed_video, compressed_audio = self.media_handler._generate_smart_filename(video, os.path.dirname(video), recordings)
+            compressed_video = record.get('compressed_video') or compressed_video
+            compressed_audio = record.get('compressed_audio') or compressed_audio
+            known_audio.add(compressed_audio)
+
+            created += self._register(adopted, 'compress', video, meeting_folder, account_type,
+                                      [compressed_video], inputs=[video])
+            created += self._register(adopted, 'extract', video, meeting_folder, account_type,
+                                      [compressed_audio], depends_on=[task_key('compress', video)])
+            created += self._register_transcript_chain(adopted, video, compressed_audio, meeting_folder, account_type,
+                                                       [task_key('extract', video)], summary_enabled)
+
+        # Аудио, извлеченное до появления графа (оригинал видео уже удален)
+        for audio in sorted(audios):
+            if audio in known_audio or task_key('transcribe', audio) in existing_keys:
+                continue
+            created += self._register_transcript_chain(adopted, audio, audio, meeting_folder, account_type,
+                                                       [], summary_enabled, inputs=[audio])
+
+        if created:
+            created += self._register_meeting_tasks(adopted, meeting_folder, account_type, summary_config)
+        return created
+
+    def _register_transcript_chain(self, adopted: set, source: str, audio: str, meeting_folder: str,
+                                   account_type: str, depends_on: List[str], summary_enabled: bool,
+                                   inputs: List[str] = None) -> int:
+        """
+        Регистрирует задачи транскрипции и саммари для одной записи.
+
+        Args:
+            adopted: Множество задач, принятых как выполненные
+            source: Исходный файл записи (часть ключа задач)
+            audio: Путь к сжатому аудио
+            meeting_folder: Папка встречи
+            account_type: Тип аккаунта
+            depends_on: Зависимости задачи транскрипции
+            summary_enabled: Регистрировать ли задачу саммари
+            inputs: Собственные входы задачи транскрипции
+
+        Returns:
+            Количество новых задач
+        """
+        transcript = self._transcript_path(audio)
+        base_path = os.path.splitext(transcript)[0]
+        created = self._register(adopted, 'transcribe', source, meeting_folder, account_type,
+                                 [transcript], inputs=inputs, depends_on=depends_on)
+        if summary_enabled:
+            created += self._register(adopted, 'summarize', source, meeting_folder, account_type,
+                                      [base_path + '_summary.txt', base_path + '_analysis.json'],
+                                      depends_on=[task_key('transcribe', source)])
+        return created
+
+    def _register_meeting_tasks(self, adopted: set, meeting_folder: str, account_type: str,
+                                summary_config: Dict[str, Any]) -> int:
+        """
+        Регистрирует (или перестраивает) задачи уровня встречи: комплексное саммари и Notion.
+
+        Args:
+            adopted: Множество задач, принятых как выполненные
+            meeting_folder: Папка встречи
+            account_type: Тип аккаунта
+            summary_config: Настройки саммари
+
+        Returns:
+            Количество новых задач
+        """
+        tasks = self.state_manager.get_tasks(meeting_folder)
+        transcribe_keys = [task['task_key'] for task in tasks if task['task_type'] == 'transcribe']
+        summarize_keys = [task['task_key'] for task in tasks if task['task_type'] == 'summarize']
+        notion_deps = transcribe_keys + summarize_keys
+        created = 0
+
+        # TASK-2: Комплексное саммари только для встреч с несколькими записями
+        if summary_config.get('enable_complex_summary', False) and len(transcribe_keys) > 1:
+            complex_dir = os.path.join(meeting_folder, "complex_summary")
+            existing = [
+                os.path.join(complex_dir, file) for file in sorted(os.listdir(complex_dir))
+                if '_complex_' in file
+            ] if os.path.isdir(complex_dir) else []
+            # Комплексное саммари строится из саммари файлов: ждем их, а не только транскрипции
+            created += self._register(adopted, 'complex_summary', meeting_folder, meeting_folder, account_type,
+                                      existing, depends_on=summarize_keys or transcribe_keys)
+            notion_deps.append(task_key('complex_summary', meeting_folder))
+
+        created += self._register(adopted, 'notion_update', meeting_folder, meeting_folder, account_type,
+                                  [], depends_on=notion_deps)
+        return created
+
+    def _register(self, adopted: set, task_type: str, source: str, meeting_folder: str, account_type: str,
+                  outputs: List[str], inputs: List[str] = None, depends_on: List[str] = None) -> int:
+        """
+        Регистрирует задачу. Новая задача, чьи результаты уже есть на диске
+        (обработка до появления графа), сразу принимается как выполненная.
+
+        Args:
+            adopted: Множество задач, принятых как выполненные
+            task_type: Тип задачи
+            source: Исходный файл записи или папка встречи
+            meeting_folder: Папка встречи
+            account_type: Тип аккаунта
+            outputs: Ожидаемые результаты задачи
+            inputs: Собственные входы задачи
+            depends_on: Ключи задач-зависимостей
+
+        Returns:
+            1 если задача создана, 0 если уже существовала
+        """
+        key = task_key(task_type, source)
+        depends_on = depends_on or []
+        if not self.state_manager.register_task(key, meeting_folder, account_type, task_type, inputs, depends_on):
+            return 0
+
+        if task_type == 'notion_update':
+            # Notion уже обновлялся прежним кодом, если все результаты встречи существовали
+            ready = bool(depends_on) and all(dep in adopted for dep in depends_on)
+        else:
+            ready = bool(outputs) and all(os.path.exists(path) for path in outputs) and all(dep in adopted for dep in depends_on)
+
+        fields = {"outputs": outputs}
+        if ready:
+            adopted.add(key)
+            fields.update(status='done', input_fingerprint=self.fingerprint(self.state_manager.get_task(key)))
+        self.state_manager.update_task(key, **fields)
+        return 1
+
+    def refresh(self) -> int:
+        """
+        Возвращает в очередь выполненные и неудачные задачи, чьи входы изменились
+        с последнего запуска (для неудачных это также сбрасывает счетчик попыток).
+
+        Returns:
+            Количество задач, поставленных на перезапуск
+        """
+        invalidated = 0
+        for task in self.state_manager.get_tasks(statuses=['done', 'failed']):
+            if self._inputs_changed(task):
+                self.state_manager.update_task(task['task_key'], status='pending', attempts=0, next_attempt_at=0)
+                invalidated += 1
+        return invalidated
+
+    def invalidate_dependents(self, key: str) -> int:
+        """
+        Возвращает в очередь выполненные задачи, зависящие от перезапущенной задачи.
+
+        Args:
+            key: Ключ выполненной задачи
+
+        Returns:
+            Количество задач, поставленных на перезапуск
+        """
+        invalidated = 0
+        for task in self.state_manager.get_task_dependents(key):
+            if task['status'] == 'done' and self._inputs_changed(task):
+                self.state_manager.update_task(task['task_key'], status='pending', attempts=0, next_attempt_at=0)
+                invalidated += 1
+        return invalidated
+
+    def _inputs_changed(self, task: Dict[str, Any]) -> bool:
+        """Проверяет, изменились ли входные файлы задачи с момента ее выполнения."""
+        fingerprint = self.fingerprint(task)
+        # Входы удалены (например, оригинал видео после сжатия) - результат остается актуальным
+        return fingerprint is not None and fingerprint != task.get('input_fingerprint')
+
+    def input_files(self, task: Dict[str, Any]) -> List[str]:
+        """
+        Возвращает входные файлы задачи: собственные входы и результаты зависимостей.
+
+        Args:
+            task: Задача графа
+
+        Returns:
+            Список путей
+        """
+        files = list(task.get('inputs') or [])
+        for dependency in self.state_manager.get_task_dependencies(task['task_key']):
+            files.extend(dependency['outputs'])
+        return files
+
+    def fingerprint(self, task: Dict[str, Any]) -> Optional[str]:
+        """
+        Вычисляет отпечаток входных файлов задачи по размеру и времени изменения.
+
+        Args:
+            task: Задача графа
+
+        Returns:
+            MD5 отпечаток или None, если ни одного входного файла нет
+        """
+        parts = []
+        for path in sorted(set(self.input_files(task))):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            parts.append(f"{path}|{stat.st_size}|{stat.st_mtime_ns}")
+        if not parts:
+            return None
+        return hashlib.md5("\n".join(parts).encode('utf-8')).hexdigest()
+
+    # ===== ВЫПОЛНЕНИЕ ЗАДАЧ =====
+
+    def execute(self, task: Dict[str, Any]) -> List[str]:
+        """
+        Выполняет задачу графа.
+
+        Args:
+            task: Задача графа
+
+        Returns:
+            Список результатов задачи
+
+        Raises:
+            RuntimeError: Если задача завершилась неудачно
+        """
+        source = task['task_key'].split(':', 1)[1]
+        inputs = [path for path in self.input_files(task) if os.path.exists(path)]
+        outputs = task['outputs']
+        task_type = task['task_type']
+
+        if task_type == 'compress':
+            if not self.media_handler._compress_video(source, outputs[0], self.quality):
+                raise RuntimeError(f"не удалось сжать видео {source}")
+            return outputs
+
+        if task_type == 'extract':
+            if not inputs or not self.media_handler._extract_audio(inputs[0], outputs[0]):
+                raise RuntimeError(f"не удалось извлечь аудио из {source}")
+            self.media_handler._finalize_processed_video(source, inputs[0], outputs[0])
+            return outputs
+
+        if task_type == 'transcribe':
+            if not inputs or not self.transcription_handler._process_audio_file(inputs[0]):
+                raise RuntimeError(f"не удалось транскрибировать {source}")
+            return outputs
+
+        if task_type == 'summarize':
+            if not inputs or not self.summary_handler._process_transcript_file(inputs[0]):
+                raise RuntimeError(f"не удалось создать саммари для {source}")
+            return outputs
+
+        if task_type == 'complex_summary':
+            result = self.summary_handler._process_multiple_transcripts(sorted(inputs), task['account_type'], source)
+            if not result:
+                raise RuntimeError(f"не удалось создать комплексное саммари для {source}")
+            return [result['summary_file'], result['analysis_file']]
+
+        if task_type == 'notion_update':
+            return self._update_notion(task, inputs)
+
+        raise RuntimeError(f"неизвестный тип задачи {task_type}")
+
+    def _update_notion(self, task: Dict[str, Any], files: List[str]) -> List[str]:
+        """
+        Добавляет на страницу Notion транскрипции и саммари встречи,
+        которые еще не были туда отправлены.
+
+        Args:
+            task: Задача обновления Notion
+            files: Результаты зависимостей (транскрипции, саммари, анализ)
+
+        Returns:
+            Список отправленных в Notion файлов
+        """
+        meeting_folder = task['meeting_folder']
+        event_id = self.state_manager.find_event_id_by_folder(meeting_folder)
+        if not event_id:
+            raise RuntimeError(f"событие для папки {os.path.basename(meeting_folder)} не найдено")
+
+        pushed = list(task['outputs'])
+        for path in sorted(files):
+            if path in pushed:
+                continue
+            if path.endswith('_transcript.txt'):
+                updated = self.state_manager.update_notion_with_transcription(event_id, path)
+            elif path.endswith('_summary.txt') or '_complex_summary_' in os.path.basename(path):
+                analysis = path.replace('_summary.txt', '_analysis.json').replace('_complex_summary_', '_complex_analysis_')
+                if analysis.endswith('.txt'):
+                    analysis = analysis[:-4] + '.json'
+                updated = self.state_manager.update_notion_with_summary(event_id, path, analysis)
+            else:
+                continue
+            if not updated:
+                raise RuntimeError(f"не удалось обновить страницу Notion события {event_id}")
+            # Сохраняем прогресс сразу, чтобы повтор не дублировал уже отправленное
+            pushed.append(path)
+            self.state_manager.update_task(task['task_key'], outputs=pushed)
+        return pushed
+
+    def _transcript_path(self, audio: str) -> str:
+        """Путь к транскрипции, который создает TranscriptionHandler для аудио файла."""
+        base_path = os.path.splitext(audio)[0]
+        if base_path.endswith('_compressed'):
+            base_path = base_path[:-10]
+        return base_path + '__transcript.txt'
+
+    def _ctime(self, path: str) -> float:
+        """Время создания файла (текущее время, если недоступно)."""
+        try:
+            return os.path.getctime(path)
+        except OSError:
+            return time.time()
+
+
+class DagRunner:
+    """
+    Исполнитель графа задач с пулами потоков по типам задач и повторами с задержкой.
+
+    Пулы потоков живут между циклами сервиса: если цикл исчерпал отведенное время,
+    запущенные задачи продолжают выполняться в фоне и учитываются следующим запуском.
+    """
+
+    def __init__(self, graph: MeetingTaskGraph, pools: Dict[str, int], max_attempts: int = 3,
+                 retry_delay: int = 60, backoff: int = 2, logger=None):
+        """
+        Инициализация исполнителя.
+
+        Args:
+            graph: Граф задач
+            pools: Количество потоков по пулам ('media', 'transcription', 'summary', 'notion')
+            max_attempts: Максимальное количество попыток задачи
+            retry_delay: Задержка перед повтором в секундах
+            backoff: Множитель задержки для каждой следующей попытки
+            logger: Логгер
+        """
+        self.graph = graph
+        self.state_manager = graph.state_manager
+        self.pools = pools
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.backoff = backoff
+        self.logger = logger or graph.logger
+        self._executors: Dict[str, concurrent.futures.ThreadPoolExecutor] = {}
+        self._in_flight: Dict[concurrent.futures.Future, tuple] = {}
+        self._recovered = False
+
+    def run(self, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Выполняет готовые задачи. Задача запускается, как только выполнены
+        все ее зависимости; неудачные задачи повторяются в следующих циклах.
+
+        Args:
+            deadline: Момент (time.time()), после которого управление возвращается,
+                а незавершенные задачи продолжают выполняться в фоне (None - ждать все)
+
+        Returns:
+            Статистика {"tasks": {тип: {"done": n, "failed": n, "duration": s}},
+            "graph": {...}, "in_flight": n}
+        """
+        stats = {task_type: {"done": 0, "failed": 0, "duration": 0.0} for task_type in TASK_POOLS}
+        if not self._recovered:
+            # Задачи 'running' от прошлого запуска сервиса уже никто не выполняет
+            reset = self.state_manager.reset_running_tasks()
+            if reset:
+                self.logger.info(f"🔁 Возвращено в очередь прерванных задач: {reset}")
+            self._recovered = True
+
+        while True:
+            # Запущенные задачи помечены 'running' и повторно не выбираются
+            for task in self.state_manager.get_runnable_tasks(self.max_attempts, time.time()):
+                fingerprint = self.graph.fingerprint(task)
+                self.state_manager.update_task(task['task_key'], status='running')
+                executor = self._get_executor(TASK_POOLS.get(task['task_type'], 'media'))
+                future = executor.submit(self.graph.execute, task)
+                self._in_flight[future] = (task, fingerprint, time.time())
+
+            if not self._in_flight:
+                break
+
+            timeout = None
+            if deadline is not None:
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    break
+
+            done, _ = concurrent.futures.wait(self._in_flight, timeout=timeout,
+                                              return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                task, fingerprint, started = self._in_flight.pop(future)
+                self._complete(task, fingerprint, started, future, stats)
+
+        if self._in_flight:
+            running = ", ".join(sorted({task['task_type'] for task, _, _ in self._in_flight.values()}))
+            self.logger.info(f"⏳ Время цикла истекло, в фоне выполняются задачи: {len(self._in_flight)} ({running})")
+
+        return {
+            "tasks": stats,
+            "graph": self.state_manager.get_task_graph_summary(),
+            "in_flight": len(self._in_flight)
+        }
+
+    def has_in_flight(self) -> bool:
+        """Проверяет, выполняются ли задачи в фоне."""
+        return bool(self._in_flight)
+
+    def shutdown(self, wait: bool = False):
+        """
+        Останавливает пулы потоков.
+
+        Args:
+            wait: Дождаться завершения выполняющихся задач
+        """
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait)
+        self._executors = {}
+        if wait:
+            stats = {task_type: {"done": 0, "failed": 0, "duration": 0.0} for task_type in TASK_POOLS}
+            for future, (task, fingerprint, started) in list(self._in_flight.items()):
+                self._complete(task, fingerprint, started, future, stats)
+            self._in_flight = {}
+
+    def _get_executor(self, pool: str) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        Возвращает пул потоков, создавая его при первом обращении.
+
+        Args:
+            pool: Название пула
+
+        Returns:
+            Пул потоков
+        """
+        if pool not in self._executors:
+            workers = max(1, int(self.pools.get(pool, 1)))
+            self._executors[pool] = concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix=f"dag-{pool}"
+            )
+        return self._executors[pool]
+
+    def _complete(self, task: Dict[str, Any], fingerprint: Optional[str], started: float,
+                  future: concurrent.futures.Future, stats: Dict[str, Any]):
+        """
+        Сохраняет результат выполнения задачи.
+
+        Args:
+            task: Задача графа
+            fingerprint: Отпечаток входов на момент запуска
+            started: Время запуска
+            future: Завершенная задача пула
+            stats: Статистика запуска
+        """
+        key = task['task_key']
+        duration = time.time() - started
+        stats[task['task_type']]["duration"] += duration
+        try:
+            outputs = future.result()
+            self.state_manager.update_task(
+                key, status='done', outputs=outputs, input_fingerprint=fingerprint,
+                attempts=0, next_attempt_at=0, last_error=None, duration=round(duration, 2)
+            )
+            stats[task['task_type']]["done"] += 1
+            self.logger.info(f"✅ Задача {task['task_type']} выполнена за {duration:.1f}с: {os.path.basename(key.split(':', 1)[1])}")
+            self.graph.invalidate_dependents(key)
+        except Exception as e:
+            attempts = task.get('attempts', 0) + 1
+            next_attempt_at = time.time() + self.retry_delay * (self.backoff ** (attempts - 1))
+            self.state_manager.update_task(
+                key, status='failed', attempts=attempts, next_attempt_at=next_attempt_at,
+                input_fingerprint=fingerprint, last_error=str(e), duration=round(duration, 2)
+            )
+            stats[task['task_type']]["failed"] += 1
+            if attempts >= self.max_attempts:
+                self.logger.error(f"❌ Задача {task['task_type']} не выполнена после {attempts} попыток: {e}")
+            else:
+                self.logger.warning(f"⚠️ Задача {task['task_type']} не выполнена (попытка {attempts}/{self.max_attempts}): {e}")
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Фоновая отправка отчетов в Telegram из очереди в памяти процесса.
+
+Цикл сервиса только ставит отчет в очередь и продолжает работу; фоновый поток
+отправляет его через TelegramAPI (постоянная HTTP сессия, разбиение по лимиту
+4096 символов, ожидание retry_after). Отчеты, накопившиеся за окно объединения
+или пока отправка была недоступна, уходят одной сводкой.
+"""
+
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+
+class TelegramOutbox:
+    """Очередь отчетов Telegram с объединением и фоновой отправкой."""
+
+    def __init__(self, config_manager, telegram_api, logger=None):
+        """
+        Инициализация очереди.
+
+        Args:
+            config_manager: Менеджер конфигурации
+            telegram_api: TelegramAPI для отправки сообщений
+            logger: Логгер
+        """
+        self.config_manager = config_manager
+        self.telegram_api = telegram_api
+        self.logger = logger or logging.getLogger(__name__)
+
+        config = config_manager.get_telegram_config()
+        self.coalesce_window = config.get('coalesce_window', 60)
+        self.max_pending = config.get('queue_max_pending', 20)
+        self.retry_delay = config.get('retry_delay', 60)
+
+        # Отчеты, ожидающие отправки: (время постановки, текст)
+        self._pending: List[Tuple[datetime, str]] = []
+        # Сводка, отправленная не полностью: (текст, количество доставленных частей)
+        self._partial: Optional[Tuple[str, int]] = None
+        self._first_queued_at: Optional[float] = None
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.stats = {"queued": 0, "sent": 0, "coalesced": 0, "errors": 0, "dropped": 0}
+
+    @property
+    def running(self) -> bool:
+        """Запущен ли фоновый поток отправки."""
+        return self._running
+
+    def start(self):
+        """Запускает фоновый поток отправки."""
+        if self._running:
+            return
+        self._running = True
+        self._wakeup.clear()
+        self._thread = threading.Thread(target=self._worker, name="telegram-outbox", daemon=True)
+        self._thread.start()
+        self.logger.info("📨 Фоновая отправка уведомлений Telegram запущена")
+
+    def stop(self, timeout: float = 30):
+        """
+        Останавливает фоновый поток и отправляет накопленные отчеты.
+
+        Args:
+            timeout: Время ожидания завершения потока в секундах
+        """
+        if not self._running:
+            return
+        self._running = False
+        self._wakeup.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        self.flush()
+        self.telegram_api.close()
+
+    def enqueue(self, report: str) -> int:
+        """
+        Ставит отчет в очередь на отправку.
+
+        Args:
+            report: Текст отчета (HTML)
+
+        Returns:
+            Количество отчетов в очереди
+        """
+        with self._lock:
+            if not self._pending:
+                self._first_queued_at = time.monotonic()
+            self._pending.append((datetime.now(), report))
+            if len(self._pending) > self.max_pending:
+                # Отправка давно недоступна: старые отчеты устарели, храним последние
+                dropped = len(self._pending) - self.max_pending
+                del self._pending[:dropped]
+                self.stats["dropped"] += dropped
+                self.logger.warning(f"⚠️ Очередь Telegram переполнена, отброшено старых отчетов: {dropped}")
+            self.stats["queued"] += 1
+            depth = len(self._pending)
+        self._wakeup.set()
+        return depth
+
+    def flush(self) -> bool:
+        """
+        Отправляет все накопленные отчеты в текущем потоке, не дожидаясь окна объединения.
+
+        Сначала досылаются недоставленные части прошлой сводки, затем новые отчеты.
+
+        Returns:
+            True если очередь пуста после отправки
+        """
+        with self._send_lock:
+            with self._lock:
+                partial = self._partial
+            if partial:
+                text, start = partial
+                delivered, total = self.telegram_api.send_message_parts(text, parse_mode="HTML", start=start)
+                if delivered < total:
+                    return self._keep_partial(text, delivered, total)
+                with self._lock:
+                    self._partial = None
+                self.stats["sent"] += 1
+                self.logger.info(f"📨 Дослано частей сводки: {total - start}")
+
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._first_queued_at = None
+            if not batch:
+                return True
+
+            text = self._build_digest(batch)
+            delivered, total = self.telegram_api.send_message_parts(text, parse_mode="HTML")
+            if delivered:
+                self.stats["coalesced"] += len(batch) - 1
+            if delivered == total:
+                self.stats["sent"] += 1
+                if len(batch) > 1:
+                    self.logger.info(f"📨 Отправлена сводка из {len(batch)} отчетов")
+                return True
+
+            if delivered:
+                # Часть сводки уже в чате: повторно отправятся только оставшиеся части
+                return self._keep_partial(text, delivered, total)
+
+            # Ничего не доставлено: возвращаем отчеты в начало очереди, отправятся вместе со следующими
+            with self._lock:
+                self._pending = batch + self._pending
+                self._first_queued_at = time.monotonic()
+                self._retry_at = time.monotonic() + self.retry_delay
+            self.stats["errors"] += 1
+            self.logger.warning(f"⚠️ Отчеты Telegram ({len(batch)}) не отправлены, повтор через {self.retry_delay}с")
+            return False
+
+    def _keep_partial(self, text: str, delivered: int, total: int) -> bool:
+        """
+        Запоминает частично отправленную сводку для досылки после паузы.
+
+        Args:
+            text: Текст сводки
+            delivered: Доставлено частей
+            total: Всего частей
+
+        Returns:
+            False (очередь не пуста)
+        """
+        with self._lock:
+            self._partial = (text, delivered)
+            self._retry_at = time.monotonic() + self.retry_delay
+        self.stats["errors"] += 1
+        self.logger.warning(f"⚠️ Сводка Telegram доставлена частично ({delivered}/{total}), "
+                            f"оставшиеся части через {self.retry_delay}с")
+        return False
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Возвращает метрики очереди: глубину и статистику отправки.
+
+        Returns:
+            Словарь метрик
+        """
+        with self._lock:
+            depth = len(self._pending) + (1 if self._partial else 0)
+            oldest = self._pending[0][0] if self._pending else None
+        metrics = dict(self.stats)
+        metrics.update(depth=depth, lag=(datetime.now() - oldest).total_seconds() if oldest else 0.0)
+        return metrics
+
+    def _worker(self):
+        """Фоновый поток: ждет окончания окна объединения и отправляет сводку."""
+        while self._running:
+            with self._lock:
+                if self._pending:
+                    ready_at = max(self._first_queued_at + self.coalesce_window, self._retry_at)
+                    wait = ready_at - time.monotonic()
+                elif self._partial:
+                    wait = self._retry_at - time.monotonic()
+                else:
+                    wait = None
+            if wait is not None and wait <= 0:
+                try:
+                    self.flush()
+                except Exception as e:
+                    self.logger.error(f"❌ Ошибка фоновой отправки в Telegram: {e}")
+                continue
+            self._wakeup.wait(wait)
+            self._wakeup.clear()
+
+    def _build_digest(self, batch: List[Tuple[datetime, str]]) -> str:
+        """
+        Собирает одно сообщение из накопленных отчетов.
+
+        Args:
+            batch: Отчеты (время постановки, текст)
+
+        Returns:
+            Текст сообщения
+        """
+        if len(batch) == 1:
+            return batch[0][1]
+        parts = [f"📬 <b>Сводка отчетов: {len(batch)}</b>"]
+        for queued_at, report in batch:
+            parts.append(f"🕒 <b>{queued_at.strftime('%H:%M:%S')}</b>\n{report}")
+        return "\n\n".join(parts)
@@ -8,6 +8,7 @@ import os
 from typing import Dict, Any, List
 from .process_handler import ProcessHandler
 from .base_handler import retry
+from .stage_pipeline import StageOutput
 
 
 class TranscriptionHandler(ProcessHandler):
@@ -216,6 +217,28 @@ class TranscriptionHandler(ProcessHandler):
             self.logger.error(f"❌ Ошибка обработки аудио файла {file_path}: {e}")
             return False
     
+    def process_pipeline_item(self, file_path: str):
+        """
+        Транскрибирует один аудио файл на этапе конвейера.
+        
+        Args:
+            file_path: Путь к сжатому аудио файлу
+            
+        Returns:
+            StageOutput с путем к файлу транскрипции для этапа саммари, None
+            если файл не требует обработки, False при ошибке
+        """
+        if not self._should_process_audio_file(file_path):
+            return None
+        
+        if not self._process_audio_file(file_path):
+            return False
+        
+        base_path = os.path.splitext(file_path)[0]
+        if base_path.endswith('_compressed'):
+            base_path = base_path[:-10]
+        return StageOutput(base_path + '__transcript.txt')
+    
     def _get_current_timestamp(self) -> str:
         """
         Получает текущий timestamp.
@@ -9,6 +9,41 @@ from typing import Dict, Any, List
 from datetime import datetime
 
 
+def _notion_client(notion_token: str):
+    """
+    Возвращает общий клиент Notion (одна сессия и общий лимит запросов).
+    
+    Args:
+        notion_token: Токен для API Notion
+        
+    Returns:
+        Клиент Notion
+    """
+    try:
+        from src.handlers.notion_api import get_notion_client
+    except ImportError:
+        from handlers.notion_api import get_notion_client
+    return get_notion_client(notion_token)
+
+
+def _diff_blocks(blocks: List[Dict[str, Any]], previous: List[str]):
+    """
+    Оставляет только блоки, которые еще не добавлялись на страницу.
+    
+    Args:
+        blocks: Блоки для добавления
+        previous: Хеши уже добавленных блоков
+        
+    Returns:
+        Кортеж (новые блоки, хеши всех блоков)
+    """
+    try:
+        from src.handlers.notion_diff import diff_blocks
+    except ImportError:
+        from handlers.notion_diff import diff_blocks
+    return diff_blocks(blocks, previous)
+
+
 def load_meeting_template(template_path: str = "templates/meeting_page_template.json") -> Dict[str, Any]:
     """
     Загружает шаблон страницы встречи из JSON файла.
@@ -243,7 +278,7 @@ def apply_template_to_page(
     Returns:
         True если шаблон успешно применен, False в противном случае
     """
-    import requests
+    notion = _notion_client(notion_token)
     
     headers = {
         "Authorization": f"Bearer {notion_token}",
@@ -262,7 +297,7 @@ def apply_template_to_page(
             print(f"⚠️ В шаблоне отсутствует поле 'children'")
             return False
             
-        response = requests.patch(url, headers=headers, json=template_data)
+        response = notion.patch(url, headers=headers, json=template_data)
         response.raise_for_status()
         return True
     except Exception as e:
@@ -277,21 +312,26 @@ def add_meeting_details_to_page(
     notion_token: str,
     page_id: str,
     event_data: Dict[str, Any],
-    logger=None
+    logger=None,
+    state_manager=None
 ) -> bool:
     """
     Добавляет детальную информацию о встрече на страницу Notion.
     
+    Если передан state_manager, добавляются только блоки, которых еще не было
+    на странице после предыдущих вызовов; при отсутствии новых блоков запрос не выполняется.
+    
     Args:
         notion_token: Токен для API Notion
         page_id: ID страницы для обновления
         event_data: Данные события
         logger: Логгер (опционально)
+        state_manager: StateManager с хешами уже добавленных блоков (опционально)
         
     Returns:
         True если информация успешно добавлена, False в противном случае
     """
-    import requests
+    notion = _notion_client(notion_token)
     
     headers = {
         "Authorization": f"Bearer {notion_token}",
@@ -397,13 +437,25 @@ def add_meeting_details_to_page(
             }
         })
     
+    # Оставляем только блоки, которых еще нет на странице
+    block_hashes = None
+    if state_manager is not None and detail_blocks:
+        detail_blocks, block_hashes = _diff_blocks(detail_blocks, state_manager.get_page_hashes(page_id)['blocks'])
+        if not detail_blocks:
+            if logger:
+                logger.info(f"⏭️ Детальная информация на странице {page_id} не изменилась")
+            return True
+    
     # Если есть детали для добавления
     if detail_blocks:
         try:
             url = f"https://api.notion.com/v1/blocks/{page_id}/children"
-            response = requests.patch(url, headers=headers, json={"children": detail_blocks})
+            response = notion.patch(url, headers=headers, json={"children": detail_blocks})
             response.raise_for_status()
             
+            if block_hashes is not None:
+                state_manager.save_page_hashes(page_id, blocks=block_hashes)
+            
             if logger:
                 logger.info(f"✅ Детальная информация о встрече добавлена на страницу {page_id}")
             else:
@@ -438,7 +490,7 @@ def create_simple_notion_page(
     Returns:
         ID созданной страницы или пустая строка в случае ошибки
     """
-    import requests
+    notion = _notion_client(notion_token)
     
     headers = {
         "Authorization": f"Bearer {notion_token}",
@@ -573,7 +625,7 @@ def create_simple_notion_page(
             print(f"   Название: {event_data.get('title', 'Встреча без названия')}")
             print(f"   Свойства: {list(notion_properties.keys())}")
         
-        response = requests.post(
+        response = notion.post(
             "https://api.notion.com/v1/pages",
             headers=headers,
             json=create_data
@@ -611,7 +663,8 @@ def check_page_exists(
     database_id: str,
     event_title: str,
     event_date: str,
-    logger=None
+    logger=None,
+    mirror=None
 ) -> str:
     """
     Проверяет, существует ли уже страница для события с таким названием и датой.
@@ -621,11 +674,23 @@ def check_page_exists(
         database_id: ID базы данных
         event_title: Название события
         event_date: Дата события
+        logger: Логгер
+        mirror: Локальное зеркало базы (NotionMirror); если задано, запрос к API не выполняется
         
     Returns:
         ID существующей страницы или пустая строка, если страница не найдена
     """
-    import requests
+    # Ищем в локальном зеркале базы, если оно доступно и актуально
+    if mirror is not None and mirror.ensure_fresh():
+        existing_page_id = mirror.find_page(title=event_title, event_date=event_date) if event_date else None
+        if existing_page_id:
+            if logger:
+                logger.info(f"🔍 Найдена существующая страница: {existing_page_id}")
+            else:
+                print(f"🔍 Найдена существующая страница: {existing_page_id}")
+        return existing_page_id or ""
+    
+    notion = _notion_client(notion_token)
     
     headers = {
         "Authorization": f"Bearer {notion_token}",
@@ -656,7 +721,7 @@ def check_page_exists(
     }
     
     try:
-        response = requests.post(url, headers=headers, json=query_data)
+        response = notion.post(url, headers=headers, json=query_data)
         response.raise_for_status()
         
         results = response.json().get("results", [])
@@ -684,7 +749,9 @@ def create_page_with_template(
     database_id: str,
     event_data: Dict[str, Any],
     template: Dict[str, Any],
-    logger=None
+    logger=None,
+    mirror=None,
+    state_manager=None
 ) -> str:
     """
     Создает новую страницу в базе данных с применением шаблона.
@@ -694,6 +761,9 @@ def create_page_with_template(
         database_id: ID базы данных
         event_data: Данные события
         template: Шаблон для применения
+        logger: Логгер
+        mirror: Локальное зеркало базы (NotionMirror) для проверки существования страницы
+        state_manager: StateManager с хешами добавленных блоков (повторно добавляются только новые блоки)
         
     Returns:
         ID созданной страницы или пустая строка в случае ошибки
@@ -704,7 +774,8 @@ def create_page_with_template(
         database_id, 
         event_data.get("title", ""), 
         event_data.get("date", ""),
-        logger
+        logger,
+        mirror
     )
     
     if existing_page_id:
@@ -719,7 +790,8 @@ def create_page_with_template(
         else:
             print(f"🔧 Добавляю детальную информацию на существующую страницу {existing_page_id}...")
         
-        add_meeting_details_to_page(notion_token, existing_page_id, event_data, logger)
+        add_meeting_details_to_page(notion_token, existing_page_id, event_data, logger,
+                                    state_manager=state_manager)
         
         return existing_page_id
     
@@ -728,6 +800,10 @@ def create_page_with_template(
     if not page_id:
         return ""
     
+    # Новая страница сразу попадает в зеркало, чтобы не создать дубликат до следующей синхронизации
+    if mirror is not None:
+        mirror.remember_page(page_id, event_data)
+    
     # Теперь попробуем применить шаблон
     if logger:
         logger.info(f"🔧 Применяю шаблон к странице {page_id}...")
@@ -746,7 +822,8 @@ def create_page_with_template(
         else:
             print(f"🔧 Добавляю детальную информацию о встрече на страницу {page_id}...")
         
-        add_meeting_details_to_page(notion_token, page_id, event_data, logger)
+        add_meeting_details_to_page(notion_token, page_id, event_data, logger,
+                                    state_manager=state_manager)
         
         return page_id
     else:
@@ -757,13 +834,16 @@ def create_page_with_template(
         return page_id
 
 
-def create_meeting_page(event_data: Dict[str, Any], config_manager) -> Dict[str, Any]:
+def create_meeting_page(event_data: Dict[str, Any], config_manager, mirror=None,
+                        state_manager=None) -> Dict[str, Any]:
     """
     Создает страницу встречи в Notion.
     
     Args:
         event_data: Данные события
         config_manager: Менеджер конфигурации
+        mirror: Локальное зеркало базы (NotionMirror)
+        state_manager: StateManager с хешами добавленных блоков
         
     Returns:
         Результат создания страницы
@@ -796,7 +876,9 @@ def create_meeting_page(event_data: Dict[str, Any], config_manager) -> Dict[str,
             notion_token, 
             database_id, 
             event_data, 
-            template
+            template,
+            mirror=mirror,
+            state_manager=state_manager
         )
         
         if page_id:
@@ -820,7 +902,8 @@ def create_meeting_page(event_data: Dict[str, Any], config_manager) -> Dict[str,
         }
 
 
-def update_meeting_page(page_id: str, update_data: Dict[str, Any], config_manager) -> Dict[str, Any]:
+def update_meeting_page(page_id: str, update_data: Dict[str, Any], config_manager,
+                        state_manager=None) -> Dict[str, Any]:
     """
     Обновляет страницу встречи в Notion.
     
@@ -828,6 +911,7 @@ def update_meeting_page(page_id: str, update_data: Dict[str, Any], config_manage
         page_id: ID страницы
         update_data: Данные для обновления
         config_manager: Менеджер конфигурации
+        state_manager: StateManager с хешами добавленных блоков
         
     Returns:
         Результат обновления страницы
@@ -845,7 +929,7 @@ def update_meeting_page(page_id: str, update_data: Dict[str, Any], config_manage
             }
         
         # Добавляем детальную информацию на страницу
-        add_meeting_details_to_page(notion_token, page_id, update_data)
+        add_meeting_details_to_page(notion_token, page_id, update_data, state_manager=state_manager)
         
         return {
             "status": "success",
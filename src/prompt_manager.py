@@ -7,6 +7,7 @@ TASK-3: Управление конфигурируемыми промптами
 """
 
 import os
+import re
 import json
 import logging
 from typing import Dict, Any, Optional, List
@@ -28,6 +29,32 @@ from config.prompt_settings import (
     OUTPUT_FORMAT_SETTINGS
 )
 
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+# Окно контекста моделей в токенах (по префиксу имени), если не задано OPENAI_CONTEXT_WINDOW
+MODEL_CONTEXT_WINDOWS = {
+    'gpt-4o': 128000,
+    'gpt-4-turbo': 128000,
+    'gpt-4': 8192,
+    'gpt-3.5-turbo': 16385,
+}
+DEFAULT_CONTEXT_WINDOW = 16385
+
+# Служебные токены формата чата: на каждое сообщение и на начало ответа
+MESSAGE_TOKEN_OVERHEAD = 4
+REPLY_TOKEN_OVERHEAD = 3
+
+# Доля окна, оставляемая в запас на неточность подсчета (без tiktoken - оценка по длине)
+CONTEXT_SAFETY_MARGIN = 0.05
+
+# Заголовок файла транскрипции: от "# Транскрипция файла" до "## Содержание:"
+_TRANSCRIPT_HEADER_RE = re.compile(r'\A\s*# Транскрипция[^\n]*\n.*?^## Содержание:[ \t]*\n', re.S | re.M)
+
 
 class PromptManager:
     """Менеджер для управления конфигурируемыми промптами."""
@@ -60,12 +87,23 @@ class PromptManager:
         self.style_settings = STYLE_SETTINGS
         self.output_format_settings = OUTPUT_FORMAT_SETTINGS
         
+        # Токенизаторы по моделям (создаются при первом подсчете)
+        self._encodings = {}
+        openai_config = config_manager.get_openai_config() if hasattr(config_manager, 'get_openai_config') else {}
+        self.context_window = int(openai_config.get('context_window', 0) or 0)
+        # Модель и ответ по умолчанию для промптов без типа (как у анализа транскрипций)
+        self.default_model = openai_config.get('analysis_model', 'gpt-4o-mini')
+        self.default_max_tokens = int(openai_config.get('analysis_max_tokens', 4000) or 0)
+        
         self.logger.info("🔧 PromptManager инициализирован")
     
     def get_prompt(self, prompt_type: str, custom_prompt: str = None) -> str:
         """
         Получить промпт указанного типа.
         
+        Промпт считается токенизатором модели из настроек типа: если вместе с
+        ответом (max_tokens) он не помещается в окно модели, он обрезается.
+        
         Args:
             prompt_type: Тип промпта
             custom_prompt: Пользовательский промпт (если есть)
@@ -77,15 +115,17 @@ class PromptManager:
             # Проверяем, есть ли пользовательский промпт
             if custom_prompt and custom_prompt.strip():
                 self.logger.info(f"🔧 Используется пользовательский промпт для {prompt_type}")
-                return custom_prompt
-            
-            # Используем базовый промпт
-            if prompt_type in self.base_prompts:
+                prompt = custom_prompt
+            elif prompt_type in self.base_prompts:
+                # Используем базовый промпт
                 self.logger.info(f"🔧 Используется базовый промпт для {prompt_type}")
-                return self.base_prompts[prompt_type]
+                prompt = self.base_prompts[prompt_type]
             else:
                 self.logger.warning(f"⚠️ Неизвестный тип промпта: {prompt_type}")
                 return ""
+            
+            model, max_tokens = self._get_model_limits(prompt_type)
+            return self._fit_placeholder('', '', prompt, model, max_tokens)
                 
         except Exception as e:
             self.logger.error(f"❌ Ошибка получения промпта {prompt_type}: {e}")
@@ -213,13 +253,18 @@ class PromptManager:
             self.logger.error(f"❌ Ошибка получения настроек формата вывода: {e}")
             return self.output_format_settings['json']
     
-    def customize_prompt(self, base_prompt: str, customizations: Dict[str, Any]) -> str:
+    def customize_prompt(self, base_prompt: str, customizations: Dict[str, Any], prompt_type: str = None) -> str:
         """
         Кастомизировать базовый промпт.
         
+        Самое длинное подставляемое значение (обычно текст транскрипции)
+        подгоняется под окно модели: оно обрезается так, чтобы весь промпт вместе
+        с ответом (max_tokens) поместился в контекст.
+        
         Args:
             base_prompt: Базовый промпт
             customizations: Кастомизации
+            prompt_type: Тип промпта для выбора модели и max_tokens (по умолчанию - настройки анализа)
             
         Returns:
             Кастомизированный промпт
@@ -227,13 +272,22 @@ class PromptManager:
         try:
             customized_prompt = base_prompt
             
-            # Применяем кастомизации
-            for key, value in customizations.items():
-                if isinstance(value, str) and value:
-                    # Заменяем плейсхолдеры в промпте
-                    placeholder = f"{{{key}}}"
-                    if placeholder in customized_prompt:
-                        customized_prompt = customized_prompt.replace(placeholder, str(value))
+            # Значения для плейсхолдеров, которые есть в промпте
+            values = {
+                f"{{{key}}}": str(value) for key, value in customizations.items()
+                if isinstance(value, str) and value and f"{{{key}}}" in base_prompt
+            }
+            longest = max(values, key=lambda placeholder: len(values[placeholder])) if values else None
+            
+            # Применяем кастомизации (кроме самого длинного значения)
+            for placeholder, value in values.items():
+                if placeholder != longest:
+                    customized_prompt = customized_prompt.replace(placeholder, value)
+            
+            if longest:
+                model, max_tokens = self._get_model_limits(prompt_type)
+                customized_prompt = self._fit_placeholder(customized_prompt, longest, values[longest],
+                                                          model, max_tokens)
             
             self.logger.info(f"🔧 Промпт кастомизирован с {len(customizations)} параметрами")
             return customized_prompt
@@ -242,6 +296,190 @@ class PromptManager:
             self.logger.error(f"❌ Ошибка кастомизации промпта: {e}")
             return base_prompt
     
+    def _get_model_limits(self, prompt_type: str = None):
+        """
+        Модель и максимум токенов ответа для типа промпта.
+        
+        Args:
+            prompt_type: Тип промпта (None - настройки анализа из OpenAI конфигурации)
+            
+        Returns:
+            Кортеж (модель, max_tokens)
+        """
+        settings = self.get_prompt_settings(prompt_type) if prompt_type else {}
+        return (settings.get('model') or self.default_model,
+                int(settings.get('max_tokens') or self.default_max_tokens))
+    
+    def _fit_placeholder(self, prompt: str, placeholder: str, value: str, model: str, max_tokens: int) -> str:
+        """
+        Подставить значение в промпт, обрезав его до остатка окна модели.
+        
+        Args:
+            prompt: Промпт с плейсхолдером (пустая строка - значение и есть весь промпт)
+            placeholder: Плейсхолдер вида {key}
+            value: Подставляемое значение
+            model: Модель
+            max_tokens: Максимум токенов ответа
+            
+        Returns:
+            Промпт с подставленным значением
+        """
+        fixed = prompt.replace(placeholder, '') if placeholder else prompt
+        overhead = self.count_tokens(fixed, model) + MESSAGE_TOKEN_OVERHEAD + REPLY_TOKEN_OVERHEAD
+        budget = max(0, int(self.get_context_window(model) * (1 - CONTEXT_SAFETY_MARGIN)) - overhead - max_tokens)
+        value_tokens = self.count_tokens(value, model)
+        if value_tokens > budget:
+            self.logger.warning(f"⚠️ Промпт ({overhead + value_tokens} токенов) не помещается в окно {model}, "
+                                f"подставляемый текст обрезан до {budget} токенов")
+            value = self.truncate_to_tokens(value, budget, model)
+            value_tokens = self.count_tokens(value, model)
+        self.logger.debug(f"🔢 Промпт для {model}: {overhead + value_tokens} токенов, ответ до {max_tokens}")
+        return prompt.replace(placeholder, value) if placeholder else value
+    
+    def count_tokens(self, text: str, model: str = None) -> int:
+        """
+        Подсчитать токены текста токенизатором модели.
+        
+        Без tiktoken используется оценка по длине (русский текст - около 3 символов на токен).
+        
+        Args:
+            text: Текст
+            model: Модель (по умолчанию - кодировка cl100k_base)
+            
+        Returns:
+            Количество токенов
+        """
+        encoding = self._get_encoding(model)
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+        return len(text) // 3 + 1
+    
+    def get_context_window(self, model: str) -> int:
+        """
+        Получить размер окна контекста модели.
+        
+        Args:
+            model: Модель
+            
+        Returns:
+            Размер окна в токенах (OPENAI_CONTEXT_WINDOW или по имени модели)
+        """
+        if self.context_window:
+            return self.context_window
+        for prefix in sorted(MODEL_CONTEXT_WINDOWS, key=len, reverse=True):
+            if (model or '').startswith(prefix):
+                return MODEL_CONTEXT_WINDOWS[prefix]
+        return DEFAULT_CONTEXT_WINDOW
+    
+    def strip_transcript_header(self, text: str) -> str:
+        """
+        Убрать служебный заголовок файла транскрипции (имя файла, дата, статус, модель).
+        
+        Заголовок не несет смысла для модели, но тратит токены и меняет хеш
+        содержимого при каждой повторной транскрипции.
+        
+        Args:
+            text: Содержимое файла транскрипции
+            
+        Returns:
+            Текст транскрипции без заголовка
+        """
+        return _TRANSCRIPT_HEADER_RE.sub('', text, count=1)
+    
+    def truncate_to_tokens(self, text: str, max_tokens: int, model: str = None) -> str:
+        """
+        Обрезать текст до указанного количества токенов, по возможности по границе строки.
+        
+        Args:
+            text: Текст
+            max_tokens: Максимум токенов
+            model: Модель
+            
+        Returns:
+            Обрезанный текст
+        """
+        if max_tokens <= 0:
+            return ""
+        encoding = self._get_encoding(model)
+        if encoding is not None:
+            tokens = encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            truncated = encoding.decode(tokens[:max_tokens])
+        else:
+            if len(text) // 3 + 1 <= max_tokens:
+                return text
+            truncated = text[:max_tokens * 3]
+        line_end = truncated.rfind('\n')
+        if line_end > len(truncated) * 0.8:
+            truncated = truncated[:line_end]
+        return truncated.rstrip()
+    
+    def get_content_budget(self, system_prompt: str, prompt_template: str, model: str, max_tokens: int) -> int:
+        """
+        Получить количество токенов, доступное содержимому в шаблоне промпта.
+        
+        Args:
+            system_prompt: Системный промпт
+            prompt_template: Шаблон пользовательского промпта с {content}
+            model: Модель
+            max_tokens: Максимум токенов ответа
+            
+        Returns:
+            Бюджет токенов содержимого
+        """
+        window = self.get_context_window(model)
+        overhead = (self.count_tokens(system_prompt, model) + self.count_tokens(prompt_template.format(content=''), model)
+                    + 2 * MESSAGE_TOKEN_OVERHEAD + REPLY_TOKEN_OVERHEAD)
+        return max(0, int(window * (1 - CONTEXT_SAFETY_MARGIN)) - overhead - max_tokens)
+    
+    def fit_prompt(self, system_prompt: str, prompt_template: str, content: str, model: str,
+                   max_tokens: int) -> Dict[str, Any]:
+        """
+        Подогнать содержимое под окно модели с учетом промпта и ответа.
+        
+        Длинные тексты должны заранее делиться на фрагменты по get_content_budget;
+        здесь содержимое, которое все же не помещается, обрезается, чтобы запрос не
+        упал на стороне API после отправки всего текста.
+        
+        Args:
+            system_prompt: Системный промпт
+            prompt_template: Шаблон пользовательского промпта с {content}
+            content: Содержимое
+            model: Модель
+            max_tokens: Максимум токенов ответа
+            
+        Returns:
+            Словарь {"content", "prompt_tokens", "content_budget", "truncated"}
+        """
+        budget = self.get_content_budget(system_prompt, prompt_template, model, max_tokens)
+        content_tokens = self.count_tokens(content, model)
+        truncated = content_tokens > budget
+        if truncated:
+            self.logger.warning(f"⚠️ Содержимое ({content_tokens} токенов) не помещается в окно {model}, "
+                                f"обрезано до {budget} токенов")
+            content = self.truncate_to_tokens(content, budget, model)
+            content_tokens = self.count_tokens(content, model)
+        prompt_tokens = (self.count_tokens(system_prompt, model) + self.count_tokens(prompt_template.format(content=''), model)
+                         + content_tokens + 2 * MESSAGE_TOKEN_OVERHEAD + REPLY_TOKEN_OVERHEAD)
+        return {"content": content, "prompt_tokens": prompt_tokens, "content_budget": budget, "truncated": truncated}
+    
+    def _get_encoding(self, model: str = None):
+        """Токенизатор tiktoken для модели или None, если tiktoken недоступен."""
+        if not TIKTOKEN_AVAILABLE:
+            return None
+        key = model or ''
+        if key not in self._encodings:
+            try:
+                self._encodings[key] = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding('cl100k_base')
+            except Exception:
+                try:
+                    self._encodings[key] = tiktoken.get_encoding('cl100k_base')
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Токенизатор tiktoken недоступен, используется оценка по длине: {e}")
+                    self._encodings[key] = None
+        return self._encodings[key]
+    
     def save_debug_prompt(self, prompt_type: str, prompt: str, settings: Dict[str, Any]):
         """
         Сохранить промпт для отладки.
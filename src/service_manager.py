@@ -14,7 +14,6 @@ import logging
 import uuid
 from logging.handlers import RotatingFileHandler
 import threading
-import subprocess
 import traceback
 import concurrent.futures
 from datetime import datetime, timedelta
@@ -49,6 +48,12 @@ try:
     )
     from src.handlers.smart_report_generator import SmartReportGenerator
     from src.handlers.state_manager import StateManager
+    from src.handlers.stage_pipeline import StagePipeline
+    from src.handlers.task_graph import MeetingTaskGraph, DagRunner
+    from src.handlers.notion_outbox import NotionOutbox
+    from src.handlers.telegram_outbox import TelegramOutbox
+    from src.handlers.llm_executor import get_llm_executor
+    from src.telegram_api import TelegramAPI
     NEW_HANDLERS_AVAILABLE = True
     print("✅ Новые модульные обработчики загружены")
 except ImportError as e:
@@ -145,6 +150,24 @@ class MeetingAutomationService:
         self.current_cycle_state = {}
         self.cycle_counter = 0  # Счетчик выполненных циклов
         
+        # Состояние детектора простоя: mtime папок встреч и токены календаря
+        self._workspace_snapshot = {}
+        self._calendar_tokens = {}
+        self._meeting_ends = []
+        self._last_full_cycle = 0
+        self._last_cycle_processed = 0
+        
+        # Событие для прерывания ожидания следующего цикла
+        self._wakeup = threading.Event()
+        
+        # Тяжелые этапы продолжают выполняться в фоне между циклами
+        self.background_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="background")
+        self._processing_future = None
+        self.dag_runner = None
+        self.notion_outbox = None
+        self.telegram_api = None
+        self.telegram_outbox = None
+        
         # Флаг работы сервиса
         self.running = False
         self.thread = None
@@ -163,7 +186,9 @@ class MeetingAutomationService:
             'cpu_usage': [],
             'memory_usage': [],
             'disk_usage': [],
-            'cycle_times': []
+            'cycle_times': [],
+            'notion_outbox_depth': [],
+            'notion_outbox_lag': []
         }
         
         # Загружаем кэш из файла, если он существует
@@ -184,23 +209,43 @@ class MeetingAutomationService:
             # Сначала создаем notion_handler
             self.notion_handler = NotionHandler(self.config_manager, None, self.logger)
             
-            # Сначала создаем notion_handler
-            self.notion_handler = NotionHandler(self.config_manager, None, self.logger)
-            
-            # Затем создаем account_handler с notion_handler
-            self.account_handler = AccountHandler(self.config_manager, None, self.notion_handler, self.logger)
-            self.transcription_handler_new = TranscriptionHandler(self.config_manager, None, self.logger)
-            self.summary_handler = SummaryHandler(self.config_manager, None, self.logger)
-            # Передаем self (ServiceManager) в MediaHandler для доступа к кэшу
-            self.media_handler = MediaHandler(self.config_manager, None, self.logger, service_manager=self)
+            # Календарь и интеграция создаются один раз и переиспользуются всеми циклами
             self.calendar_handler = CalendarHandler(self.config_manager, self.logger)
             self.logger.info(f"📅 CalendarHandler создан: {type(self.calendar_handler).__name__}")
             
             self.calendar_integration_handler = CalendarIntegrationHandler(self.config_manager, self.notion_handler, self.calendar_handler, self.logger)
             self.logger.info(f"📅 CalendarIntegrationHandler создан с calendar_handler: {type(self.calendar_integration_handler.calendar_handler).__name__}")
+            
+            # Затем создаем account_handler с теми же (прогретыми) обработчиками
+            self.account_handler = AccountHandler(self.config_manager, self.calendar_handler, self.notion_handler, self.logger,
+                                                  calendar_integration_handler=self.calendar_integration_handler)
+            self.transcription_handler_new = TranscriptionHandler(self.config_manager, None, self.logger)
+            self.summary_handler = SummaryHandler(self.config_manager, None, self.logger)
+            # Передаем self (ServiceManager) в MediaHandler для доступа к кэшу
+            self.media_handler = MediaHandler(self.config_manager, None, self.logger, service_manager=self)
             self.metrics_handler = MetricsHandler(self.config_manager, self.logger)
             self.smart_report_generator = SmartReportGenerator(self.logger)
             self.state_manager = StateManager(logger=self.logger)
+            self.task_graph = MeetingTaskGraph(
+                self.state_manager, self.media_handler, self.transcription_handler_new,
+                self.summary_handler, self.config_manager, self.logger
+            )
+            if self.config_manager.get_notion_config().get('outbox_enabled', False):
+                # Изменения Notion отправляются фоновым потоком из очереди
+                self.notion_outbox = NotionOutbox(self.config_manager, self.state_manager, self.notion_handler, self.logger)
+                self.logger.info("✅ Очередь изменений Notion включена")
+            telegram_config = self.config_manager.get_telegram_config()
+            if telegram_config.get('bot_token') and telegram_config.get('chat_id'):
+                # Отчеты отправляются в процессе сервиса через одну HTTP сессию
+                self.telegram_api = TelegramAPI(telegram_config)
+                if telegram_config.get('queue_enabled', True):
+                    self.telegram_outbox = TelegramOutbox(self.config_manager, self.telegram_api, self.logger)
+                    self.logger.info("✅ Очередь уведомлений Telegram включена")
+            if self.config_manager.get_task_graph_config().get('enabled', False):
+                # Notion обновляется задачей графа, а не при пометке транскрипций/саммари
+                for handler in (self.transcription_handler_new, self.summary_handler):
+                    if handler.state_manager:
+                        handler.state_manager.auto_notion_updates = False
             self.logger.info("✅ SmartReportGenerator инициализирован")
             self.logger.info("✅ StateManager инициализирован")
             self.logger.info("✅ CalendarHandler инициализирован")
@@ -875,9 +920,12 @@ class MeetingAutomationService:
             # Формируем умный отчет через SmartReportGenerator
             self.logger.info("🔍 Использую SmartReportGenerator для формирования отчета...")
             try:
+                # Очереди этапов читаются из агрегатов StateManager без сканирования таблиц
+                stage_backlog = self.state_manager.get_stage_backlog()
                 report = self.smart_report_generator.generate_smart_report(
                     current_state, previous_state, 
-                    current_state.get('execution_time', 0) if current_state else 0
+                    current_state.get('execution_time', 0) if current_state else 0,
+                    stage_backlog=stage_backlog
                 )
                 self.logger.info(f"🔍 SmartReportGenerator вернул: {type(report)}, длина: {len(report) if report else 0}")
             except Exception as e:
@@ -895,31 +943,26 @@ class MeetingAutomationService:
             self.logger.info(f"🔍 Содержимое отчета (первые 200 символов): {report[:200]}...")
             self.logger.info(f"🔍 Полный отчет: {report}")
             
-            cmd = [
-                sys.executable,
-                'meeting_automation_universal.py',
-                'notify',
-                '--message', report,
-                '--notification_type', 'detailed'
-            ]
-            
-            self.logger.info(f"🔄 Запуск команды: {' '.join(cmd[:4])}...")
-            
-            process = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # Логируем результат выполнения команды
-            self.logger.info(f"🔍 Команда выполнена: returncode={process.returncode}")
-            if process.stdout:
-                self.logger.info(f"🔍 stdout: {process.stdout}")
-            if process.stderr:
-                self.logger.info(f"🔍 stderr: {process.stderr}")
+            if not self.telegram_api:
+                self.logger.error("❌ Telegram не настроен")
+                return {"status": "error", "message": "Telegram not configured"}
+            
+            if self.telegram_outbox:
+                depth = self.telegram_outbox.enqueue(report)
+                if self.telegram_outbox.running:
+                    self.logger.info(f"📨 Отчет поставлен в очередь Telegram (в очереди: {depth})")
+                    return {"status": "queued", "message": f"Report queued ({depth} pending)"}
+                # Фоновый поток не запущен (одиночный цикл): отправляем сразу
+                sent = self.telegram_outbox.flush()
+            else:
+                sent = self.telegram_api.send_message(report, parse_mode="HTML")
             
-            if process.returncode == 0:
+            if sent:
                 self.logger.info("✅ Детальный отчет отправлен в Telegram успешно")
                 return {"status": "success", "message": "Detailed report sent"}
             else:
-                self.logger.error(f"❌ Ошибка отправки детального отчета: {process.stderr}")
-                return {"status": "error", "message": process.stderr}
+                self.logger.error("❌ Ошибка отправки детального отчета")
+                return {"status": "error", "message": "Telegram delivery failed"}
             
         except Exception as e:
             self.logger.error(f"❌ Ошибка отправки уведомлений: {e}")
@@ -956,8 +999,13 @@ class MeetingAutomationService:
             self.logger.error(f"❌ Ошибка форматирования сообщения: {e}")
             return f"❌ Ошибка формирования статуса: {str(e)}"
     
-    def create_status_files(self):
-        """Создание файлов статуса в папках аккаунтов."""
+    def create_status_files(self, changed_folders: Optional[set] = None):
+        """
+        Создание файлов статуса в папках аккаунтов.
+        
+        Args:
+            changed_folders: Изменившиеся папки встреч (None - обновить все)
+        """
         try:
             self.logger.info("📁 Создаю файлы статуса в папках аккаунтов...")
             
@@ -966,10 +1014,11 @@ class MeetingAutomationService:
                 personal_folder = personal_config.get('local_drive_root')
                 self.logger.info(f"🔍 Личный аккаунт: папка = {personal_folder}, существует = {os.path.exists(personal_folder) if personal_folder else False}")
                 if personal_folder and os.path.exists(personal_folder):
-                    # Создаем статус в корневой папке
-                    self._create_folder_status_file(personal_folder, "personal")
-                    # Создаем статус в каждой папке встречи
-                    self._create_meeting_status_files(personal_folder, "personal")
+                    if self._has_changed_folders(personal_folder, changed_folders):
+                        # Создаем статус в корневой папке
+                        self._create_folder_status_file(personal_folder, "personal")
+                        # Создаем статус в каждой папке встречи
+                        self._create_meeting_status_files(personal_folder, "personal", changed_folders)
                 else:
                     self.logger.warning(f"⚠️ Папка личного аккаунта недоступна: {personal_folder}")
             
@@ -978,10 +1027,11 @@ class MeetingAutomationService:
                 work_folder = work_config.get('local_drive_root')
                 self.logger.info(f"🔍 Рабочий аккаунт: папка = {work_folder}, существует = {os.path.exists(work_folder) if work_folder else False}")
                 if work_folder and os.path.exists(work_folder):
-                    # Создаем статус в корневой папке
-                    self._create_folder_status_file(work_folder, "work")
-                    # Создаем статус в каждой папке встречи
-                    self._create_meeting_status_files(work_folder, "work")
+                    if self._has_changed_folders(work_folder, changed_folders):
+                        # Создаем статус в корневой папке
+                        self._create_folder_status_file(work_folder, "work")
+                        # Создаем статус в каждой папке встречи
+                        self._create_meeting_status_files(work_folder, "work", changed_folders)
                 else:
                     self.logger.warning(f"⚠️ Папка рабочего аккаунта недоступна: {work_folder}")
             
@@ -1014,13 +1064,21 @@ class MeetingAutomationService:
         except Exception as e:
             self.logger.error(f"❌ Ошибка создания файла статуса для {folder_path}: {e}")
     
-    def _create_meeting_status_files(self, root_folder: str, account_type: str):
-        """Создание файлов статуса в каждой папке встречи."""
+    def _has_changed_folders(self, root_folder: str, changed_folders: Optional[set]) -> bool:
+        """Проверяет, изменилась ли корневая папка аккаунта или хотя бы одна папка встречи в ней."""
+        if changed_folders is None:
+            return True
+        return any(folder == root_folder or os.path.dirname(folder) == root_folder for folder in changed_folders)
+    
+    def _create_meeting_status_files(self, root_folder: str, account_type: str, changed_folders: Optional[set] = None):
+        """Создание файлов статуса в папках встреч (только изменившихся, если список передан)."""
         try:
             # Ищем все папки встреч (папки с датами)
             meeting_folders = []
             for item in os.listdir(root_folder):
                 item_path = os.path.join(root_folder, item)
+                if changed_folders is not None and item_path not in changed_folders:
+                    continue
                 if os.path.isdir(item_path) and any(char.isdigit() for char in item):
                     meeting_folders.append(item_path)
             
@@ -1138,7 +1196,8 @@ class MeetingAutomationService:
         """Мониторинг производительности системы."""
         try:
             # Получаем текущие показатели системы
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Без блокировки: загрузка CPU с момента предыдущего вызова
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory_info = psutil.virtual_memory()
             memory_percent = memory_info.percent
             disk_info = psutil.disk_usage('/')
@@ -1164,9 +1223,6 @@ class MeetingAutomationService:
             self.logger.info(f"   Память: {memory_percent:.1f}% ({memory_info.used / (1024 ** 3):.1f} ГБ / {memory_info.total / (1024 ** 3):.1f} ГБ)")
             self.logger.info(f"   Диск: {disk_percent:.1f}% ({disk_info.used / (1024 ** 3):.1f} ГБ / {disk_info.total / (1024 ** 3):.1f} ГБ)")
             
-            # Сохраняем статистику производительности в файл
-            self._save_performance_stats()
-            
             return {
                 'cpu_percent': cpu_percent,
                 'memory_percent': memory_percent,
@@ -1212,8 +1268,8 @@ class MeetingAutomationService:
             # Мониторинг производительности в начале цикла
             self._monitor_performance()
             
-            # Загружаем предыдущее состояние
-            self.previous_cycle_state = self._load_previous_state()
+            # Предыдущее состояние берем из памяти, с диска - только после перезапуска
+            self.previous_cycle_state = self.current_cycle_state or self._load_previous_state()
             
             # Обновляем кэш перед запуском цикла
             self._load_cache()
@@ -1254,36 +1310,40 @@ class MeetingAutomationService:
                     work_duration = time.time() - work_start
                     self.logger.info(f"⏱️ Время обработки рабочего аккаунта: {work_duration:.2f} секунд")
             
-            # Этап 2: Сжатие медиа → выделение MP3
-            self.logger.info("🎬 ЭТАП 2: Обработка медиа файлов...")
-            media_start = time.time()
-            media_stats = self.process_media_files()
-            media_duration = time.time() - media_start
-            self.logger.info(f"⏱️ Время обработки медиа: {media_duration:.2f} секунд")
-            self.logger.info(f"📊 Результат обработки медиа: {media_stats}")
-            
-            # Этап 3: Транскрипция
-            self.logger.info("🎤 ЭТАП 3: Транскрипция аудио...")
-            self.logger.info("🔍 Проверка наличия аудио файлов для транскрипции...")
-            transcription_start = time.time()
-            transcription_stats = self.process_audio_transcription()
-            transcription_duration = time.time() - transcription_start
-            self.logger.info(f"⏱️ Время транскрипции: {transcription_duration:.2f} секунд")
-            self.logger.info(f"📊 Результат транскрипции: обработано {transcription_stats.get('processed', 0)}, ошибок {transcription_stats.get('errors', 0)}")
-            
-            # Этап 4: Саммари и другая полезная информация (если включено)
-            summary_config = self.config_manager.get_summary_config()
-            if summary_config.get('enable_general_summary', False) or summary_config.get('enable_complex_summary', False):
-                self.logger.info("📋 ЭТАП 4: Генерация саммари и анализ транскрипций...")
-                summary_start = time.time()
-                summary_stats, notion_update_stats = self.process_summaries()
-                summary_duration = time.time() - summary_start
-                self.logger.info(f"⏱️ Время генерации саммари: {summary_duration:.2f} секунд")
-                self.logger.info(f"📊 Результат генерации саммари: обработано {summary_stats.get('processed', 0)}, ошибок {summary_stats.get('errors', 0)}")
+            # Изменения Notion из этапа 1 уже в очереди - отправляем их, не дожидаясь опроса
+            if self.notion_outbox:
+                self.notion_outbox.wake()
+            
+            # Если папки встреч и календарь не изменились, остальные этапы пропускаем
+            changes = self._detect_changes(personal_stats, work_stats)
+            if changes['idle']:
+                total_duration = time.time() - start_time
+                self.performance_stats['cycle_times'].append(total_duration)
+                if len(self.performance_stats['cycle_times']) > 100:
+                    self.performance_stats['cycle_times'] = self.performance_stats['cycle_times'][-100:]
+                self._last_cycle_processed = 0
+                self.logger.info(f"💤 Изменений нет, этапы 2-6 пропущены (цикл {total_duration:.2f} секунд)")
+                return
+            self._last_full_cycle = time.time()
+            self.logger.info(f"🔍 Изменения: папок {len(changes['folders'])}, календарь {'да' if changes['calendar'] else 'нет'}, незавершенные задачи {'да' if changes['pending'] else 'нет'}")
+            
+            # Сколько цикл ждет тяжелые этапы, прежде чем оставить их выполняться в фоне
+            processing_deadline = self.config_manager.get_service_schedule_config().get('processing_deadline', 0)
+            pipeline_stats = None
+            graph_stats = None
+            if self.config_manager.get_task_graph_config().get('enabled', False):
+                # Этапы 2-4 и 5.5: граф задач по встречам
+                self.logger.info("🕸️ ЭТАПЫ 2-4: Выполнение графа задач по встречам...")
+                graph_start = time.time()
+                media_stats, transcription_stats, summary_stats, notion_update_stats, graph_stats = self.run_task_graph(
+                    time.time() + processing_deadline if processing_deadline else None
+                )
+                self.logger.info(f"⏱️ Время выполнения графа задач: {time.time() - graph_start:.2f} секунд")
+                self.logger.info(f"📊 Состояние графа задач: {graph_stats['graph']}")
             else:
-                self.logger.info("📋 ЭТАП 4: Генерация саммари отключена в настройках")
-                summary_stats = {"status": "skipped", "processed": 0, "errors": 0, "message": "General summary disabled"}
-                notion_update_stats = {"status": "skipped", "message": "Notion updates not implemented"}
+                # Этапы 2-4 выполняются в фоновом потоке и могут продолжаться после окончания цикла
+                media_stats, transcription_stats, summary_stats, notion_update_stats, pipeline_stats = \
+                    self._run_processing_with_deadline(bool(changes['folders']), processing_deadline)
             
             # Этап 5: Обновление Notion
             self.logger.info("📝 ЭТАП 5: Синхронизация с Notion...")
@@ -1294,33 +1354,41 @@ class MeetingAutomationService:
             self.logger.info(f"📊 Результат синхронизации с Notion: {notion_stats}")
             
             # Этап 5.5: Обновление страниц Notion результатами обработки
-            self.logger.info("📝 ЭТАП 5.5: Обновление страниц Notion результатами обработки...")
-            notion_update_start = time.time()
-            notion_update_stats = self._update_notion_with_results()
-            notion_update_duration = time.time() - notion_update_start
-            self.logger.info(f"⏱️ Время обновления страниц Notion: {notion_update_duration:.2f} секунд")
-            self.logger.info(f"📊 Результат обновления страниц Notion: {notion_update_stats}")
+            # (в режиме графа выполняется задачами notion_update)
+            if not graph_stats:
+                self.logger.info("📝 ЭТАП 5.5: Обновление страниц Notion результатами обработки...")
+                notion_update_start = time.time()
+                notion_update_stats = self._update_notion_with_results()
+                notion_update_duration = time.time() - notion_update_start
+                self.logger.info(f"⏱️ Время обновления страниц Notion: {notion_update_duration:.2f} секунд")
+                self.logger.info(f"📊 Результат обновления страниц Notion: {notion_update_stats}")
             
             # Создаем текущее состояние цикла
             self.current_cycle_state = self._create_cycle_state(
                 personal_stats, work_stats, media_stats, transcription_stats, notion_stats, summary_stats, notion_update_stats
             )
+            if pipeline_stats:
+                self.current_cycle_state["pipeline"] = pipeline_stats
+            if graph_stats:
+                self.current_cycle_state["task_graph"] = graph_stats
+            if self.notion_outbox:
+                outbox_metrics = self.notion_outbox.get_metrics()
+                self.current_cycle_state["notion_outbox"] = outbox_metrics
+                self.performance_stats['notion_outbox_depth'] = (self.performance_stats['notion_outbox_depth'] + [outbox_metrics['depth']])[-100:]
+                self.performance_stats['notion_outbox_lag'] = (self.performance_stats['notion_outbox_lag'] + [outbox_metrics['lag']])[-100:]
             
             # Сохраняем текущее состояние в SQLite
             cycle_id = getattr(self, 'cycle_count', 0) + 1
             self.state_manager.save_system_state(self.current_cycle_state, cycle_id)
             self.cycle_count = cycle_id
             
-            # Сохраняем текущее состояние (старый метод для совместимости)
-            self._save_state(self.current_cycle_state)
-            
             # Этап 6: Отчет в Telegram и создание файлов статуса (параллельно)
             self.logger.info("📱 ЭТАП 6: Отправка уведомлений и создание файлов статуса...")
             
             with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
                 # Запускаем задачи параллельно
                 telegram_future = executor.submit(self.send_telegram_notifications, self.current_cycle_state, self.previous_cycle_state)
-                status_future = executor.submit(self.create_status_files)
+                status_future = executor.submit(self.create_status_files, changes['folders'])
                 
                 # Получаем результаты
                 telegram_start = time.time()
@@ -1339,6 +1407,8 @@ class MeetingAutomationService:
             # Сохраняем кэш после выполнения цикла
             self._save_cache()
             
+            self._last_cycle_processed = self.current_cycle_state.get('total_processed', 0)
+            
             # Логируем результаты
             total_duration = time.time() - start_time
             self.performance_stats['cycle_times'].append(total_duration)
@@ -1352,7 +1422,16 @@ class MeetingAutomationService:
             self.logger.info(f"   🎤 Транскрипция: обработано {transcription_stats.get('processed', 0)}, ошибок {transcription_stats.get('errors', 0)}")
             self.logger.info(f"   📋 Саммари: обработано {summary_stats.get('processed', 0)}, ошибок {summary_stats.get('errors', 0)}")
             self.logger.info(f"   📝 Notion: синхронизировано {notion_stats.get('synced', 0)}, ошибок {notion_stats.get('errors', 0)}")
+            if self.notion_outbox:
+                outbox = self.current_cycle_state["notion_outbox"]
+                self.logger.info(f"   📬 Очередь Notion: {outbox['depth']} операций, задержка {outbox['lag']:.0f}с, объединено {outbox['coalesced']}, провалено {outbox['failed']}")
             self.logger.info(f"   📱 Telegram: {telegram_stats.get('status', 'unknown')}")
+            if self.telegram_outbox:
+                telegram_queue = self.telegram_outbox.get_metrics()
+                self.logger.info(f"   📨 Очередь Telegram: {telegram_queue['depth']} отчетов, отправлено {telegram_queue['sent']}, объединено {telegram_queue['coalesced']}, ошибок {telegram_queue['errors']}")
+            llm_stats = get_llm_executor(self.config_manager, self.logger).stats
+            if llm_stats['requests'] or llm_stats['errors']:
+                self.logger.info(f"   🤖 OpenAI: запросов {llm_stats['requests']}, повторов {llm_stats['retries']}, ошибок {llm_stats['errors']}, токенов {llm_stats['prompt_tokens'] + llm_stats['completion_tokens']}")
             self.logger.info(f"⏱️ ОБЩЕЕ ВРЕМЯ ВЫПОЛНЕНИЯ ЦИКЛА: {total_duration:.2f} секунд")
             
             # Сохраняем статистику производительности
@@ -1364,6 +1443,96 @@ class MeetingAutomationService:
             self.logger.error(f"❌ Критическая ошибка в цикле сервиса: {e}")
             self.logger.debug(f"Стек вызовов: {traceback.format_exc()}")
     
+    def _run_processing_stages(self, folders_changed: bool) -> tuple:
+        """
+        Этапы 2-4 без графа задач: конвейер или последовательная обработка.
+        
+        Args:
+            folders_changed: В папках встреч были изменения с прошлого цикла
+            
+        Returns:
+            Кортеж (media_stats, transcription_stats, summary_stats, notion_update_stats, pipeline_stats)
+        """
+        pipeline_stats = None
+        if self.config_manager.get_pipeline_config().get('enabled', False):
+            # Этапы 2-4: конвейер медиа → транскрипция → саммари
+            self.logger.info("🧵 ЭТАПЫ 2-4: Конвейер медиа → транскрипция → саммари...")
+            pipeline_start = time.time()
+            media_stats, transcription_stats, summary_stats, pipeline_stats = self.run_pipeline_stages()
+            notion_update_stats = {"status": "skipped", "message": "Notion updates not implemented"}
+            self.logger.info(f"⏱️ Время работы конвейера: {time.time() - pipeline_start:.2f} секунд")
+            self.logger.info(f"📊 Результат конвейера: {pipeline_stats['stages']}")
+        else:
+            # Этап 2: Сжатие медиа → выделение MP3
+            if folders_changed:
+                # В папках встреч появились файлы - не ждем интервала медиа
+                self.last_media_check = 0
+            self.logger.info("🎬 ЭТАП 2: Обработка медиа файлов...")
+            media_start = time.time()
+            media_stats = self.process_media_files()
+            media_duration = time.time() - media_start
+            self.logger.info(f"⏱️ Время обработки медиа: {media_duration:.2f} секунд")
+            self.logger.info(f"📊 Результат обработки медиа: {media_stats}")
+        
+            # Этап 3: Транскрипция
+            self.logger.info("🎤 ЭТАП 3: Транскрипция аудио...")
+            self.logger.info("🔍 Проверка наличия аудио файлов для транскрипции...")
+            transcription_start = time.time()
+            transcription_stats = self.process_audio_transcription()
+            transcription_duration = time.time() - transcription_start
+            self.logger.info(f"⏱️ Время транскрипции: {transcription_duration:.2f} секунд")
+            self.logger.info(f"📊 Результат транскрипции: обработано {transcription_stats.get('processed', 0)}, ошибок {transcription_stats.get('errors', 0)}")
+        
+            # Этап 4: Саммари и другая полезная информация (если включено)
+            summary_config = self.config_manager.get_summary_config()
+            if summary_config.get('enable_general_summary', False) or summary_config.get('enable_complex_summary', False):
+                self.logger.info("📋 ЭТАП 4: Генерация саммари и анализ транскрипций...")
+                summary_start = time.time()
+                summary_stats, notion_update_stats = self.process_summaries()
+                summary_duration = time.time() - summary_start
+                self.logger.info(f"⏱️ Время генерации саммари: {summary_duration:.2f} секунд")
+                self.logger.info(f"📊 Результат генерации саммари: обработано {summary_stats.get('processed', 0)}, ошибок {summary_stats.get('errors', 0)}")
+            else:
+                self.logger.info("📋 ЭТАП 4: Генерация саммари отключена в настройках")
+                summary_stats = {"status": "skipped", "processed": 0, "errors": 0, "message": "General summary disabled"}
+                notion_update_stats = {"status": "skipped", "message": "Notion updates not implemented"}
+        return media_stats, transcription_stats, summary_stats, notion_update_stats, pipeline_stats
+    
+    def _run_processing_with_deadline(self, folders_changed: bool, deadline: int) -> tuple:
+        """
+        Запускает этапы 2-4 в фоновом потоке и ждет их не дольше отведенного времени.
+        
+        Если обработка не укладывается, она продолжается в фоне, а цикл переходит
+        к следующим этапам. Результат забирает один из следующих циклов, новая
+        обработка до этого не запускается.
+        
+        Args:
+            folders_changed: В папках встреч были изменения с прошлого цикла
+            deadline: Время ожидания в секундах (0 - ждать завершения)
+            
+        Returns:
+            Кортеж (media_stats, transcription_stats, summary_stats, notion_update_stats, pipeline_stats)
+        """
+        if self._processing_future is None:
+            self._processing_future = self.background_executor.submit(self._run_processing_stages, folders_changed)
+        else:
+            self.logger.info("⏳ Обработка медиа и транскрипций с прошлого цикла еще выполняется")
+        
+        try:
+            result = self._processing_future.result(timeout=deadline or None)
+        except concurrent.futures.TimeoutError:
+            self.logger.info(f"⏳ Обработка не уложилась в {deadline} секунд и продолжится в фоне")
+            running_stats = {"status": "running", "processed": 0, "errors": 0, "message": "Processing continues in background"}
+            return (dict(running_stats), dict(running_stats), dict(running_stats),
+                    {"status": "skipped", "message": "Processing continues in background"}, None)
+        except Exception as e:
+            self.logger.error(f"❌ Ошибка фоновой обработки: {e}")
+            self.logger.debug(f"Стек вызовов: {traceback.format_exc()}")
+            result = tuple({"status": "error", "processed": 0, "errors": 1, "details": [str(e)]} for _ in range(4)) + (None,)
+        
+        self._processing_future = None
+        return result
+    
     @retry(max_attempts=2, delay=3, backoff=2)
     def process_summaries(self) -> tuple:
         """Обработка саммари для транскрипций."""
@@ -1379,6 +1548,337 @@ class MeetingAutomationService:
             return error_stats, {"status": "skipped", "message": "Notion updates not implemented"}
     
 
+    def run_pipeline_stages(self) -> tuple:
+        """
+        Обработка медиа, транскрипций и саммари конвейером этапов.
+        
+        Каждый этап работает в своем пуле потоков с ограниченной очередью,
+        поэтому файл уходит на транскрипцию сразу после извлечения аудио.
+        
+        Returns:
+            Кортеж (media_stats, transcription_stats, summary_stats, pipeline_stats)
+        """
+        pipeline_config = self.config_manager.get_pipeline_config()
+        summary_config = self.config_manager.get_summary_config()
+        summary_enabled = summary_config.get('enable_general_summary', False) or summary_config.get('enable_complex_summary', False)
+        queue_size = pipeline_config.get('queue_size', 4)
+        
+        # Корневые папки аккаунтов для поиска файлов и определения типа аккаунта встречи
+        roots = {}
+        if self.config_manager.is_personal_enabled():
+            roots['personal'] = self.config_manager.get_personal_config().get('local_drive_root')
+        if self.config_manager.is_work_enabled():
+            roots['work'] = self.config_manager.get_work_config().get('local_drive_root')
+        roots = {account: root for account, root in roots.items() if root and os.path.exists(root)}
+        
+        summarized_meetings = set()
+        
+        def summary_stage(transcript_file):
+            result = self.summary_handler.process_pipeline_item(transcript_file)
+            if result is True:
+                summarized_meetings.add(os.path.dirname(transcript_file))
+            return result
+        
+        pipeline = StagePipeline(self.logger)
+        pipeline.add_stage('media', self.media_handler.process_pipeline_item,
+                           pipeline_config.get('media_workers', 1), queue_size)
+        pipeline.add_stage('transcription', self.transcription_handler_new.process_pipeline_item,
+                           pipeline_config.get('transcription_workers', 1), queue_size)
+        if summary_enabled:
+            pipeline.add_stage('summary', summary_stage, pipeline_config.get('summary_workers', 8), queue_size)
+        
+        media_found = 0
+        media_due = (time.time() - self.last_media_check) >= self.media_check_interval
+        pipeline.start()
+        try:
+            for account_type, root in roots.items():
+                # Медиа: видео ставятся в очередь только по интервалу медиа обработки
+                if media_due:
+                    for item in self.media_handler.find_pending_videos(root):
+                        media_found += 1
+                        pipeline.submit('media', item, os.path.dirname(item[0]))
+                
+                # Уже извлеченные аудио и транскрипции подхватываются на своих этапах.
+                # Рабочие потоки уже пишут файлы в это дерево: FFmpeg пишет во временный
+                # файл и переименовывает готовый, поэтому обход видит только целые mp3;
+                # если файл поставил в этап предыдущий этап, конвейер не примет его второй раз
+                for dirpath, _, files in os.walk(root):
+                    for file in files:
+                        file_path = os.path.join(dirpath, file)
+                        if file.lower().endswith('_compressed.mp3'):
+                            if self.transcription_handler_new._should_process_audio_file(file_path):
+                                pipeline.submit('transcription', file_path, dirpath)
+                        elif summary_enabled and file.lower().endswith('_transcript.txt'):
+                            if self.summary_handler._should_process_transcript_file(file_path):
+                                pipeline.submit('summary', file_path, dirpath)
+            
+            if media_due:
+                self.last_media_check = time.time()
+            
+            pipeline.join()
+        finally:
+            pipeline.shutdown()
+        
+        # TASK-2: Комплексное саммари для встреч, по которым появились новые саммари
+        if summary_config.get('enable_complex_summary', False):
+            for meeting in sorted(summarized_meetings):
+                account_type = next((a for a, r in roots.items() if meeting.startswith(r)), 'personal')
+                self.summary_handler.process_meeting_complex_summary(meeting, account_type)
+        
+        pipeline_stats = pipeline.get_stats()
+        pipeline.log_latency_report()
+        stages = pipeline_stats['stages']
+        
+        def stage_stats(name, skipped_status="skipped"):
+            stage = stages.get(name)
+            if not stage:
+                return {"status": skipped_status, "processed": 0, "errors": 0}
+            return {
+                "status": "success" if stage['errors'] == 0 else "partial_success",
+                "processed": stage['processed'],
+                "errors": stage['errors'],
+                "duration": stage['busy_time']
+            }
+        
+        media_stats = stage_stats('media')
+        media_stats['synced'] = media_found
+        if not media_due:
+            media_stats['status'] = "skipped"
+        transcription_stats = stage_stats('transcription')
+        summary_stats = stage_stats('summary')
+        
+        self.last_media_stats = media_stats
+        self.last_transcription_stats = transcription_stats
+        self.last_summary_stats = summary_stats
+        return media_stats, transcription_stats, summary_stats, pipeline_stats
+    
+    def run_task_graph(self, deadline: Optional[float] = None) -> tuple:
+        """
+        Обновление и выполнение графа задач по встречам.
+        
+        Новые записи регистрируются при изменении папки встречи, дальше
+        порядок обработки определяется зависимостями задач в графе.
+        
+        Args:
+            deadline: Момент (time.time()), после которого незавершенные задачи
+                продолжают выполняться в фоне, а цикл идет дальше
+        
+        Returns:
+            Кортеж (media_stats, transcription_stats, summary_stats, notion_update_stats, graph_stats)
+        """
+        graph_config = self.config_manager.get_task_graph_config()
+        pipeline_config = self.config_manager.get_pipeline_config()
+        
+        sync_stats = self.task_graph.sync(self._get_account_roots())
+        if self.dag_runner is None:
+            # Исполнитель живет между циклами, чтобы долгие задачи не прерывались
+            self.dag_runner = DagRunner(
+                self.task_graph,
+                pools={
+                    'media': pipeline_config.get('media_workers', 1),
+                    'transcription': pipeline_config.get('transcription_workers', 1),
+                    'summary': pipeline_config.get('summary_workers', 8),
+                    'notion': 1
+                },
+                max_attempts=graph_config.get('max_attempts', 3),
+                retry_delay=graph_config.get('retry_delay', 60),
+                logger=self.logger
+            )
+        graph_stats = self.dag_runner.run(deadline)
+        graph_stats['sync'] = sync_stats
+        tasks = graph_stats['tasks']
+        
+        def task_stats(*task_types):
+            done = sum(tasks[t]['done'] for t in task_types)
+            failed = sum(tasks[t]['failed'] for t in task_types)
+            if not done and not failed:
+                return {"status": "skipped", "processed": 0, "errors": 0}
+            return {
+                "status": "success" if failed == 0 else "partial_success",
+                "processed": done,
+                "errors": failed,
+                "duration": round(sum(tasks[t]['duration'] for t in task_types), 2)
+            }
+        
+        # Медиа считается обработанным после извлечения аудио
+        media_stats = task_stats('extract')
+        media_stats['errors'] = media_stats['errors'] + tasks['compress']['failed']
+        transcription_stats = task_stats('transcribe')
+        summary_stats = task_stats('summarize', 'complex_summary')
+        notion_update_stats = task_stats('notion_update')
+        
+        self.last_media_stats = media_stats
+        self.last_transcription_stats = transcription_stats
+        self.last_summary_stats = summary_stats
+        self.last_notion_update_stats = notion_update_stats
+        return media_stats, transcription_stats, summary_stats, notion_update_stats, graph_stats
+    
+    def _get_account_roots(self) -> Dict[str, str]:
+        """
+        Получает существующие корневые папки включенных аккаунтов.
+        
+        Returns:
+            Словарь {тип_аккаунта: путь_к_папке}
+        """
+        roots = {}
+        if self.config_manager.is_personal_enabled():
+            roots['personal'] = self.config_manager.get_personal_config().get('local_drive_root')
+        if self.config_manager.is_work_enabled():
+            roots['work'] = self.config_manager.get_work_config().get('local_drive_root')
+        return {account: root for account, root in roots.items() if root and os.path.exists(root)}
+    
+    def _take_workspace_snapshot(self) -> Dict[str, float]:
+        """
+        Снимает время изменения корневых папок аккаунтов и папок встреч.
+        
+        Returns:
+            Словарь {путь_к_папке: mtime}
+        """
+        snapshot = {}
+        for root in self._get_account_roots().values():
+            try:
+                snapshot[root] = os.stat(root).st_mtime
+                with os.scandir(root) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            snapshot[entry.path] = entry.stat().st_mtime
+            except OSError as e:
+                self.logger.warning(f"⚠️ Не удалось просканировать папку {root}: {e}")
+        return snapshot
+    
+    def _has_pending_work(self) -> bool:
+        """
+        Проверяет, осталась ли незавершенная обработка с прошлых циклов.
+        
+        Returns:
+            True если обработка идет в фоне, есть задачи к запуску или прошлый цикл что-то обработал
+        """
+        if self._processing_future is not None or (self.dag_runner and self.dag_runner.has_in_flight()):
+            return True
+        if self.config_manager.get_task_graph_config().get('enabled', False):
+            max_attempts = self.config_manager.get_task_graph_config().get('max_attempts', 3)
+            return bool(self.state_manager.get_runnable_tasks(max_attempts, time.time()))
+        # Без графа задач о незавершенной работе судим по прошлому циклу
+        return self._last_cycle_processed > 0
+    
+    def _detect_changes(self, personal_stats: Dict[str, Any], work_stats: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Определяет изменения с прошлого цикла по папкам встреч и токенам календаря.
+        
+        Args:
+            personal_stats: Результат обработки календаря личного аккаунта
+            work_stats: Результат обработки календаря рабочего аккаунта
+            
+        Returns:
+            Словарь {"idle", "folders", "calendar", "pending"}
+        """
+        snapshot = self._take_workspace_snapshot()
+        previous = self._workspace_snapshot
+        changed_folders = {path for path, mtime in snapshot.items() if previous.get(path) != mtime}
+        changed_folders |= set(previous) - set(snapshot)
+        self._workspace_snapshot = snapshot
+        
+        tokens = {}
+        meeting_ends = []
+        calendar_changed = False
+        for account, stats in (('personal', personal_stats), ('work', work_stats)):
+            if stats.get('change_token'):
+                tokens[account] = stats['change_token']
+            elif stats.get('status') != 'skipped':
+                # Обработка аккаунта не вернула токен (ошибка, дочерний процесс без
+                # --result-file): изменения календаря неизвестны, цикл не считается простоем
+                calendar_changed = True
+            meeting_ends.extend(stats.get('meeting_ends', []))
+            if stats.get('folders_created') or stats.get('notion_pages_created'):
+                calendar_changed = True
+        if tokens != self._calendar_tokens:
+            calendar_changed = True
+        self._calendar_tokens = tokens
+        self._meeting_ends = meeting_ends
+        
+        pending = self._has_pending_work()
+        schedule_config = self.config_manager.get_service_schedule_config()
+        full_cycle_due = time.time() - self._last_full_cycle >= schedule_config.get('full_cycle_interval', 3600)
+        idle = (
+            schedule_config.get('idle_skip', False)
+            and not full_cycle_due
+            and not changed_folders
+            and not calendar_changed
+            and not pending
+        )
+        return {"idle": idle, "folders": changed_folders, "calendar": calendar_changed, "pending": pending}
+    
+    def _parse_meeting_end(self, value: str) -> Optional[float]:
+        """
+        Преобразует время окончания встречи из ISO строки в timestamp.
+        
+        Args:
+            value: Время окончания в формате ISO (события на весь день пропускаются)
+            
+        Returns:
+            Timestamp или None
+        """
+        if not value or len(value) <= 10:
+            return None
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return None
+    
+    def _get_next_interval(self) -> int:
+        """
+        Вычисляет паузу до следующего цикла.
+        
+        Короткая пауза - пока идет обработка или скоро заканчивается встреча,
+        длинная - ночью и в выходные, в остальное время - SERVICE_CHECK_INTERVAL.
+        
+        Returns:
+            Пауза в секундах
+        """
+        schedule_config = self.config_manager.get_service_schedule_config()
+        if not schedule_config.get('adaptive_interval', False):
+            return self.interval
+        
+        min_interval = schedule_config.get('min_interval', 60)
+        now = time.time()
+        
+        # Незавершенная обработка: ждем недолго, но не раньше ближайшего повтора задачи
+        if self._last_cycle_processed > 0 or self._has_pending_work():
+            self.logger.info(f"⏩ Идет обработка, следующий цикл через {min_interval} секунд")
+            return min_interval
+        if self.config_manager.get_task_graph_config().get('enabled', False):
+            max_attempts = self.config_manager.get_task_graph_config().get('max_attempts', 3)
+            retries = [
+                task['next_attempt_at'] for task in self.state_manager.get_tasks(statuses=['failed'])
+                if task['attempts'] < max_attempts and task.get('next_attempt_at')
+            ]
+            if retries and min(retries) - now < self.interval:
+                interval = max(min_interval, int(min(retries) - now))
+                self.logger.info(f"🔁 Ожидается повтор задачи, следующий цикл через {interval} секунд")
+                return interval
+        
+        # Встреча только что закончилась или скоро закончится - ждем запись
+        window = schedule_config.get('meeting_end_window', 900)
+        ends = [end for end in (self._parse_meeting_end(value) for value in self._meeting_ends) if end]
+        if any(now - window <= end <= now + window for end in ends):
+            self.logger.info(f"⏩ Встреча заканчивается, следующий цикл через {min_interval} секунд")
+            return min_interval
+        
+        current = datetime.now()
+        active = (
+            current.weekday() < 5
+            and schedule_config.get('active_hours_start', 8) <= current.hour < schedule_config.get('active_hours_end', 21)
+        )
+        interval = self.interval if active else schedule_config.get('max_interval', 1800)
+        
+        # Не пропускаем окончание ближайшей встречи
+        upcoming = [end - now for end in ends if end > now]
+        if upcoming and min(upcoming) < interval:
+            interval = max(min_interval, int(min(upcoming)))
+        if not active:
+            self.logger.info(f"🌙 Нерабочее время, следующий цикл через {interval} секунд")
+        return interval
+    
     def service_worker(self):
         """Рабочий поток сервиса."""
         self.logger.info("👷 Рабочий поток сервиса запущен")
@@ -1387,12 +1887,13 @@ class MeetingAutomationService:
             try:
                 self.run_service_cycle()
                 
-                # Ждем до следующей проверки
-                time.sleep(self.interval)
+                # Ждем до следующей проверки (stop() прерывает ожидание)
+                if self.running:
+                    self._wakeup.wait(self._get_next_interval())
                 
             except Exception as e:
                 self.logger.error(f"❌ Ошибка в рабочем потоке: {e}")
-                time.sleep(60)  # Ждем минуту при ошибке
+                self._wakeup.wait(60)  # Ждем минуту при ошибке
     
     def start(self):
         """Запуск сервиса."""
@@ -1406,6 +1907,11 @@ class MeetingAutomationService:
             return
         
         self.running = True
+        self._wakeup.clear()
+        if self.notion_outbox:
+            self.notion_outbox.start()
+        if self.telegram_outbox:
+            self.telegram_outbox.start()
         self.thread = threading.Thread(target=self.service_worker, daemon=True)
         self.thread.start()
         
@@ -1429,12 +1935,27 @@ class MeetingAutomationService:
         
         self.logger.info("🛑 Останавливаю сервис...")
         self.running = False
+        self._wakeup.set()
         
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=10)
             if self.thread.is_alive():
                 self.logger.warning("⚠️ Рабочий поток не завершился корректно")
         
+        # Текущая операция очереди Notion дорабатывает, остальные останутся в очереди
+        if self.notion_outbox:
+            self.notion_outbox.stop()
+        
+        # Накопленные отчеты Telegram отправляются перед выходом
+        if self.telegram_outbox:
+            self.telegram_outbox.stop()
+        
+        # Фоновые задачи не ждем: прерванные задачи графа перезапустятся при следующем старте
+        self.background_executor.shutdown(wait=False)
+        if self.dag_runner:
+            self.dag_runner.shutdown(wait=False)
+        get_llm_executor(self.config_manager, self.logger).shutdown()
+        
         self.logger.info("✅ Сервис остановлен")
     
     def _load_previous_state(self):
@@ -1566,12 +2087,22 @@ class MeetingAutomationService:
             }
 
     def _save_state(self, state):
-        """Сохранение состояния цикла."""
+        """Сохранение состояния сервиса."""
         try:
-            # TODO: Реализовать сохранение состояния
-            pass
+            # Создаем директорию для состояния, если её нет
+            state_dir = Path('data')
+            state_dir.mkdir(exist_ok=True)
+            
+            state_file = state_dir / 'service_state.json'
+            
+            with open(state_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            
+            self.logger.info(f"✅ Состояние сохранено в {state_file}")
         except Exception as e:
             self.logger.error(f"❌ Ошибка сохранения состояния: {e}")
+            self.logger.debug(f"Стек вызовов: {traceback.format_exc()}")
+    
     @retry(max_attempts=2, delay=3, backoff=2)
     def _update_notion_with_results(self) -> Dict[str, Any]:
         """Обновляет страницы Notion результатами обработки."""
@@ -1616,21 +2147,6 @@ class MeetingAutomationService:
                 "errors": 1
             }
             return error_stats
-        """Сохранение состояния сервиса."""
-        try:
-            # Создаем директорию для состояния, если её нет
-            state_dir = Path('data')
-            state_dir.mkdir(exist_ok=True)
-            
-            state_file = state_dir / 'service_state.json'
-            
-            with open(state_file, 'w', encoding='utf-8') as f:
-                json.dump(state, f, ensure_ascii=False, indent=2)
-            
-            self.logger.info(f"✅ Состояние сохранено в {state_file}")
-        except Exception as e:
-            self.logger.error(f"❌ Ошибка сохранения состояния: {e}")
-            self.logger.debug(f"Стек вызовов: {traceback.format_exc()}")
 
 
 def main():
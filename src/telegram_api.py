@@ -2,14 +2,136 @@
 Telegram API для отправки уведомлений.
 """
 
+import re
+import time
 import logging
+import threading
 import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+
+# Максимальная длина текста одного сообщения Telegram
+MESSAGE_LIMIT = 4096
+
+# Теги и HTML-сущности, внутри которых нельзя разрезать сообщение
+_HTML_TOKEN_RE = re.compile(r'<[^<>]*>|&#?[a-zA-Z0-9]+;')
+_HTML_TAG_RE = re.compile(r'<(/?)([a-zA-Z][a-zA-Z0-9-]*)')
+
+
+def _close_tags(stack: List[Tuple[str, str]]) -> str:
+    """Закрывающие теги для открытых тегов (в обратном порядке)."""
+    return ''.join(f'</{name}>' for name, _ in reversed(stack))
+
+
+def _find_cut(text: str, limit: int, min_pos: int, html: bool) -> Tuple[int, List[Tuple[str, str]]]:
+    """
+    Находит место разреза текста не длиннее limit с учетом закрывающих тегов.
+
+    Предпочитает перевод строки, затем пробел во второй половине сообщения;
+    никогда не режет внутри тега или HTML-сущности.
+
+    Args:
+        text: Текст
+        limit: Максимальная длина части
+        min_pos: Минимальная позиция разреза (после повторно открытых тегов)
+        html: Учитывать HTML разметку
+
+    Returns:
+        Позиция разреза и теги, открытые в этой позиции
+    """
+    stack: List[Tuple[str, str]] = []
+    best: Dict[str, Tuple[int, List[Tuple[str, str]]]] = {}
+    tokens = _HTML_TOKEN_RE.finditer(text) if html else iter(())
+    pos = 0
+
+    def candidates(start: int, end: int) -> bool:
+        """Отмечает позиции разреза после символов text[start:end]; False - лимит исчерпан."""
+        reserve = len(_close_tags(stack))
+        for cut in range(start + 1, end + 1):
+            if cut + reserve > limit:
+                return False
+            if cut <= min_pos:
+                continue
+            char = text[cut - 1]
+            kind = 'newline' if char == '\n' else 'space' if char == ' ' else 'any'
+            best[kind] = (cut, list(stack))
+            if kind != 'any':
+                best['any'] = best[kind]
+        return True
+
+    within_limit = True
+    for token in tokens:
+        within_limit = candidates(pos, token.start())
+        if not within_limit:
+            break
+        pos = token.end()
+        tag = _HTML_TAG_RE.match(token.group())
+        if tag and tag.group(1):
+            for index in range(len(stack) - 1, -1, -1):
+                if stack[index][0] == tag.group(2).lower():
+                    del stack[index:]
+                    break
+        elif tag:
+            stack.append((tag.group(2).lower(), token.group()))
+            continue
+        # Позиция сразу после закрывающего тега или сущности
+        if pos + len(_close_tags(stack)) > limit:
+            within_limit = False
+            break
+        if pos > min_pos:
+            best['any'] = (pos, list(stack))
+    if within_limit:
+        candidates(pos, len(text))
+
+    for kind in ('newline', 'space'):
+        if kind in best and best[kind][0] >= limit // 2:
+            return best[kind]
+    if 'any' in best:
+        return best['any']
+    # Повторно открытые теги не оставляют места для текста: режем без разметки
+    return max(min_pos + 1, limit), []
+
+
+def split_message(text: str, limit: int = MESSAGE_LIMIT, html: bool = True) -> List[str]:
+    """
+    Разбивает текст на сообщения не длиннее лимита Telegram.
+
+    Разрез делается по переводу строки или пробелу, не внутри тега или
+    HTML-сущности; открытые теги закрываются в конце части и открываются
+    заново в начале следующей, чтобы каждая часть была корректным HTML.
+
+    Args:
+        text: Текст сообщения
+        limit: Максимальная длина части
+        html: Текст содержит HTML разметку (parse_mode=HTML)
+
+    Returns:
+        Список частей
+    """
+    chunks = []
+    reopen = ''
+    rest = text
+    while rest:
+        body = reopen + rest
+        if len(body) <= limit:
+            chunks.append(body)
+            break
+        cut, stack = _find_cut(body, limit, len(reopen), html)
+        chunk = body[:cut].rstrip() + _close_tags(stack)
+        if chunk.strip():
+            chunks.append(chunk)
+        reopen = ''.join(opening for _, opening in stack)
+        rest = body[cut:].lstrip('\n')
+    return chunks
 
 
 class TelegramAPI:
     """API для работы с Telegram Bot."""
     
+    # Время последней отправки по чатам (общее для всех экземпляров процесса)
+    _chat_last_sent: Dict[str, float] = {}
+    _chat_lock = threading.Lock()
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Инициализация Telegram API.
@@ -19,20 +141,84 @@ class TelegramAPI:
         """
         self.bot_token = config.get('bot_token')
         self.chat_id = config.get('chat_id')
-        self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
+        api_base_url = (config.get('api_base_url') or 'https://api.telegram.org').rstrip('/')
+        self.base_url = f"{api_base_url}/bot{self.bot_token}"
         
         if not self.bot_token or not self.chat_id:
             raise ValueError("Telegram bot_token и chat_id обязательны")
         
+        # Лимиты Telegram: не чаще одного сообщения в секунду в чат, при 429 ждем retry_after
+        self.min_interval = float(config.get('min_interval', 1.0))
+        self.max_retries = int(config.get('max_retries', 3))
+        
+        # Постоянная сессия: соединение с api.telegram.org переиспользуется между сообщениями
+        self.session = requests.Session()
         self.logger = logging.getLogger(__name__)
     
+    def close(self):
+        """Закрывает HTTP сессию."""
+        self.session.close()
+    
     def send_message(self, text: str, parse_mode: Optional[str] = None) -> bool:
         """
         Отправка сообщения в Telegram.
         
+        Длинный текст разбивается на части по лимиту Telegram (4096 символов),
+        части отправляются по порядку.
+        
+        Args:
+            text: Текст сообщения
+            parse_mode: Режим парсинга (Markdown, HTML)
+            
+        Returns:
+            True если все части сообщения отправлены успешно
+        """
+        delivered, total = self.send_message_parts(text, parse_mode)
+        return delivered == total
+    
+    def send_message_parts(self, text: str, parse_mode: Optional[str] = None, start: int = 0) -> Tuple[int, int]:
+        """
+        Отправляет части длинного сообщения, начиная с указанной.
+        
+        Разбиение детерминировано, поэтому после частичной отправки тот же текст
+        можно дослать с первой недоставленной части, не повторяя доставленные.
+        
         Args:
             text: Текст сообщения
             parse_mode: Режим парсинга (Markdown, HTML)
+            start: Количество уже доставленных частей
+            
+        Returns:
+            Кортеж (доставлено частей всего, всего частей)
+        """
+        chunks = split_message(text, html=(parse_mode or '').upper() == 'HTML')
+        if len(chunks) > 1 and start == 0:
+            self.logger.info(f"✂️ Сообщение разбито на {len(chunks)} частей по {MESSAGE_LIMIT} символов")
+        for index in range(start, len(chunks)):
+            if not self._send_text(chunks[index], parse_mode):
+                if len(chunks) > 1:
+                    self.logger.error(f"❌ Не отправлена часть {index + 1}/{len(chunks)} сообщения")
+                return index, len(chunks)
+        return len(chunks), len(chunks)
+    
+    def _wait_for_chat_slot(self):
+        """Выдерживает минимальный интервал между сообщениями в чат."""
+        # Слот резервируется под блокировкой, а ожидание идет без нее:
+        # отправка в другие чаты не ждет, пока спит этот поток
+        with self._chat_lock:
+            now = time.monotonic()
+            slot = max(now, self._chat_last_sent.get(str(self.chat_id), 0.0) + self.min_interval)
+            self._chat_last_sent[str(self.chat_id)] = slot
+        if slot > now:
+            time.sleep(slot - now)
+    
+    def _send_text(self, text: str, parse_mode: Optional[str] = None) -> bool:
+        """
+        Отправка одного сообщения с учетом лимитов чата.
+        
+        Args:
+            text: Текст сообщения (не длиннее MESSAGE_LIMIT)
+            parse_mode: Режим парсинга (Markdown, HTML)
             
         Returns:
             True если сообщение отправлено успешно
@@ -46,11 +232,20 @@ class TelegramAPI:
             if parse_mode:
                 data['parse_mode'] = parse_mode
             
-            response = requests.post(
-                f"{self.base_url}/sendMessage",
-                data=data,
-                timeout=30
-            )
+            for attempt in range(self.max_retries + 1):
+                self._wait_for_chat_slot()
+                response = self.session.post(
+                    f"{self.base_url}/sendMessage",
+                    data=data,
+                    timeout=30
+                )
+                
+                if response.status_code == 429 and attempt < self.max_retries:
+                    retry_after = self._retry_after(response)
+                    self.logger.warning(f"⏳ Лимит Telegram, повтор через {retry_after:.0f}с")
+                    time.sleep(retry_after)
+                    continue
+                break
             
             if response.status_code == 200:
                 result = response.json()
@@ -74,6 +269,28 @@ class TelegramAPI:
             self.logger.error(f"❌ Неожиданная ошибка при отправке в Telegram: {e}")
             return False
     
+    @staticmethod
+    def _retry_after(response) -> float:
+        """
+        Время ожидания из ответа 429 (parameters.retry_after или заголовок Retry-After).
+        
+        Args:
+            response: Ответ Telegram API
+            
+        Returns:
+            Задержка в секундах
+        """
+        try:
+            retry_after = response.json().get('parameters', {}).get('retry_after')
+        except ValueError:
+            retry_after = None
+        if retry_after is None:
+            retry_after = response.headers.get('Retry-After', 1)
+        try:
+            return max(float(retry_after), 1.0)
+        except (TypeError, ValueError):
+            return 1.0
+    
     def send_photo(self, photo_path: str, caption: Optional[str] = None) -> bool:
         """
         Отправка фото в Telegram.
@@ -98,7 +315,7 @@ class TelegramAPI:
                     'photo': photo
                 }
                 
-                response = requests.post(
+                response = self.session.post(
                     f"{self.base_url}/sendPhoto",
                     data=data,
                     files=files,
@@ -154,7 +371,7 @@ class TelegramAPI:
                     'document': document
                 }
                 
-                response = requests.post(
+                response = self.session.post(
                     f"{self.base_url}/sendDocument",
                     data=data,
                     files=files,
@@ -194,7 +411,7 @@ class TelegramAPI:
             Информация о боте или None при ошибке
         """
         try:
-            response = requests.get(f"{self.base_url}/getMe", timeout=30)
+            response = self.session.get(f"{self.base_url}/getMe", timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
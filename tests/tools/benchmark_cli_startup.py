@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Замер времени запуска команд meeting_automation_universal.py.
+
+Каждая команда запускается в отдельном интерпретаторе с -X importtime во
+временной папке и с чистым окружением (без .env проекта, аккаунты не настроены,
+Telegram направлен на закрытый локальный порт), поэтому команды не делают
+реальной работы и замер показывает стоимость импортов и инициализации.
+
+Выводит время импортов, общее время процесса, число загруженных модулей и
+самые тяжелые импорты верхнего уровня. Цель для notify - импорты до 200 мс.
+
+    python tests/tools/benchmark_cli_startup.py
+    python tests/tools/benchmark_cli_startup.py --actions notify calendar --runs 5
+"""
+
+import os
+import re
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, Any, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SCRIPT = os.path.join(ROOT, 'meeting_automation_universal.py')
+
+ACTIONS = ['notify', 'calendar', 'notion', 'transcribe', 'media']
+NOTIFY_TARGET_MS = 200
+
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( +)(\S+)')
+
+# Переменные окружения, которые передаются командам (остальные отбрасываются)
+_KEEP_ENV = ('PATH', 'HOME', 'LANG', 'LC_ALL', 'TMPDIR', 'SYSTEMROOT', 'VIRTUAL_ENV', 'CONDA_PREFIX')
+
+
+def make_env() -> Dict[str, str]:
+    """
+    Формирует чистое окружение для команд.
+
+    Returns:
+        Словарь переменных окружения
+    """
+    env = {key: value for key, value in os.environ.items() if key in _KEEP_ENV or key.startswith('PYTHON')}
+    env.update({
+        'TELEGRAM_BOT_TOKEN': 'benchmark',
+        'TELEGRAM_CHAT_ID': '0',
+        'TELEGRAM_API_BASE_URL': 'http://127.0.0.1:9',
+        'TELEGRAM_MAX_RETRIES': '0',
+        'NOTION_OUTBOX_ENABLED': 'false',
+    })
+    return env
+
+
+def parse_importtime(stderr: str) -> Dict[str, Any]:
+    """
+    Разбирает вывод -X importtime.
+
+    Args:
+        stderr: Поток ошибок процесса
+
+    Returns:
+        {"total_ms", "modules", "top": [(модуль, мс), ...]}
+    """
+    top = []
+    modules = 0
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        modules += 1
+        if len(match.group(3)) == 1:
+            top.append((match.group(4), int(match.group(2)) / 1000))
+    return {
+        'total_ms': sum(ms for _, ms in top),
+        'modules': modules,
+        'top': sorted(top, key=lambda item: -item[1]),
+    }
+
+
+def run_command(args: List[str], workdir: str, env: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Запускает интерпретатор с -X importtime и замеряет время.
+
+    Args:
+        args: Аргументы после python -X importtime
+        workdir: Рабочая папка процесса
+        env: Окружение
+
+    Returns:
+        Результат разбора importtime с полями wall_ms и returncode
+    """
+    started = time.perf_counter()
+    process = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd=workdir, env=env,
+                             capture_output=True, text=True, timeout=300)
+    wall_ms = (time.perf_counter() - started) * 1000
+    result = parse_importtime(process.stderr)
+    result.update(wall_ms=wall_ms, returncode=process.returncode)
+    return result
+
+
+def action_args(action: str) -> List[str]:
+    """Аргументы командной строки для команды."""
+    args = [SCRIPT, action]
+    if action == 'notify':
+        args += ['--message', '<b>benchmark</b>']
+    return args
+
+
+def main():
+    """Запуск замера."""
+    parser = argparse.ArgumentParser(description="Время запуска команд meeting_automation_universal.py")
+    parser.add_argument('--actions', nargs='+', choices=ACTIONS, default=ACTIONS, help='Команды для замера')
+    parser.add_argument('--runs', type=int, default=3, help='Запусков на команду (берется лучший)')
+    parser.add_argument('--top', type=int, default=5, help='Сколько тяжелых импортов показать')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='cli_startup_')
+    env = make_env()
+    print(f"🧪 Интерпретатор: {sys.executable}")
+    print(f"📁 Рабочая папка: {workdir}, запусков на команду: {args.runs}")
+
+    try:
+        baseline = min((run_command(['-c', 'pass'], workdir, env) for _ in range(args.runs)),
+                       key=lambda item: item['wall_ms'])
+        print(f"\n📏 Пустой интерпретатор: импорты {baseline['total_ms']:.0f} мс, "
+              f"процесс {baseline['wall_ms']:.0f} мс, модулей {baseline['modules']}")
+
+        notify_ok = None
+        for action in args.actions:
+            result = min((run_command(action_args(action), workdir, env) for _ in range(args.runs)),
+                         key=lambda item: item['total_ms'])
+            print(f"\n⚡ {action}")
+            print(f"   📦 Импорты: {result['total_ms']:.0f} мс "
+                  f"(+{result['total_ms'] - baseline['total_ms']:.0f} мс к пустому интерпретатору), "
+                  f"модулей {result['modules']}")
+            print(f"   ⏱️ Процесс: {result['wall_ms']:.0f} мс, код возврата {result['returncode']}")
+            for module, ms in result['top'][:args.top]:
+                print(f"      {module:<40} {ms:>8.1f} мс")
+            if action == 'notify':
+                notify_ok = result['total_ms'] < NOTIFY_TARGET_MS
+
+        if notify_ok is not None:
+            if notify_ok:
+                print(f"\n✅ notify укладывается в цель {NOTIFY_TARGET_MS} мс на импорты")
+            else:
+                print(f"\n⚠️ notify превышает цель {NOTIFY_TARGET_MS} мс на импорты")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный тест синхронизации встреч с Notion на локальной заглушке API.
+
+Поднимает tests/tools/notion_stub_server.py в процессе, направляет на нее общий
+клиент Notion (NOTION_API_BASE_URL) и синхронизирует N синтетических событий
+через NotionHandler.upsert_meeting_page - напрямую или через очередь notion_outbox.
+Второй проход по тем же событиям показывает стоимость повторной синхронизации.
+
+Выводит время, количество запросов на событие по эндпоинтам и число ответов 429.
+
+    python tests/tools/benchmark_notion_sync.py --events 200 --rate 30
+    python tests/tools/benchmark_notion_sync.py --events 50 --mode outbox
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, Any, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from notion_stub_server import NotionStubServer
+
+
+def make_events(count: int, account_type: str = 'work') -> List[Dict[str, Any]]:
+    """
+    Создает синтетические события календаря.
+
+    Args:
+        count: Количество событий
+        account_type: Тип аккаунта
+
+    Returns:
+        Список событий
+    """
+    base = datetime(2026, 1, 5, 9, 0)
+    events = []
+    for index in range(count):
+        start = base + timedelta(days=index // 6, hours=index % 6)
+        events.append({
+            'id': f'bench-event-{index:05d}',
+            'title': f'Синтетическая встреча {index}',
+            'start': start.isoformat() + '+03:00',
+            'end': (start + timedelta(minutes=45)).isoformat() + '+03:00',
+            'attendees': [f'user{index % 7}@example.com', f'user{index % 11}@example.com'],
+            'description': 'Событие для нагрузочного теста',
+            'account_type': account_type
+        })
+    return events
+
+
+def run_pass(handler, outbox, events: List[Dict[str, Any]], account_type: str) -> Dict[str, Any]:
+    """
+    Синхронизирует события один раз.
+
+    Args:
+        handler: NotionHandler
+        outbox: NotionOutbox (None - синхронизация напрямую)
+        events: События
+        account_type: Тип аккаунта
+
+    Returns:
+        Статистика прохода {"ok", "errors", "seconds"}
+    """
+    started = time.perf_counter()
+    ok = errors = 0
+    if outbox is None:
+        for event in events:
+            if handler.upsert_meeting_page(event, account_type).get('success'):
+                ok += 1
+            else:
+                errors += 1
+    else:
+        for event in events:
+            handler.state_manager.enqueue_notion_operation(
+                'upsert_meeting', f"{account_type}:{event['id']}", {'event': event, 'account_type': account_type}
+            )
+        stats = outbox.drain()
+        ok, errors = stats['processed'], stats['errors']
+    return {'ok': ok, 'errors': errors, 'seconds': time.perf_counter() - started}
+
+
+def print_report(name: str, result: Dict[str, Any], stats: Dict[str, Any], events: int):
+    """Выводит результаты прохода."""
+    print(f"\n📊 {name}")
+    print(f"   ✅ Успешно: {result['ok']}, ❌ ошибок: {result['errors']}")
+    print(f"   ⏱️ Время: {result['seconds']:.2f}с ({result['seconds'] / max(events, 1) * 1000:.1f} мс/событие)")
+    print(f"   📡 Запросов: {stats['total']} ({stats['total'] / max(events, 1):.2f} на событие), "
+          f"429: {stats['rate_limited']}")
+    for endpoint, count in sorted(stats['by_endpoint'].items(), key=lambda item: -item[1]):
+        print(f"      {endpoint:<28} {count:>6}  ({count / max(events, 1):.2f} на событие)")
+
+
+def main():
+    """Запуск нагрузочного теста."""
+    parser = argparse.ArgumentParser(description="Нагрузочный тест синхронизации с Notion на заглушке API")
+    parser.add_argument('--events', type=int, default=100, help='Количество синтетических событий')
+    parser.add_argument('--rate', type=float, default=3.0, help='Лимит запросов в секунду у заглушки (0 - без лимита)')
+    parser.add_argument('--client-rate', type=float, default=None,
+                        help='NOTION_RATE_LIMIT клиента (по умолчанию равен --rate)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Задержка ответа заглушки в секундах')
+    parser.add_argument('--mode', choices=['inline', 'outbox'], default='inline',
+                        help='inline - upsert_meeting_page напрямую, outbox - через очередь notion_outbox')
+    parser.add_argument('--verbose', action='store_true', help='Показывать логи обработчиков')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    logger = logging.getLogger('benchmark_notion_sync')
+
+    server = NotionStubServer(rate_limit=args.rate, latency=args.latency)
+    database_id = server.state.create_database()
+    base_url = server.start()
+
+    # Изолируем локальные базы SQLite и берем шаблоны страниц из репозитория
+    workdir = tempfile.mkdtemp(prefix='notion_bench_')
+    os.symlink(os.path.join(ROOT, 'templates'), os.path.join(workdir, 'templates'))
+    os.chdir(workdir)
+
+    client_rate = args.client_rate if args.client_rate is not None else (args.rate or 1000)
+    os.environ.update({
+        'NOTION_API_BASE_URL': base_url,
+        'NOTION_TOKEN': 'stub-token',
+        'NOTION_DATABASE_ID': database_id,
+        'NOTION_RATE_LIMIT': str(client_rate),
+        'NOTION_OUTBOX_ENABLED': 'true' if args.mode == 'outbox' else 'false',
+        'NOTION_OUTBOX_RETRY_DELAY': '0',
+    })
+
+    from src.config_manager import ConfigManager
+    from src.handlers.notion_handler import NotionHandler
+
+    config_manager = ConfigManager(env_file=os.path.join(workdir, '.env'))
+    handler = NotionHandler(config_manager, logger=logger)
+    outbox = None
+    if args.mode == 'outbox':
+        from src.handlers.notion_outbox import NotionOutbox
+        outbox = NotionOutbox(config_manager, state_manager=handler.state_manager,
+                              notion_handler=handler, logger=logger)
+
+    events = make_events(args.events)
+    print(f"🧪 Заглушка Notion: {base_url} (лимит {args.rate or '∞'} rps, клиент {client_rate} rps)")
+    print(f"📅 Событий: {len(events)}, режим: {args.mode}, рабочая папка: {workdir}")
+
+    try:
+        first = run_pass(handler, outbox, events, 'work')
+        print_report("Первая синхронизация (создание страниц)", first, server.state.stats(), len(events))
+
+        server.state.reset_stats()
+        second = run_pass(handler, outbox, events, 'work')
+        print_report("Повторная синхронизация (без изменений)", second, server.state.stats(), len(events))
+
+        pages = len(server.state.pages)
+        print(f"\n📄 Страниц в заглушке: {pages} (ожидалось {len(events)})")
+        if pages != len(events):
+            print("⚠️ Количество страниц не совпадает с количеством событий - есть дубли или потери")
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный тест саммаризации на локальной заглушке OpenAI API.
+
+Поднимает tests/tools/openai_stub_server.py в процессе, направляет на нее
+SummaryHandler (OPENAI_BASE_URL) и прогоняет синтетический корпус встреч:
+- саммари файлов: все транскрипции корпуса через _process_folder_summaries
+  (параллельно через общий исполнитель OpenAI);
+- комплексные саммари: process_meeting_complex_summary для каждой встречи.
+Повторный проход по копии корпуса в новых папках проверяет кэш саммари:
+запросов к API быть не должно. В режиме --mode batch корпус проходит через
+SummaryBatchRunner (Batch API заглушки), интерактивных запросов быть не должно.
+
+Выводит пропускную способность, p50/p95 задержки запросов и встреч, токены на
+встречу, число 429 и повторов. Нужен установленный модуль openai, ключ не нужен.
+
+    python tests/tools/benchmark_summaries.py --meetings 50 --latency 0.5
+    python tests/tools/benchmark_summaries.py --meetings 20 --words 20000 --error-rate 0.1 --concurrency 4
+    python tests/tools/benchmark_summaries.py --meetings 50 --mode batch
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import logging
+import argparse
+import tempfile
+from typing import Dict, Any, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from openai_stub_server import OpenAIStubServer, percentile
+
+SPEAKERS = ['Анна', 'Борис', 'Виктория', 'Глеб', 'Дарья']
+TOPICS = ['релиз мобильного приложения', 'бюджет на квартал', 'найм в команду аналитики',
+          'миграцию базы данных', 'отчет для заказчика', 'план тестирования', 'инцидент в продакшене']
+PHRASES = ['Предлагаю обсудить {topic}.', 'По поводу {topic} есть риски по срокам.',
+           'Я возьму {topic} на себя до пятницы.', 'Решили перенести {topic} на следующую неделю.',
+           'Нужно согласовать {topic} с руководством.', 'Какие у нас метрики по теме: {topic}?',
+           'Давайте зафиксируем договоренности про {topic}.']
+
+
+def make_transcript(words: int, rng: random.Random, name: str) -> str:
+    """
+    Создает синтетическую транскрипцию с заголовком, как у TranscriptionHandler.
+
+    Args:
+        words: Примерное количество слов
+        rng: Генератор случайных чисел
+        name: Имя исходного файла
+
+    Returns:
+        Содержимое файла транскрипции
+    """
+    lines, count = [], 0
+    while count < words:
+        phrase = ' '.join(rng.choice(PHRASES).format(topic=rng.choice(TOPICS)) for _ in range(rng.randint(1, 3)))
+        lines.append(f"{rng.choice(SPEAKERS)}: {phrase}")
+        count += len(phrase.split())
+    return (f"# Транскрипция файла: {name}\n\n"
+            f"Дата создания: 2026-01-05 10:00:00\n"
+            f"Статус: Успешно транскрибировано через Whisper\n"
+            f"Модель: medium\n"
+            f"Язык: ru\n\n"
+            f"## Содержание:\n" + "\n".join(lines) + "\n")
+
+
+def make_corpus(root: str, meetings: int, files: int, words: int, seed: int) -> List[str]:
+    """
+    Создает папки встреч с транскрипциями.
+
+    Args:
+        root: Корневая папка корпуса
+        meetings: Количество встреч
+        files: Транскрипций на встречу
+        words: Слов в транскрипции
+        seed: Зерно генератора
+
+    Returns:
+        Пути к папкам встреч
+    """
+    rng = random.Random(seed)
+    folders = []
+    for index in range(meetings):
+        folder = os.path.join(root, f"2026-01-{5 + index // 10:02d} {10 + index % 10}-00 Встреча {index:03d}")
+        os.makedirs(folder)
+        for part in range(files):
+            name = f"meeting_{index:03d}_part{part + 1}"
+            with open(os.path.join(folder, f"{name}__transcript.txt"), 'w', encoding='utf-8') as f:
+                f.write(make_transcript(words, rng, f"{name}.mp3"))
+        folders.append(folder)
+    return folders
+
+
+def run_pass(handler, root: str, folders: List[str], server) -> Dict[str, Any]:
+    """
+    Прогоняет корпус: саммари файлов, затем комплексные саммари встреч.
+
+    Args:
+        handler: SummaryHandler
+        root: Корневая папка корпуса
+        folders: Папки встреч
+        server: Заглушка OpenAI
+
+    Returns:
+        Статистика прохода
+    """
+    server.state.reset_stats()
+    started = time.perf_counter()
+    files_result = handler._process_folder_summaries(root, 'work')
+    files_seconds = time.perf_counter() - started
+    files_stats = server.state.stats()
+
+    server.state.reset_stats()
+    meeting_seconds, complex_ok = [], 0
+    started = time.perf_counter()
+    for folder in folders:
+        meeting_started = time.perf_counter()
+        result = handler.process_meeting_complex_summary(folder, 'work')
+        meeting_seconds.append(time.perf_counter() - meeting_started)
+        complex_ok += 1 if result and result.get('status') == 'success' else 0
+    complex_seconds = time.perf_counter() - started
+
+    return {
+        'files': files_result, 'files_seconds': files_seconds, 'files_stats': files_stats,
+        'complex_ok': complex_ok, 'complex_seconds': complex_seconds,
+        'complex_stats': server.state.stats(), 'meeting_seconds': sorted(meeting_seconds)
+    }
+
+
+def run_batch_pass(runner, folders: List[str], server) -> Dict[str, Any]:
+    """
+    Прогоняет корпус через пакетную обработку (саммари файлов и комплексные саммари).
+
+    Args:
+        runner: SummaryBatchRunner
+        folders: Папки встреч
+        server: Заглушка OpenAI
+
+    Returns:
+        Статистика прохода
+    """
+    server.state.reset_stats()
+    before = dict(runner.stats)
+    started = time.perf_counter()
+    result = runner.run([(folder, 'work') for folder in folders])
+    result = {key: value - before.get(key, 0) if isinstance(value, int) and key in before else value
+              for key, value in result.items()}
+    return {'batch': result, 'seconds': time.perf_counter() - started, 'stats': server.state.stats()}
+
+
+def print_batch_report(name: str, result: Dict[str, Any], meetings: int, files: int):
+    """Выводит результаты пакетного прохода."""
+    batch, stats = result['batch'], result['stats']
+    print(f"\n📊 {name}")
+    print(f"   📦 Пакетов: {batch['batches']}, раундов: {batch['rounds']}, запросов в пакетах: {batch['requests']}, "
+          f"ответов: {batch['completed']}, неудачных: {batch['failed']}")
+    print(f"   📄 Саммари создано: {batch['processed']} из {meetings * files}, ошибок: {batch['errors']}, "
+          f"завершено: {'да' if batch['complete'] else 'нет'}")
+    print(f"   ⏱️ {result['seconds']:.2f}с, {meetings / max(result['seconds'], 1e-9) * 60:.1f} встреч/мин")
+    print(f"   📡 Интерактивных запросов: {stats['completions']}, запросов в пакетах у заглушки: {stats['batch_requests']}")
+    print(f"   🔢 Токенов на встречу: {stats['prompt_tokens'] / max(meetings, 1):.0f} промпт + "
+          f"{stats['completion_tokens'] / max(meetings, 1):.0f} ответ")
+    if stats['completions']:
+        print(f"⚠️ Пакетный проход отправил {stats['completions']} интерактивных запросов")
+
+
+def print_report(name: str, result: Dict[str, Any], meetings: int, files: int):
+    """Выводит результаты прохода."""
+    transcripts = meetings * files
+    files_stats, complex_stats = result['files_stats'], result['complex_stats']
+    print(f"\n📊 {name}")
+
+    print(f"   📄 Саммари файлов: обработано {result['files'].get('processed', 0)} из {transcripts}, "
+          f"ошибок {result['files'].get('errors', 0)}")
+    print(f"      ⏱️ {result['files_seconds']:.2f}с, "
+          f"{transcripts / max(result['files_seconds'], 1e-9) * 60:.1f} транскрипций/мин")
+    print(f"      📡 Запросов: {files_stats['completions']} (+429: {files_stats['injected_429'] + files_stats['limited_429']}), "
+          f"одновременно до {files_stats['peak_concurrency']}, "
+          f"задержка p50 {files_stats['latency_p50']:.2f}с, p95 {files_stats['latency_p95']:.2f}с")
+
+    print(f"   🧩 Комплексные саммари: {result['complex_ok']} из {meetings}")
+    print(f"      ⏱️ {result['complex_seconds']:.2f}с, "
+          f"{meetings / max(result['complex_seconds'], 1e-9) * 60:.1f} встреч/мин, "
+          f"на встречу p50 {percentile(result['meeting_seconds'], 50):.2f}с, "
+          f"p95 {percentile(result['meeting_seconds'], 95):.2f}с")
+    print(f"      📡 Запросов: {complex_stats['completions']} (+429: {complex_stats['injected_429'] + complex_stats['limited_429']})")
+
+    prompt_tokens = files_stats['prompt_tokens'] + complex_stats['prompt_tokens']
+    completion_tokens = files_stats['completion_tokens'] + complex_stats['completion_tokens']
+    print(f"   🔢 Токенов на встречу: {prompt_tokens / max(meetings, 1):.0f} промпт + "
+          f"{completion_tokens / max(meetings, 1):.0f} ответ")
+
+
+def main():
+    """Запуск нагрузочного теста."""
+    parser = argparse.ArgumentParser(description="Нагрузочный тест саммаризации на заглушке OpenAI API")
+    parser.add_argument('--meetings', type=int, default=20, help='Количество встреч в корпусе')
+    parser.add_argument('--files', type=int, default=2, help='Транскрипций на встречу')
+    parser.add_argument('--words', type=int, default=3000, help='Слов в транскрипции')
+    parser.add_argument('--latency', type=float, default=0.5, help='Базовая задержка ответа заглушки в секундах')
+    parser.add_argument('--token-latency', type=float, default=0.0, help='Задержка заглушки на токен ответа')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Доля ответов 429 от заглушки')
+    parser.add_argument('--rpm', type=int, default=0, help='Лимит запросов в минуту у заглушки (0 - без лимита)')
+    parser.add_argument('--tpm', type=int, default=0, help='Лимит токенов в минуту у заглушки (0 - без лимита)')
+    parser.add_argument('--concurrency', type=int, default=8, help='OPENAI_MAX_CONCURRENCY клиента')
+    parser.add_argument('--client-rpm', type=int, default=None, help='OPENAI_RPM клиента (по умолчанию равен --rpm)')
+    parser.add_argument('--client-tpm', type=int, default=None, help='OPENAI_TPM клиента (по умолчанию равен --tpm)')
+    parser.add_argument('--mode', choices=['interactive', 'batch'], default='interactive',
+                        help='interactive - обычные запросы, batch - через Batch API')
+    parser.add_argument('--batch-delay', type=float, default=1.0, help='Время выполнения пакета заглушкой в секундах')
+    parser.add_argument('--seed', type=int, default=1, help='Зерно генератора корпуса и ошибок')
+    parser.add_argument('--verbose', action='store_true', help='Показывать логи обработчиков')
+    args = parser.parse_args()
+
+    try:
+        import openai  # noqa: F401
+    except ImportError:
+        print("❌ Модуль openai не установлен: pip install openai")
+        sys.exit(1)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    logger = logging.getLogger('benchmark_summaries')
+
+    server = OpenAIStubServer(latency=args.latency, token_latency=args.token_latency,
+                              error_rate=args.error_rate, rpm=args.rpm, tpm=args.tpm, seed=args.seed,
+                              batch_delay=args.batch_delay)
+    base_url = server.start()
+
+    # Изолируем локальную базу SQLite и корпус во временной папке
+    workdir = tempfile.mkdtemp(prefix='summary_bench_')
+    os.chdir(workdir)
+    root = os.path.join(workdir, 'corpus')
+    folders = make_corpus(root, args.meetings, args.files, args.words, args.seed)
+
+    os.environ.update({
+        'OPENAI_API_KEY': 'stub',
+        'OPENAI_BASE_URL': base_url,
+        'OPENAI_MAX_CONCURRENCY': str(args.concurrency),
+        'OPENAI_RPM': str(args.client_rpm if args.client_rpm is not None else args.rpm),
+        'OPENAI_TPM': str(args.client_tpm if args.client_tpm is not None else args.tpm),
+        'SUMMARY_CACHE_ENABLED': 'true',
+        # Пакетный режим создает комплексные саммари сам, обычный - отдельным этапом по встречам
+        'ENABLE_COMPLEX_SUMMARY': 'true' if args.mode == 'batch' else 'false',
+        'OPENAI_BATCH_POLL_INTERVAL': '1',
+        'OPENAI_BATCH_DIR': os.path.join(workdir, 'batches'),
+    })
+
+    from src.config_manager import ConfigManager
+    from src.handlers.summary_handler import SummaryHandler
+    from src.handlers.llm_executor import get_llm_executor
+    from src.handlers.summary_batch import SummaryBatchRunner
+
+    config_manager = ConfigManager(env_file=os.path.join(workdir, '.env'))
+    handler = SummaryHandler(config_manager, logger=logger)
+    executor = get_llm_executor(config_manager, logger)
+
+    print(f"🧪 Заглушка OpenAI: {base_url} (задержка {args.latency}с, 429: {args.error_rate:.0%}, "
+          f"лимит {args.rpm or '∞'} rpm / {args.tpm or '∞'} tpm)")
+    print(f"📁 Встреч: {args.meetings} × {args.files} транскрипций по ~{args.words} слов, "
+          f"одновременных запросов: {args.concurrency}, режим: {args.mode}, рабочая папка: {workdir}")
+
+    try:
+        if args.mode == 'batch':
+            runner = SummaryBatchRunner(config_manager, handler, logger)
+            first = run_batch_pass(runner, folders, server)
+            print_batch_report("Первый проход (Batch API)", first, args.meetings, args.files)
+
+            copy_root = os.path.join(workdir, 'corpus_copy')
+            shutil.copytree(root, copy_root, ignore=shutil.ignore_patterns('*_summary.txt', '*_analysis.json',
+                                                                           'complex_summary'))
+            copy_folders = [os.path.join(copy_root, os.path.basename(folder)) for folder in folders]
+            second = run_batch_pass(runner, copy_folders, server)
+            print_batch_report("Повторный проход (копия корпуса, кэш саммари)", second, args.meetings, args.files)
+            if second['batch']['requests'] or second['stats']['completions']:
+                print("⚠️ Повторный проход отправил запросы - кэш саммари не сработал")
+            else:
+                print("✅ Повторный проход не отправил ни одного запроса")
+            return
+
+        first = run_pass(handler, root, folders, server)
+        print_report("Первый проход", first, args.meetings, args.files)
+        print(f"   🔁 Повторов клиента: {executor.stats['retries']}, ошибок: {executor.stats['errors']}")
+
+        # Та же речь в других папках: саммари должны браться из кэша
+        copy_root = os.path.join(workdir, 'corpus_copy')
+        shutil.copytree(root, copy_root, ignore=shutil.ignore_patterns('*_summary.txt', '*_analysis.json',
+                                                                       'complex_summary'))
+        copy_folders = [os.path.join(copy_root, os.path.basename(folder)) for folder in folders]
+        second = run_pass(handler, copy_root, copy_folders, server)
+        print_report("Повторный проход (копия корпуса, кэш саммари)", second, args.meetings, args.files)
+        requests = second['files_stats']['completions'] + second['complex_stats']['completions']
+        if requests:
+            print(f"⚠️ Повторный проход отправил {requests} запросов - кэш саммари не сработал")
+        else:
+            print("✅ Повторный проход не отправил ни одного запроса")
+    finally:
+        executor.shutdown()
+        server.stop()
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,601 @@
+#!/usr/bin/env python3
+"""
+Локальная заглушка Notion API для тестов и бенчмарков без рабочего пространства Notion.
+
+Реализует эндпоинты, которые использует проект:
+- POST  /v1/databases/{id}/query  (фильтры, сортировки, пагинация)
+- GET   /v1/databases/{id}
+- POST  /v1/pages, GET/PATCH /v1/pages/{id}
+- GET/PATCH /v1/blocks/{id}/children (пагинация, дозапись)
+- POST  /v1/search, GET /v1/users/me
+
+Проверяет ограничения Notion (100 элементов в массивах, 2000 символов в rich_text,
+page_size <= 100, размер тела запроса) и ограничивает частоту запросов, отвечая
+429 с Retry-After. Ведет счетчики запросов по эндпоинтам.
+
+Запуск отдельно:
+    python tests/tools/notion_stub_server.py --port 8787 --rate 3
+    NOTION_API_BASE_URL=http://127.0.0.1:8787/v1 python meeting_automation_universal.py notion
+"""
+
+import re
+import json
+import time
+import uuid
+import argparse
+import threading
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# Ограничения Notion API
+MAX_ARRAY_LENGTH = 100
+MAX_RICH_TEXT_LENGTH = 2000
+MAX_PAGE_SIZE = 100
+MAX_BODY_BYTES = 500 * 1024
+
+
+class NotionError(Exception):
+    """Ошибка, возвращаемая клиенту в формате Notion."""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+def _now() -> str:
+    """Текущее время в формате Notion (ISO 8601, UTC, миллисекунды)."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.') + f"{datetime.now(timezone.utc).microsecond // 1000:03d}Z"
+
+
+def _plain_text(items: List[Dict[str, Any]]) -> str:
+    """Склеивает plain_text массива rich_text."""
+    return "".join(item.get("plain_text") or item.get("text", {}).get("content", "") for item in items or [])
+
+
+def _normalize_rich_text(items: List[Dict[str, Any]], path: str) -> List[Dict[str, Any]]:
+    """
+    Проверяет массив rich_text и дополняет его полями, которые возвращает Notion.
+
+    Args:
+        items: Массив rich_text из запроса
+        path: Путь к полю (для сообщения об ошибке)
+
+    Returns:
+        Нормализованный массив
+    """
+    if not isinstance(items, list):
+        raise NotionError(400, "validation_error", f"{path} should be an array")
+    if len(items) > MAX_ARRAY_LENGTH:
+        raise NotionError(400, "validation_error",
+                          f"{path}.length should be ≤ `{MAX_ARRAY_LENGTH}`, instead was `{len(items)}`.")
+    normalized = []
+    for index, item in enumerate(items):
+        content = item.get("text", {}).get("content", "")
+        if len(content) > MAX_RICH_TEXT_LENGTH:
+            raise NotionError(400, "validation_error",
+                              f"{path}[{index}].text.content.length should be ≤ `{MAX_RICH_TEXT_LENGTH}`, "
+                              f"instead was `{len(content)}`.")
+        normalized.append({
+            "type": "text",
+            "text": {"content": content, "link": item.get("text", {}).get("link")},
+            "annotations": item.get("annotations", {}),
+            "plain_text": content,
+            "href": (item.get("text", {}).get("link") or {}).get("url")
+        })
+    return normalized
+
+
+class NotionStubState:
+    """Хранилище заглушки: базы, страницы, блоки и счетчики запросов."""
+
+    def __init__(self, rate_limit: float = 3.0, burst: Optional[float] = None, latency: float = 0.0):
+        """
+        Инициализация хранилища.
+
+        Args:
+            rate_limit: Допустимое количество запросов в секунду (0 - без ограничения)
+            burst: Размер всплеска запросов (по умолчанию равен rate_limit)
+            latency: Искусственная задержка ответа в секундах
+        """
+        self.lock = threading.RLock()
+        self.databases: Dict[str, Dict[str, Any]] = {}
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.children: Dict[str, List[Dict[str, Any]]] = {}
+        self.rate_limit = rate_limit
+        self.burst = burst or max(1.0, rate_limit)
+        self.latency = latency
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Сбрасывает счетчики запросов."""
+        with self.lock:
+            self.requests: Dict[str, int] = {}
+            self.statuses: Dict[int, int] = {}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Возвращает счетчики запросов.
+
+        Returns:
+            Словарь {"total", "by_endpoint", "by_status", "rate_limited"}
+        """
+        with self.lock:
+            return {
+                "total": sum(self.requests.values()),
+                "by_endpoint": dict(self.requests),
+                "by_status": dict(self.statuses),
+                "rate_limited": self.statuses.get(429, 0)
+            }
+
+    def create_database(self, database_id: str = None, title: str = "Meetings") -> str:
+        """
+        Создает базу данных встреч.
+
+        Args:
+            database_id: ID базы (по умолчанию случайный)
+            title: Название базы
+
+        Returns:
+            ID базы данных
+        """
+        database_id = database_id or str(uuid.uuid4())
+        with self.lock:
+            self.databases[database_id] = {
+                "object": "database",
+                "id": database_id,
+                "title": [{"type": "text", "text": {"content": title}, "plain_text": title}],
+                "properties": {
+                    "Name": {"type": "title"}, "Date": {"type": "date"}, "Event ID": {"type": "rich_text"},
+                    "Calendar": {"type": "select"}, "Attendees": {"type": "rich_text"},
+                    "Meeting Link": {"type": "url"}, "Drive Folder": {"type": "url"}
+                }
+            }
+        return database_id
+
+    def take_token(self) -> bool:
+        """Забирает токен ограничителя частоты; False - запрос нужно отклонить с 429."""
+        if not self.rate_limit:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_limit)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def count(self, endpoint: str, status: int):
+        """Учитывает запрос в счетчиках."""
+        with self.lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    # ----- страницы -----
+
+    def _normalize_properties(self, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """Проверяет свойства страницы и приводит их к формату ответа Notion."""
+        normalized = {}
+        for name, value in (properties or {}).items():
+            if "title" in value:
+                normalized[name] = {"type": "title", "title": _normalize_rich_text(value["title"], f"body.properties.{name}.title")}
+            elif "rich_text" in value:
+                normalized[name] = {"type": "rich_text", "rich_text": _normalize_rich_text(value["rich_text"], f"body.properties.{name}.rich_text")}
+            elif "select" in value:
+                normalized[name] = {"type": "select", "select": value["select"]}
+            elif "date" in value:
+                normalized[name] = {"type": "date", "date": value["date"]}
+            elif "url" in value:
+                normalized[name] = {"type": "url", "url": value["url"]}
+            else:
+                normalized[name] = value
+        return normalized
+
+    def create_page(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Создает страницу (POST /v1/pages)."""
+        database_id = (body.get("parent") or {}).get("database_id")
+        if database_id and database_id not in self.databases:
+            raise NotionError(404, "object_not_found", f"Could not find database with ID: {database_id}.")
+        children = body.get("children") or []
+        self._validate_blocks(children, "body.children")
+        page_id = str(uuid.uuid4())
+        now = _now()
+        with self.lock:
+            page = {
+                "object": "page",
+                "id": page_id,
+                "created_time": now,
+                "last_edited_time": now,
+                "archived": False,
+                "parent": {"type": "database_id", "database_id": database_id} if database_id else body.get("parent"),
+                "properties": self._normalize_properties(body.get("properties")),
+                "url": f"https://www.notion.so/{page_id.replace('-', '')}"
+            }
+            self.pages[page_id] = page
+            self.children[page_id] = [self._make_block(block, page_id) for block in children]
+        return page
+
+    def get_page(self, page_id: str) -> Dict[str, Any]:
+        """Возвращает страницу (GET /v1/pages/{id})."""
+        page = self.pages.get(page_id)
+        if not page:
+            raise NotionError(404, "object_not_found", f"Could not find page with ID: {page_id}.")
+        return page
+
+    def update_page(self, page_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Обновляет свойства страницы (PATCH /v1/pages/{id})."""
+        with self.lock:
+            page = self.get_page(page_id)
+            page["properties"].update(self._normalize_properties(body.get("properties")))
+            if "archived" in body:
+                page["archived"] = bool(body["archived"])
+            page["last_edited_time"] = _now()
+            return page
+
+    # ----- блоки -----
+
+    def _validate_blocks(self, blocks: List[Dict[str, Any]], path: str):
+        """Проверяет массив блоков по ограничениям Notion."""
+        if not isinstance(blocks, list):
+            raise NotionError(400, "validation_error", f"{path} should be an array")
+        if len(blocks) > MAX_ARRAY_LENGTH:
+            raise NotionError(400, "validation_error",
+                              f"{path}.length should be ≤ `{MAX_ARRAY_LENGTH}`, instead was `{len(blocks)}`.")
+        for index, block in enumerate(blocks):
+            block_type = block.get("type")
+            if not block_type or block_type not in block:
+                raise NotionError(400, "validation_error", f"{path}[{index}] should have a `type` with matching body")
+            body = block[block_type]
+            if "rich_text" in body:
+                body["rich_text"] = _normalize_rich_text(body["rich_text"], f"{path}[{index}].{block_type}.rich_text")
+            if body.get("children"):
+                self._validate_blocks(body["children"], f"{path}[{index}].{block_type}.children")
+
+    def _make_block(self, block: Dict[str, Any], parent_id: str) -> Dict[str, Any]:
+        """Создает блок в формате ответа Notion."""
+        block_id = str(uuid.uuid4())
+        block_type = block["type"]
+        body = dict(block[block_type])
+        nested = body.pop("children", None) or []
+        now = _now()
+        self.children[block_id] = [self._make_block(child, block_id) for child in nested]
+        return {
+            "object": "block", "id": block_id, "type": block_type, block_type: body,
+            "parent": {"type": "page_id", "page_id": parent_id},
+            "has_children": bool(nested), "created_time": now, "last_edited_time": now, "archived": False
+        }
+
+    def append_children(self, block_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Дописывает блоки (PATCH /v1/blocks/{id}/children)."""
+        children = body.get("children")
+        if children is None:
+            raise NotionError(400, "validation_error", "body.children should be defined")
+        self._validate_blocks(children, "body.children")
+        with self.lock:
+            if block_id not in self.children:
+                raise NotionError(404, "object_not_found", f"Could not find block with ID: {block_id}.")
+            created = [self._make_block(block, block_id) for block in children]
+            self.children[block_id].extend(created)
+            if block_id in self.pages:
+                self.pages[block_id]["last_edited_time"] = _now()
+        return {"object": "list", "results": created, "has_more": False, "next_cursor": None}
+
+    def list_children(self, block_id: str, params: Dict[str, str]) -> Dict[str, Any]:
+        """Возвращает дочерние блоки с пагинацией (GET /v1/blocks/{id}/children)."""
+        if block_id not in self.children:
+            raise NotionError(404, "object_not_found", f"Could not find block with ID: {block_id}.")
+        return self._paginate(self.children[block_id], params.get("page_size"), params.get("start_cursor"))
+
+    # ----- запросы к базе -----
+
+    def query_database(self, database_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Выполняет запрос к базе (POST /v1/databases/{id}/query)."""
+        if database_id not in self.databases:
+            raise NotionError(404, "object_not_found", f"Could not find database with ID: {database_id}.")
+        with self.lock:
+            pages = [page for page in self.pages.values()
+                     if not page["archived"] and page["parent"].get("database_id") == database_id]
+        if body.get("filter"):
+            pages = [page for page in pages if self._match(page, body["filter"])]
+        for sort in reversed(body.get("sorts") or []):
+            pages.sort(key=lambda page: self._sort_value(page, sort) or "",
+                       reverse=sort.get("direction") == "descending")
+        return self._paginate(pages, body.get("page_size"), body.get("start_cursor"))
+
+    def search(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Ищет страницы по названию (POST /v1/search)."""
+        query = (body.get("query") or "").lower()
+        with self.lock:
+            pages = [page for page in self.pages.values() if not page["archived"]]
+            if (body.get("filter") or {}).get("value") == "database":
+                pages = list(self.databases.values())
+        if query:
+            pages = [page for page in pages
+                     if query in _plain_text(self._title_of(page)).lower()]
+        return self._paginate(pages, body.get("page_size"), body.get("start_cursor"))
+
+    def _title_of(self, obj: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Возвращает rich_text названия страницы или базы."""
+        if obj.get("object") == "database":
+            return obj.get("title", [])
+        for prop in obj.get("properties", {}).values():
+            if prop.get("type") == "title":
+                return prop["title"]
+        return []
+
+    def _paginate(self, items: List[Dict[str, Any]], page_size: Any, start_cursor: Optional[str]) -> Dict[str, Any]:
+        """Формирует страницу результатов в формате Notion."""
+        page_size = int(page_size or MAX_PAGE_SIZE)
+        if page_size > MAX_PAGE_SIZE or page_size < 1:
+            raise NotionError(400, "validation_error",
+                              f"body.page_size should be ≤ `{MAX_PAGE_SIZE}`, instead was `{page_size}`.")
+        start = int(start_cursor or 0)
+        chunk = items[start:start + page_size]
+        has_more = start + page_size < len(items)
+        return {
+            "object": "list",
+            "results": chunk,
+            "has_more": has_more,
+            "next_cursor": str(start + page_size) if has_more else None
+        }
+
+    def _sort_value(self, page: Dict[str, Any], sort: Dict[str, Any]) -> Any:
+        """Значение страницы для сортировки."""
+        if sort.get("timestamp"):
+            return page.get(sort["timestamp"])
+        return self._property_value(page, sort.get("property"))
+
+    def _property_value(self, page: Dict[str, Any], name: str) -> Any:
+        """Простое значение свойства страницы для фильтров и сортировок."""
+        prop = page["properties"].get(name)
+        if not prop:
+            return None
+        kind = prop.get("type")
+        if kind in ("title", "rich_text"):
+            return _plain_text(prop[kind])
+        if kind == "select":
+            return (prop.get("select") or {}).get("name")
+        if kind == "date":
+            return (prop.get("date") or {}).get("start")
+        return prop.get(kind)
+
+    def _match(self, page: Dict[str, Any], condition: Dict[str, Any]) -> bool:
+        """Проверяет страницу на соответствие фильтру Notion."""
+        if "and" in condition:
+            return all(self._match(page, item) for item in condition["and"])
+        if "or" in condition:
+            return any(self._match(page, item) for item in condition["or"])
+        if condition.get("timestamp"):
+            field = condition["timestamp"]
+            return self._compare(page.get(field), condition[field], is_date=True)
+        name = condition.get("property")
+        for kind in ("title", "rich_text", "select", "date", "url"):
+            if kind in condition:
+                return self._compare(self._property_value(page, name), condition[kind], is_date=kind == "date")
+        raise NotionError(400, "validation_error", f"Unsupported filter: {json.dumps(condition)[:200]}")
+
+    def _compare(self, value: Any, operators: Dict[str, Any], is_date: bool = False) -> bool:
+        """Применяет операторы сравнения фильтра к значению."""
+        for operator, expected in operators.items():
+            if operator == "is_empty":
+                result = not value
+            elif operator == "is_not_empty":
+                result = bool(value)
+            elif value is None:
+                return False
+            elif is_date:
+                # Даты сравниваются по дню, если в фильтре указана только дата
+                actual = str(value)[:len(str(expected))] if len(str(expected)) == 10 else str(value)
+                result = {
+                    "equals": actual == expected, "before": actual < expected, "after": actual > expected,
+                    "on_or_before": actual <= expected, "on_or_after": actual >= expected
+                }.get(operator)
+                if result is None:
+                    raise NotionError(400, "validation_error", f"Unsupported date operator: {operator}")
+            elif operator == "equals":
+                result = value == expected
+            elif operator == "does_not_equal":
+                result = value != expected
+            elif operator == "contains":
+                result = str(expected).lower() in str(value).lower()
+            elif operator == "starts_with":
+                result = str(value).startswith(str(expected))
+            else:
+                raise NotionError(400, "validation_error", f"Unsupported operator: {operator}")
+            if not result:
+                return False
+        return True
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """HTTP обработчик заглушки."""
+
+    state: NotionStubState = None
+
+    ROUTES: List[Tuple[str, str, str, str]] = [
+        ("POST", r"^/v1/databases/([^/]+)/query$", "databases.query", "query_database"),
+        ("GET", r"^/v1/databases/([^/]+)$", "databases.retrieve", "get_database"),
+        ("POST", r"^/v1/pages$", "pages.create", "create_page"),
+        ("GET", r"^/v1/pages/([^/]+)$", "pages.retrieve", "get_page"),
+        ("PATCH", r"^/v1/pages/([^/]+)$", "pages.update", "update_page"),
+        ("GET", r"^/v1/blocks/([^/]+)/children$", "blocks.children.list", "list_children"),
+        ("PATCH", r"^/v1/blocks/([^/]+)/children$", "blocks.children.append", "append_children"),
+        ("POST", r"^/v1/search$", "search", "search"),
+        ("GET", r"^/v1/users/me$", "users.me", "me"),
+    ]
+
+    def log_message(self, format, *args):
+        """Отключает логирование каждого запроса в stderr."""
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def _dispatch(self, method: str):
+        """Разбирает запрос, применяет ограничения и вызывает обработчик эндпоинта."""
+        state = self.state
+        path, _, query = self.path.partition("?")
+        params = dict(part.split("=", 1) for part in query.split("&") if "=" in part)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        endpoint = f"{method} {path}"
+        handler = None
+        args: Tuple[str, ...] = ()
+        for route_method, pattern, name, action in self.ROUTES:
+            match = re.match(pattern, path)
+            if route_method == method and match:
+                endpoint, handler, args = name, action, match.groups()
+                break
+
+        if state.latency:
+            time.sleep(state.latency)
+
+        try:
+            if not (self.headers.get("Authorization") or "").startswith("Bearer "):
+                raise NotionError(401, "unauthorized", "API token is invalid.")
+            if not state.take_token():
+                state.count(endpoint, 429)
+                self._send(429, {"object": "error", "status": 429, "code": "rate_limited",
+                                 "message": "You have been rate limited. Please try again in a few minutes."},
+                           {"Retry-After": "1"})
+                return
+            if handler is None:
+                raise NotionError(400, "invalid_request_url", "Invalid request URL.")
+            if len(raw) > MAX_BODY_BYTES:
+                raise NotionError(413, "payload_too_large", "Request body too large.")
+            body = json.loads(raw.decode("utf-8")) if raw else {}
+            result = self._handle(handler, args, body, params)
+            state.count(endpoint, 200)
+            self._send(200, result)
+        except NotionError as e:
+            state.count(endpoint, e.status)
+            self._send(e.status, {"object": "error", "status": e.status, "code": e.code, "message": e.message})
+        except json.JSONDecodeError:
+            state.count(endpoint, 400)
+            self._send(400, {"object": "error", "status": 400, "code": "invalid_json", "message": "Error parsing JSON body."})
+
+    def _handle(self, action: str, args: Tuple[str, ...], body: Dict[str, Any], params: Dict[str, str]) -> Dict[str, Any]:
+        """Вызывает метод хранилища для эндпоинта."""
+        state = self.state
+        if action == "query_database":
+            return state.query_database(args[0], body)
+        if action == "get_database":
+            if args[0] not in state.databases:
+                raise NotionError(404, "object_not_found", f"Could not find database with ID: {args[0]}.")
+            return state.databases[args[0]]
+        if action == "create_page":
+            return state.create_page(body)
+        if action == "get_page":
+            return state.get_page(args[0])
+        if action == "update_page":
+            return state.update_page(args[0], body)
+        if action == "list_children":
+            return state.list_children(args[0], params)
+        if action == "append_children":
+            return state.append_children(args[0], body)
+        if action == "search":
+            return state.search(body)
+        return {"object": "user", "id": "stub-bot", "type": "bot", "name": "Notion stub"}
+
+    def _send(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None):
+        """Отправляет JSON ответ."""
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class NotionStubServer:
+    """Заглушка Notion API на localhost, работающая в фоновом потоке."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, rate_limit: float = 3.0,
+                 burst: Optional[float] = None, latency: float = 0.0):
+        """
+        Инициализация сервера.
+
+        Args:
+            host: Адрес для прослушивания
+            port: Порт (0 - любой свободный)
+            rate_limit: Допустимое количество запросов в секунду (0 - без ограничения)
+            burst: Размер всплеска запросов
+            latency: Искусственная задержка ответа в секундах
+        """
+        self.state = NotionStubState(rate_limit, burst, latency)
+        handler = type("NotionStubHandler", (_RequestHandler,), {"state": self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Адрес API для NOTION_API_BASE_URL."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> str:
+        """
+        Запускает сервер в фоновом потоке.
+
+        Returns:
+            Адрес API
+        """
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="notion-stub", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        """Останавливает сервер."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "NotionStubServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    """Запуск заглушки как отдельного сервера."""
+    parser = argparse.ArgumentParser(description="Локальная заглушка Notion API")
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес для прослушивания")
+    parser.add_argument("--port", type=int, default=8787, help="Порт")
+    parser.add_argument("--rate", type=float, default=3.0, help="Лимит запросов в секунду (0 - без ограничения)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Задержка ответа в секундах")
+    parser.add_argument("--database-id", default=None, help="ID создаваемой базы данных")
+    args = parser.parse_args()
+
+    server = NotionStubServer(args.host, args.port, args.rate, latency=args.latency)
+    database_id = server.state.create_database(args.database_id)
+    print(f"🧪 Заглушка Notion API: {server.base_url}")
+    print(f"   NOTION_API_BASE_URL={server.base_url}")
+    print(f"   NOTION_DATABASE_ID={database_id}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 Запросы: {json.dumps(server.state.stats(), ensure_ascii=False)}")
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+"""
+Локальная заглушка OpenAI API (chat completions) для тестов и бенчмарков без платного ключа.
+
+Реализует эндпоинты, которые использует саммаризация:
+- POST /v1/chat/completions
+- POST /v1/files, GET /v1/files/{id}, GET /v1/files/{id}/content
+- POST /v1/batches, GET /v1/batches/{id}, POST /v1/batches/{id}/cancel
+- GET  /v1/models
+
+Отвечает в формате OpenAI: детерминированный текст саммари, usage с подсчетом
+токенов (tiktoken, если установлен, иначе оценка по длине), ошибка
+context_length_exceeded при превышении окна модели. Имитирует задержку
+(базовая + на токен ответа), ограничения RPM/TPM и случайные 429 с
+retry-after-ms. Пакеты Batch API выполняются в фоне через --batch-delay
+секунд без интерактивных лимитов. Ведет счетчики запросов, токенов, задержек
+и одновременных запросов.
+
+Запуск отдельно:
+    python tests/tools/openai_stub_server.py --port 8788 --latency 0.5 --error-rate 0.05
+    OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:8788/v1 python tools/process_missing_summaries.py
+"""
+
+import re
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from collections import deque
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+DEFAULT_CONTEXT_WINDOW = 128000
+
+# Служебные токены формата чата: на каждое сообщение и на начало ответа
+MESSAGE_TOKEN_OVERHEAD = 4
+REPLY_TOKEN_OVERHEAD = 3
+
+# Токенизатор cl100k_base: None - еще не загружался, False - недоступен (нет сети для словаря)
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Подсчитывает токены текста (cl100k_base или оценка по длине)."""
+    global _encoding
+    if _encoding is None:
+        try:
+            _encoding = tiktoken.get_encoding('cl100k_base') if TIKTOKEN_AVAILABLE else False
+        except Exception:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return len(text) // 3 + 1
+
+
+class OpenAIError(Exception):
+    """Ошибка, возвращаемая клиенту в формате OpenAI."""
+
+    def __init__(self, status: int, error_type: str, code: Optional[str], message: str,
+                 headers: Dict[str, str] = None):
+        super().__init__(message)
+        self.status = status
+        self.error_type = error_type
+        self.code = code
+        self.message = message
+        self.headers = headers or {}
+
+
+class OpenAIStubState:
+    """Настройки и счетчики заглушки."""
+
+    def __init__(self, latency: float = 0.2, token_latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, rpm: int = 0, tpm: int = 0,
+                 context_window: int = DEFAULT_CONTEXT_WINDOW, seed: int = None, batch_delay: float = 1.0):
+        """
+        Инициализация заглушки.
+
+        Args:
+            latency: Базовая задержка ответа в секундах
+            token_latency: Дополнительная задержка на токен ответа в секундах
+            jitter: Случайный разброс задержки (доля от задержки, 0.2 - ±20%)
+            error_rate: Доля запросов, на которые отвечается 429 (0.0 - 1.0)
+            rpm: Лимит запросов в минуту (0 - без ограничения)
+            tpm: Лимит токенов в минуту (0 - без ограничения)
+            context_window: Окно контекста моделей в токенах
+            seed: Зерно генератора случайных чисел (для воспроизводимых 429)
+            batch_delay: Через сколько секунд после создания пакет Batch API выполняется
+        """
+        self.lock = threading.Lock()
+        self.latency = latency
+        self.token_latency = token_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rpm = rpm
+        self.tpm = tpm
+        self.context_window = context_window
+        self.random = random.Random(seed)
+        self.batch_delay = batch_delay
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self._window: deque = deque()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Сбрасывает счетчики."""
+        with self.lock:
+            self.statuses: Dict[int, int] = {}
+            self.latencies: List[float] = []
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.injected_429 = 0
+            self.limited_429 = 0
+            self.active = 0
+            self.peak_concurrency = 0
+            self.batch_requests = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Возвращает счетчики.
+
+        Returns:
+            Словарь {"total", "by_status", "completions", "prompt_tokens", "completion_tokens",
+            "injected_429", "limited_429", "latency_p50", "latency_p95", "peak_concurrency", "batch_requests"}
+        """
+        with self.lock:
+            latencies = sorted(self.latencies)
+            return {
+                "total": sum(self.statuses.values()),
+                "by_status": dict(self.statuses),
+                "completions": self.statuses.get(200, 0),
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "injected_429": self.injected_429,
+                "limited_429": self.limited_429,
+                "latency_p50": percentile(latencies, 50),
+                "latency_p95": percentile(latencies, 95),
+                "peak_concurrency": self.peak_concurrency,
+                "batch_requests": self.batch_requests
+            }
+
+    def enter(self):
+        """Учитывает начало обработки запроса."""
+        with self.lock:
+            self.active += 1
+            self.peak_concurrency = max(self.peak_concurrency, self.active)
+
+    def leave(self, status: int, seconds: float = None):
+        """Учитывает окончание обработки запроса."""
+        with self.lock:
+            self.active -= 1
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if seconds is not None:
+                self.latencies.append(seconds)
+
+    def admit(self, tokens: int):
+        """
+        Проверяет лимиты и случайные ошибки; при отказе выбрасывает 429.
+
+        Args:
+            tokens: Токены запроса (промпт и max_tokens ответа)
+        """
+        with self.lock:
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.injected_429 += 1
+                raise OpenAIError(429, "requests", "rate_limit_exceeded",
+                                  "Rate limit reached (injected by stub). Please try again in 500ms.",
+                                  {"retry-after-ms": "500"})
+            now = time.monotonic()
+            while self._window and self._window[0][0] <= now - 60:
+                self._window.popleft()
+            used = sum(entry[1] for entry in self._window)
+            if (self.rpm and len(self._window) >= self.rpm) or (self.tpm and self._window and used + tokens > self.tpm):
+                self.limited_429 += 1
+                wait = self._window[0][0] + 60 - now
+                raise OpenAIError(429, "requests", "rate_limit_exceeded",
+                                  f"Rate limit reached. Please try again in {wait:.1f}s.",
+                                  {"retry-after-ms": str(int(wait * 1000) + 1)})
+            self._window.append((now, tokens))
+
+    def complete(self, body: Dict[str, Any], interactive: bool = True) -> Dict[str, Any]:
+        """
+        Формирует ответ chat.completions.
+
+        Args:
+            body: Тело запроса
+            interactive: False для запросов из пакета (без лимитов, 429 и задержки)
+
+        Returns:
+            Ответ в формате OpenAI
+        """
+        model = body.get("model")
+        messages = body.get("messages")
+        if not model:
+            raise OpenAIError(400, "invalid_request_error", None, "you must provide a model parameter")
+        if not isinstance(messages, list) or not messages:
+            raise OpenAIError(400, "invalid_request_error", None, "'messages' must be a non-empty array")
+        max_tokens = int(body.get("max_tokens") or 256)
+
+        prompt_tokens = REPLY_TOKEN_OVERHEAD + sum(
+            count_tokens(str(message.get("content") or "")) + MESSAGE_TOKEN_OVERHEAD for message in messages
+        )
+        if prompt_tokens + max_tokens > self.context_window:
+            raise OpenAIError(400, "invalid_request_error", "context_length_exceeded",
+                              f"This model's maximum context length is {self.context_window} tokens. "
+                              f"However, you requested {prompt_tokens + max_tokens} tokens "
+                              f"({prompt_tokens} in the messages, {max_tokens} in the completion).")
+        if interactive:
+            self.admit(prompt_tokens + max_tokens)
+
+        content = self._summarize(str(messages[-1].get("content") or ""), max_tokens)
+        completion_tokens = count_tokens(content)
+        if interactive:
+            delay = self.latency + self.token_latency * completion_tokens
+            if self.jitter:
+                delay *= 1 + self.random.uniform(-self.jitter, self.jitter)
+            time.sleep(max(0.0, delay))
+
+        with self.lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "logprobs": None,
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    # ----- файлы и пакеты -----
+
+    def create_file(self, filename: str, purpose: str, data: bytes) -> Dict[str, Any]:
+        """
+        Сохраняет загруженный файл.
+
+        Args:
+            filename: Имя файла
+            purpose: Назначение (batch, batch_output)
+            data: Содержимое
+
+        Returns:
+            Объект файла
+        """
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        info = {"id": file_id, "object": "file", "bytes": len(data), "created_at": int(time.time()),
+                "filename": filename, "purpose": purpose, "status": "processed"}
+        with self.lock:
+            self.files[file_id] = {"info": info, "data": data}
+        return info
+
+    def get_file(self, file_id: str) -> Dict[str, Any]:
+        """Возвращает файл {"info", "data"} или 404."""
+        with self.lock:
+            if file_id not in self.files:
+                raise OpenAIError(404, "invalid_request_error", None, f"No such File object: {file_id}")
+            return self.files[file_id]
+
+    def create_batch(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Создает пакет и запускает его выполнение в фоне.
+
+        Args:
+            body: Тело запроса (input_file_id, endpoint, completion_window, metadata)
+
+        Returns:
+            Объект пакета
+        """
+        input_file = self.get_file(body.get("input_file_id", ""))
+        if body.get("endpoint") != "/v1/chat/completions":
+            raise OpenAIError(400, "invalid_request_error", None, "Only /v1/chat/completions is supported by the stub")
+        if body.get("completion_window") != "24h":
+            raise OpenAIError(400, "invalid_request_error", None, "completion_window must be 24h")
+        lines = [line for line in input_file["data"].decode("utf-8").splitlines() if line.strip()]
+        batch_id = f"batch_{uuid.uuid4().hex[:24]}"
+        batch = {
+            "id": batch_id, "object": "batch", "endpoint": body["endpoint"], "errors": None,
+            "input_file_id": body["input_file_id"], "completion_window": "24h", "status": "validating",
+            "output_file_id": None, "error_file_id": None, "created_at": int(time.time()),
+            "in_progress_at": None, "completed_at": None, "cancelled_at": None,
+            "request_counts": {"total": len(lines), "completed": 0, "failed": 0},
+            "metadata": body.get("metadata")
+        }
+        with self.lock:
+            self.batches[batch_id] = batch
+        threading.Thread(target=self._run_batch, args=(batch_id, lines), name="openai-stub-batch", daemon=True).start()
+        return dict(batch)
+
+    def get_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Возвращает пакет или 404."""
+        with self.lock:
+            if batch_id not in self.batches:
+                raise OpenAIError(404, "invalid_request_error", None, f"No such Batch object: {batch_id}")
+            return dict(self.batches[batch_id])
+
+    def cancel_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Отменяет пакет, который еще не выполнен."""
+        self.get_batch(batch_id)
+        with self.lock:
+            batch = self.batches[batch_id]
+            if batch["status"] in ("validating", "in_progress"):
+                batch.update(status="cancelled", cancelled_at=int(time.time()))
+            return dict(batch)
+
+    def _run_batch(self, batch_id: str, lines: List[str]):
+        """Выполняет запросы пакета и записывает файлы результатов и ошибок."""
+        with self.lock:
+            self.batches[batch_id].update(status="in_progress", in_progress_at=int(time.time()))
+        time.sleep(self.batch_delay)
+
+        outputs, errors = [], []
+        for line in lines:
+            item = json.loads(line)
+            result = {"id": f"batch_req_{uuid.uuid4().hex[:24]}", "custom_id": item.get("custom_id")}
+            try:
+                body = self.complete(item.get("body") or {}, interactive=False)
+                result.update(response={"status_code": 200, "request_id": uuid.uuid4().hex, "body": body}, error=None)
+                outputs.append(result)
+            except OpenAIError as e:
+                result.update(response={"status_code": e.status, "request_id": uuid.uuid4().hex,
+                                        "body": {"error": {"message": e.message, "type": e.error_type, "code": e.code}}},
+                              error=None)
+                errors.append(result)
+            with self.lock:
+                self.batch_requests += 1
+
+        with self.lock:
+            batch = self.batches[batch_id]
+            if batch["status"] == "cancelled":
+                return
+        output_file = self.create_file(f"{batch_id}_output.jsonl", "batch_output",
+                                       "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in outputs).encode("utf-8"))
+        error_file = self.create_file(f"{batch_id}_error.jsonl", "batch_output",
+                                      "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in errors).encode("utf-8")) if errors else None
+        with self.lock:
+            batch.update(status="completed", completed_at=int(time.time()), output_file_id=output_file["id"],
+                         error_file_id=error_file["id"] if error_file else None,
+                         request_counts={"total": len(lines), "completed": len(outputs), "failed": len(errors)})
+
+    def _summarize(self, prompt: str, max_tokens: int) -> str:
+        """Детерминированный ответ: первые строки содержимого как пункты саммари."""
+        lines = [line.strip() for line in prompt.splitlines() if len(line.strip()) > 20]
+        points = [f"- {line[:160]}" for line in lines[1:6]] or ["- Обсуждение без выделенных тем"]
+        text = "1. Основные темы обсуждения\n" + "\n".join(points)
+        words = text.split(" ")
+        while len(words) > 1 and count_tokens(" ".join(words)) > max_tokens:
+            words = words[:len(words) // 2]
+        return " ".join(words)
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Перцентиль отсортированного списка (0.0 для пустого)."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(percent / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """HTTP обработчик заглушки."""
+
+    state: OpenAIStubState = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        """Отключает логирование каждого запроса в stderr."""
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str):
+        """Разбирает запрос и вызывает обработчик эндпоинта."""
+        state = self.state
+        path = self.path.partition("?")[0]
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        completion = method == "POST" and path == "/v1/chat/completions"
+        if completion:
+            state.enter()
+        started = time.perf_counter()
+        try:
+            if not (self.headers.get("Authorization") or "").startswith("Bearer "):
+                raise OpenAIError(401, "invalid_request_error", "invalid_api_key", "Incorrect API key provided.")
+            if completion:
+                result = state.complete(self._json(raw))
+                state.leave(200, time.perf_counter() - started)
+                self._send(200, result)
+                return
+            self._route(method, path, raw)
+        except OpenAIError as e:
+            if completion:
+                state.leave(e.status)
+            self._send_error(e)
+
+    def _route(self, method: str, path: str, raw: bytes):
+        """Эндпоинты моделей, файлов и пакетов."""
+        state = self.state
+        if method == "GET" and path == "/v1/models":
+            self._send(200, {"object": "list", "data": [
+                {"id": model, "object": "model", "owned_by": "stub"} for model in ("gpt-4o-mini", "gpt-4o")
+            ]})
+        elif method == "POST" and path == "/v1/files":
+            fields = self._multipart(raw)
+            upload = fields.get("file")
+            if not upload:
+                raise OpenAIError(400, "invalid_request_error", None, "Missing file")
+            self._send(200, state.create_file(upload[0], (fields.get("purpose") or ("", b""))[1].decode("utf-8"), upload[1]))
+        elif method == "GET" and re.match(r"^/v1/files/[^/]+/content$", path):
+            self._send_raw(200, state.get_file(path.split("/")[3])["data"])
+        elif method == "GET" and re.match(r"^/v1/files/[^/]+$", path):
+            self._send(200, state.get_file(path.split("/")[3])["info"])
+        elif method == "POST" and path == "/v1/batches":
+            self._send(200, state.create_batch(self._json(raw)))
+        elif method == "GET" and re.match(r"^/v1/batches/[^/]+$", path):
+            self._send(200, state.get_batch(path.split("/")[3]))
+        elif method == "POST" and re.match(r"^/v1/batches/[^/]+/cancel$", path):
+            self._send(200, state.cancel_batch(path.split("/")[3]))
+        else:
+            raise OpenAIError(404, "invalid_request_error", "unknown_url", f"Unknown request URL: {method} {path}.")
+
+    def _json(self, raw: bytes) -> Dict[str, Any]:
+        """Разбирает JSON тело запроса."""
+        try:
+            return json.loads(raw.decode("utf-8")) if raw else {}
+        except json.JSONDecodeError:
+            raise OpenAIError(400, "invalid_request_error", None, "We could not parse the JSON body of your request.")
+
+    def _multipart(self, raw: bytes) -> Dict[str, Tuple[str, bytes]]:
+        """Разбирает multipart/form-data: имя поля -> (имя файла, содержимое)."""
+        content_type = self.headers.get("Content-Type") or ""
+        message = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + raw)
+        if not message.is_multipart():
+            raise OpenAIError(400, "invalid_request_error", None, "Expected multipart/form-data")
+        fields = {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            fields[name] = (part.get_filename() or "", part.get_payload(decode=True) or b"")
+        return fields
+
+    def _send_error(self, error: OpenAIError):
+        """Отправляет ошибку в формате OpenAI."""
+        self._send(error.status, {"error": {"message": error.message, "type": error.error_type,
+                                            "param": None, "code": error.code}}, error.headers)
+
+    def _send_raw(self, status: int, data: bytes):
+        """Отправляет содержимое файла."""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None):
+        """Отправляет JSON ответ."""
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class OpenAIStubServer:
+    """Заглушка OpenAI API на localhost, работающая в фоновом потоке."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **options):
+        """
+        Инициализация сервера.
+
+        Args:
+            host: Адрес для прослушивания
+            port: Порт (0 - любой свободный)
+            **options: Параметры OpenAIStubState (latency, error_rate, rpm, tpm, ...)
+        """
+        self.state = OpenAIStubState(**options)
+        handler = type("OpenAIStubHandler", (_RequestHandler,), {"state": self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Адрес API для OPENAI_BASE_URL."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> str:
+        """
+        Запускает сервер в фоновом потоке.
+
+        Returns:
+            Адрес API
+        """
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="openai-stub", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        """Останавливает сервер."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "OpenAIStubServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    """Запуск заглушки как отдельного сервера."""
+    parser = argparse.ArgumentParser(description="Локальная заглушка OpenAI API (chat completions)")
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес для прослушивания")
+    parser.add_argument("--port", type=int, default=8788, help="Порт")
+    parser.add_argument("--latency", type=float, default=0.2, help="Базовая задержка ответа в секундах")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Задержка на токен ответа в секундах")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Разброс задержки (доля)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Доля запросов с ответом 429")
+    parser.add_argument("--rpm", type=int, default=0, help="Лимит запросов в минуту (0 - без ограничения)")
+    parser.add_argument("--tpm", type=int, default=0, help="Лимит токенов в минуту (0 - без ограничения)")
+    parser.add_argument("--context-window", type=int, default=DEFAULT_CONTEXT_WINDOW, help="Окно контекста в токенах")
+    parser.add_argument("--batch-delay", type=float, default=1.0, help="Время выполнения пакета Batch API в секундах")
+    args = parser.parse_args()
+
+    server = OpenAIStubServer(args.host, args.port, latency=args.latency, token_latency=args.token_latency,
+                              jitter=args.jitter, error_rate=args.error_rate, rpm=args.rpm, tpm=args.tpm,
+                              context_window=args.context_window, batch_delay=args.batch_delay)
+    print(f"🧪 Заглушка OpenAI API: {server.base_url}")
+    print(f"   OPENAI_BASE_URL={server.base_url}")
+    print("   OPENAI_API_KEY=stub")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 Запросы: {json.dumps(server.state.stats(), ensure_ascii=False)}")
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
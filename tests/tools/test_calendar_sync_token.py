@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Тесты инкрементальной синхронизации Google Calendar и обработки 410 Gone
+"""
+
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+# Добавляем корень проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.handlers.state_manager import StateManager
+from src.handlers.calendar_handler import CalendarHandler
+
+
+class FakeHttpError(Exception):
+    """Ошибка API с кодом ответа, как у googleapiclient.errors.HttpError."""
+
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.resp = type('Response', (), {'status': status})()
+
+
+class FakeCalendarService:
+    """Сервис Google Calendar: отдает заданные ответы и записывает параметры запросов."""
+
+    def __init__(self):
+        self.calls = []
+        self.full_items = []
+        self.changes = []
+        self.sync_error = None
+        self.token_number = 0
+
+    def events(self):
+        return self
+
+    def list(self, **params):
+        self.calls.append(params)
+        self._params = params
+        return self
+
+    def execute(self):
+        if 'syncToken' in self._params:
+            if self.sync_error:
+                raise FakeHttpError(self.sync_error)
+            items = self.changes
+        else:
+            items = self.full_items
+        self.token_number += 1
+        return {'items': items, 'nextSyncToken': f'token-{self.token_number}'}
+
+
+def google_event(event_id, start, status='confirmed'):
+    """Событие в формате Google Calendar API."""
+    return {'id': event_id, 'status': status, 'summary': event_id,
+            'start': {'dateTime': start.isoformat()}, 'end': {'dateTime': (start + timedelta(hours=1)).isoformat()}}
+
+
+class TestGoogleSyncToken(unittest.TestCase):
+    """_sync_google_events: полная и инкрементальная синхронизация кэша."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.handler = CalendarHandler.__new__(CalendarHandler)
+        self.handler.logger = logging.getLogger('tests')
+        self.handler.state_manager = StateManager(os.path.join(self.tmp_dir, 'system_state.db'), self.handler.logger)
+        self.service = FakeCalendarService()
+
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.window = (now - timedelta(days=1), now + timedelta(days=7))
+        self.start = now + timedelta(days=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def sync(self):
+        events = self.handler._sync_google_events(self.service, 'work', 'primary', *self.window, full_sync_interval=3600)
+        return [event['id'] for event in events]
+
+    def test_incremental_sync_applies_changes(self):
+        self.service.full_items = [google_event('a', self.start), google_event('b', self.start + timedelta(hours=2))]
+        self.assertEqual(self.sync(), ['a', 'b'])
+
+        self.service.changes = [google_event('b', self.start, status='cancelled'),
+                                google_event('c', self.start + timedelta(hours=3))]
+        self.assertEqual(self.sync(), ['a', 'c'])
+        self.assertEqual(self.service.calls[-1]['syncToken'], 'token-1')
+        self.assertNotIn('timeMin', self.service.calls[-1])
+
+    def test_gone_sync_token_triggers_full_sync(self):
+        self.service.full_items = [google_event('a', self.start), google_event('b', self.start)]
+        self.sync()
+
+        # Токен устарел: кэш заменяется полной выгрузкой
+        self.service.sync_error = 410
+        self.service.full_items = [google_event('d', self.start)]
+        self.assertEqual(self.sync(), ['d'])
+        self.assertIn('syncToken', self.service.calls[-2])
+        self.assertIn('timeMin', self.service.calls[-1])
+
+        state = self.handler.state_manager.get_calendar_sync_state('work', 'primary')
+        self.assertEqual(state['sync_token'], 'token-2')
+        self.assertGreater(state['full_synced_at'], 0)
+
+        # Следующая синхронизация снова инкрементальная с новым токеном
+        self.service.sync_error = None
+        self.service.changes = []
+        self.assertEqual(self.sync(), ['d'])
+        self.assertEqual(self.service.calls[-1]['syncToken'], 'token-2')
+
+    def test_other_errors_are_raised(self):
+        self.service.full_items = [google_event('a', self.start)]
+        self.sync()
+
+        self.service.sync_error = 500
+        with self.assertRaises(FakeHttpError):
+            self.sync()
+        state = self.handler.state_manager.get_calendar_sync_state('work', 'primary')
+        self.assertEqual(state['sync_token'], 'token-1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Тесты хеша входов комплексного саммари
+"""
+
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import unittest
+
+# Добавляем корень проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.handlers.summary_handler import SummaryHandler
+
+
+OPENAI_CONFIG = {'model': 'gpt-4o-mini', 'temperature': 0.3}
+
+
+class TestComplexInputsHash(unittest.TestCase):
+    """_complex_inputs_hash: комплексное саммари устаревает вместе со своими входами."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.handler = SummaryHandler.__new__(SummaryHandler)
+        self.handler.logger = logging.getLogger('tests')
+        self.handler.summary_prompt_version = '1'
+        self.transcripts = [self._transcript('a', "Первая запись"), self._transcript('b', "Вторая запись")]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _transcript(self, name, content):
+        path = os.path.join(self.tmp_dir, f"{name}_transcript.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return {"file": os.path.basename(path), "content": content, "path": path}
+
+    def _write_summary(self, name, text, openai=True):
+        header = "Сгенерировано через OpenAI API\n" if openai else "Базовое саммари\n"
+        with open(os.path.join(self.tmp_dir, f"{name}_transcript_summary.txt"), 'w', encoding='utf-8') as f:
+            f.write(f"# Саммари\n{header}\n## Содержание:\n{text}\n")
+
+    def _hash(self, config=OPENAI_CONFIG, transcripts=None):
+        return self.handler._complex_inputs_hash(transcripts or self.transcripts, config)[1]
+
+    def test_same_inputs_give_same_hash_in_any_order(self):
+        self._write_summary('a', "Саммари первой")
+        self.assertEqual(self._hash(), self._hash(transcripts=list(reversed(self.transcripts))))
+
+    def test_file_summary_change_invalidates(self):
+        self._write_summary('a', "Саммари первой")
+        before = self._hash()
+        self._write_summary('a', "Исправленное саммари первой")
+        self.assertNotEqual(before, self._hash())
+
+    def test_new_file_summary_invalidates(self):
+        before = self._hash()
+        self._write_summary('b', "Саммари второй")
+        self.assertNotEqual(before, self._hash())
+
+    def test_summary_without_openai_is_ignored(self):
+        before = self._hash()
+        self._write_summary('b', "Заглушка", openai=False)
+        self.assertEqual(before, self._hash())
+
+    def test_model_and_prompt_version_invalidate(self):
+        before = self._hash()
+        self.assertNotEqual(before, self._hash(config={'model': 'gpt-4o', 'temperature': 0.3}))
+        self.assertNotEqual(before, self._hash(config={'model': 'gpt-4o-mini', 'temperature': 0.7}))
+        self.handler.summary_prompt_version = '2'
+        self.assertNotEqual(before, self._hash())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Тесты потокового разбора iCal: повторения, EXDATE и RECURRENCE-ID в окне
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime
+
+# Добавляем корень проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+try:
+    from src.handlers.ical_stream import iter_window_occurrences
+    ICAL_AVAILABLE = True
+except ImportError:
+    ICAL_AVAILABLE = False
+
+
+def feed(*events):
+    """Собирает ленту iCal из тел VEVENT."""
+    lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//tests//RU']
+    for event in events:
+        lines += ['BEGIN:VEVENT'] + event.strip().splitlines() + ['END:VEVENT']
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(lines).encode('utf-8')
+
+
+WEEKLY_SERIES = """
+UID:weekly@test
+SUMMARY:Планерка
+DTSTART:20240101T100000
+DTEND:20240101T103000
+RRULE:FREQ=WEEKLY;BYDAY=MO
+"""
+
+WINDOW = (datetime(2024, 3, 1), datetime(2024, 3, 31, 23, 59))
+
+
+@unittest.skipUnless(ICAL_AVAILABLE, "icalendar не установлен")
+class TestWindowOccurrences(unittest.TestCase):
+    """iter_window_occurrences: экземпляры событий внутри окна."""
+
+    def occurrences(self, source):
+        return [(str(component.get('summary')), start) for component, start, _ in
+                iter_window_occurrences(source, *WINDOW)]
+
+    def test_rrule_is_expanded_only_inside_window(self):
+        starts = [start for _, start in self.occurrences(feed(WEEKLY_SERIES))]
+        self.assertEqual(starts, [datetime(2024, 3, day, 10, 0) for day in (4, 11, 18, 25)])
+
+    def test_exdate_removes_occurrence(self):
+        series = WEEKLY_SERIES + "EXDATE:20240311T100000\n"
+        starts = [start for _, start in self.occurrences(feed(series))]
+        self.assertNotIn(datetime(2024, 3, 11, 10, 0), starts)
+        self.assertEqual(len(starts), 3)
+
+    def test_recurrence_id_replaces_occurrence(self):
+        moved = """
+UID:weekly@test
+RECURRENCE-ID:20240318T100000
+SUMMARY:Планерка (перенесена)
+DTSTART:20240319T150000
+DTEND:20240319T153000
+"""
+        result = self.occurrences(feed(WEEKLY_SERIES, moved))
+        self.assertIn(('Планерка (перенесена)', datetime(2024, 3, 19, 15, 0)), result)
+        self.assertNotIn(datetime(2024, 3, 18, 10, 0), [start for _, start in result])
+        self.assertEqual(len(result), 4)
+
+    def test_cancelled_recurrence_id_removes_occurrence(self):
+        cancelled = """
+UID:weekly@test
+RECURRENCE-ID:20240325T100000
+STATUS:CANCELLED
+DTSTART:20240325T100000
+DTEND:20240325T103000
+"""
+        starts = [start for _, start in self.occurrences(feed(WEEKLY_SERIES, cancelled))]
+        self.assertEqual(starts, [datetime(2024, 3, day, 10, 0) for day in (4, 11, 18)])
+
+    def test_override_before_series_in_feed(self):
+        # Переопределение может идти в ленте раньше самой серии
+        moved = """
+UID:weekly@test
+RECURRENCE-ID:20240304T100000
+SUMMARY:Перенос
+DTSTART:20240305T090000
+DTEND:20240305T093000
+"""
+        result = self.occurrences(feed(moved, WEEKLY_SERIES))
+        self.assertEqual(result[0], ('Перенос', datetime(2024, 3, 5, 9, 0)))
+        self.assertEqual(len(result), 4)
+
+    def test_single_events_outside_window_are_skipped(self):
+        inside = "UID:in@test\nSUMMARY:Внутри\nDTSTART:20240315T120000\nDTEND:20240315T130000"
+        outside = "UID:out@test\nSUMMARY:Снаружи\nDTSTART:20230315T120000\nDTEND:20230315T130000"
+        self.assertEqual(self.occurrences(feed(outside, inside)), [('Внутри', datetime(2024, 3, 15, 12, 0))])
+
+    def test_broken_event_does_not_stop_feed(self):
+        broken = "UID:broken@test\nSUMMARY:Сломано\nDTSTART:20240315T120000\nRRULE:FREQ=NOPE"
+        inside = "UID:in@test\nSUMMARY:Внутри\nDTSTART:20240316T120000\nDTEND:20240316T130000"
+        self.assertEqual(self.occurrences(feed(broken, inside)), [('Внутри', datetime(2024, 3, 16, 12, 0))])
+
+
+if __name__ == '__main__':
+    unittest.main()
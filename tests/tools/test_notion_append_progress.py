@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Тесты прогресса дозаписи контента на страницы Notion в StateManager
+"""
+
+import os
+import sys
+import shutil
+import sqlite3
+import logging
+import tempfile
+import unittest
+
+# Добавляем корень проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.handlers.state_manager import StateManager
+
+
+class StateManagerTestCase(unittest.TestCase):
+    """Базовый класс: StateManager на временной базе."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, 'system_state.db')
+        self.state = StateManager(self.db_path, logger=logging.getLogger('tests'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+class TestNotionAppendProgress(StateManagerTestCase):
+    """Прогресс дозаписи контента на страницы Notion."""
+
+    def test_progress_is_kept_per_content_hash(self):
+        self.state.set_append_progress('page-1', 'transcription', 'hash-a', 100, completed=True)
+        self.state.set_append_progress('page-1', 'transcription', 'hash-b', 40, completed=False)
+
+        first = self.state.get_append_progress('page-1', 'transcription', 'hash-a')
+        second = self.state.get_append_progress('page-1', 'transcription', 'hash-b')
+        self.assertEqual((first['blocks_appended'], first['completed']), (100, 1))
+        self.assertEqual((second['blocks_appended'], second['completed']), (40, 0))
+        self.assertIsNone(self.state.get_append_progress('page-1', 'transcription', 'hash-c'))
+
+    def test_progress_is_updated_in_place(self):
+        self.state.set_append_progress('page-1', 'summary', 'hash-a', 100, completed=False)
+        self.state.set_append_progress('page-1', 'summary', 'hash-a', 250, completed=True)
+
+        progress = self.state.get_append_progress('page-1', 'summary', 'hash-a')
+        self.assertEqual((progress['blocks_appended'], progress['completed']), (250, 1))
+
+    def test_legacy_table_is_migrated(self):
+        # Таблица прежней схемы: ключ (page_id, content_key) без хеша контента
+        legacy_path = os.path.join(self.tmp_dir, 'legacy.db')
+        with sqlite3.connect(legacy_path) as conn:
+            conn.execute('''
+                CREATE TABLE notion_append_progress (
+                    page_id TEXT NOT NULL,
+                    content_key TEXT NOT NULL,
+                    content_hash TEXT,
+                    blocks_appended INTEGER DEFAULT 0,
+                    completed INTEGER DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (page_id, content_key)
+                )
+            ''')
+            conn.execute("INSERT INTO notion_append_progress (page_id, content_key, content_hash, blocks_appended, completed)"
+                         " VALUES ('page-1', 'summary', 'hash-a', 70, 0)")
+            conn.commit()
+
+        state = StateManager(legacy_path, logger=logging.getLogger('tests'))
+        progress = state.get_append_progress('page-1', 'summary', 'hash-a')
+        self.assertEqual((progress['blocks_appended'], progress['completed']), (70, 0))
+
+        state.set_append_progress('page-1', 'summary', 'hash-b', 10, completed=False)
+        self.assertIsNotNone(state.get_append_progress('page-1', 'summary', 'hash-a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
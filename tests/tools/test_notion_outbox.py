@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Тесты объединения операций очереди изменений Notion в StateManager
+"""
+
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import unittest
+
+# Добавляем корень проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.handlers.state_manager import StateManager
+
+
+class StateManagerTestCase(unittest.TestCase):
+    """Базовый класс: StateManager на временной базе."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, 'system_state.db')
+        self.state = StateManager(self.db_path, logger=logging.getLogger('tests'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+class TestNotionOutboxCoalescing(StateManagerTestCase):
+    """Объединение ожидающих операций очереди Notion."""
+
+    def test_upsert_of_same_event_keeps_latest_payload(self):
+        self.state.enqueue_notion_operation('upsert_meeting', 'event-1', {'title': 'Старое'})
+        self.state.enqueue_notion_operation('upsert_meeting', 'event-1', {'title': 'Новое'})
+
+        operations = self.state.claim_notion_operations()
+        self.assertEqual(len(operations), 1)
+        self.assertEqual(operations[0]['payload'], {'title': 'Новое'})
+        self.assertEqual(operations[0]['coalesced'], 1)
+
+    def test_appends_of_different_files_are_kept(self):
+        self.state.enqueue_notion_operation('append_transcription', 'event-1', {'transcript_file': 'a.txt'})
+        self.state.enqueue_notion_operation('append_transcription', 'event-1', {'transcript_file': 'b.txt'})
+
+        files = sorted(op['payload']['transcript_file'] for op in self.state.claim_notion_operations())
+        self.assertEqual(files, ['a.txt', 'b.txt'])
+
+    def test_repeated_append_of_same_file_is_merged(self):
+        self.state.enqueue_notion_operation('append_summary', 'event-1', {'summary_file': 's.txt'})
+        self.state.enqueue_notion_operation('append_summary', 'event-1', {'summary_file': 's.txt'})
+
+        self.assertEqual(len(self.state.claim_notion_operations()), 1)
+
+    def test_claimed_operation_is_not_merged(self):
+        self.state.enqueue_notion_operation('upsert_meeting', 'event-1', {'title': 'Первое'})
+        self.assertEqual(len(self.state.claim_notion_operations()), 1)
+
+        # Выполняемая операция уже ушла в Notion: новое изменение ставится отдельно
+        self.state.enqueue_notion_operation('upsert_meeting', 'event-1', {'title': 'Второе'})
+        operations = self.state.claim_notion_operations()
+        self.assertEqual([op['payload']['title'] for op in operations], ['Второе'])
+        self.assertEqual(self.state.claim_notion_operations(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
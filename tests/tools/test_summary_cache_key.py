@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Тесты нормализации транскрипций и ключа кэша саммари
+"""
+
+import os
+import sys
+import unittest
+
+# Добавляем корень проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.handlers.summary_handler import SummaryHandler, normalize_transcript
+
+
+SYSTEM_PROMPT = "Ты - помощник по анализу встреч."
+PROMPT_TEMPLATE = "Сделай саммари:\n\n{content}"
+OPENAI_CONFIG = {'model': 'gpt-4o-mini', 'temperature': 0.3}
+
+
+class TestNormalizeTranscript(unittest.TestCase):
+    """Нормализация текста транскрипции."""
+
+    def test_line_endings_and_spaces_are_normalized(self):
+        original = "Иван:  привет\nМария: добрый день\n"
+        resaved = "Иван: привет \r\n\r\n\r\n\r\nМария:\tдобрый   день\r\n"
+        self.assertEqual(normalize_transcript(original), "Иван: привет\nМария: добрый день")
+        self.assertEqual(normalize_transcript(resaved), "Иван: привет\n\nМария: добрый день")
+
+    def test_unicode_is_composed(self):
+        decomposed = "\u0435\u0308лка"
+        self.assertEqual(normalize_transcript(decomposed), "\u0451лка")
+
+
+class TestSummaryCacheKey(unittest.TestCase):
+    """Ключ кэша саммари: содержимое, версия промпта, модель и температура."""
+
+    def setUp(self):
+        self.handler = SummaryHandler.__new__(SummaryHandler)
+        self.handler.summary_cache_enabled = True
+        self.handler.state_manager = object()
+        self.handler.prompt_manager = None
+        self.handler.summary_prompt_version = '1'
+
+    def _key(self, content, config=OPENAI_CONFIG, template=PROMPT_TEMPLATE, max_tokens=1000):
+        request = self.handler._build_summary_request(config, SYSTEM_PROMPT, template, content, max_tokens)
+        return request['cache_key']
+
+    def test_same_normalized_content_gives_same_key(self):
+        first = normalize_transcript("Иван: привет\nМария: добрый день")
+        second = normalize_transcript("Иван:  привет\r\nМария: добрый день\r\n")
+        self.assertEqual(self._key(first), self._key(second))
+
+    def test_key_depends_on_request_parameters(self):
+        base = self._key("текст")
+        self.assertNotEqual(base, self._key("другой текст"))
+        self.assertNotEqual(base, self._key("текст", config={'model': 'gpt-4o', 'temperature': 0.3}))
+        self.assertNotEqual(base, self._key("текст", config={'model': 'gpt-4o-mini', 'temperature': 0.7}))
+        self.assertNotEqual(base, self._key("текст", template="Кратко:\n{content}"))
+        self.assertNotEqual(base, self._key("текст", max_tokens=2000))
+
+    def test_prompt_version_changes_key(self):
+        base = self._key("текст")
+        self.handler.summary_prompt_version = '2'
+        self.assertNotEqual(base, self._key("текст"))
+
+    def test_no_key_when_cache_disabled(self):
+        self.handler.summary_cache_enabled = False
+        request = self.handler._build_summary_request(OPENAI_CONFIG, SYSTEM_PROMPT, PROMPT_TEMPLATE, "текст", 1000)
+        self.assertIsNone(request['cache_key'])
+        self.assertIsNone(request['prompt_version'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Тесты разбиения длинных сообщений Telegram
+"""
+
+import os
+import re
+import sys
+import unittest
+
+# Добавляем корень проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.telegram_api import split_message
+
+
+_TAG_RE = re.compile(r'<(/?)([a-z]+)[^<>]*>')
+
+
+def unbalanced_tags(chunk):
+    """Возвращает теги части, оставшиеся открытыми или закрытые без открытия."""
+    stack = []
+    for closing, name in _TAG_RE.findall(chunk):
+        if not closing:
+            stack.append(name)
+        elif stack and stack[-1] == name:
+            stack.pop()
+        else:
+            return [f'/{name}']
+    return stack
+
+
+def plain_text(chunks):
+    """Текст частей без разметки и переводов строк (для проверки, что ничего не потеряно)."""
+    return re.sub(r'\s+', '', _TAG_RE.sub('', ''.join(chunks)))
+
+
+class TestSplitMessage(unittest.TestCase):
+    """split_message: лимит длины и корректный HTML в каждой части."""
+
+    def test_short_message_is_not_split(self):
+        self.assertEqual(split_message("<b>Отчет</b>", limit=100), ["<b>Отчет</b>"])
+
+    def test_chunks_fit_limit_and_keep_text(self):
+        text = "\n".join(f"Строка номер {index} с текстом отчета" for index in range(200))
+        chunks = split_message(text, limit=300)
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= 300 for chunk in chunks))
+        self.assertEqual(plain_text(chunks), plain_text([text]))
+
+    def test_open_tags_are_closed_and_reopened(self):
+        text = '<b>Итоги встречи</b>\n<i>' + ' '.join(f"пункт{index}" for index in range(150)) + '</i>\nКонец'
+        chunks = split_message(text, limit=200)
+        self.assertGreater(len(chunks), 2)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), 200)
+            self.assertEqual(unbalanced_tags(chunk), [], chunk)
+        # Продолжение курсива открывается заново в следующей части
+        self.assertTrue(chunks[1].startswith('<i>'))
+        self.assertEqual(plain_text(chunks), plain_text([text]))
+
+    def test_nested_tags_with_attributes(self):
+        link = '<a href="https://example.com/meeting">ссылка</a>'
+        text = '<b>' + ' '.join([link] * 40) + '</b>'
+        chunks = split_message(text, limit=250)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), 250)
+            self.assertEqual(unbalanced_tags(chunk), [], chunk)
+            self.assertEqual(chunk.count('<a '), chunk.count('</a>'))
+
+    def test_entities_are_not_cut(self):
+        text = ' '.join(['&lt;тег&gt; &amp;'] * 100)
+        for chunk in split_message(text, limit=97):
+            self.assertLessEqual(len(chunk), 97)
+            self.assertIsNone(re.search(r'&[a-z]*$', chunk), chunk)
+            self.assertIsNone(re.match(r'^[a-z]*;', chunk), chunk)
+
+    def test_plain_text_mode_ignores_markup(self):
+        text = 'x' * 150 + '<b>' + 'y' * 150
+        chunks = split_message(text, limit=100, html=False)
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+        self.assertEqual(''.join(chunks), text)
+
+
+if __name__ == '__main__':
+    unittest.main()
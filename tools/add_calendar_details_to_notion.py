@@ -7,13 +7,14 @@
 import os
 import sys
 import sqlite3
-import requests
 import json
 from dotenv import load_dotenv
 
 # Добавляем путь к модулям проекта
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.handlers.notion_api import get_notion_client
+
 def add_calendar_details_to_notion():
     """Добавляет детали календаря в страницы Notion."""
     
@@ -130,7 +131,7 @@ def add_calendar_details_to_notion():
                         update_url = f"https://api.notion.com/v1/pages/{page_id}"
                         update_data = {"properties": properties_to_update}
                         
-                        response = requests.patch(update_url, headers=headers, json=update_data)
+                        response = get_notion_client().patch(update_url, headers=headers, json=update_data)
                         response.raise_for_status()
                         print(f"   ✅ Свойства страницы обновлены")
                         
@@ -224,7 +225,7 @@ def _add_event_description_to_page(page_id: str, calendar_data: dict, headers: d
         
         # Проверяем, не добавлено ли уже описание
         blocks_url = f"https://api.notion.com/v1/blocks/{page_id}/children"
-        blocks_response = requests.get(blocks_url, headers=headers)
+        blocks_response = get_notion_client().get(blocks_url, headers=headers)
         blocks_response.raise_for_status()
         blocks_data = blocks_response.json()
         
@@ -275,7 +276,7 @@ def _add_event_description_to_page(page_id: str, calendar_data: dict, headers: d
         ]
         
         blocks_data = {"children": description_blocks}
-        response = requests.patch(blocks_url, headers=headers, json=blocks_data)
+        response = get_notion_client().patch(blocks_url, headers=headers, json=blocks_data)
         response.raise_for_status()
         
     except Exception as e:
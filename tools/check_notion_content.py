@@ -5,9 +5,12 @@
 
 import os
 import sys
-import requests
 from dotenv import load_dotenv
 
+# Добавляем корневую директорию в путь для импортов
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.handlers.notion_api import get_notion_client
+
 # Загружаем переменные окружения
 load_dotenv()
 
@@ -46,7 +49,7 @@ def check_notion_content():
             if start_cursor:
                 payload["start_cursor"] = start_cursor
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = get_notion_client().post(url, headers=headers, json=payload)
             response.raise_for_status()
             
             data = response.json()
@@ -74,7 +77,7 @@ def check_notion_content():
             # Получаем блоки страницы
             try:
                 url = f"https://api.notion.com/v1/blocks/{page_id}/children"
-                response = requests.get(url, headers=headers)
+                response = get_notion_client().get(url, headers=headers)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -7,12 +7,13 @@
 import os
 import sys
 import sqlite3
-import requests
 from dotenv import load_dotenv
 
 # Добавляем путь к модулям проекта
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.handlers.notion_api import get_notion_client
+
 def check_notion_content_status():
     """Проверяет статус контента в Notion страницах."""
     
@@ -90,7 +91,7 @@ def check_notion_content_status():
                 try:
                     # Получаем свойства страницы
                     page_url = f"https://api.notion.com/v1/pages/{page_id}"
-                    response = requests.get(page_url, headers=headers)
+                    response = get_notion_client().get(page_url, headers=headers)
                     response.raise_for_status()
                     page_data = response.json()
                     
@@ -139,7 +140,7 @@ def check_notion_content_status():
                     
                     # Получаем блоки страницы для проверки контента
                     blocks_url = f"https://api.notion.com/v1/blocks/{page_id}/children"
-                    blocks_response = requests.get(blocks_url, headers=headers)
+                    blocks_response = get_notion_client().get(blocks_url, headers=headers)
                     blocks_response.raise_for_status()
                     blocks_data = blocks_response.json()
                     
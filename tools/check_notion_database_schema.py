@@ -5,9 +5,12 @@
 
 import os
 import sys
-import requests
 from dotenv import load_dotenv
 
+# Добавляем корневую директорию в путь для импортов
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.handlers.notion_api import get_notion_client
+
 # Загружаем переменные окружения
 load_dotenv()
 
@@ -35,7 +38,7 @@ def check_notion_database_schema():
         
         # Получаем информацию о базе данных
         url = f"https://api.notion.com/v1/databases/{database_id}"
-        response = requests.get(url, headers=headers)
+        response = get_notion_client().get(url, headers=headers)
         response.raise_for_status()
         
         database_info = response.json()
@@ -93,7 +96,7 @@ def check_notion_database_schema():
         url = f"https://api.notion.com/v1/databases/{database_id}/query"
         payload = {"page_size": 1}
         
-        response = requests.post(url, headers=headers, json=payload)
+        response = get_notion_client().post(url, headers=headers, json=payload)
         response.raise_for_status()
         
         data = response.json()
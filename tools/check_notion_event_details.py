@@ -6,10 +6,13 @@
 import os
 import sys
 import sqlite3
-import requests
 from dotenv import load_dotenv
 from datetime import datetime
 
+# Добавляем корневую директорию в путь для импортов
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.handlers.notion_api import get_notion_client
+
 # Загружаем переменные окружения
 load_dotenv()
 
@@ -77,7 +80,7 @@ def check_notion_event_details():
             if start_cursor:
                 payload["start_cursor"] = start_cursor
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = get_notion_client().post(url, headers=headers, json=payload)
             response.raise_for_status()
             
             data = response.json()
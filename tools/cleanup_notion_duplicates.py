@@ -5,11 +5,14 @@
 
 import os
 import sys
-import requests
 from collections import defaultdict
 from dotenv import load_dotenv
 from datetime import datetime
 
+# Добавляем корневую директорию в путь для импортов
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.handlers.notion_api import get_notion_client
+
 # Загружаем переменные окружения
 load_dotenv()
 
@@ -50,7 +53,7 @@ def cleanup_notion_duplicates(dry_run=True):
             if start_cursor:
                 payload["start_cursor"] = start_cursor
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = get_notion_client().post(url, headers=headers, json=payload)
             response.raise_for_status()
             
             data = response.json()
@@ -133,7 +136,7 @@ def cleanup_notion_duplicates(dry_run=True):
                 
                 # Удаляем страницу
                 url = f"https://api.notion.com/v1/pages/{page_id}"
-                response = requests.patch(url, headers=headers, json={"archived": True})
+                response = get_notion_client().patch(url, headers=headers, json={"archived": True})
                 response.raise_for_status()
                 
                 deleted_count += 1
@@ -7,13 +7,14 @@
 import os
 import sys
 import sqlite3
-import requests
 import json
 from dotenv import load_dotenv
 
 # Добавляем путь к модулям проекта
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.handlers.notion_api import get_notion_client
+
 def complete_notion_enhancement():
     """Выполняет полное улучшение всех страниц Notion."""
     
@@ -142,7 +143,7 @@ def _check_if_needs_enhancement(page_id: str, headers: dict) -> bool:
     try:
         # Получаем блоки страницы
         blocks_url = f"https://api.notion.com/v1/blocks/{page_id}/children"
-        blocks_response = requests.get(blocks_url, headers=headers)
+        blocks_response = get_notion_client().get(blocks_url, headers=headers)
         blocks_response.raise_for_status()
         blocks_data = blocks_response.json()
         
@@ -197,7 +198,7 @@ def _update_page_properties(page_id: str, event_id: str, folder_path: str, heade
             update_url = f"https://api.notion.com/v1/pages/{page_id}"
             update_data = {"properties": properties_to_update}
             
-            response = requests.patch(update_url, headers=headers, json=update_data)
+            response = get_notion_client().patch(update_url, headers=headers, json=update_data)
             response.raise_for_status()
             return True
         
@@ -262,7 +263,7 @@ def _add_meeting_description(page_id: str, event_title: str, start_time: str, en
         blocks_url = f"https://api.notion.com/v1/blocks/{page_id}/children"
         blocks_data = {"children": description_blocks}
         
-        response = requests.patch(blocks_url, headers=headers, json=blocks_data)
+        response = get_notion_client().patch(blocks_url, headers=headers, json=blocks_data)
         response.raise_for_status()
         return True
         
@@ -354,7 +355,7 @@ def _add_transcription_to_page(page_id: str, transcript_file: str, headers: dict
         blocks_url = f"https://api.notion.com/v1/blocks/{page_id}/children"
         blocks_data = {"children": blocks}
         
-        response = requests.patch(blocks_url, headers=headers, json=blocks_data)
+        response = get_notion_client().patch(blocks_url, headers=headers, json=blocks_data)
         response.raise_for_status()
         return True
         
@@ -437,7 +438,7 @@ def _add_summary_to_page(page_id: str, summary_file: str, analysis_file: str, he
         blocks_url = f"https://api.notion.com/v1/blocks/{page_id}/children"
         blocks_data = {"children": blocks}
         
-        response = requests.patch(blocks_url, headers=headers, json=blocks_data)
+        response = get_notion_client().patch(blocks_url, headers=headers, json=blocks_data)
         response.raise_for_status()
         return True
         
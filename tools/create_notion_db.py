@@ -27,9 +27,12 @@ import json
 import argparse
 from typing import Dict, Any
 
-import requests
 from dotenv import load_dotenv
 
+# Добавляем корневую директорию в путь для импортов
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.handlers.notion_api import get_notion_client
+
 NOTION_API_URL = "https://api.notion.com/v1/databases"
 NOTION_VERSION = "2022-06-28"
 
@@ -69,7 +72,7 @@ def create_database(token: str, parent_page_id: str, title: str) -> str:
         "properties": DEFAULT_PROPERTIES,
     }
 
-    resp = requests.post(NOTION_API_URL, headers=headers, data=json.dumps(payload), timeout=30)
+    resp = get_notion_client().post(NOTION_API_URL, headers=headers, data=json.dumps(payload), timeout=30)
     if resp.status_code not in (200, 201):
         print("✖ Не удалось создать базу данных в Notion.")
         print(f"Status: {resp.status_code}")
@@ -230,37 +230,78 @@ class DatabaseViewer:
         except Exception as e:
             print(f"❌ Ошибка получения синхронизации с Notion: {e}")
     
+    def _has_table(self, table_name: str) -> bool:
+        """Проверяет наличие таблицы в базе данных."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
+        return cursor.fetchone() is not None
+    
     def show_statistics(self):
         """Показывает общую статистику."""
         try:
             cursor = self.conn.cursor()
             
-            # Общая статистика
-            cursor.execute('SELECT COUNT(*) FROM system_state')
-            total_cycles = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT COUNT(*) FROM processed_events')
-            total_events = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT COUNT(*) FROM processed_media')
-            total_media = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT COUNT(*) FROM processed_transcriptions')
-            total_transcriptions = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT COUNT(*) FROM notion_sync')
-            total_notion_sync = cursor.fetchone()[0]
-            
-            # Статистика по аккаунтам
-            cursor.execute('SELECT account_type, COUNT(*) FROM processed_events GROUP BY account_type')
-            events_by_account = cursor.fetchall()
+            if self._has_table('stats_counters'):
+                # Агрегаты поддерживаются триггерами StateManager - без сканирования таблиц
+                cursor.execute('SELECT table_name, account_type, total, success FROM stats_counters')
+                counters = cursor.fetchall()
+                
+                def total(table, success_only=False):
+                    return sum(row['success' if success_only else 'total'] or 0
+                               for row in counters if row['table_name'] == table)
+                
+                total_cycles = total('system_state')
+                total_events = total('processed_events')
+                total_media = total('processed_media')
+                total_transcriptions = total('processed_transcriptions')
+                total_summaries = total('processed_summaries')
+                total_notion_sync = total('notion_sync_status', success_only=True)
+                events_by_account = [(row['account_type'], row['total'])
+                                     for row in counters if row['table_name'] == 'processed_events']
+                backlog = {
+                    'folders': total('processed_events') - total('folder_creation_status', True),
+                    'notion': total('processed_events') - total('notion_sync_status', True),
+                    'transcription': total('processed_media', True) - total('processed_transcriptions', True),
+                    'summary': total('processed_transcriptions', True) - total('processed_summaries', True)
+                }
+                
+                cursor.execute('''
+                    SELECT day, stage, processed, errors FROM stats_daily_throughput
+                    WHERE day >= date('now', '-6 days')
+                    ORDER BY day DESC, stage
+                ''')
+                throughput = cursor.fetchall()
+            else:
+                # Старая база без агрегатов
+                cursor.execute('SELECT COUNT(*) FROM system_state')
+                total_cycles = cursor.fetchone()[0]
+                
+                cursor.execute('SELECT COUNT(*) FROM processed_events')
+                total_events = cursor.fetchone()[0]
+                
+                cursor.execute('SELECT COUNT(*) FROM processed_media')
+                total_media = cursor.fetchone()[0]
+                
+                cursor.execute('SELECT COUNT(*) FROM processed_transcriptions')
+                total_transcriptions = cursor.fetchone()[0]
+                
+                cursor.execute('SELECT COUNT(*) FROM notion_sync')
+                total_notion_sync = cursor.fetchone()[0]
+                
+                total_summaries = None
+                backlog = {}
+                throughput = []
+                
+                # Статистика по аккаунтам
+                cursor.execute('SELECT account_type, COUNT(*) FROM processed_events GROUP BY account_type')
+                events_by_account = cursor.fetchall()
             
             # Последний цикл
             cursor.execute('''
                 SELECT cycle_id, timestamp, personal_events_processed, work_events_processed,
                        media_processed, transcriptions_processed, notion_synced, errors_count
                 FROM system_state 
-                ORDER BY created_at DESC LIMIT 1
+                ORDER BY id DESC LIMIT 1
             ''')
             
             last_cycle = cursor.fetchone()
@@ -271,6 +312,8 @@ class DatabaseViewer:
             print(f"📅 Всего обработанных событий: {total_events}")
             print(f"🎬 Всего обработанных медиа файлов: {total_media}")
             print(f"🎤 Всего обработанных транскрипций: {total_transcriptions}")
+            if total_summaries is not None:
+                print(f"📋 Всего обработанных саммари: {total_summaries}")
             print(f"📝 Всего синхронизаций с Notion: {total_notion_sync}")
             
             if events_by_account:
@@ -278,6 +321,20 @@ class DatabaseViewer:
                 for account, count in events_by_account:
                     print(f"   {account}: {count}")
             
+            if backlog:
+                print("\n⏳ Очереди этапов:")
+                print(f"   📁 Папки: {max(backlog['folders'], 0)}, 📝 Notion: {max(backlog['notion'], 0)}")
+                print(f"   🎤 Транскрипция: {max(backlog['transcription'], 0)}, 📋 Саммари: {max(backlog['summary'], 0)}")
+            
+            if throughput:
+                print("\n📈 Обработано по дням (успешно/ошибки):")
+                current_day = None
+                for row in throughput:
+                    if row['day'] != current_day:
+                        current_day = row['day']
+                        print(f"   {current_day}:")
+                    print(f"      {row['stage']:<14} {row['processed']}/{row['errors']}")
+            
             if last_cycle:
                 print(f"\n🔄 Последний цикл #{last_cycle['cycle_id']} ({last_cycle['timestamp']}):")
                 print(f"   📅 События: личные={last_cycle['personal_events_processed']}, рабочие={last_cycle['work_events_processed']}")
@@ -345,20 +402,118 @@ class DatabaseViewer:
         except Exception as e:
             print(f"❌ Ошибка поиска событий: {e}")
     
-    def show_processing_table(self, limit: int = 20):
-        """Показывает таблицу обработки событий."""
-        try:
-            cursor = self.conn.cursor()
+    def _fetch_events_with_stages(self, limit: int) -> List[sqlite3.Row]:
+        """
+        Получает последние события вместе с состоянием этапов обработки.
+        
+        Если в базе есть таблица event_stage_summary (поддерживается триггерами
+        StateManager), состояние этапов читается одним запросом.
+        
+        Args:
+            limit: Количество событий
             
-            # Получаем все события
+        Returns:
+            Список строк событий
+        """
+        cursor = self.conn.cursor()
+        
+        if self._has_table('event_stage_summary'):
+            cursor.execute('''
+                SELECT pe.event_id, pe.account_type, pe.event_title, pe.event_start_time,
+                       pe.event_end_time, pe.processed_at,
+                       ess.folder_created, ess.notion_synced, ess.media_count,
+                       ess.transcription_count, ess.summary_count, ess.last_media_at,
+                       ess.last_transcription_at, ess.last_notion_sync_at
+                FROM processed_events pe
+                LEFT JOIN event_stage_summary ess
+                       ON ess.event_id = pe.event_id AND ess.account_type = pe.account_type
+                ORDER BY pe.processed_at DESC 
+                LIMIT ?
+            ''', (limit,))
+        else:
             cursor.execute('''
                 SELECT event_id, account_type, event_title, event_start_time, event_end_time, processed_at
                 FROM processed_events 
                 ORDER BY processed_at DESC 
                 LIMIT ?
             ''', (limit,))
+        
+        return cursor.fetchall()
+    
+    def _get_event_stages(self, event: sqlite3.Row) -> Dict[str, Any]:
+        """
+        Возвращает состояние этапов обработки события.
+        
+        Для старых баз без event_stage_summary выполняет поиск по таблицам обработки.
+        
+        Args:
+            event: Строка события из _fetch_events_with_stages
             
-            events = cursor.fetchall()
+        Returns:
+            Словарь с флагами, количеством файлов и временем этапов
+        """
+        if 'folder_created' in event.keys():
+            return {
+                'folder_created': event['folder_created'] or 0,
+                'notion_synced': event['notion_synced'] or 0,
+                'media_count': event['media_count'] or 0,
+                'transcription_count': event['transcription_count'] or 0,
+                'summary_count': event['summary_count'] or 0,
+                'last_media_at': event['last_media_at'],
+                'last_transcription_at': event['last_transcription_at'],
+                'last_notion_sync_at': event['last_notion_sync_at']
+            }
+        
+        cursor = self.conn.cursor()
+        event_id = event['event_id']
+        account_type = event['account_type']
+        stages = {
+            'folder_created': 0, 'notion_synced': 0, 'media_count': 0,
+            'transcription_count': 0, 'summary_count': 0, 'last_media_at': None,
+            'last_transcription_at': None, 'last_notion_sync_at': None
+        }
+        
+        # Проверяем создание папки
+        cursor.execute('''
+            SELECT folder_path FROM folder_creation_status 
+            WHERE event_id = ? AND account_type = ? AND status = 'success'
+        ''', (event_id, account_type))
+        folder_result = cursor.fetchone()
+        stages['folder_created'] = 1 if folder_result else 0
+        
+        # Проверяем создание страницы в Notion
+        cursor.execute('''
+            SELECT MAX(last_sync), SUM(sync_status = 'success') FROM notion_sync_status 
+            WHERE event_id = ?
+        ''', (event_id,))
+        notion_result = cursor.fetchone()
+        stages['last_notion_sync_at'] = notion_result[0]
+        stages['notion_synced'] = notion_result[1] or 0
+        
+        # Медиа, транскрипции и саммари ищем по папке события
+        if folder_result and folder_result[0]:
+            folder_path = folder_result[0]
+            for table, path_col, time_col, count_key, last_key in (
+                ('processed_media', 'file_path', 'processed_at', 'media_count', 'last_media_at'),
+                ('processed_transcriptions', 'file_path', 'processed_at', 'transcription_count', 'last_transcription_at'),
+                ('processed_summaries', 'summary_file', 'created_at', 'summary_count', None)
+            ):
+                cursor.execute(f'''
+                    SELECT COUNT(*), MAX({time_col}) FROM {table} 
+                    WHERE {path_col} LIKE ?
+                ''', (f'{folder_path}%',))
+                count, last_time = cursor.fetchone()
+                stages[count_key] = count
+                if last_key:
+                    stages[last_key] = last_time
+        
+        return stages
+    
+    def show_processing_table(self, limit: int = 20):
+        """Показывает таблицу обработки событий."""
+        try:
+            # Получаем события вместе с агрегированным состоянием этапов
+            events = self._fetch_events_with_stages(limit)
             
             if not events:
                 print("📊 События для таблицы не найдены")
@@ -373,7 +528,6 @@ class DatabaseViewer:
             print("-" * 200)
             
             for event in events:
-                event_id = event['event_id']
                 account_type = event['account_type']
                 event_title = event['event_title'][:37] + "..." if len(event['event_title']) > 40 else event['event_title']
                 
@@ -391,59 +545,17 @@ class DatabaseViewer:
                 # Проверяем статус обработки для каждого этапа
                 calendar_status = "✅" if event['processed_at'] else "❌"
                 
-                # Проверяем создание папки
-                cursor.execute('''
-                    SELECT COUNT(*) FROM folder_creation_status 
-                    WHERE event_id = ? AND account_type = ? AND status = 'success'
-                ''', (event_id, account_type))
-                folder_count = cursor.fetchone()[0]
-                folder_status = "✅" if folder_count > 0 else "❌"
+                stages = self._get_event_stages(event)
+                folder_count = stages['folder_created']
+                notion_page_count = stages['notion_synced']
+                media_count = stages['media_count']
+                trans_count = stages['transcription_count']
+                summary_count = stages['summary_count']
                 
-                # Проверяем создание страницы в Notion
-                cursor.execute('''
-                    SELECT COUNT(*) FROM notion_sync_status 
-                    WHERE event_id = ? AND sync_status = 'success'
-                ''', (event_id,))
-                notion_page_count = cursor.fetchone()[0]
+                folder_status = "✅" if folder_count > 0 else "❌"
                 notion_page_status = "✅" if notion_page_count > 0 else "❌"
-                
-                # Проверяем медиа файлы - ищем по папке события
-                cursor.execute('''
-                    SELECT fcs.folder_path FROM folder_creation_status fcs
-                    WHERE fcs.event_id = ? AND fcs.account_type = ? AND fcs.status = 'success'
-                ''', (event_id, account_type))
-                folder_result = cursor.fetchone()
-                
-                media_count = 0
-                if folder_result:
-                    folder_path = folder_result[0]
-                    cursor.execute('''
-                        SELECT COUNT(*) FROM processed_media 
-                        WHERE file_path LIKE ?
-                    ''', (f'{folder_path}%',))
-                    media_count = cursor.fetchone()[0]
                 media_status = f"✅({media_count})" if media_count > 0 else "❌"
-                
-                # Проверяем транскрипции - ищем по папке события
-                trans_count = 0
-                if folder_result:
-                    folder_path = folder_result[0]
-                    cursor.execute('''
-                        SELECT COUNT(*) FROM processed_transcriptions 
-                        WHERE file_path LIKE ?
-                    ''', (f'{folder_path}%',))
-                    trans_count = cursor.fetchone()[0]
                 trans_status = f"✅({trans_count})" if trans_count > 0 else "❌"
-                
-                # Проверяем саммари - ищем по папке события
-                summary_count = 0
-                if folder_result:
-                    folder_path = folder_result[0]
-                    cursor.execute('''
-                        SELECT COUNT(*) FROM processed_summaries 
-                        WHERE summary_file LIKE ?
-                    ''', (f'{folder_path}%',))
-                    summary_count = cursor.fetchone()[0]
                 summary_status = f"✅({summary_count})" if summary_count > 0 else "❌"
                 
                 # Определяем общий статус
@@ -476,17 +588,8 @@ class DatabaseViewer:
     def show_detailed_processing_table(self, limit: int = 10):
         """Показывает детальную таблицу обработки с временными метками."""
         try:
-            cursor = self.conn.cursor()
-            
-            # Получаем все события
-            cursor.execute('''
-                SELECT event_id, account_type, event_title, event_start_time, event_end_time, processed_at
-                FROM processed_events 
-                ORDER BY processed_at DESC 
-                LIMIT ?
-            ''', (limit,))
-            
-            events = cursor.fetchall()
+            # Получаем события вместе с агрегированным состоянием этапов
+            events = self._fetch_events_with_stages(limit)
             
             if not events:
                 print("📊 События для детальной таблицы не найдены")
@@ -501,39 +604,17 @@ class DatabaseViewer:
             print("-" * 180)
             
             for event in events:
-                event_id = event['event_id']
                 account_type = event['account_type']
                 event_title = event['event_title'][:37] + "..." if len(event['event_title']) > 40 else event['event_title']
                 
                 # Время обработки календаря
                 calendar_time = event['processed_at'][:16] if event['processed_at'] else "❌"
                 
-                # Проверяем медиа файлы с временными метками
-                cursor.execute('''
-                    SELECT processed_at FROM processed_media 
-                    WHERE file_path LIKE ? 
-                    ORDER BY processed_at DESC LIMIT 1
-                ''', (f'%{event_id}%',))
-                media_result = cursor.fetchone()
-                media_time = media_result[0][:16] if media_result else "❌"
-                
-                # Проверяем транскрипции с временными метками
-                cursor.execute('''
-                    SELECT processed_at FROM processed_transcriptions 
-                    WHERE file_path LIKE ? 
-                    ORDER BY processed_at DESC LIMIT 1
-                ''', (f'%{event_id}%',))
-                trans_result = cursor.fetchone()
-                trans_time = trans_result[0][:16] if trans_result else "❌"
-                
-                # Проверяем синхронизацию с Notion с временными метками
-                cursor.execute('''
-                    SELECT last_sync FROM notion_sync 
-                    WHERE event_id = ? 
-                    ORDER BY last_sync DESC LIMIT 1
-                ''', (event_id,))
-                notion_result = cursor.fetchone()
-                notion_time = notion_result[0][:16] if notion_result else "❌"
+                # Временные метки этапов
+                stages = self._get_event_stages(event)
+                media_time = stages['last_media_at'][:16] if stages['last_media_at'] else "❌"
+                trans_time = stages['last_transcription_at'][:16] if stages['last_transcription_at'] else "❌"
+                notion_time = stages['last_notion_sync_at'][:16] if stages['last_notion_sync_at'] else "❌"
                 
                 # Определяем общий статус
                 completed_stages = sum([
@@ -5,10 +5,13 @@
 
 import os
 import sys
-import requests
 from dotenv import load_dotenv
 import json
 
+# Добавляем корневую директорию в путь для импортов
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.handlers.notion_api import get_notion_client
+
 # Загружаем переменные окружения
 load_dotenv()
 
@@ -40,7 +43,7 @@ def debug_notion_date_field():
             "page_size": 3
         }
         
-        response = requests.post(url, headers=headers, json=payload)
+        response = get_notion_client().post(url, headers=headers, json=payload)
         response.raise_for_status()
         
         data = response.json()
@@ -7,13 +7,14 @@
 import os
 import sys
 import sqlite3
-import requests
 import json
 from dotenv import load_dotenv
 
 # Добавляем путь к модулям проекта
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.handlers.notion_api import get_notion_client
+
 def enhance_notion_pages():
     """Улучшает страницы Notion, добавляя недостающие данные."""
     
@@ -119,7 +120,7 @@ def enhance_notion_pages():
                         update_url = f"https://api.notion.com/v1/pages/{page_id}"
                         update_data = {"properties": properties_to_update}
                         
-                        response = requests.patch(update_url, headers=headers, json=update_data)
+                        response = get_notion_client().patch(update_url, headers=headers, json=update_data)
                         response.raise_for_status()
                         print(f"   ✅ Свойства страницы обновлены")
                     
@@ -174,7 +175,7 @@ def enhance_notion_pages():
                     blocks_url = f"https://api.notion.com/v1/blocks/{page_id}/children"
                     blocks_data = {"children": description_blocks}
                     
-                    response = requests.patch(blocks_url, headers=headers, json=blocks_data)
+                    response = get_notion_client().patch(blocks_url, headers=headers, json=blocks_data)
                     response.raise_for_status()
                     print(f"   ✅ Описание встречи добавлено")
                     
@@ -278,7 +279,7 @@ def _add_transcription_to_page(page_id: str, transcript_file: str, headers: dict
         blocks_url = f"https://api.notion.com/v1/blocks/{page_id}/children"
         blocks_data = {"children": blocks}
         
-        response = requests.patch(blocks_url, headers=headers, json=blocks_data)
+        response = get_notion_client().patch(blocks_url, headers=headers, json=blocks_data)
         response.raise_for_status()
         print(f"   ✅ Транскрипция добавлена")
         
@@ -360,7 +361,7 @@ def _add_summary_to_page(page_id: str, summary_file: str, analysis_file: str, he
         blocks_url = f"https://api.notion.com/v1/blocks/{page_id}/children"
         blocks_data = {"children": blocks}
         
-        response = requests.patch(blocks_url, headers=headers, json=blocks_data)
+        response = get_notion_client().patch(blocks_url, headers=headers, json=blocks_data)
         response.raise_for_status()
         print(f"   ✅ Саммари и анализ добавлены")
         
@@ -6,12 +6,13 @@
 import os
 import sys
 import sqlite3
-import requests
 from dotenv import load_dotenv
 
 # Добавляем путь к модулям проекта
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.handlers.notion_api import get_notion_client
+
 def generate_sync_report():
     """Генерирует отчет о синхронизации."""
     
@@ -169,7 +170,7 @@ def generate_sync_report():
                 try:
                     # Получаем блоки страницы
                     blocks_url = f"https://api.notion.com/v1/blocks/{page_id}/children"
-                    blocks_response = requests.get(blocks_url, headers=headers)
+                    blocks_response = get_notion_client().get(blocks_url, headers=headers)
                     blocks_response.raise_for_status()
                     blocks_data = blocks_response.json()
                     
@@ -4,11 +4,15 @@
 """
 
 import sqlite3
-import requests
 import os
+import sys
 import json
 from dotenv import load_dotenv
 
+# Добавляем корневую директорию в путь для импортов
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.handlers.notion_api import get_notion_client
+
 def load_config():
     """Загружает конфигурацию из .env"""
     load_dotenv()
@@ -30,7 +34,7 @@ def clear_page_content(page_id, headers):
     try:
         # Получаем все блоки
         blocks_url = f'https://api.notion.com/v1/blocks/{page_id}/children'
-        response = requests.get(blocks_url, headers=headers)
+        response = get_notion_client().get(blocks_url, headers=headers)
         
         if response.status_code != 200:
             print(f"❌ Ошибка получения блоков: {response.status_code}")
@@ -43,7 +47,7 @@ def clear_page_content(page_id, headers):
         for block in blocks[1:]:
             block_id = block['id']
             delete_url = f'https://api.notion.com/v1/blocks/{block_id}'
-            delete_response = requests.delete(delete_url, headers=headers)
+            delete_response = get_notion_client().delete(delete_url, headers=headers)
             
             if delete_response.status_code != 200:
                 print(f"⚠️ Не удалось удалить блок {block_id}")
@@ -467,7 +471,7 @@ def improve_event_formatting(event_id, config):
         blocks_url = f'https://api.notion.com/v1/blocks/{page_id}/children'
         blocks_data = {'children': chunk}
         
-        response = requests.patch(blocks_url, headers=headers, json=blocks_data)
+        response = get_notion_client().patch(blocks_url, headers=headers, json=blocks_data)
         
         if response.status_code == 200:
             print(f"✅ Добавлено {len(chunk)} блоков")
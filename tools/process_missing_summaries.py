@@ -1,11 +1,20 @@
 #!/usr/bin/env python3
 """
 Скрипт для обработки саммари для событий с транскрипциями, но без саммари.
+
+    python tools/process_missing_summaries.py
+    python tools/process_missing_summaries.py --batch                 # через OpenAI Batch API
+    python tools/process_missing_summaries.py --batch --max-wait 600  # не ждать дольше 10 минут
+
+В режиме --batch запросы отправляются пакетами (дешевле, вне интерактивных
+лимитов); если пакеты не успели обработаться, повторный запуск с --batch
+продолжит ожидание уже отправленных пакетов.
 """
 
 import os
 import sys
 import sqlite3
+import argparse
 from datetime import datetime
 
 # Добавляем корневую папку проекта в путь
@@ -14,6 +23,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.config_manager import ConfigManager
 from src.handlers.state_manager import StateManager
 from src.handlers.summary_handler import SummaryHandler
+from src.handlers.summary_batch import SummaryBatchRunner
 
 def find_events_with_transcriptions_but_no_summaries():
     """
@@ -122,6 +132,35 @@ def process_summaries_for_events(events):
         import traceback
         traceback.print_exc()
 
+def process_summaries_in_batches(events, max_wait=0):
+    """
+    Обрабатывает саммари для списка событий через OpenAI Batch API.
+    """
+    if not events:
+        print("✅ Все события уже имеют саммари")
+        return
+    
+    print(f"\n📦 Пакетная обработка саммари для {len(events)} событий...")
+    
+    try:
+        config_manager = ConfigManager()
+        runner = SummaryBatchRunner(config_manager)
+        stats = runner.run([(event['folder_path'], event['account_type']) for event in events], max_wait=max_wait)
+        
+        print(f"\n📊 Результат пакетной обработки:")
+        print(f"  📤 Пакетов: {stats['batches']}, запросов: {stats['requests']}, раундов: {stats['rounds']}")
+        print(f"  ✅ Ответов получено: {stats['completed']}")
+        print(f"  ⚠️ Выполнено обычным путем: {stats['failed']}")
+        if stats['complete']:
+            print(f"  📋 Саммари создано: {stats['processed']} файлов, ошибок: {stats['errors']}")
+        else:
+            print("  ⏳ Пакеты еще обрабатываются: запустите скрипт с --batch позже")
+        
+    except Exception as e:
+        print(f"❌ Критическая ошибка при пакетной обработке саммари: {e}")
+        import traceback
+        traceback.print_exc()
+
 def verify_summary_results():
     """
     Проверяет результаты обработки саммари.
@@ -150,9 +189,18 @@ def verify_summary_results():
         print(f"  📈 Покрытие саммари: {coverage:.1f}%")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Создание саммари для событий с транскрипциями без саммари")
+    parser.add_argument('--batch', action='store_true', help='Отправлять запросы через OpenAI Batch API')
+    parser.add_argument('--max-wait', type=int, default=0,
+                        help='Максимальное ожидание пакетов в секундах (0 - до завершения)')
+    args = parser.parse_args()
+    
     try:
         events = find_events_with_transcriptions_but_no_summaries()
-        process_summaries_for_events(events)
+        if args.batch:
+            process_summaries_in_batches(events, args.max_wait)
+        else:
+            process_summaries_for_events(events)
         verify_summary_results()
         print(f"\n✅ Обработка саммари завершена!")
     except Exception as e:
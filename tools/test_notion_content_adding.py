@@ -7,12 +7,13 @@
 import os
 import sys
 import sqlite3
-import requests
 from dotenv import load_dotenv
 
 # Добавляем путь к модулям проекта
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.handlers.notion_api import get_notion_client
+
 def test_notion_content_adding():
     """Тестирует добавление контента в Notion страницы."""
     
@@ -226,7 +227,7 @@ def _add_test_content_to_page(page_id: str, content_type: str, content: str, hea
         blocks_url = f"https://api.notion.com/v1/blocks/{page_id}/children"
         blocks_data = {"children": blocks}
         
-        response = requests.patch(blocks_url, headers=headers, json=blocks_data)
+        response = get_notion_client().patch(blocks_url, headers=headers, json=blocks_data)
         response.raise_for_status()
         
         return True
@@ -241,7 +242,7 @@ def _check_page_content(page_id: str, headers: dict) -> bool:
     try:
         # Получаем блоки страницы
         blocks_url = f"https://api.notion.com/v1/blocks/{page_id}/children"
-        blocks_response = requests.get(blocks_url, headers=headers)
+        blocks_response = get_notion_client().get(blocks_url, headers=headers)
         blocks_response.raise_for_status()
         blocks_data = blocks_response.json()
         
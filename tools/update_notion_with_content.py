@@ -6,10 +6,13 @@
 import os
 import sys
 import sqlite3
-import requests
 from dotenv import load_dotenv
 from datetime import datetime
 
+# Добавляем корневую директорию в путь для импортов
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.handlers.notion_api import get_notion_client
+
 # Загружаем переменные окружения
 load_dotenv()
 
@@ -85,7 +88,7 @@ def update_notion_with_content(dry_run=True):
             if start_cursor:
                 payload["start_cursor"] = start_cursor
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = get_notion_client().post(url, headers=headers, json=payload)
             response.raise_for_status()
             
             data = response.json()
@@ -273,7 +276,7 @@ def update_notion_with_content(dry_run=True):
                         "children": blocks_to_add
                     }
                     
-                    response = requests.patch(url, headers=headers, json=payload)
+                    response = get_notion_client().patch(url, headers=headers, json=payload)
                     response.raise_for_status()
                     
                     updated_count += 1